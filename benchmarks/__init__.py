@@ -0,0 +1,3 @@
+"""
+Offline benchmark suite for the server hot paths (python -m benchmarks.run)
+"""
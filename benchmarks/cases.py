@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Benchmark cases for the server's hot paths.
+
+Every case builds the real service objects and swaps their infrastructure
+clients for the stand-ins in ``benchmarks.standins``, seeded with a synthetic
+but deterministic catalog of skills and tools. Each case factory checks that
+the path under test actually succeeds against the stand-ins before it is
+timed, so a broken stand-in fails the run instead of benchmarking an error
+path.
+"""
+
+import asyncio
+import itertools
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .standins import (
+    FakeRedisClient,
+    HashEmbeddingClient,
+    LocalQdrantClient,
+    SQLitePostgresClient,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# (skill id, name, vocabulary)
+SKILL_DOMAINS = [
+    ("calendar-management", "Calendar Management", "schedule meetings calendar events reminders"),
+    ("web-search", "Web Search", "search web pages news results links"),
+    ("file-operations", "File Operations", "read write files directories documents"),
+    ("data-analysis", "Data Analysis", "analyze data statistics charts tables"),
+    ("communication", "Communication", "send email messages chat notifications"),
+    ("code-development", "Code Development", "code repository git review tests"),
+    ("image-generation", "Image Generation", "generate images pictures render artwork"),
+    ("knowledge-base", "Knowledge Base", "store retrieve knowledge notes memory"),
+    ("deployment", "Deployment", "deploy kubernetes containers services clusters"),
+    ("finance", "Finance", "invoices payments billing budget expenses"),
+]
+VERBS = ["create", "list", "get", "update", "delete", "search", "summarize", "export"]
+
+
+@dataclass
+class Case:
+    """A prepared benchmark: the timed operation and how to run it"""
+
+    fn: Callable[[], Awaitable[Any]]
+    before_each: Optional[Callable[[], Awaitable[Any]]] = None
+    slow: bool = False  # Runs with the (small) --slow-iterations count
+    concurrent: bool = True  # Honors --concurrency
+
+
+def build_catalog(n_tools: int) -> List[Dict[str, Any]]:
+    """Deterministic tool catalog spread across SKILL_DOMAINS"""
+    tools = []
+    for i in range(n_tools):
+        skill_id, skill_name, vocabulary = SKILL_DOMAINS[i % len(SKILL_DOMAINS)]
+        words = vocabulary.split()
+        verb = VERBS[(i // len(SKILL_DOMAINS)) % len(VERBS)]
+        shift = i % len(words)
+        rotated = words[shift:] + words[:shift]
+        tools.append(
+            {
+                "name": f"{verb}_{skill_id.replace('-', '_')}_{i}",
+                "description": f"{verb.capitalize()} {' '.join(rotated[:3])} "
+                f"for {skill_name.lower()} workflows",
+                "skill_id": skill_id,
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string"},
+                        "limit": {"type": "integer", "default": 10},
+                    },
+                    "required": ["query"],
+                },
+            }
+        )
+    return tools
+
+
+def build_queries() -> List[str]:
+    """Natural-language queries, a few per skill domain"""
+    queries = []
+    for _, _, vocabulary in SKILL_DOMAINS:
+        words = vocabulary.split()
+        queries.append(f"{words[0]} {words[1]}")
+        queries.append(f"{VERBS[0]} {words[2]} {words[3]}")
+        queries.append(f"{VERBS[5]} {words[1]} and {words[4]}")
+    return queries
+
+
+async def _synthetic_tool(query: str, limit: int = 10) -> Dict[str, Any]:
+    return {"query": query, "limit": limit, "items": []}
+
+
+class BenchContext:
+    """Stand-ins and service objects shared by the cases of one run"""
+
+    def __init__(self, n_tools: int = 200, n_servers: int = 10):
+        self.n_tools = n_tools
+        self.n_servers = n_servers
+        self.catalog = build_catalog(n_tools)
+        self.queries = build_queries()
+        self.embedder = HashEmbeddingClient()
+        self.db = self.new_db()
+        self.qdrant = LocalQdrantClient()
+        self._seeded = False
+        self._search_service = None
+        self._meta_mcp = None
+        self.install_cache()
+
+    def new_db(self) -> SQLitePostgresClient:
+        from core.config import get_settings
+
+        return SQLitePostgresClient(schema_aliases=[get_settings().db_schema])
+
+    def install_cache(self):
+        """Point the global RedisCache at a fresh fakeredis instance"""
+        from core.cache import redis_cache
+
+        redis_cache._cache = redis_cache.RedisCache(client=FakeRedisClient())
+        return redis_cache._cache
+
+    def query_cycle(self):
+        return itertools.cycle(self.queries)
+
+    async def seed(self):
+        """Load the catalog into PostgreSQL (tools) and Qdrant (tools + skills)"""
+        if self._seeded:
+            return
+        await self.db.insert_into(
+            "tools",
+            [
+                {
+                    "name": t["name"],
+                    "description": t["description"],
+                    "category": "general",
+                    "input_schema": t["input_schema"],
+                    "is_active": True,
+                    "primary_skill_id": t["skill_id"],
+                    "skill_ids": [t["skill_id"]],
+                    "is_classified": True,
+                }
+                for t in self.catalog
+            ],
+            schema="mcp",
+        )
+        rows = await self.db.query("SELECT id, name FROM mcp.tools")
+        ids = {row["name"]: row["id"] for row in rows}
+
+        embeddings = await self.embedder.embeddings.create(
+            input=[t["description"] for t in self.catalog]
+        )
+        await self.qdrant.create_collection("mcp_unified_search", 1536)
+        await self.qdrant.upsert_points(
+            "mcp_unified_search",
+            [
+                {
+                    "id": ids[t["name"]],
+                    "vector": item.embedding,
+                    "payload": {
+                        "type": "tool",
+                        "name": t["name"],
+                        "description": t["description"],
+                        "db_id": ids[t["name"]],
+                        "is_active": True,
+                        "is_global": True,
+                        "primary_skill_id": t["skill_id"],
+                        "skill_ids": [t["skill_id"]],
+                        "metadata": {"category": "general"},
+                    },
+                }
+                for t, item in zip(self.catalog, embeddings.data)
+            ],
+        )
+
+        skill_embeddings = await self.embedder.embeddings.create(
+            input=[f"{name}: {vocabulary}" for _, name, vocabulary in SKILL_DOMAINS]
+        )
+        await self.qdrant.create_collection("mcp_skills", 1536)
+        await self.qdrant.upsert_points(
+            "mcp_skills",
+            [
+                {
+                    "id": i,
+                    "vector": item.embedding,
+                    "payload": {
+                        "id": skill_id,
+                        "name": name,
+                        "description": vocabulary,
+                        "is_active": True,
+                        "tool_count": sum(1 for t in self.catalog if t["skill_id"] == skill_id),
+                    },
+                }
+                for i, ((skill_id, name, vocabulary), item) in enumerate(
+                    zip(SKILL_DOMAINS, skill_embeddings.data)
+                )
+            ],
+        )
+        self._seeded = True
+
+    def vector_repository(self, qdrant: LocalQdrantClient):
+        from services.vector_service.vector_repository import VectorRepository
+
+        repository = VectorRepository()
+        repository.client = qdrant
+        return repository
+
+    async def search_service(self):
+        if self._search_service is None:
+            from services.search_service.hierarchical_search_service import (
+                HierarchicalSearchService,
+            )
+
+            await self.seed()
+            self._search_service = HierarchicalSearchService(
+                vector_repository=self.vector_repository(self.qdrant),
+                model_client=self.embedder,
+                db_pool=self.db,
+                qdrant_client=self.qdrant,
+            )
+        return self._search_service
+
+    def catalog_mcp(self, name: str = "Internal MCP"):
+        """FastMCP server exposing the synthetic catalog"""
+        from mcp.server.fastmcp import FastMCP
+
+        mcp = FastMCP(name, stateless_http=True)
+        for tool in self.catalog:
+            mcp.add_tool(_synthetic_tool, name=tool["name"], description=tool["description"])
+        return mcp
+
+    async def meta_mcp(self):
+        """External FastMCP with the discovery meta-tools over the catalog"""
+        if self._meta_mcp is None:
+            from mcp.server.fastmcp import FastMCP
+
+            from services.search_service.unified_meta_search import UnifiedMetaSearch
+            from tools.meta_tools import discovery_tools
+
+            search_service = await self.search_service()
+
+            async def get_unified_search():
+                return UnifiedMetaSearch(hierarchical_search=search_service)
+
+            # discover() builds its search service through this module-level hook
+            discovery_tools._get_unified_search = get_unified_search
+
+            self._meta_mcp = FastMCP("Smart MCP Server", stateless_http=True)
+            discovery_tools.register_discovery_tools(
+                self._meta_mcp, internal_mcp=self.catalog_mcp()
+            )
+        return self._meta_mcp
+
+    def sync_service(self, mcp_server, db: SQLitePostgresClient, qdrant: LocalQdrantClient):
+        """SyncService wired to the given stand-ins"""
+        from services.sync_service.sync_service import SyncService
+
+        sync = SyncService(mcp_server=mcp_server)
+        sync.isa_model = self.embedder
+        sync.vector_repo.client = qdrant
+        sync.tool_service.repository.db = db
+        sync.skill_service.repository.db = db
+        return sync
+
+
+async def _call_tool(mcp, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Call a tool through FastMCP and return its structured result"""
+    _, structured = await mcp.call_tool(name, arguments)
+    return structured.get("result", structured)
+
+
+def _check(condition: bool, message: str):
+    if not condition:
+        raise RuntimeError(f"Benchmark setup check failed: {message}")
+
+
+# ============ Cases ============
+
+CaseFactory = Callable[[BenchContext], Awaitable[Case]]
+CASES: Dict[str, CaseFactory] = {}
+
+
+def case(name: str):
+    """Register a case factory under ``name``"""
+
+    def decorator(factory: CaseFactory) -> CaseFactory:
+        CASES[name] = factory
+        return factory
+
+    return decorator
+
+
+@case("redis_cache.get_hit")
+async def redis_cache_get_hit(ctx: BenchContext) -> Case:
+    cache = ctx.install_cache()
+    value = {
+        "id": 1,
+        "name": ctx.catalog[0]["name"],
+        "input_schema": ctx.catalog[0]["input_schema"],
+    }
+    await cache.set("tool", "id:1", value)
+    _check(await cache.get("tool", "id:1") == value, "cache round trip")
+    return Case(lambda: cache.get("tool", "id:1"))
+
+
+@case("redis_cache.get_miss")
+async def redis_cache_get_miss(ctx: BenchContext) -> Case:
+    cache = ctx.install_cache()
+    return Case(lambda: cache.get("tool", "id:missing"))
+
+
+@case("redis_cache.set")
+async def redis_cache_set(ctx: BenchContext) -> Case:
+    cache = ctx.install_cache()
+    keys = itertools.count()
+    value = {
+        "id": 1,
+        "name": ctx.catalog[0]["name"],
+        "input_schema": ctx.catalog[0]["input_schema"],
+    }
+    return Case(lambda: cache.set("tool", f"id:{next(keys) % 1000}", value))
+
+
+@case("monitoring.check_and_log")
+async def monitoring_check_and_log(ctx: BenchContext) -> Case:
+    """Rate limit check plus request log with full history and 100k keys tracked"""
+    from types import SimpleNamespace
+
+    from core.monitoring import MonitoringManager
+
+    manager = MonitoringManager()
+    policy = SimpleNamespace(rate_limits={"default": {"calls": 1_000_000, "window": 3600}})
+    requests = itertools.count()
+
+    async def request():
+        i = next(requests)
+        user = f"user{i % 100_000}"
+        if manager.check_rate_limit("tool", user, policy):
+            manager.log_request("tool", user, True, 0.001 + (i % 100) / 1000, "LOW")
+
+    for _ in range(100_000):
+        await request()
+    _check(manager.metrics["total_requests"] == 100_000, "requests logged")
+    return Case(request)
+
+
+@case("search.hierarchical")
+async def search_hierarchical(ctx: BenchContext) -> Case:
+    service = await ctx.search_service()
+    queries = ctx.query_cycle()
+    result = await service.search(ctx.queries[0])
+    _check(bool(result.matched_skills), "stage 1 matched no skills")
+    _check(bool(result.tools), "stage 2 matched no tools")
+    _check(result.tools[0].input_schema is not None, "stage 3 loaded no schemas")
+    return Case(lambda: service.search(next(queries)))
+
+
+@case("search.direct")
+async def search_direct(ctx: BenchContext) -> Case:
+    service = await ctx.search_service()
+    queries = ctx.query_cycle()
+    result = await service.search(ctx.queries[0], strategy="direct")
+    _check(bool(result.tools), "direct search matched no tools")
+    return Case(lambda: service.search(next(queries), strategy="direct"))
+
+
+@case("meta.discover")
+async def meta_discover(ctx: BenchContext) -> Case:
+    mcp = await ctx.meta_mcp()
+    queries = ctx.query_cycle()
+    result = await _call_tool(mcp, "discover", {"query": ctx.queries[0]})
+    _check(result.get("total_found", 0) > 0, f"discover returned {result}")
+    return Case(lambda: mcp.call_tool("discover", {"query": next(queries)}))
+
+
+@case("meta.get_tool_schema")
+async def meta_get_tool_schema(ctx: BenchContext) -> Case:
+    mcp = await ctx.meta_mcp()
+    names = itertools.cycle(t["name"] for t in ctx.catalog)
+    result = await _call_tool(mcp, "get_tool_schema", {"tool_name": ctx.catalog[-1]["name"]})
+    _check("input_schema" in result, f"get_tool_schema returned {result}")
+    return Case(lambda: mcp.call_tool("get_tool_schema", {"tool_name": next(names)}))
+
+
+@case("meta.execute")
+async def meta_execute(ctx: BenchContext) -> Case:
+    mcp = await ctx.meta_mcp()
+    names = itertools.cycle(t["name"] for t in ctx.catalog)
+
+    def call():
+        return mcp.call_tool(
+            "execute", {"tool_name": next(names), "parameters": {"query": "quarterly report"}}
+        )
+
+    _, structured = await call()
+    result = structured.get("result", structured)
+    _check(result.get("query") == "quarterly report", f"execute returned {result}")
+    return Case(call)
+
+
+@case("sync.tools.full")
+async def sync_tools_full(ctx: BenchContext) -> Case:
+    """First sync of the whole catalog into empty stores"""
+    mcp = ctx.catalog_mcp()
+    state = {}
+
+    async def fresh_stores():
+        ctx.install_cache()
+        state["sync"] = ctx.sync_service(mcp, ctx.new_db(), LocalQdrantClient())
+        await state["sync"].initialize()
+
+    await fresh_stores()
+    result = await state["sync"].sync_tools()
+    _check(result["synced"] == ctx.n_tools, f"sync_tools returned {result}")
+    return Case(
+        lambda: state["sync"].sync_tools(), before_each=fresh_stores, slow=True, concurrent=False
+    )
+
+
+@case("sync.tools.incremental")
+async def sync_tools_incremental(ctx: BenchContext) -> Case:
+    """Re-sync of an unchanged catalog"""
+    mcp = ctx.catalog_mcp()
+    ctx.install_cache()
+    sync = ctx.sync_service(mcp, ctx.new_db(), LocalQdrantClient())
+    await sync.initialize()
+    await sync.sync_tools()
+    result = await sync.sync_tools()
+    _check(
+        result["synced"] == 0 and result["failed"] == 0 and result["total"] == ctx.n_tools,
+        f"sync_tools returned {result}",
+    )
+    return Case(sync.sync_tools, slow=True, concurrent=False)
+
+
+class _LoopbackSessionManager:
+    """Answers every tool call immediately, in place of remote MCP sessions"""
+
+    async def call_tool(self, server_id: str, tool_name: str, arguments: Dict[str, Any]):
+        return {"content": [{"type": "text", "text": tool_name}], "isError": False}
+
+
+async def _router(ctx: BenchContext):
+    from services.aggregator_service.domain import ServerStatus
+    from services.aggregator_service.request_router import RequestRouter
+    from services.aggregator_service.server_registry import ServerRegistry
+
+    registry = ServerRegistry()
+    router = RequestRouter(session_manager=_LoopbackSessionManager(), server_registry=registry)
+    for i in range(ctx.n_servers):
+        server = await registry.add(
+            {
+                "name": f"server-{i}",
+                "transport_type": "STREAMABLE_HTTP",
+                "connection_config": {"url": f"http://server-{i}.local/mcp"},
+            }
+        )
+        await registry.update_status(server["id"], ServerStatus.CONNECTED)
+    tool_names = itertools.cycle(
+        f"server-{i % ctx.n_servers}.{t['name']}" for i, t in enumerate(ctx.catalog)
+    )
+    return router, tool_names
+
+
+@case("aggregator.route")
+async def aggregator_route(ctx: BenchContext) -> Case:
+    router, tool_names = await _router(ctx)
+    context = await router.route(next(tool_names), {})
+    _check(context.server_name == "server-0", f"routed to {context.server_name}")
+    return Case(lambda: router.route(next(tool_names), {"query": "status"}))
+
+
+@case("aggregator.route_and_execute")
+async def aggregator_route_and_execute(ctx: BenchContext) -> Case:
+    router, tool_names = await _router(ctx)
+    result = await router.route_and_execute(next(tool_names), {})
+    _check(not result["is_error"], f"execute returned {result}")
+    return Case(lambda: router.route_and_execute(next(tool_names), {"query": "status"}))
+
+
+@case("startup.auto_discovery")
+async def startup_auto_discovery(ctx: BenchContext) -> Case:
+    """Tool/prompt/resource discovery and registration, modules already imported"""
+    from mcp.server.fastmcp import FastMCP
+
+    from core.auto_discovery import AutoDiscoverySystem
+
+    async def discover():
+        mcp = FastMCP("Smart MCP Server", stateless_http=True)
+        await AutoDiscoverySystem().auto_register_with_mcp(mcp)
+        return mcp
+
+    mcp = await discover()
+    _check(len(await mcp.list_tools()) > 0, "no tools discovered")
+    return Case(discover, slow=True, concurrent=False)
+
+
+_STARTUP_SCRIPT = """
+import asyncio, logging, sys
+import main
+logging.disable(logging.CRITICAL)
+mcp = asyncio.run(main.SmartMCPServer().initialize(skip_sync=True, meta_tools_only={meta}))
+sys.exit(0 if mcp is not None else 1)
+"""
+
+
+async def _cold_start(meta_tools_only: bool):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        _STARTUP_SCRIPT.format(meta=meta_tools_only),
+        cwd=PROJECT_ROOT,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"Server startup failed: {stderr.decode()[-2000:]}")
+
+
+@case("startup.initialize")
+async def startup_initialize(ctx: BenchContext) -> Case:
+    """Cold SmartMCPServer.initialize(skip_sync=True) in a fresh interpreter"""
+    return Case(lambda: _cold_start(False), slow=True, concurrent=False)
+
+
+@case("startup.initialize_meta_tools_only")
+async def startup_initialize_meta_tools_only(ctx: BenchContext) -> Case:
+    """Cold start in meta-tools-only mode (stdio default)"""
+    return Case(lambda: _cold_start(True), slow=True, concurrent=False)
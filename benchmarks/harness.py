@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness.
+
+Runs an async callable repeatedly, records per-call latency with
+``time.perf_counter`` and reports exact p50/p95/p99 (from the sorted samples,
+no sketching) plus throughput. Reports are plain JSON so they can be stored as
+baselines and compared later.
+"""
+
+import asyncio
+import gc
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+REPORT_VERSION = 1
+
+# Metrics compared against a baseline; latencies regress upwards, throughput downwards
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+DEFAULT_COMPARE_METRICS = ("p50_ms", "p95_ms", "throughput_ops")
+
+
+@dataclass
+class BenchmarkResult:
+    """Latency distribution and throughput of one benchmark"""
+
+    name: str
+    iterations: int
+    concurrency: int
+    mean_ms: float
+    min_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    throughput_ops: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """q-th percentile (0..100) of sorted samples, linearly interpolated"""
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+
+def summarize(
+    name: str, samples_s: Sequence[float], elapsed_s: float, concurrency: int = 1
+) -> BenchmarkResult:
+    """Build a result from per-call latencies and the wall time of the run (seconds)"""
+    ordered = sorted(s * 1000 for s in samples_s)
+    count = len(ordered)
+    return BenchmarkResult(
+        name=name,
+        iterations=count,
+        concurrency=concurrency,
+        mean_ms=sum(ordered) / count if count else 0.0,
+        min_ms=ordered[0] if count else 0.0,
+        p50_ms=percentile(ordered, 50),
+        p95_ms=percentile(ordered, 95),
+        p99_ms=percentile(ordered, 99),
+        max_ms=ordered[-1] if count else 0.0,
+        throughput_ops=count / elapsed_s if elapsed_s > 0 else 0.0,
+    )
+
+
+async def measure(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    iterations: int = 200,
+    warmup: int = 10,
+    concurrency: int = 1,
+    before_each: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> BenchmarkResult:
+    """
+    Benchmark an async callable.
+
+    Args:
+        name: Benchmark name
+        fn: Operation under test
+        iterations: Timed calls
+        warmup: Untimed calls made first
+        concurrency: Calls kept in flight at once; throughput is then
+            iterations / wall time
+        before_each: Untimed per-call setup (requires concurrency == 1;
+            throughput is then iterations / total timed latency)
+
+    Returns:
+        BenchmarkResult
+    """
+    if before_each is not None and concurrency != 1:
+        raise ValueError("before_each requires concurrency == 1")
+
+    for _ in range(warmup):
+        if before_each is not None:
+            await before_each()
+        await fn()
+
+    samples: List[float] = []
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            if before_each is not None:
+                await before_each()
+            start = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    elapsed = time.perf_counter() - start
+
+    if before_each is not None:
+        elapsed = sum(samples)
+    return summarize(name, samples, elapsed, concurrency)
+
+
+# ============ Reports ============
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                cwd=Path(__file__).parent,
+            ).stdout.strip()
+            or None
+        )
+    except Exception:
+        return None
+
+
+def build_report(results: Sequence[BenchmarkResult], config: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-serializable report of a run"""
+    return {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "git_commit": _git_commit(),
+        },
+        "config": config,
+        "benchmarks": {r.name: r.to_dict() for r in results},
+    }
+
+
+@dataclass
+class MetricChange:
+    """Change of one metric between a baseline and the current run"""
+
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+    change_pct: float
+    regressed: bool
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.15,
+    metrics: Sequence[str] = DEFAULT_COMPARE_METRICS,
+    noise_floor_ms: float = 0.05,
+) -> List[MetricChange]:
+    """
+    Compare two reports, benchmark by benchmark.
+
+    A latency metric regresses when it grows by more than ``tolerance`` (as a
+    fraction) and by more than ``noise_floor_ms``; throughput regresses when
+    it drops by more than ``tolerance`` and each operation takes more than
+    ``noise_floor_ms`` longer. Benchmarks missing from either report are
+    skipped.
+
+    Returns:
+        One MetricChange per compared metric
+    """
+    changes = []
+    for name, now in current.get("benchmarks", {}).items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            continue
+        for metric in metrics:
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            if metric == "throughput_ops":
+                # Judge the noise floor on the per-operation time the throughput implies
+                slower_ms = 1000 / new - 1000 / old if new > 0 and old > 0 else 0.0
+                regressed = change < -tolerance and slower_ms > noise_floor_ms
+            else:
+                regressed = change > tolerance and (new - old) > noise_floor_ms
+            changes.append(MetricChange(name, metric, old, new, change * 100, regressed))
+    return changes
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    """Plain-text table of results"""
+    lines = [
+        f"{'benchmark':<34} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>10}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.name:<34} {r.iterations:>6} {r.p50_ms:>10.3f} {r.p95_ms:>10.3f} "
+            f"{r.p99_ms:>10.3f} {r.throughput_ops:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def format_changes(changes: Sequence[MetricChange]) -> str:
+    """Plain-text table of baseline changes, regressions flagged"""
+    lines = [f"{'benchmark':<34} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for c in changes:
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(
+            f"{c.benchmark:<34} {c.metric:<15} {c.baseline:>10.3f} {c.current:>10.3f} "
+            f"{c.change_pct:>+7.1f}%{flag}"
+        )
+    return "\n".join(lines)
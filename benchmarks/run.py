@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite.
+
+Usage:
+    python -m benchmarks.run                              # all cases, table + JSON report
+    python -m benchmarks.run --only search. --only meta.  # name prefixes
+    python -m benchmarks.run --save-baseline              # store as benchmarks/results/baseline.json
+    python -m benchmarks.run --baseline benchmarks/results/baseline.json --tolerance 0.2
+
+With ``--baseline`` the run is compared metric by metric and the exit code is
+1 if any metric regressed beyond the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import List
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    __package__ = "benchmarks"
+
+from .cases import CASES, PROJECT_ROOT, BenchContext
+from .harness import (
+    DEFAULT_COMPARE_METRICS,
+    BenchmarkResult,
+    build_report,
+    compare,
+    format_changes,
+    format_results,
+    measure,
+)
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_BASELINE = RESULTS_DIR / "baseline.json"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="isA MCP hot-path benchmarks")
+    parser.add_argument("--only", action="append", default=[], help="Run cases with this prefix")
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per case")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed calls per case")
+    parser.add_argument(
+        "--slow-iterations", type=int, default=5, help="Timed calls for startup and sync cases"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Calls in flight, for cases that allow it"
+    )
+    parser.add_argument("--tools", type=int, default=200, help="Synthetic catalog size")
+    parser.add_argument("--servers", type=int, default=10, help="Aggregated servers")
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_DIR / "latest.json", help="JSON report path"
+    )
+    parser.add_argument("--baseline", type=Path, help="Compare against this report")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help=f"Also write the report to {DEFAULT_BASELINE}"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed fractional regression (0.15 = 15%%)"
+    )
+    parser.add_argument(
+        "--metric",
+        action="append",
+        dest="metrics",
+        help=f"Metric to compare (default: {', '.join(DEFAULT_COMPARE_METRICS)})",
+    )
+    return parser.parse_args(argv)
+
+
+async def run_cases(args: argparse.Namespace) -> List[BenchmarkResult]:
+    ctx = BenchContext(n_tools=args.tools, n_servers=args.servers)
+    results = []
+    for name, factory in CASES.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        prepared = await factory(ctx)
+        result = await measure(
+            name,
+            prepared.fn,
+            iterations=args.slow_iterations if prepared.slow else args.iterations,
+            warmup=min(args.warmup, 1) if prepared.slow else args.warmup,
+            concurrency=args.concurrency if prepared.concurrent else 1,
+            before_each=prepared.before_each,
+        )
+        print(format_results([result]).splitlines()[-1], file=sys.stderr, flush=True)
+        results.append(result)
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.list:
+        for name, factory in CASES.items():
+            print(f"{name:<36} {(factory.__doc__ or '').strip()}")
+        return 0
+
+    # Services log every call at INFO; keep console I/O out of the measurements
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger().setLevel(logging.ERROR)
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+
+    results = asyncio.run(run_cases(args))
+    config = {
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "slow_iterations": args.slow_iterations,
+        "concurrency": args.concurrency,
+        "tools": args.tools,
+        "servers": args.servers,
+    }
+    report = build_report(results, config)
+
+    print(format_results(results))
+    for path in [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else []):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != config:
+            print(f"\nWarning: baseline config differs: {baseline.get('config')}")
+        changes = compare(
+            baseline,
+            report,
+            tolerance=args.tolerance,
+            metrics=args.metrics or DEFAULT_COMPARE_METRICS,
+        )
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        print(format_changes(changes))
+        regressions = [c for c in changes if c.regressed]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
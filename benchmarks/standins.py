@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+In-process stand-ins for the benchmark suite.
+
+Each stand-in implements the subset of the isa_common client interface the
+services actually call, so services run unmodified against local state:
+
+- HashEmbeddingClient: deterministic feature-hashing embeddings (embeddings.create)
+- LocalQdrantClient: brute-force cosine search with Qdrant-style filters (AsyncQdrantClient)
+- SQLitePostgresClient: in-memory SQLite with an attached ``mcp`` schema (AsyncPostgresClient)
+- FakeRedisClient: fakeredis behind the AsyncRedisClient interface
+
+None of them talk to the network, and the same inputs always produce the same
+vectors, rows and scores, so runs are comparable across machines and commits.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import re
+import sqlite3
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+EMBEDDING_DIMENSION = 1536  # text-embedding-3-small
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ============ Embedding Model ============
+
+
+class HashEmbeddingClient:
+    """
+    Deterministic embedding model.
+
+    Words and word bigrams are hashed into signed buckets and the result is
+    L2-normalized, so texts sharing vocabulary get a high cosine similarity.
+    Exposes the OpenAI-style ``client.embeddings.create(input=..., model=...)``.
+
+    Args:
+        dimension: Vector size
+        latency_ms: Simulated round-trip time per create() call
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION, latency_ms: float = 0.0):
+        self.dimension = dimension
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self.embeddings = self
+
+    def embed(self, text: str) -> List[float]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = [0.0] * self.dimension
+        for feature in features or [""]:
+            digest = int.from_bytes(
+                hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"
+            )
+            vector[digest % self.dimension] += 1.0 if digest >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    async def create(self, input: Union[str, List[str]], model: str = "hash-embedding", **kwargs):
+        self.calls += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        texts = [input] if isinstance(input, str) else list(input)
+        return SimpleNamespace(
+            model=model,
+            data=[
+                SimpleNamespace(index=i, embedding=self.embed(text)) for i, text in enumerate(texts)
+            ],
+        )
+
+
+# ============ Vector Store ============
+
+
+def _payload_matches(payload: Dict[str, Any], filter_conditions: Optional[Dict]) -> bool:
+    """Evaluate a Qdrant-style must/should/must_not filter against a payload"""
+    if not filter_conditions:
+        return True
+    if not all(_condition_matches(payload, c) for c in filter_conditions.get("must") or []):
+        return False
+    should = filter_conditions.get("should") or []
+    if should and not any(_condition_matches(payload, c) for c in should):
+        return False
+    return not any(_condition_matches(payload, c) for c in filter_conditions.get("must_not") or [])
+
+
+def _condition_matches(payload: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+    if "field" not in condition:
+        # Nested filter, e.g. {"should": [...]} inside "must"
+        return _payload_matches(payload, condition)
+
+    value = payload.get(condition["field"])
+    if "match" in condition:
+        expected = next(iter(condition["match"].values()))
+        if isinstance(value, list):
+            return expected in value
+        return value == expected
+    if "range" in condition:
+        if value is None:
+            return False
+        bounds = condition["range"]
+        return (
+            ("gt" not in bounds or value > bounds["gt"])
+            and ("gte" not in bounds or value >= bounds["gte"])
+            and ("lt" not in bounds or value < bounds["lt"])
+            and ("lte" not in bounds or value <= bounds["lte"])
+        )
+    return True
+
+
+class LocalQdrantClient:
+    """
+    In-memory vector store with the AsyncQdrantClient interface.
+
+    Search is exact (brute-force cosine over the points that pass the filter),
+    so results are deterministic.
+    """
+
+    def __init__(self):
+        # collection -> point id -> (unit vector, payload)
+        self._collections: Dict[str, Dict[Any, tuple]] = {}
+        self._operation_ids = itertools.count(1)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def reconnect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _operation_id(self) -> str:
+        return f"op-{next(self._operation_ids)}"
+
+    # ============ Collections ============
+
+    async def list_collections(self) -> List[str]:
+        return list(self._collections)
+
+    async def create_collection(
+        self, collection_name: str, vector_size: int, distance: str = "Cosine"
+    ) -> Optional[bool]:
+        self._collections.setdefault(collection_name, {})
+        return True
+
+    async def delete_collection(self, collection_name: str) -> Optional[bool]:
+        return self._collections.pop(collection_name, None) is not None
+
+    async def get_collection_info(self, collection_name: str) -> Optional[Dict]:
+        points = self._collections.get(collection_name)
+        if points is None:
+            return None
+        return {"name": collection_name, "points_count": len(points), "status": "green"}
+
+    async def count_points(self, collection_name: str) -> Optional[int]:
+        return len(self._collections.get(collection_name, {}))
+
+    async def create_field_index(
+        self, collection_name: str, field_name: str, field_type: str = "keyword"
+    ) -> Optional[str]:
+        return self._operation_id()
+
+    # ============ Points ============
+
+    async def upsert_points(
+        self, collection_name: str, points: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        collection = self._collections.setdefault(collection_name, {})
+        for point in points:
+            vector = np.asarray(point["vector"], dtype=np.float32)
+            norm = float(np.linalg.norm(vector)) or 1.0
+            collection[point["id"]] = (vector / norm, dict(point.get("payload") or {}))
+        return self._operation_id()
+
+    async def delete_points(self, collection_name: str, ids: List[Any]) -> Optional[str]:
+        collection = self._collections.get(collection_name, {})
+        for point_id in ids:
+            collection.pop(point_id, None)
+        return self._operation_id()
+
+    async def update_payload(
+        self, collection_name: str, ids: List[Any], payload: Dict[str, Any]
+    ) -> Optional[str]:
+        collection = self._collections.get(collection_name, {})
+        for point_id in ids:
+            if point_id in collection:
+                collection[point_id][1].update(payload)
+        return self._operation_id()
+
+    async def scroll(
+        self,
+        collection_name: str,
+        filter_conditions: Optional[Dict] = None,
+        limit: int = 100,
+        offset_id: Optional[Any] = None,
+        with_payload: bool = True,
+        with_vectors: bool = False,
+    ) -> Optional[Dict]:
+        collection = self._collections.get(collection_name, {})
+        ids = sorted(
+            (
+                i
+                for i, (_, payload) in collection.items()
+                if _payload_matches(payload, filter_conditions)
+            ),
+            key=str,
+        )
+        if offset_id is not None:
+            ids = [i for i in ids if str(i) >= str(offset_id)]
+        page, rest = ids[:limit], ids[limit:]
+        return {
+            "points": [
+                self._point(collection_name, i, None, with_payload, with_vectors) for i in page
+            ],
+            "next_offset": rest[0] if rest else None,
+        }
+
+    async def search(
+        self,
+        collection_name: str,
+        vector: List[float],
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        with_payload: bool = True,
+        with_vectors: bool = False,
+    ) -> Optional[List[Dict]]:
+        return await self.search_with_filter(
+            collection_name,
+            vector,
+            limit=limit,
+            score_threshold=score_threshold,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+
+    async def search_with_filter(
+        self,
+        collection_name: str,
+        vector: List[float],
+        filter_conditions: Optional[Dict] = None,
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        offset: Optional[int] = None,
+        with_payload: bool = True,
+        with_vectors: bool = False,
+        params: Optional[Dict] = None,
+    ) -> Optional[List[Dict]]:
+        collection = self._collections.get(collection_name, {})
+        candidates = [
+            (point_id, unit)
+            for point_id, (unit, payload) in collection.items()
+            if _payload_matches(payload, filter_conditions)
+        ]
+        if not candidates:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        query /= float(np.linalg.norm(query)) or 1.0
+        scores = np.stack([unit for _, unit in candidates]) @ query
+        order = np.argsort(-scores, kind="stable")
+
+        results = []
+        for index in order[(offset or 0) :]:
+            score = float(scores[index])
+            if score_threshold is not None and score < score_threshold:
+                break
+            point_id = candidates[index][0]
+            results.append(
+                self._point(collection_name, point_id, score, with_payload, with_vectors)
+            )
+            if len(results) >= limit:
+                break
+        return results
+
+    def _point(
+        self,
+        collection_name: str,
+        point_id: Any,
+        score: Optional[float],
+        with_payload: bool,
+        with_vectors: bool,
+    ) -> Dict[str, Any]:
+        unit, payload = self._collections[collection_name][point_id]
+        point: Dict[str, Any] = {"id": point_id}
+        if score is not None:
+            point["score"] = score
+        if with_payload:
+            point["payload"] = dict(payload)
+        if with_vectors:
+            point["vector"] = unit.tolist()
+        return point
+
+
+# ============ PostgreSQL ============
+
+_SCHEMA_SQL = """
+CREATE TABLE mcp.tools (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT,
+    category TEXT,
+    input_schema JSON DEFAULT '{}',
+    output_schema JSON,
+    annotations JSON,
+    metadata JSON DEFAULT '{}',
+    call_count INTEGER DEFAULT 0,
+    success_count INTEGER DEFAULT 0,
+    failure_count INTEGER DEFAULT 0,
+    avg_response_time_ms INTEGER DEFAULT 0,
+    last_used_at TIMESTAMP,
+    is_active BOOLEAN DEFAULT 1,
+    is_deprecated BOOLEAN DEFAULT 0,
+    deprecation_message TEXT,
+    source_server_id TEXT,
+    original_name TEXT,
+    is_external BOOLEAN NOT NULL DEFAULT 0,
+    is_classified BOOLEAN NOT NULL DEFAULT 0,
+    skill_ids JSON DEFAULT '[]',
+    primary_skill_id TEXT,
+    is_default BOOLEAN NOT NULL DEFAULT 0,
+    org_id TEXT,
+    is_global BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE mcp.skill_categories (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    keywords JSON DEFAULT '[]',
+    examples JSON DEFAULT '[]',
+    parent_domain TEXT,
+    tool_count INTEGER DEFAULT 0,
+    is_active BOOLEAN DEFAULT 1,
+    org_id TEXT,
+    is_global BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE mcp.tool_skill_assignments (
+    tool_id INTEGER NOT NULL,
+    skill_id TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    is_primary BOOLEAN DEFAULT 0,
+    source TEXT DEFAULT 'llm_auto',
+    org_id TEXT,
+    is_global BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (tool_id, skill_id)
+);
+
+CREATE TABLE mcp.tool_classification_memo (
+    tool_id INTEGER PRIMARY KEY,
+    memo_key TEXT NOT NULL,
+    primary_skill_id TEXT,
+    assignments JSON DEFAULT '[]',
+    classified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# PostgreSQL syntax -> SQLite, applied in order
+_SQL_REWRITES = [
+    (
+        re.compile(r"= *ANY *\( *\$(\d+) *\)", re.IGNORECASE),
+        r"IN (SELECT value FROM json_each(?\1))",
+    ),
+    (re.compile(r"\$(\d+)"), r"?\1"),
+    (re.compile(r"::[a-z_]+(\[\])?", re.IGNORECASE), ""),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bILIKE\b", re.IGNORECASE), "LIKE"),
+]
+
+
+def _decode_json(raw: bytes) -> Any:
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw.decode()
+
+
+sqlite3.register_converter("BOOLEAN", lambda raw: raw not in (b"0", b""))
+sqlite3.register_converter("JSON", _decode_json)
+
+
+def _to_sqlite_param(value: Any) -> Any:
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class SQLitePostgresClient:
+    """
+    In-memory SQLite with the AsyncPostgresClient interface.
+
+    The ``mcp`` schema is an attached database, so ``mcp.tools`` resolves as in
+    PostgreSQL. ``$n`` placeholders, ``::type`` casts, ``NOW()``, ``ILIKE`` and
+    ``= ANY($n)`` are rewritten; JSONB and array columns are stored as JSON and
+    decoded on read, like the isa_common SQLite client used for local mode.
+
+    Args:
+        schema_aliases: Other schema names that refer to ``mcp`` (e.g. the
+            configured ``db_schema``)
+        schema_sql: DDL run at startup
+    """
+
+    def __init__(self, schema_aliases: Sequence[str] = (), schema_sql: str = _SCHEMA_SQL):
+        self._rewrites = list(_SQL_REWRITES)
+        aliases = [a for a in schema_aliases if a != "mcp"]
+        if aliases:
+            pattern = r"\b(?:" + "|".join(map(re.escape, aliases)) + r")\.(?=\w)"
+            self._rewrites.append((re.compile(pattern), "mcp."))
+        self._db = sqlite3.connect(
+            ":memory:",
+            isolation_level=None,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("ATTACH DATABASE ':memory:' AS mcp")
+        self._db.executescript(schema_sql)
+        self.statements = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def close(self) -> None:
+        self._db.close()
+
+    def _run(self, sql: str, params: Optional[Sequence[Any]]) -> sqlite3.Cursor:
+        for pattern, replacement in self._rewrites:
+            sql = pattern.sub(replacement, sql)
+        self.statements += 1
+        return self._db.execute(sql, [_to_sqlite_param(p) for p in params or []])
+
+    async def query(
+        self, sql: str, params: Optional[List[Any]] = None, schema: str = "public"
+    ) -> Optional[List[Dict]]:
+        return [dict(row) for row in self._run(sql, params).fetchall()]
+
+    async def query_row(
+        self, sql: str, params: Optional[List[Any]] = None, schema: str = "public"
+    ) -> Optional[Dict]:
+        row = self._run(sql, params).fetchone()
+        return dict(row) if row is not None else None
+
+    async def execute(
+        self, sql: str, params: Optional[List[Any]] = None, schema: str = "public"
+    ) -> Optional[int]:
+        return self._run(sql, params).rowcount
+
+    async def insert_into(
+        self, table: str, rows: List[Dict], returning: bool = False, schema: str = "public"
+    ) -> Optional[int]:
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        target = f"{schema}.{table}" if schema != "public" else table
+        sql = (
+            f"INSERT INTO {target} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        self.statements += 1
+        self._db.executemany(sql, [[_to_sqlite_param(row.get(c)) for c in columns] for row in rows])
+        return len(rows)
+
+
+# ============ Redis ============
+
+
+class FakeRedisClient:
+    """fakeredis behind the AsyncRedisClient interface used by RedisCache"""
+
+    def __init__(self, server=None):
+        import fakeredis
+
+        self._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int = 0) -> Optional[bool]:
+        return bool(await self._redis.set(key, value, ex=ttl_seconds or None))
+
+    async def delete(self, key: str) -> Optional[bool]:
+        return bool(await self._redis.delete(key))
+
+    async def list_keys(self, pattern: str = "*", limit: int = 100) -> List[str]:
+        keys = []
+        async for key in self._redis.scan_iter(match=pattern, count=limit):
+            keys.append(key)
+            if len(keys) >= limit:
+                break
+        return keys
+
+    async def delete_multiple(self, keys: List[str]) -> Optional[int]:
+        return await self._redis.delete(*keys) if keys else 0
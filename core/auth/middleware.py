@@ -41,6 +41,7 @@ class MCPUnifiedAuthMiddleware(BaseHTTPMiddleware):
         # Note: "/" is handled separately to avoid matching all paths
         self.bypass_paths = {
             "/health",
+            "/metrics",
             "/static",
             "/portal",
             "/admin",
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Redis cache layer for MCP services
+"""
+
+from .redis_cache import CACHE_PREFIX, CACHE_TTL, RedisCache, cached, get_cache
+
+__all__ = [
+    "CACHE_PREFIX",
+    "CACHE_TTL",
+    "RedisCache",
+    "cached",
+    "get_cache",
+]
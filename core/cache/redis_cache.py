@@ -41,13 +41,20 @@ class RedisCache:
 
     _instance: Optional["RedisCache"] = None
 
-    def __init__(self):
-        settings = get_settings()
-        self._client = AsyncRedisClient(
-            host=settings.infrastructure.redis_host,
-            port=settings.infrastructure.redis_port,
-            user_id="mcp-cache-service",
-        )
+    def __init__(self, client=None):
+        """
+        Args:
+            client: Optional AsyncRedisClient-compatible client (defaults to one
+                built from settings)
+        """
+        if client is None:
+            settings = get_settings()
+            client = AsyncRedisClient(
+                host=settings.infrastructure.redis_host,
+                port=settings.infrastructure.redis_port,
+                user_id="mcp-cache-service",
+            )
+        self._client = client
         self._enabled = True
 
     @classmethod
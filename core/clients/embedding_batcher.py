@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Embedding Batcher
+Token-budgeted, concurrent batching engine for OpenAI-compatible embedding APIs
+
+Packs texts into requests by estimated token count (not item count), keeps a
+bounded number of requests in flight, retries transient failures with
+exponential backoff and shrinks the batch budget when the service throttles.
+Identical texts are embedded once.
+
+Failures are raised as EmbeddingBatchError instead of being replaced with zero
+vectors, so callers can decide whether a partial result is acceptable.
+
+Usage:
+    batcher = EmbeddingBatcher()                      # uses the shared model client
+    vectors = await batcher.embed(["first text", "second text"])
+
+    batcher = EmbeddingBatcher(client=my_client, max_in_flight=8)
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# OpenAI-compatible limits: 2048 inputs and ~300k tokens per request, 8191 tokens
+# per input. The default token budget stays well below the request limit so a
+# single batch does not monopolize the service's per-minute token quota.
+DEFAULT_MAX_BATCH_INPUTS = 2048
+DEFAULT_MAX_BATCH_TOKENS = 50_000
+DEFAULT_MIN_BATCH_TOKENS = 2_000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English/code)"""
+    return len(text) // 4 + 1
+
+
+class EmbeddingBatchError(Exception):
+    """Raised when some texts could not be embedded after all retries"""
+
+    def __init__(self, message: str, failed_indices: List[int], results: List[Any]):
+        super().__init__(message)
+        self.failed_indices = failed_indices
+        # Partial results aligned with the input; None where embedding failed
+        self.results = results
+
+
+@dataclass
+class _Batch:
+    """A group of unique-text indices sent in one request"""
+
+    indices: List[int]
+    tokens: int
+    attempt: int = 0
+
+
+@dataclass
+class BatcherStats:
+    """Counters for a batcher instance (cumulative across calls)"""
+
+    requests: int = 0
+    texts: int = 0
+    deduplicated: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    token_budget: int = 0
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "texts": self.texts,
+            "deduplicated": self.deduplicated,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "token_budget": self.token_budget,
+            "last_error": self.last_error,
+        }
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Detect rate-limit / overload responses from OpenAI-compatible clients"""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status in (429, 503):
+        return True
+    message = str(error).lower()
+    return any(
+        marker in message for marker in ("rate limit", "too many requests", "429", "overloaded")
+    )
+
+
+class EmbeddingBatcher:
+    """Concurrent, rate-aware embedding batcher"""
+
+    def __init__(
+        self,
+        client: Any = None,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_batch_inputs: int = DEFAULT_MAX_BATCH_INPUTS,
+        min_batch_tokens: int = DEFAULT_MIN_BATCH_TOKENS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_retries: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 20.0,
+        token_counter: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Args:
+            client: OpenAI-compatible client exposing ``embeddings.create``;
+                defaults to the shared ISA model client
+            model: Embedding model name
+            max_batch_tokens: Upper bound on estimated tokens per request
+            max_batch_inputs: Upper bound on texts per request
+            min_batch_tokens: Floor for the adaptive token budget
+            max_in_flight: Maximum concurrent embedding requests
+            max_retries: Attempts per batch before it is reported as failed
+            base_backoff: Initial backoff in seconds (doubles per attempt)
+            max_backoff: Backoff ceiling in seconds
+            token_counter: Token estimator; defaults to ``estimate_tokens``
+        """
+        self._client = client
+        self.model = model
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_inputs = max_batch_inputs
+        self.min_batch_tokens = min(min_batch_tokens, max_batch_tokens)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.token_counter = token_counter or estimate_tokens
+
+        # Adaptive budget: halved on throttling, grown back additively on success
+        self._token_budget = max_batch_tokens
+        self.stats = BatcherStats(token_budget=max_batch_tokens)
+
+    async def _get_client(self):
+        """Lazy load the shared model client"""
+        if self._client is None:
+            from core.clients.model_client import get_model_client
+
+            self._client = await get_model_client()
+        return self._client
+
+    @property
+    def token_budget(self) -> int:
+        """Current adaptive token budget per request"""
+        return self._token_budget
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def embed(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """
+        Embed texts, preserving input order.
+
+        Raises:
+            EmbeddingBatchError: If any text could not be embedded
+        """
+        if not texts:
+            return []
+
+        # Deduplicate identical texts
+        unique_texts: List[str] = []
+        positions: Dict[str, int] = {}
+        mapping: List[int] = []
+        for text in texts:
+            idx = positions.get(text)
+            if idx is None:
+                idx = len(unique_texts)
+                positions[text] = idx
+                unique_texts.append(text)
+            mapping.append(idx)
+
+        self.stats.texts += len(texts)
+        self.stats.deduplicated += len(texts) - len(unique_texts)
+
+        unique_results = await self._embed_unique(unique_texts, model or self.model)
+
+        results = [unique_results[idx] for idx in mapping]
+        failed = [i for i, vector in enumerate(results) if vector is None]
+        if failed:
+            self.stats.failures += len(failed)
+            raise EmbeddingBatchError(
+                f"Failed to embed {len(failed)}/{len(texts)} texts",
+                failed_indices=failed,
+                results=results,
+            )
+        return results
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _pack(self, indices: List[int], token_counts: List[int]) -> List[_Batch]:
+        """Pack indices into batches under the current token and input budgets"""
+        batches: List[_Batch] = []
+        current: List[int] = []
+        current_tokens = 0
+        budget = self._token_budget
+
+        for idx in indices:
+            tokens = token_counts[idx]
+            if current and (
+                current_tokens + tokens > budget or len(current) >= self.max_batch_inputs
+            ):
+                batches.append(_Batch(current, current_tokens))
+                current, current_tokens = [], 0
+            current.append(idx)
+            current_tokens += tokens
+
+        if current:
+            batches.append(_Batch(current, current_tokens))
+        return batches
+
+    async def _embed_unique(self, texts: List[str], model: str) -> List[Optional[List[float]]]:
+        token_counts = [self.token_counter(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        client = await self._get_client()
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def run(batch: _Batch):
+            while True:
+                async with semaphore:
+                    error = await self._send(client, model, texts, batch, results)
+                if error is None:
+                    return
+
+                throttled = is_throttle_error(error)
+                if throttled:
+                    self.stats.throttled += 1
+                    self._shrink_budget()
+
+                if batch.attempt + 1 >= self.max_retries:
+                    logger.error(
+                        f"Embedding batch of {len(batch.indices)} texts failed after "
+                        f"{batch.attempt + 1} attempts: {error}"
+                    )
+                    self.stats.last_error = str(error)
+                    return
+
+                self.stats.retries += 1
+                delay = self._backoff_delay(batch.attempt, error)
+                logger.warning(
+                    f"Embedding batch failed ({'throttled' if throttled else error}); "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                batch.attempt += 1
+
+                # Re-split throttled batches that no longer fit the reduced budget
+                if throttled and batch.tokens > self._token_budget and len(batch.indices) > 1:
+                    retries = self._pack(batch.indices, token_counts)
+                    for retry in retries:
+                        retry.attempt = batch.attempt
+                    await asyncio.gather(*(run(retry) for retry in retries))
+                    return
+
+        await asyncio.gather(
+            *(run(batch) for batch in self._pack(list(range(len(texts))), token_counts))
+        )
+        return results
+
+    async def _send(self, client, model, texts, batch, results) -> Optional[BaseException]:
+        """Send one request; store vectors and return None, or return the error"""
+        batch_texts = [texts[i] for i in batch.indices]
+        self.stats.requests += 1
+        try:
+            response = await client.embeddings.create(input=batch_texts, model=model)
+            vectors = [item.embedding for item in response.data]
+            if len(vectors) != len(batch_texts):
+                raise ValueError(
+                    f"Embedding count mismatch: expected {len(batch_texts)}, got {len(vectors)}"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return e
+
+        for idx, vector in zip(batch.indices, vectors):
+            results[idx] = vector
+        self._grow_budget()
+        return None
+
+    def _backoff_delay(self, attempt: int, error: BaseException) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)) and retry_after > 0:
+            return min(float(retry_after), self.max_backoff)
+        delay = min(self.base_backoff * (2**attempt), self.max_backoff)
+        return delay * (0.5 + random.random() / 2)
+
+    def _shrink_budget(self):
+        self._token_budget = max(self.min_batch_tokens, self._token_budget // 2)
+        self.stats.token_budget = self._token_budget
+
+    def _grow_budget(self):
+        if self._token_budget < self.max_batch_tokens:
+            step = max(self.min_batch_tokens, self.max_batch_tokens // 10)
+            self._token_budget = min(self.max_batch_tokens, self._token_budget + step)
+            self.stats.token_budget = self._token_budget
+
+
+__all__ = [
+    "EmbeddingBatcher",
+    "EmbeddingBatchError",
+    "BatcherStats",
+    "estimate_tokens",
+    "is_throttle_error",
+]
@@ -29,6 +29,9 @@ class LoggingConfig:
     loki_enabled: bool = False
     loki_grpc_host: str = "localhost"
     loki_grpc_port: int = 50054
+    loki_url: str = ""  # Loki HTTP push endpoint
+    loki_transport: str = "grpc"  # "http" pushes batches to loki_url instead
+    loki_tenant_id: str = ""  # X-Scope-OrgID for HTTP pushes
 
     # Service identity
     service_name: str = "mcp"
@@ -46,6 +49,9 @@ class LoggingConfig:
             loki_enabled=_bool(os.getenv("LOKI_ENABLED", "false")),
             loki_grpc_host=os.getenv("LOKI_GRPC_HOST", "localhost"),
             loki_grpc_port=_int(os.getenv("LOKI_GRPC_PORT", "50054"), 50054),
+            loki_url=os.getenv("LOKI_URL", ""),
+            loki_transport=os.getenv("LOKI_TRANSPORT", "grpc").lower(),
+            loki_tenant_id=os.getenv("LOKI_TENANT_ID", ""),
             service_name=os.getenv("SERVICE_NAME", "mcp"),
             environment=os.getenv("ENVIRONMENT", env),
         )
@@ -200,6 +200,8 @@ class MCPConfig:
     # Performance Optimization
     lazy_load_ai_selectors: bool = True
     lazy_load_external_services: bool = True
+    # Store tool schemas in the Qdrant payload so search can skip the schema fetch
+    schemas_in_vector_payload: bool = False
 
     # Meta-tools only mode
     # When True, only expose 4 meta-tools (discover, get_tool_schema, execute, list_skills)
@@ -243,6 +245,7 @@ class MCPConfig:
             # Optimization
             lazy_load_ai_selectors=_bool(os.getenv("LAZY_LOAD_AI_SELECTORS", "true")),
             lazy_load_external_services=_bool(os.getenv("LAZY_LOAD_EXTERNAL_SERVICES", "true")),
+            schemas_in_vector_payload=_bool(os.getenv("SCHEMAS_IN_VECTOR_PAYLOAD", "false")),
             # Meta-tools only mode
             meta_tools_only=_bool(os.getenv("META_TOOLS_ONLY", "false")),
             # Load sub-configs
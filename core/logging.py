@@ -59,9 +59,9 @@ DEPENDENCIES:
     - json: Structured log format serialization
     - datetime: Timestamp generation and formatting
     - pathlib: Cross-platform log file path handling
+    - queue/threading: Background Loki shipping off the logging call path
 
 OPTIMIZATION POINTS:
-    - Implement asynchronous logging for high-throughput scenarios
     - Add log aggregation and centralized collection
     - Optimize JSON serialization for structured logs
     - Implement log compression for long-term storage
@@ -97,13 +97,18 @@ USAGE:
     logger.tool_execution("analyze_data", "user123", True, 1.23)
 """
 
+import gzip
 import logging
 import logging.handlers
+import queue
 import sys
 import json
 import os
+import threading
+import time
+import urllib.request
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 
@@ -217,6 +222,242 @@ class MCPLogger:
         )
 
 
+# (labels, [(timestamp_ns, line), ...]) per Loki stream
+LokiStreams = List[Tuple[Dict[str, str], List[Tuple[int, str]]]]
+
+
+class LokiHttpSender:
+    """Pushes batches to Loki's HTTP push API as gzip-compressed JSON"""
+
+    def __init__(self, url: str, tenant_id: Optional[str] = None, timeout: float = 5.0):
+        self.url = url.rstrip("/")
+        if not self.url.endswith("/loki/api/v1/push"):
+            self.url += "/loki/api/v1/push"
+        self.tenant_id = tenant_id
+        self.timeout = timeout
+
+    def __call__(self, streams: LokiStreams):
+        payload = {
+            "streams": [
+                {"stream": labels, "values": [[str(ts), line] for ts, line in values]}
+                for labels, values in streams
+            ]
+        }
+        body = gzip.compress(json.dumps(payload).encode("utf-8"))
+
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        if self.tenant_id:
+            headers["X-Scope-OrgID"] = self.tenant_id
+
+        request = urllib.request.Request(self.url, data=body, headers=headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def close(self):
+        pass
+
+
+class LokiGrpcSender:
+    """Pushes batches through isa_common's gRPC LokiClient, one line per call"""
+
+    def __init__(self, loki_host: str, loki_port: int, user_id: str):
+        from isa_common.loki_client import LokiClient
+
+        self._client_class = LokiClient
+        self.loki_host = loki_host
+        self.loki_port = loki_port
+        self.user_id = user_id
+        self.client = None
+
+    def __call__(self, streams: LokiStreams):
+        # Lazy initialization of LokiClient (only when needed)
+        if self.client is None:
+            self.client = self._client_class(
+                host=self.loki_host, port=self.loki_port, user_id=self.user_id
+            )
+            self.client.__enter__()  # Open connection
+
+        for labels, values in streams:
+            for _, line in values:
+                self.client.push_log(message=line, labels=labels)
+
+    def close(self):
+        """Clean up Loki client connection"""
+        if self.client:
+            try:
+                self.client.__exit__(None, None, None)
+            except Exception:
+                pass
+
+
+class QueuedLokiHandler(logging.Handler):
+    """
+    Ships log records to Loki from a background thread.
+
+    emit() only formats the record and puts it on a bounded queue; it never
+    touches the network. A shipper thread drains the queue into batches of up
+    to ``batch_size`` records or ``flush_interval`` seconds, groups them into
+    streams and hands them to ``sender`` with retries. When the queue is full
+    records are dropped and counted rather than blocking the caller. close()
+    (called by logging.shutdown at exit) ships whatever is still queued.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        sender: Callable[[LokiStreams], None],
+        service_labels: Dict[str, str],
+        user_id: str,
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        super().__init__()
+        self.sender = sender
+        self.service_labels = service_labels
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+
+        # Counters; dropped is written by emitting threads and the shipper
+        self.dropped = 0
+        self.shipped = 0
+        self.batches = 0
+        self._error_count = 0
+        self._dropped_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name="loki-shipper", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        """Enqueue a formatted record; drop it if the queue is full"""
+        try:
+            entry = (
+                record.levelname.lower(),
+                record.name,
+                time.time_ns(),
+                self.format(record),
+            )
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count_dropped(1)
+        except Exception:
+            self.handleError(record)
+
+    def _count_dropped(self, count: int):
+        with self._dropped_lock:
+            self.dropped += count
+
+    def _run(self):
+        """Shipper thread: batch by size and time until stopped"""
+        batch: List[Tuple[str, str, int, str]] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # flush_interval elapsed since the batch's first record
+
+            if item is None or item is self._STOP or isinstance(item, threading.Event):
+                # Markers are queued behind the records they cover (FIFO)
+                if batch:
+                    self._ship(batch)
+                    batch = []
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is self._STOP:
+                    return
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._ship(batch)
+                batch = []
+
+    def _ship(self, batch: List[Tuple[str, str, int, str]]):
+        """Send one batch with exponential backoff; count it as dropped on failure"""
+        streams: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        for level, logger_name, ts, line in batch:
+            streams.setdefault((level, logger_name), []).append((ts, line))
+
+        payload = []
+        for (level, logger_name), values in streams.items():
+            labels = self.service_labels.copy()
+            labels["level"] = level
+            labels["logger"] = logger_name.replace(f"{self.user_id}.", "").replace(
+                self.user_id, "main"
+            )
+            payload.append((labels, values))
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.sender(payload)
+                self.shipped += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_backoff * (2**attempt))
+                    continue
+
+                # Graceful degradation - don't fail the application
+                self._count_dropped(len(batch))
+                self._error_count += 1
+                if self._error_count <= 3:
+                    print(
+                        f"[LOKI_ERROR] Failed to push {len(batch)} logs to Loki: {e}",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+
+    def flush(self, timeout: float = 10.0):
+        """Block until records queued so far have been shipped (or timeout)"""
+        if self._closed or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Shipping counters"""
+        return {
+            "queued": self._queue.qsize(),
+            "shipped": self.shipped,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "errors": self._error_count,
+        }
+
+    def close(self, timeout: float = 10.0):
+        """Ship remaining records, stop the shipper and close the sender"""
+        if not self._closed:
+            self._closed = True
+            if self._thread.is_alive():
+                try:
+                    self._queue.put(self._STOP, timeout=timeout)
+                except queue.Full:
+                    pass
+                self._thread.join(timeout)
+            close_sender = getattr(self.sender, "close", None)
+            if close_sender:
+                close_sender()
+        super().close()
+
+
 def setup_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
@@ -229,6 +470,9 @@ def setup_logging(
     loki_enabled: bool = False,
     service_name: str = "mcp",
     environment: str = "development",
+    loki_url: Optional[str] = None,
+    loki_transport: str = "grpc",
+    loki_tenant_id: Optional[str] = None,
 ) -> None:
     """
     Setup centralized logging configuration with Loki gRPC support
@@ -245,6 +489,10 @@ def setup_logging(
         loki_enabled: Whether to enable Loki centralized logging via gRPC
         service_name: Service name for Loki labels
         environment: Environment name (development, staging, production)
+        loki_url: Loki HTTP URL, used when ``loki_transport`` is "http"
+        loki_transport: "grpc" (isa_common client, line by line) or "http"
+            (batches pushed gzip-compressed to ``loki_url``)
+        loki_tenant_id: Tenant sent as X-Scope-OrgID with HTTP pushes
     """
     # Convert string level to logging level
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
@@ -280,82 +528,6 @@ def setup_logging(
     # Loki gRPC handler (centralized logging - recommended for production)
     if loki_enabled:
         try:
-            from isa_common.loki_client import LokiClient
-
-            # Custom Loki handler that uses isa_common.LokiClient via gRPC
-            class LokiGrpcHandler(logging.Handler):
-                """
-                Custom Loki handler that uses isa_common.LokiClient via gRPC
-
-                This handler automatically pushes logs to Loki using the LokiClient
-                from isa_common, which handles gRPC connection management, retries,
-                and efficient batching.
-                """
-
-                def __init__(
-                    self, loki_host: str, loki_port: int, user_id: str, service_labels: dict
-                ):
-                    super().__init__()
-                    self.loki_host = loki_host
-                    self.loki_port = loki_port
-                    self.user_id = user_id
-                    self.service_labels = service_labels
-                    self.client = None
-                    self._error_count = 0
-                    self._success_count = 0
-
-                def emit(self, record):
-                    """Send log record to Loki via gRPC"""
-                    try:
-                        # Lazy initialization of LokiClient (only when needed)
-                        if self.client is None:
-                            self.client = LokiClient(
-                                host=self.loki_host, port=self.loki_port, user_id=self.user_id
-                            )
-                            self.client.__enter__()  # Open connection
-
-                        # Format the log message
-                        log_entry = self.format(record)
-
-                        # Build labels with level and logger name
-                        labels = self.service_labels.copy()
-                        labels["level"] = record.levelname.lower()
-                        labels["logger"] = record.name.replace(f"{self.user_id}.", "").replace(
-                            self.user_id, "main"
-                        )
-
-                        # Push to Loki using simple API
-                        self.client.push_log(message=log_entry, labels=labels)
-
-                        self._success_count += 1
-
-                        # Debug: log first few successful pushes (use stderr to not corrupt MCP stdio)
-                        if self._success_count <= 2:
-                            print(
-                                f"[LOKI_DEBUG] Successfully pushed log to Loki: {log_entry[:80]}",
-                                file=sys.stderr,
-                                flush=True,
-                            )
-
-                    except Exception as e:
-                        # Graceful degradation - don't fail the application
-                        self._error_count += 1
-                        if self._error_count <= 3:
-                            print(
-                                f"[LOKI_ERROR] Failed to push log to Loki: {e}",
-                                file=sys.stderr,
-                                flush=True,
-                            )
-
-                def close(self):
-                    """Clean up Loki client connection"""
-                    if self.client:
-                        try:
-                            self.client.__exit__(None, None, None)
-                        except Exception:
-                            pass
-                    super().close()
-
             # Extract service name and logger component
             # e.g., "mcp.security" -> service="mcp_service", logger="security"
             service_id = f"{service_name}_service"
@@ -363,12 +535,20 @@ def setup_logging(
             # Labels for Loki (used for filtering and searching)
             service_labels = {"service": service_id, "environment": environment, "job": service_id}
 
-            # Create Loki gRPC handler
-            loki_handler = LokiGrpcHandler(
-                loki_host=loki_host,
-                loki_port=loki_port,
-                user_id=service_id,
+            if loki_transport == "http" and not loki_url:
+                root_logger.warning("LOKI_TRANSPORT=http requires LOKI_URL; using gRPC")
+            if loki_transport == "http" and loki_url:
+                sender = LokiHttpSender(loki_url, tenant_id=loki_tenant_id)
+                loki_target = f"{sender.url} via HTTP"
+            else:
+                sender = LokiGrpcSender(loki_host, loki_port, user_id=service_id)
+                loki_target = f"{loki_host}:{loki_port} via gRPC"
+
+            # Records are queued and shipped in batches by a background thread
+            loki_handler = QueuedLokiHandler(
+                sender=sender,
                 service_labels=service_labels,
+                user_id=service_id,
             )
 
             # Set formatter
@@ -380,7 +560,7 @@ def setup_logging(
             root_logger.addHandler(loki_handler)
 
             # Log successful Loki integration
-            root_logger.info(f"Centralized logging enabled | loki={loki_host}:{loki_port} via gRPC")
+            root_logger.info(f"Centralized logging enabled | loki={loki_target}")
 
         except ImportError as e:
             # isa_common not installed
@@ -483,6 +663,9 @@ def setup_mcp_logging(config=None):
             loki_enabled=log_config.loki_enabled,
             service_name=log_config.service_name,
             environment=log_config.environment,
+            loki_url=log_config.loki_url or None,
+            loki_transport=log_config.loki_transport,
+            loki_tenant_id=log_config.loki_tenant_id or None,
         )
     else:
         # Fallback to environment variables
@@ -500,6 +683,9 @@ def setup_mcp_logging(config=None):
             loki_enabled=os.getenv("LOKI_ENABLED", "false").lower() == "true",
             service_name=os.getenv("SERVICE_NAME", "mcp"),
             environment=os.getenv("ENVIRONMENT", "development"),
+            loki_url=os.getenv("LOKI_URL") or None,
+            loki_transport=os.getenv("LOKI_TRANSPORT", "grpc").lower(),
+            loki_tenant_id=os.getenv("LOKI_TENANT_ID") or None,
         )
 
 
@@ -33,13 +33,14 @@ FUNCTIONALITY:
 
     - Performance Metrics Collection:
       * Response time measurement and statistics
+      * Streaming per-tool latency percentiles (p50/p95/p99)
       * Execution duration tracking for optimization
       * Resource utilization monitoring and alerting
       * Throughput analysis and capacity metrics
       * System uptime and availability tracking
 
     - Rate Limiting and Abuse Prevention:
-      * Sliding window rate limiting implementation
+      * GCRA (token bucket) rate limiting with O(1) state per key
       * Per-user and per-tool rate limit enforcement
       * Configurable rate limiting policies and thresholds
       * Rate limit violation detection and response
@@ -61,13 +62,14 @@ FUNCTIONALITY:
 
 DEPENDENCIES:
     - time: System timing and duration measurements
+    - collections: Fixed-size request history and rate limiter state
+    - math: Latency sketch bucket mapping
     - datetime: Timestamp generation and formatting
     - logging: Structured logging for audit trails
     - typing: Type hints for monitoring data structures
     - core.logging: Enhanced logging infrastructure
 
 OPTIMIZATION POINTS:
-    - Implement efficient circular buffers for request history
     - Add metrics aggregation for reduced memory usage
     - Optimize rate limiting with Redis or distributed storage
     - Add metrics export to external monitoring systems
@@ -106,17 +108,140 @@ USAGE:
     metrics = monitor_manager.get_metrics()
 """
 
+import math
 import time
 import logging
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict
+from itertools import islice
+from typing import Callable, Dict, List, Optional
 
 # Import here to avoid circular imports when needed
 logger = logging.getLogger(__name__)
 
 
+class LatencySketch:
+    """
+    Streaming latency histogram with bounded relative error (DDSketch-style).
+
+    Values are counted in logarithmic buckets, so recording is O(1), memory is
+    bounded by the value range (about 1,100 buckets from 1µs to 1h at 1%
+    accuracy) and any percentile is within ``relative_accuracy`` of the true
+    value.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0  # Values at or below min_value
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float):
+        """Record one value"""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= self.min_value:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q (0..1); None when empty"""
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return self.min
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # Bucket midpoint, clamped to the observed range
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """Summary in milliseconds"""
+        if not self.count:
+            return {"count": 0}
+
+        def ms(value: float) -> float:
+            return round(value * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count),
+            "min_ms": ms(self.min),
+            "max_ms": ms(self.max),
+            "p50_ms": ms(self.quantile(0.50)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+        }
+
+
+class GCRARateLimiter:
+    """
+    Generic Cell Rate Algorithm (token bucket) rate limiter.
+
+    Each key stores a single theoretical arrival time (TAT). A request is
+    allowed if it does not push the TAT more than one window ahead of now,
+    which permits bursts of up to ``calls`` and a sustained ``calls/window``.
+    A key whose TAT is in the past is indistinguishable from a new key, so
+    idle keys are evicted as they reach the front of the LRU order;
+    ``max_keys`` bounds memory under key churn.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    def allow(self, key: str, calls: int, window: float) -> bool:
+        """Consume one request for key if within calls per window"""
+        now = self._clock()
+        emission_interval = window / calls
+
+        tat = self._tat.get(key, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + emission_interval
+        if new_tat - now > window:
+            return False
+
+        self._tat[key] = new_tat
+        self._tat.move_to_end(key)
+        self._evict(now)
+        return True
+
+    def _evict(self, now: float):
+        """Drop idle keys from the LRU end, then enforce max_keys"""
+        tats = self._tat
+        while tats:
+            oldest_key = next(iter(tats))
+            if tats[oldest_key] > now and len(tats) <= self.max_keys:
+                break
+            del tats[oldest_key]
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
 class MonitoringManager:
-    def __init__(self):
+    def __init__(self, history_size: int = 1000):
         self.metrics = {
             "total_requests": 0,
             "successful_requests": 0,
@@ -126,8 +251,10 @@ class MonitoringManager:
             "security_violations": 0,
             "rate_limit_hits": 0,
         }
-        self.request_history = []
-        self.rate_limiter = {}
+        # Fixed-size ring buffer: appending past history_size drops the oldest entry
+        self.request_history: deque = deque(maxlen=history_size)
+        self.rate_limiter = GCRARateLimiter()
+        self.tool_latency: Dict[str, LatencySketch] = {}
         self.start_time = time.time()
 
     def log_request(
@@ -153,39 +280,40 @@ class MonitoringManager:
 
         self.request_history.append(request_log)
 
-        # Keep only last 1000 requests
-        if len(self.request_history) > 1000:
-            self.request_history.pop(0)
+        # Rejected requests (rate limit, forbidden pattern) never ran
+        if execution_time > 0:
+            sketch = self.tool_latency.get(tool_name)
+            if sketch is None:
+                sketch = self.tool_latency[tool_name] = LatencySketch()
+            sketch.add(execution_time)
 
     def check_rate_limit(self, tool_name: str, user_id: str, policy) -> bool:
         """Check if request is within rate limits"""
-        key = f"{user_id}:{tool_name}"
-        now = time.time()
-
         limit_config = policy.rate_limits.get(tool_name, policy.rate_limits["default"])
-        window = limit_config["window"]
-        max_calls = limit_config["calls"]
 
-        if key not in self.rate_limiter:
-            self.rate_limiter[key] = []
-
-        # Clean old entries
-        self.rate_limiter[key] = [
-            timestamp for timestamp in self.rate_limiter[key] if now - timestamp < window
-        ]
-
-        if len(self.rate_limiter[key]) >= max_calls:
+        if not self.rate_limiter.allow(
+            f"{user_id}:{tool_name}", limit_config["calls"], limit_config["window"]
+        ):
             self.metrics["rate_limit_hits"] += 1
             return False
-
-        self.rate_limiter[key].append(now)
         return True
 
+    def get_request_history(self, limit: int = 0) -> List[Dict]:
+        """Most recent requests, oldest first (all when limit <= 0)"""
+        if limit <= 0:
+            return list(self.request_history)
+        recent = list(islice(reversed(self.request_history), limit))
+        recent.reverse()
+        return recent
+
     def get_metrics(self) -> Dict:
         """Get current metrics"""
         return {
             **self.metrics,
-            "recent_requests": self.request_history[-10:],  # Last 10 requests
+            "recent_requests": self.get_request_history(10),  # Last 10 requests
+            "tool_latency": {
+                tool_name: sketch.to_dict() for tool_name, sketch in self.tool_latency.items()
+            },
             "uptime": time.time() - self.start_time,
         }
 
@@ -17,6 +17,7 @@ from functools import wraps
 # Import from our core modules
 from .exception import McpError, AuthorizationError, RateLimitError, SecurityViolationError
 from .logging import get_logger
+from .tracing import get_tracer
 
 logger = get_logger(__name__)
 
@@ -175,6 +176,47 @@ class SecurityManager:
         self.policy = SecurityPolicy()
         self.monitoring_manager = monitoring_manager
 
+    def _authorize(self, tool_name: str, kwargs: Dict[str, Any], security_level: SecurityLevel):
+        """Approve a call or raise AuthorizationError"""
+        # Get user context (in real implementation, extract from request context)
+        user_id = kwargs.get("user_id", "default_user")
+
+        # Check if pre-approved
+        if self.auth_manager.is_pre_approved(tool_name, kwargs):
+            logger.info(f"Tool {tool_name} pre-approved for user {user_id}")
+            return
+
+        # Create authorization request
+        reason = f"Tool {tool_name} requires {security_level.name} level authorization"
+        auth_request = self.auth_manager.create_request(
+            tool_name, kwargs, user_id, security_level, reason
+        )
+
+        if self.monitoring_manager:
+            self.monitoring_manager.metrics["authorization_requests"] += 1
+
+        # In real implementation, this would trigger external authorization flow
+        # For demo, we'll simulate immediate approval for non-critical tools
+        if security_level in [SecurityLevel.LOW, SecurityLevel.MEDIUM]:
+            self.auth_manager.approve_request(auth_request.id, "auto_approval")
+            logger.info(f"Auto-approved {tool_name} for user {user_id}")
+            return
+
+        # For HIGH security tools, check if already approved
+        if self.auth_manager.is_pre_approved(tool_name, kwargs):
+            logger.info(f"Tool {tool_name} pre-approved for user {user_id}")
+            return
+
+        raise AuthorizationError(
+            f"Authorization required for {tool_name}. Request ID: {auth_request.id}",
+            {
+                "request_id": auth_request.id,
+                "reason": reason,
+                "tool_name": tool_name,
+                "security_level": security_level.name,
+            },
+        )
+
     def require_authorization(self, security_level: SecurityLevel = SecurityLevel.MEDIUM):
         """Decorator to require authorization for sensitive tools"""
 
@@ -189,45 +231,9 @@ class SecurityManager:
 
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                # Get user context (in real implementation, extract from request context)
-                user_id = kwargs.get("user_id", "default_user")
-
-                # Check if pre-approved
-                tool_name = func.__name__
-                if self.auth_manager.is_pre_approved(tool_name, kwargs):
-                    logger.info(f"Tool {tool_name} pre-approved for user {user_id}")
-                    return await func(*args, **kwargs)
-
-                # Create authorization request
-                reason = f"Tool {tool_name} requires {security_level.name} level authorization"
-                auth_request = self.auth_manager.create_request(
-                    tool_name, kwargs, user_id, security_level, reason
-                )
-
-                if self.monitoring_manager:
-                    self.monitoring_manager.metrics["authorization_requests"] += 1
-
-                # In real implementation, this would trigger external authorization flow
-                # For demo, we'll simulate immediate approval for non-critical tools
-                if security_level in [SecurityLevel.LOW, SecurityLevel.MEDIUM]:
-                    self.auth_manager.approve_request(auth_request.id, "auto_approval")
-                    logger.info(f"Auto-approved {tool_name} for user {user_id}")
-                    return await func(*args, **kwargs)
-                else:
-                    # For HIGH security tools, check if already approved
-                    if self.auth_manager.is_pre_approved(tool_name, kwargs):
-                        logger.info(f"Tool {tool_name} pre-approved for user {user_id}")
-                        return await func(*args, **kwargs)
-
-                    raise AuthorizationError(
-                        f"Authorization required for {tool_name}. Request ID: {auth_request.id}",
-                        {
-                            "request_id": auth_request.id,
-                            "reason": reason,
-                            "tool_name": tool_name,
-                            "security_level": security_level.name,
-                        },
-                    )
+                with get_tracer().start_as_current_span("tool.auth"):
+                    self._authorize(func.__name__, kwargs, security_level)
+                return await func(*args, **kwargs)
 
             # CRITICAL: Clean Context from annotations (same as base_tool.py)
             # This prevents FastMCP from trying to serialize Context objects
@@ -262,28 +268,29 @@ class SecurityManager:
             tool_name = func.__name__
 
             try:
-                # Rate limiting
-                if self.monitoring_manager and not self.monitoring_manager.check_rate_limit(
-                    tool_name, user_id, self.policy
-                ):
-                    if self.monitoring_manager:
-                        self.monitoring_manager.log_request(
-                            tool_name, user_id, False, 0, SecurityLevel.HIGH
-                        )
-                    raise RateLimitError(f"Rate limit exceeded for {tool_name}")
-
-                # Security pattern check
-                content_to_check = json.dumps(kwargs)
-                for pattern in self.policy.forbidden_patterns:
-                    if re.search(pattern, content_to_check, re.IGNORECASE):
+                with get_tracer().start_as_current_span("tool.auth"):
+                    # Rate limiting
+                    if self.monitoring_manager and not self.monitoring_manager.check_rate_limit(
+                        tool_name, user_id, self.policy
+                    ):
                         if self.monitoring_manager:
-                            self.monitoring_manager.metrics["security_violations"] += 1
                             self.monitoring_manager.log_request(
-                                tool_name, user_id, False, 0, SecurityLevel.CRITICAL
+                                tool_name, user_id, False, 0, SecurityLevel.HIGH
+                            )
+                        raise RateLimitError(f"Rate limit exceeded for {tool_name}")
+
+                    # Security pattern check
+                    content_to_check = json.dumps(kwargs)
+                    for pattern in self.policy.forbidden_patterns:
+                        if re.search(pattern, content_to_check, re.IGNORECASE):
+                            if self.monitoring_manager:
+                                self.monitoring_manager.metrics["security_violations"] += 1
+                                self.monitoring_manager.log_request(
+                                    tool_name, user_id, False, 0, SecurityLevel.CRITICAL
+                                )
+                            raise SecurityViolationError(
+                                f"Security violation: forbidden pattern detected"
                             )
-                        raise SecurityViolationError(
-                            f"Security violation: forbidden pattern detected"
-                        )
 
                 # Execute function
                 result = await func(*args, **kwargs)
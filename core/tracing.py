@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Request Tracing - isA MCP Core
+
+Lightweight span tracing for tool invocations and the services they call.
+
+Spans follow the OpenTelemetry data model and API names (128-bit trace ids,
+64-bit span ids, ``start_as_current_span``, ``set_attribute``,
+``record_exception``, ``SpanExporter.export/shutdown``) without requiring the
+OpenTelemetry SDK. The current span lives in a ContextVar, so it follows
+``await`` and tasks created with ``asyncio.create_task`` into the aggregator,
+search and sync services.
+
+Sampling is decided once per trace, at the root span. With tracing off
+(``TRACE_SAMPLE_RATE=0``, the default) an instrumented call costs a ContextVar
+lookup and returns a shared no-op scope; no clocks are read and nothing is
+allocated.
+
+Every finished sampled span adds its self time (duration minus the time spent
+in child spans) to a per-name LatencySketch, so the phase histograms of one
+call add up to its total latency.
+
+Usage:
+    from core.tracing import get_tracer, traced
+
+    with get_tracer().start_as_current_span("tool.auth") as span:
+        span.set_attribute("user.id", user_id)
+        ...
+
+    @traced("billing.publish")
+    async def publish(...):
+        ...
+"""
+
+import os
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .monitoring import LatencySketch
+
+AttributeValue = Union[str, bool, int, float]
+
+
+class Span:
+    """A sampled, recording span"""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "events",
+        "status",
+        "status_description",
+        "start_time",
+        "end_time",
+        "_start",
+        "_child_time",
+        "_parent",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+    ):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else random.getrandbits(128)
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, AttributeValue] = dict(attributes) if attributes else {}
+        self.events: List[Dict[str, Any]] = []
+        self.status = "UNSET"
+        self.status_description: Optional[str] = None
+        self.start_time = time.time_ns()
+        self.end_time: Optional[int] = None
+        self._start = time.perf_counter_ns()
+        self._child_time = 0
+        self._parent = parent
+
+    def is_recording(self) -> bool:
+        return self.end_time is None
+
+    def set_attribute(self, key: str, value: AttributeValue):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, AttributeValue]):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, AttributeValue]] = None):
+        self.events.append({"name": name, "time": time.time_ns(), "attributes": attributes or {}})
+
+    def set_status(self, status: str, description: Optional[str] = None):
+        """Set status to "OK" or "ERROR" """
+        self.status = status
+        self.status_description = description
+
+    def record_exception(self, exception: BaseException):
+        self.add_event(
+            "exception",
+            {
+                "exception.type": type(exception).__name__,
+                "exception.message": str(exception),
+            },
+        )
+
+    def end(self) -> int:
+        """Finish the span; returns its self time in nanoseconds"""
+        elapsed = time.perf_counter_ns() - self._start
+        self.end_time = self.start_time + elapsed
+        if self._parent is not None:
+            self._parent._child_time += elapsed
+        return elapsed - self._child_time
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e6
+
+    @property
+    def self_time_ms(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time - self._child_time) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_id": f"{self.parent_id:016x}" if self.parent_id is not None else None,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class NonRecordingSpan:
+    """Span handed out for unsampled traces; every method is a no-op"""
+
+    __slots__ = ()
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: AttributeValue):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, AttributeValue]):
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, AttributeValue]] = None):
+        pass
+
+    def set_status(self, status: str, description: Optional[str] = None):
+        pass
+
+    def record_exception(self, exception: BaseException):
+        pass
+
+
+INVALID_SPAN = NonRecordingSpan()
+
+_current_span: ContextVar[Optional[Union[Span, NonRecordingSpan]]] = ContextVar(
+    "mcp_current_span", default=None
+)
+
+
+def get_current_span() -> Union[Span, NonRecordingSpan]:
+    """The active span, or INVALID_SPAN outside a sampled trace"""
+    return _current_span.get() or INVALID_SPAN
+
+
+# ============ Exporters ============
+
+
+class SpanExporter:
+    """Receives finished sampled spans"""
+
+    def export(self, spans: Sequence[Span]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class NoOpSpanExporter(SpanExporter):
+    """Discards spans; phase histograms are still recorded"""
+
+    def export(self, spans: Sequence[Span]):
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in memory, for tests"""
+
+    def __init__(self):
+        self._spans: List[Span] = []
+
+    def export(self, spans: Sequence[Span]):
+        self._spans.extend(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def clear(self):
+        self._spans.clear()
+
+    def shutdown(self):
+        self.clear()
+
+
+# ============ Tracer ============
+
+
+class _NoOpScope:
+    """Shared context manager for calls outside a sampled trace"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> NonRecordingSpan:
+        return INVALID_SPAN
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SCOPE = _NoOpScope()
+
+
+class _SpanScope:
+    """Makes a span current for the duration of a with block"""
+
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Union[Span, NonRecordingSpan]):
+        self._tracer = tracer
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Union[Span, NonRecordingSpan]:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        span = self._span
+        if span is INVALID_SPAN:
+            return False
+        if exc is not None:
+            span.record_exception(exc)
+            span.set_status("ERROR", str(exc))
+        self._tracer._finish(span)
+        return False
+
+
+class Tracer:
+    """
+    Creates spans, samples traces and keeps per-phase latency histograms.
+
+    Args:
+        sample_rate: Fraction of root spans (traces) to record, 0..1
+        exporter: Receives finished spans; defaults to NoOpSpanExporter
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[SpanExporter] = None):
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.exporter = exporter or NoOpSpanExporter()
+        self.phase_latency: Dict[str, LatencySketch] = {}
+
+    def start_as_current_span(
+        self, name: str, attributes: Optional[Dict[str, AttributeValue]] = None
+    ):
+        """Context manager yielding the new span (INVALID_SPAN when not sampled)"""
+        parent = _current_span.get()
+        if parent is None:
+            # Root span: decide once for the whole trace
+            if self.sample_rate <= 0.0:
+                return _NOOP_SCOPE
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                # Mark the trace unsampled so child spans don't sample on their own
+                return _SpanScope(self, INVALID_SPAN)
+            return _SpanScope(self, Span(name, None, attributes))
+        if parent is INVALID_SPAN:
+            return _NOOP_SCOPE
+        return _SpanScope(self, Span(name, parent, attributes))
+
+    def _finish(self, span: Span):
+        self_time = span.end()
+        sketch = self.phase_latency.get(span.name)
+        if sketch is None:
+            sketch = self.phase_latency[span.name] = LatencySketch()
+        sketch.add(self_time / 1e9)
+        self.exporter.export((span,))
+
+    def get_phase_latency(self) -> Dict[str, Dict]:
+        """Self-time latency summary per span name, in milliseconds"""
+        return {name: sketch.to_dict() for name, sketch in self.phase_latency.items()}
+
+    def reset_phase_latency(self):
+        self.phase_latency.clear()
+
+    def shutdown(self):
+        self.exporter.shutdown()
+
+
+def _sample_rate_from_env() -> float:
+    try:
+        return float(os.getenv("TRACE_SAMPLE_RATE", "0") or 0)
+    except ValueError:
+        return 0.0
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Global tracer, created from TRACE_SAMPLE_RATE on first use"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(sample_rate=_sample_rate_from_env())
+    return _tracer
+
+
+def configure_tracing(
+    sample_rate: Optional[float] = None, exporter: Optional[SpanExporter] = None
+) -> Tracer:
+    """Replace the global tracer; returns the new one"""
+    global _tracer
+    if _tracer is not None:
+        _tracer.shutdown()
+    _tracer = Tracer(
+        sample_rate=_sample_rate_from_env() if sample_rate is None else sample_rate,
+        exporter=exporter,
+    )
+    return _tracer
+
+
+def traced(name: str, attributes: Optional[Dict[str, AttributeValue]] = None):
+    """
+    Decorator running an async function inside a span.
+
+    Usage:
+        @traced("search.query")
+        async def search(self, query: str):
+            ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with get_tracer().start_as_current_span(name, attributes):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
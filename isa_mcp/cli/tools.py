@@ -17,6 +17,8 @@ from typing import Optional
 
 import click
 
+from isa_mcp.cli.sync import get_mcp_server_url
+
 
 def run_async(coro):
     """Run async coroutine in sync context."""
@@ -33,10 +35,22 @@ def run_async(coro):
 # =========================================================================
 
 
+def remote_client():
+    """Client for the running MCP server (used when the server code is not installed)."""
+    from isa_mcp.mcp_client import AsyncMCPClient
+
+    return AsyncMCPClient(get_mcp_server_url())
+
+
 @click.group()
-def tools():
+@click.option("--no-cache", is_flag=True, help="Do not persist tool listings between runs")
+def tools(no_cache: bool):
     """Discover and manage MCP tools."""
-    pass
+    if not no_cache:
+        # Repeated invocations reuse the listing instead of downloading it again
+        from isa_mcp.tool_cache import configure_tool_cache, default_cache_path
+
+        configure_tool_cache(path=default_cache_path())
 
 
 @tools.command("discover")
@@ -124,8 +138,9 @@ def tools_discover(query: str, item_type: str, limit: int, as_json: bool):
 @tools.command("list")
 @click.option("--category", "-c", default=None, help="Filter by skill category")
 @click.option("--limit", "-n", default=50, help="Maximum results")
+@click.option("--refresh", is_flag=True, help="Bypass the tool cache (remote server only)")
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
-def tools_list(category: Optional[str], limit: int, as_json: bool):
+def tools_list(category: Optional[str], limit: int, refresh: bool, as_json: bool):
     """
     List all available tools.
 
@@ -143,11 +158,17 @@ def tools_list(category: Optional[str], limit: int, as_json: bool):
             repo = ToolRepository()
             return await repo.list_tools(category=category, limit=limit)
         except ImportError:
+            pass
+        try:
             # Fallback to meta-tools
             from tools.meta_tools.discovery_tools import discover
 
             result = await discover(query="", item_type="tools", limit=limit)
             return result.get("items", [])
+        except ImportError:
+            # Fallback to the running server, through the tool cache
+            async with remote_client() as client:
+                return (await client.list_tools(refresh=refresh))[:limit]
 
     try:
         tools_list = run_async(do_list())
@@ -203,10 +224,17 @@ def tools_schema(name: str, as_json: bool):
 
             return await get_tool_schema(tool_name=name)
         except ImportError:
+            pass
+        try:
             from services.tool_service.tool_repository import ToolRepository
 
             repo = ToolRepository()
             return await repo.get_tool_schema(name)
+        except ImportError:
+            # Fallback to the running server, through the tool cache
+            async with remote_client() as client:
+                schema = await client.get_tool_schema(name)
+                return None if "error" in schema else schema
 
     try:
         schema = run_async(do_get_schema())
@@ -331,9 +359,7 @@ def tools_defaults(as_json: bool):
             return await service.get_default_tools()
         except ImportError:
             # Fallback to HTTP API
-            from isa_mcp.mcp_client import AsyncMCPClient
-
-            async with AsyncMCPClient() as client:
+            async with remote_client() as client:
                 return await client.get_default_tools()
 
     try:
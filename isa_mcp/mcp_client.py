@@ -26,12 +26,15 @@ Usage:
 """
 
 import asyncio
+import codecs
+import itertools
 import json
 import logging
+import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union, Callable
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 from enum import Enum
@@ -41,18 +44,17 @@ try:
 except ImportError:
     aiohttp = None
 
-try:
-    import httpx
-except ImportError:
-    httpx = None
-
 try:
     import requests
 except ImportError:
     requests = None
 
+from .tool_cache import ToolListCache, get_tool_cache
+
 logger = logging.getLogger(__name__)
 
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
 
 class MCPClientMode(str, Enum):
     """MCP Client connection mode"""
@@ -110,6 +112,104 @@ class MCPToolError(MCPClientError):
     pass
 
 
+# =============================================================================
+# Server-Sent Events
+# =============================================================================
+
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass
+class SSEEvent:
+    """One dispatched Server-Sent Event"""
+
+    event: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+class SSEDecoder:
+    """
+    Incremental Server-Sent Events decoder.
+
+    Feed text chunks as they arrive; each call returns the events completed
+    by that chunk, so consumers see an event as soon as its terminating blank
+    line arrives instead of after the whole body. Handles CR, LF and CRLF line
+    endings (also split across chunks), multi-line data and comments.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._event = ""
+        self._data: List[str] = []
+        self._retry: Optional[int] = None
+        self.last_event_id: Optional[str] = None
+
+    def feed(self, chunk: str) -> List[SSEEvent]:
+        """Decode a chunk of the stream; returns the events it completed"""
+        buffer = self._buffer + chunk
+        events = []
+        pos = 0
+        for match in _LINE_END.finditer(buffer):
+            # A trailing CR may be the first half of a CRLF split across chunks
+            if match.group() == "\r" and match.end() == len(buffer):
+                break
+            event = self._process_line(buffer[pos : match.start()])
+            if event is not None:
+                events.append(event)
+            pos = match.end()
+        self._buffer = buffer[pos:]
+        return events
+
+    def end(self) -> List[SSEEvent]:
+        """Flush at end of stream, dispatching an event left unterminated"""
+        events = self.feed("\n") if self._buffer else []
+        event = self._process_line("")
+        return events + ([event] if event is not None else [])
+
+    def _process_line(self, line: str) -> Optional[SSEEvent]:
+        if not line:
+            if not self._data:
+                self._event = ""
+                return None
+            event = SSEEvent(
+                event=self._event or "message",
+                data="\n".join(self._data),
+                id=self.last_event_id,
+                retry=self._retry,
+            )
+            self._event, self._data, self._retry = "", [], None
+            return event
+
+        if line.startswith(":"):
+            return None  # Comment / keep-alive
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id" and "\0" not in value:
+            self.last_event_id = value
+        elif field == "retry" and value.isdigit():
+            self._retry = int(value)
+        return None
+
+
+async def iter_sse(response: "aiohttp.ClientResponse") -> AsyncIterator[SSEEvent]:
+    """Yield the events of an aiohttp SSE response as they arrive"""
+    decoder = SSEDecoder()
+    text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    async for chunk in response.content.iter_any():
+        for event in decoder.feed(text.decode(chunk)):
+            yield event
+    for event in decoder.feed(text.decode(b"", final=True)) + decoder.end():
+        yield event
+
+
 class AsyncMCPClient:
     """
     Async MCP Client for service-to-service communication
@@ -124,6 +224,16 @@ class AsyncMCPClient:
     - list_tools/prompts/resources() - List all items
     - get_prompt() - Get prompt with arguments
     - read_resource() - Read resource by URI
+
+    All requests share one pooled HTTP session, so calls can be issued
+    concurrently (e.g. with asyncio.gather). Every JSON-RPC request gets its
+    own id and a pending future; responses are matched by id as they are
+    decoded from the (possibly streamed) reply. call_tools(..., batch=True)
+    sends several calls as one JSON-RPC batch.
+
+    Tool listings and schemas are cached per server in a ToolListCache
+    (process-wide by default) and revalidated with the server's tool-list
+    version; notifications/tools/list_changed drops the entry.
     """
 
     def __init__(
@@ -131,6 +241,8 @@ class AsyncMCPClient:
         base_url: str = "http://localhost:8081",
         timeout: float = 30.0,
         auth_token: Optional[str] = None,
+        max_connections: int = 100,
+        tool_cache: Optional[ToolListCache] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.mcp_endpoint = f"{self.base_url}/mcp"
@@ -139,7 +251,12 @@ class AsyncMCPClient:
         self.health_endpoint = f"{self.base_url}/health"
         self.timeout = timeout
         self.auth_token = auth_token
+        self.max_connections = max_connections
         self._session: Optional[aiohttp.ClientSession] = None
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._mcp_session_id: Optional[str] = None
+        self.tool_cache = tool_cache if tool_cache is not None else get_tool_cache()
 
     async def __aenter__(self):
         await self.connect()
@@ -153,8 +270,11 @@ class AsyncMCPClient:
         if aiohttp is None:
             raise ImportError("aiohttp is required. Install with: pip install aiohttp")
 
+        if self._session is not None:
+            return
         timeout = aiohttp.ClientTimeout(total=self.timeout)
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self._session = aiohttp.ClientSession(timeout=timeout, connector=connector)
 
     async def close(self):
         """Close the HTTP session"""
@@ -170,6 +290,8 @@ class AsyncMCPClient:
         }
         if self.auth_token:
             headers["Authorization"] = f"Bearer {self.auth_token}"
+        if self._mcp_session_id:
+            headers["Mcp-Session-Id"] = self._mcp_session_id
         return headers
 
     async def _ensure_session(self):
@@ -177,21 +299,117 @@ class AsyncMCPClient:
         if self._session is None:
             await self.connect()
 
-    def _parse_sse_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse Server-Sent Events response format"""
-        if "data: " in response_text:
-            lines = response_text.strip().split("\n")
-            for line in lines:
-                if line.startswith("data: "):
+    # =========================================================================
+    # JSON-RPC Transport
+    # =========================================================================
+
+    def _new_request(self, method: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a JSON-RPC request with a fresh id and register its future"""
+        request_id = next(self._request_ids)
+        self._pending[request_id] = asyncio.get_running_loop().create_future()
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        return message
+
+    def _dispatch(self, message: Any) -> Optional[str]:
+        """
+        Resolve the pending futures of the responses in a decoded message.
+
+        Returns:
+            Message of an unmatched JSON-RPC error (e.g. a server-level
+            rejection without a request id), if any
+        """
+        if isinstance(message, list):
+            errors = [self._dispatch(item) for item in message]
+            return next((e for e in errors if e), None)
+        if not isinstance(message, dict):
+            return None
+        future = self._pending.get(message.get("id"))
+        if future is not None and not future.done() and "method" not in message:
+            future.set_result(message)
+            return None
+        if message.get("method") == TOOLS_LIST_CHANGED:
+            self.tool_cache.invalidate(self.base_url)
+            return None
+        logger.debug(f"Unmatched MCP message: {message.get('method') or message.get('id')}")
+        error = message.get("error")
+        return error.get("message") if isinstance(error, dict) else None
+
+    async def _post(self, payload: Union[Dict, List[Dict]], request_ids: List[int]) -> None:
+        """
+        POST a request or batch and dispatch every response it carries.
+
+        SSE replies are decoded incrementally, so each response resolves its
+        future as soon as its event arrives. Futures still pending when the
+        reply ends fail with MCPConnectionError.
+        """
+        await self._ensure_session()
+        unmatched_error = None
+        async with self._session.post(
+            self.mcp_endpoint, json=payload, headers=self._get_headers()
+        ) as response:
+            session_id = response.headers.get("Mcp-Session-Id")
+            if session_id:
+                self._mcp_session_id = session_id
+
+            if response.content_type == "text/event-stream":
+                async for event in iter_sse(response):
+                    if not event.data:
+                        continue
                     try:
-                        return json.loads(line[6:])
+                        unmatched_error = self._dispatch(json.loads(event.data)) or unmatched_error
                     except json.JSONDecodeError:
-                        continue
-        # Fallback to regular JSON
+                        logger.debug(f"Skipping non-JSON SSE event: {event.data[:100]}")
+            else:
+                body = await response.read()
+                if body:
+                    try:
+                        unmatched_error = self._dispatch(json.loads(body))
+                    except json.JSONDecodeError:
+                        pass
+            status = response.status
+
+        reason = f"HTTP {status}" + (f": {unmatched_error}" if unmatched_error else "")
+        for request_id in request_ids:
+            future = self._pending.get(request_id)
+            if future is not None and not future.done():
+                future.set_exception(
+                    MCPConnectionError(f"No response to request {request_id} ({reason})")
+                )
+
+    async def _request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """Send one JSON-RPC request and return its response message"""
+        message = self._new_request(method, params)
+        request_id = message["id"]
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            return {"error": "Invalid response format", "raw": response_text}
+            await self._post(message, [request_id])
+            return await self._pending[request_id]
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def batch(self, requests: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict]:
+        """
+        Send several JSON-RPC requests in one HTTP round trip.
+
+        Needs a server that accepts JSON-RPC batches (MCP protocol 2025-03-26).
+
+        Args:
+            requests: (method, params) pairs
+
+        Returns:
+            Response messages in request order
+        """
+        messages = [self._new_request(method, params) for method, params in requests]
+        request_ids = [m["id"] for m in messages]
+        try:
+            await self._post(messages, request_ids)
+            return [await self._pending[request_id] for request_id in request_ids]
+        finally:
+            for request_id in request_ids:
+                future = self._pending.pop(request_id, None)
+                if future is not None and future.done() and not future.cancelled():
+                    future.exception()  # Mark retrieved if an earlier one raised
 
     def _parse_tool_result(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Parse MCP tool response into clean format"""
@@ -306,23 +524,34 @@ class AsyncMCPClient:
         Returns:
             Dict with name, description, input_schema
         """
-        # Use the meta-tool if available, otherwise list and find
+        # Served from the (revalidated) listing cache when the tool is visible there
+        await self.list_tools()
+        entry = self.tool_cache.get(self.base_url)
+        cached = self.tool_cache.get_schema(self.base_url, tool_name)
+        if cached is not None:
+            return cached
+        tool = entry.find(tool_name) if entry else None
+        if tool is not None:
+            return self._schema_from_listing(tool)
+
+        # Hidden tools (meta-tools-only mode) are only reachable through the meta-tool
         result = await self.call_tool("get_tool_schema", {"tool_name": tool_name})
 
         if result.get("status") == "error":
-            # Fallback: search tools list
-            tools = await self.list_tools()
-            for tool in tools:
-                if tool.get("name") == tool_name:
-                    return {
-                        "name": tool["name"],
-                        "description": tool.get("description", ""),
-                        "input_schema": tool.get("inputSchema", {}),
-                    }
             return {"error": f"Tool '{tool_name}' not found"}
 
+        if "error" not in result:
+            self.tool_cache.put_schema(self.base_url, tool_name, result)
         return result
 
+    @staticmethod
+    def _schema_from_listing(tool: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": tool["name"],
+            "description": tool.get("description", ""),
+            "input_schema": tool.get("inputSchema", {}),
+        }
+
     async def execute(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a discovered tool.
@@ -433,56 +662,99 @@ class AsyncMCPClient:
         Returns:
             Parsed tool result
         """
-        await self._ensure_session()
-
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {"name": tool_name, "arguments": arguments},
-        }
-
         try:
-            async with self._session.post(
-                self.mcp_endpoint, json=payload, headers=self._get_headers()
-            ) as response:
-                response_text = await response.text()
-                data = self._parse_sse_response(response_text)
-                return self._parse_tool_result(data)
+            data = await self._request("tools/call", {"name": tool_name, "arguments": arguments})
+            return self._parse_tool_result(data)
         except Exception as e:
             logger.error(f"call_tool({tool_name}) failed: {e}")
             return {"status": "error", "error": str(e)}
 
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        """List all available tools"""
-        await self._ensure_session()
+    async def call_tools(
+        self, calls: List[Tuple[str, Dict[str, Any]]], batch: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Call several tools concurrently.
 
-        payload = {"jsonrpc": "2.0", "method": "tools/list", "id": 1}
+        Args:
+            calls: (tool_name, arguments) pairs
+            batch: Send all calls as one JSON-RPC batch instead of concurrent
+                requests (the server must accept batches)
+
+        Returns:
+            Parsed tool results in call order
+        """
+        if not batch:
+            return list(await asyncio.gather(*(self.call_tool(n, a) for n, a in calls)))
 
         try:
-            async with self._session.post(
-                self.mcp_endpoint, json=payload, headers=self._get_headers()
-            ) as response:
-                response_text = await response.text()
-                data = self._parse_sse_response(response_text)
-                return data.get("result", {}).get("tools", [])
+            responses = await self.batch(
+                [("tools/call", {"name": name, "arguments": args}) for name, args in calls]
+            )
+            return [self._parse_tool_result(r) for r in responses]
+        except Exception as e:
+            logger.error(f"call_tools(batch of {len(calls)}) failed: {e}")
+            return [{"status": "error", "error": str(e)} for _ in calls]
+
+    async def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        List all available tools.
+
+        Served from the tool cache while fresh; a stale entry is revalidated
+        with the server's tool-list version and only re-downloaded if the
+        listing changed (or the server cannot report a version).
+
+        Args:
+            refresh: Bypass the cache and download the listing
+
+        Returns:
+            A copy of the listing; changing it does not affect the cache
+        """
+        entry = None if refresh else self.tool_cache.get(self.base_url)
+        if entry is not None and self.tool_cache.is_fresh(entry):
+            return list(entry.tools)
+
+        version = await self._tools_version(entry.version if entry else None)
+        if entry is not None and version is not None and version == entry.version:
+            self.tool_cache.touch(self.base_url)
+            return list(entry.tools)
+
+        try:
+            data = await self._request("tools/list")
         except Exception as e:
             logger.error(f"list_tools() failed: {e}")
             return []
+        if "result" not in data:
+            logger.error(f"list_tools() failed: {data.get('error')}")
+            return []
+        tools = data["result"].get("tools", [])
+        # Version read before the listing: a change in between only costs a refetch
+        self.tool_cache.put(self.base_url, tools, version)
+        return list(tools)
 
-    async def list_prompts(self) -> List[Dict[str, Any]]:
-        """List all available prompts"""
+    async def _tools_version(self, known: Optional[str] = None) -> Optional[str]:
+        """Tool-list version from the server, via If-None-Match; None if unsupported"""
         await self._ensure_session()
-
-        payload = {"jsonrpc": "2.0", "method": "prompts/list", "id": 1}
-
+        headers = self._get_headers()
+        if known:
+            headers["If-None-Match"] = f'"{known}"'
         try:
-            async with self._session.post(
-                self.mcp_endpoint, json=payload, headers=self._get_headers()
+            async with self._session.get(
+                f"{self.api_endpoint}/tools/version", headers=headers
             ) as response:
-                response_text = await response.text()
-                data = self._parse_sse_response(response_text)
-                return data.get("result", {}).get("prompts", [])
+                if response.status == 304:
+                    return known
+                if response.status != 200:
+                    return None
+                return (await response.json()).get("version")
+        except Exception as e:
+            logger.debug(f"Tool-list version unavailable: {e}")
+            return None
+
+    async def list_prompts(self) -> List[Dict[str, Any]]:
+        """List all available prompts"""
+        try:
+            data = await self._request("prompts/list")
+            return data.get("result", {}).get("prompts", [])
         except Exception as e:
             logger.error(f"list_prompts() failed: {e}")
             return []
@@ -495,39 +767,18 @@ class AsyncMCPClient:
             name: Prompt name
             arguments: Arguments to render into the prompt
         """
-        await self._ensure_session()
-
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "prompts/get",
-            "id": 1,
-            "params": {"name": name, "arguments": arguments},
-        }
-
         try:
-            async with self._session.post(
-                self.mcp_endpoint, json=payload, headers=self._get_headers()
-            ) as response:
-                response_text = await response.text()
-                data = self._parse_sse_response(response_text)
-                return data.get("result", {})
+            data = await self._request("prompts/get", {"name": name, "arguments": arguments})
+            return data.get("result", {})
         except Exception as e:
             logger.error(f"get_prompt({name}) failed: {e}")
             return {"error": str(e)}
 
     async def list_resources(self) -> List[Dict[str, Any]]:
         """List all available resources"""
-        await self._ensure_session()
-
-        payload = {"jsonrpc": "2.0", "method": "resources/list", "id": 1}
-
         try:
-            async with self._session.post(
-                self.mcp_endpoint, json=payload, headers=self._get_headers()
-            ) as response:
-                response_text = await response.text()
-                data = self._parse_sse_response(response_text)
-                return data.get("result", {}).get("resources", [])
+            data = await self._request("resources/list")
+            return data.get("result", {}).get("resources", [])
         except Exception as e:
             logger.error(f"list_resources() failed: {e}")
             return []
@@ -539,17 +790,9 @@ class AsyncMCPClient:
         Args:
             uri: Resource URI (e.g., "knowledge://stats/global")
         """
-        await self._ensure_session()
-
-        payload = {"jsonrpc": "2.0", "method": "resources/read", "id": 1, "params": {"uri": uri}}
-
         try:
-            async with self._session.post(
-                self.mcp_endpoint, json=payload, headers=self._get_headers()
-            ) as response:
-                response_text = await response.text()
-                data = self._parse_sse_response(response_text)
-                return data.get("result", {})
+            data = await self._request("resources/read", {"uri": uri})
+            return data.get("result", {})
         except Exception as e:
             logger.error(f"read_resource({uri}) failed: {e}")
             return {"error": str(e)}
@@ -632,37 +875,31 @@ class AsyncMCPClient:
         Returns:
             Final progress data
         """
-        if httpx is None:
-            raise ImportError("httpx required for streaming. Install with: pip install httpx")
+        await self._ensure_session()
 
         stream_url = f"{self.base_url}/progress/{operation_id}/stream"
         final_data = None
 
-        async with httpx.AsyncClient(timeout=300.0) as http_client:
-            async with http_client.stream("GET", stream_url) as response:
-                if response.status_code != 200:
-                    return {"status": "error", "error": f"HTTP {response.status_code}"}
-
-                event_type = None
-
-                async for line in response.aiter_lines():
-                    if line.startswith("event:"):
-                        event_type = line.split(":", 1)[1].strip()
-                    elif line.startswith("data:"):
-                        data_str = line.split(":", 1)[1].strip()
-                        try:
-                            data = json.loads(data_str)
-                        except json.JSONDecodeError:
-                            continue
-
-                        if event_type == "progress":
-                            final_data = data
-                            if callback:
-                                callback(data)
-                        elif event_type == "done":
-                            return final_data or data
-                        elif event_type == "error":
-                            return {"status": "error", "error": data.get("error")}
+        # Progress streams outlive the request timeout; only bound the gap between events
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=300.0)
+        async with self._session.get(stream_url, timeout=timeout) as response:
+            if response.status != 200:
+                return {"status": "error", "error": f"HTTP {response.status}"}
+
+            async for event in iter_sse(response):
+                try:
+                    data = json.loads(event.data)
+                except json.JSONDecodeError:
+                    continue
+
+                if event.event == "progress":
+                    final_data = data
+                    if callback:
+                        callback(data)
+                elif event.event == "done":
+                    return final_data or data
+                elif event.event == "error":
+                    return {"status": "error", "error": data.get("error")}
 
         return final_data or {"status": "error", "error": "Stream ended"}
 
@@ -719,8 +956,9 @@ class MCPClient:
         base_url: str = "http://localhost:8081",
         timeout: float = 30.0,
         auth_token: Optional[str] = None,
+        tool_cache: Optional[ToolListCache] = None,
     ):
-        self._async_client = AsyncMCPClient(base_url, timeout, auth_token)
+        self._async_client = AsyncMCPClient(base_url, timeout, auth_token, tool_cache=tool_cache)
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     def _get_loop(self) -> asyncio.AbstractEventLoop:
@@ -790,9 +1028,9 @@ class MCPClient:
         """Call tool directly"""
         return self._run(self._async_client.call_tool(tool_name, arguments))
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        """List all tools"""
-        return self._run(self._async_client.list_tools())
+    def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """List all tools (cached)"""
+        return self._run(self._async_client.list_tools(refresh))
 
     def list_prompts(self) -> List[Dict[str, Any]]:
         """List all prompts"""
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Client-side cache of MCP tool listings and schemas.
+
+Keyed per server URL and shared by every AsyncMCPClient (and therefore the
+sync MCPClient and the CLI) in the process. An entry younger than
+``max_age_seconds`` is served without contacting the server; older entries
+are revalidated against the server's tool-list version (an ETag exchange
+that transfers a few bytes instead of the full listing). Entries are dropped
+when the server sends ``notifications/tools/list_changed``.
+
+With a ``path`` the cache is persisted as JSON, so separate CLI invocations
+start without a listing round trip.
+
+Usage:
+    from isa_mcp.tool_cache import configure_tool_cache, default_cache_path
+
+    configure_tool_cache(path=default_cache_path())
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_AGE_SECONDS = 30.0
+
+
+def default_cache_path() -> Path:
+    """Tool cache file under $ISA_MCP_CACHE_DIR, $XDG_CACHE_HOME/isa_mcp or ~/.cache/isa_mcp"""
+    cache_dir = os.getenv("ISA_MCP_CACHE_DIR")
+    if not cache_dir:
+        base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        cache_dir = str(Path(base) / "isa_mcp")
+    return Path(cache_dir) / "tools.json"
+
+
+@dataclass
+class ToolListEntry:
+    """Cached listing of one server"""
+
+    tools: List[Dict[str, Any]]
+    version: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+    schemas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def find(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        for tool in self.tools:
+            if tool.get("name") == tool_name:
+                return tool
+        return None
+
+
+class ToolListCache:
+    """
+    Per-server cache of tools/list results and tool schemas.
+
+    Args:
+        max_age_seconds: Age below which an entry is used without revalidation
+        path: Optional JSON file to load from and persist to
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        self.max_age_seconds = max_age_seconds
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, ToolListEntry] = {}
+        self._lock = threading.Lock()
+        if self.path:
+            self._load()
+
+    def get(self, server: str) -> Optional[ToolListEntry]:
+        return self._entries.get(server)
+
+    def is_fresh(self, entry: ToolListEntry) -> bool:
+        return entry.age() < self.max_age_seconds
+
+    def put(
+        self, server: str, tools: List[Dict[str, Any]], version: Optional[str] = None
+    ) -> ToolListEntry:
+        """Store a fresh listing; cached schemas of the server are dropped"""
+        entry = ToolListEntry(tools=tools, version=version)
+        with self._lock:
+            self._entries[server] = entry
+        self._save()
+        return entry
+
+    def touch(self, server: str) -> None:
+        """Mark an entry as revalidated"""
+        entry = self._entries.get(server)
+        if entry is not None:
+            entry.fetched_at = time.time()
+            self._save()
+
+    def get_schema(self, server: str, tool_name: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(server)
+        return entry.schemas.get(tool_name) if entry else None
+
+    def put_schema(self, server: str, tool_name: str, schema: Dict[str, Any]) -> None:
+        """Cache a schema next to the server's listing (needs a listing entry)"""
+        entry = self._entries.get(server)
+        if entry is not None:
+            entry.schemas[tool_name] = schema
+            self._save()
+
+    def invalidate(self, server: Optional[str] = None) -> None:
+        """Drop one server's entry, or every entry"""
+        with self._lock:
+            if server is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(server, None)
+        self._save()
+
+    # ============ Persistence ============
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable tool cache {self.path}: {e}")
+            return
+        if data.get("format") != CACHE_FORMAT_VERSION:
+            return
+        for server, raw in data.get("servers", {}).items():
+            try:
+                self._entries[server] = ToolListEntry(**raw)
+            except TypeError:
+                continue
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "format": CACHE_FORMAT_VERSION,
+                "servers": {
+                    server: {
+                        "tools": e.tools,
+                        "version": e.version,
+                        "fetched_at": e.fetched_at,
+                        "schemas": e.schemas,
+                    }
+                    for server, e in self._entries.items()
+                },
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Write-then-rename so concurrent CLI runs never read a partial file
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.debug(f"Could not persist tool cache to {self.path}: {e}")
+
+
+_tool_cache: Optional[ToolListCache] = None
+
+
+def get_tool_cache() -> ToolListCache:
+    """Process-wide tool cache (in-memory unless configured with a path)"""
+    global _tool_cache
+    if _tool_cache is None:
+        _tool_cache = ToolListCache()
+    return _tool_cache
+
+
+def configure_tool_cache(
+    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS, path: Optional[Union[str, Path]] = None
+) -> ToolListCache:
+    """Replace the process-wide tool cache, e.g. to persist it for the CLI"""
+    global _tool_cache
+    _tool_cache = ToolListCache(max_age_seconds=max_age_seconds, path=path)
+    return _tool_cache
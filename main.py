@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 from pathlib import Path
+from typing import Any, Dict, Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
 
@@ -60,6 +61,9 @@ class SmartMCPServer:
         self.consul_registry = None
         self.aggregator_service = None
 
+        # Fingerprint of the tool listing; reset whenever tools are registered
+        self._tools_version: Optional[Dict[str, Any]] = None
+
     async def initialize(self, skip_sync: bool = False, meta_tools_only: bool = False):
         """Initialize MCP with tools/prompts/resources
 
@@ -117,6 +121,8 @@ class SmartMCPServer:
                     enable_classification=True
                 )
                 register_aggregator_tools(self.mcp, self.aggregator_service)
+                # Reconnect registered servers without holding up readiness
+                self.aggregator_service.start_background_connect()
                 logger.debug("  Aggregator tools registered")
             except Exception as e:
                 logger.debug(f"  Aggregator service not available: {e}")
@@ -149,11 +155,15 @@ class SmartMCPServer:
                 self.aggregator_service = await create_aggregator_service(
                     enable_classification=True
                 )
+                # Reconnect registered servers without holding up readiness
+                self.aggregator_service.start_background_connect()
                 logger.debug("  Aggregator service initialized")
             except Exception as e:
                 logger.debug(f"  Aggregator service not available: {e}")
                 self.aggregator_service = None
 
+        self.invalidate_tools_version()
+
         # Get counts
         tools = await self.mcp.list_tools()
         prompts = await self.mcp.list_prompts()
@@ -230,6 +240,25 @@ class SmartMCPServer:
         )
         return self.mcp
 
+    def invalidate_tools_version(self):
+        """Drop the cached tool listing fingerprint after tools were (un)registered"""
+        self._tools_version = None
+
+    async def get_tools_version(self) -> Dict[str, Any]:
+        """Fingerprint and size of the tool listing, computed once per change
+
+        Hidden tools (meta-tools-only mode) are included since get_tool_schema
+        serves them.
+        """
+        if self._tools_version is None:
+            tools = await self.mcp.list_tools()
+            if self.internal_mcp:
+                tools += await self.internal_mcp.list_tools()
+            listing = [t.model_dump(mode="json", exclude_none=True) for t in tools]
+            version = hashlib.sha256(json.dumps(listing, sort_keys=True).encode()).hexdigest()
+            self._tools_version = {"version": version[:16], "count": len(listing)}
+        return self._tools_version
+
     async def get_server_info(self):
         """Get server information"""
         tools = await self.mcp.list_tools()
@@ -331,8 +360,9 @@ add_mcp_unified_auth_middleware(app, auth_config)
 
 # Step 6: Add custom endpoints (health, discover, etc.)
 # Import from main.py's endpoint functions
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Route
+import hashlib
 import json
 from core.auth.org_context import get_org_id
 
@@ -358,6 +388,24 @@ async def health_check(request):
     )
 
 
+async def metrics_endpoint(request):
+    """Per-tool latency and per-phase latency breakdown from sampled traces"""
+    from core.monitoring import monitor_manager
+    from core.tracing import get_tracer
+
+    tracer = get_tracer()
+    return JSONResponse(
+        {
+            "tool_latency": {
+                tool_name: sketch.to_dict()
+                for tool_name, sketch in monitor_manager.tool_latency.items()
+            },
+            "phase_latency": tracer.get_phase_latency(),
+            "trace_sample_rate": tracer.sample_rate,
+        }
+    )
+
+
 async def search_endpoint(request):
     """Hierarchical semantic search endpoint - Skill-based two-stage search"""
     if request.method == "OPTIONS":
@@ -925,6 +973,24 @@ async def get_default_tools_endpoint(request):
         return JSONResponse({"detail": str(e)}, status_code=500)
 
 
+async def get_tools_version_endpoint(request):
+    """GET /api/v1/tools/version - Fingerprint of the tool listing
+
+    Lets clients revalidate a cached tools/list without downloading it: the
+    version is also sent as an ETag and If-None-Match yields 304. The version
+    is computed once per tool registration, not per request.
+    """
+    if not smart_server or not smart_server.mcp:
+        return JSONResponse({"detail": "MCP server not ready"}, status_code=503)
+
+    tools_version = await smart_server.get_tools_version()
+
+    etag = f'"{tools_version["version"]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(tools_version, headers={"ETag": etag})
+
+
 # ==============================================================================
 # AGGREGATOR API ENDPOINTS (/api/v1/aggregator/*)
 # ==============================================================================
@@ -1093,6 +1159,7 @@ async def aggregator_health_endpoint(request):
 
 # Register routes
 app.router.routes.append(Route("/health", health_check))
+app.router.routes.append(Route("/metrics", metrics_endpoint, methods=["GET"]))
 # /discover endpoint removed - use /search instead
 app.router.routes.append(Route("/search", search_endpoint, methods=["POST", "OPTIONS"]))  # Legacy
 app.router.routes.append(Route("/sync", sync_endpoint, methods=["POST", "OPTIONS"]))
@@ -1126,6 +1193,9 @@ app.router.routes.append(Route("/api/v1/search/tools", search_tools_endpoint, me
 app.router.routes.append(
     Route("/api/v1/tools/defaults", get_default_tools_endpoint, methods=["GET"])
 )
+app.router.routes.append(
+    Route("/api/v1/tools/version", get_tools_version_endpoint, methods=["GET"])
+)
 
 # Aggregator API endpoints
 app.router.routes.append(
@@ -15,6 +15,12 @@ SERVICE_ROUTES = [
         "auth_required": False,
         "description": "Service health check",
     },
+    {
+        "path": "/metrics",
+        "methods": ["GET"],
+        "auth_required": False,
+        "description": "Tool and per-phase latency histograms",
+    },
     {
         "path": "/mcp",
         "methods": ["GET", "POST", "OPTIONS"],
@@ -7,6 +7,11 @@ Provides:
 - SessionManager: MCP ClientSession management
 - ToolAggregator: Tool discovery and indexing
 - RequestRouter: Routing requests to external servers
+- HealthMonitor: Concurrent, jittered health checks for connected servers
+- RoutingTable: In-memory routing state kept current by registry events
+- SessionPool: Load-balanced pool of sessions to one external server
+- ResilienceManager: Per-server circuit breakers, adaptive timeouts and hedging
+- ResultCache: Opt-in cache for read-only external tool results
 - create_aggregator_service: Factory function with all dependencies wired
 """
 
@@ -18,6 +23,11 @@ from .server_registry import ServerRegistry
 from .session_manager import SessionManager
 from .tool_aggregator import ToolAggregator
 from .request_router import RequestRouter
+from .health_monitor import HealthMonitor
+from .routing_table import RoutingTable
+from .session_pool import SessionPool, PoolConfig
+from .resilience import ResilienceManager, ResilienceConfig, CircuitOpenError
+from .result_cache import ResultCache, CachePolicy
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +37,15 @@ __all__ = [
     "SessionManager",
     "ToolAggregator",
     "RequestRouter",
+    "HealthMonitor",
+    "RoutingTable",
+    "SessionPool",
+    "PoolConfig",
+    "ResilienceManager",
+    "ResilienceConfig",
+    "CircuitOpenError",
+    "ResultCache",
+    "CachePolicy",
     "create_aggregator_service",
 ]
 
@@ -111,6 +130,16 @@ async def create_aggregator_service(
         except Exception as e:
             logger.warning(f"Failed to get model client: {e}. Using mock embeddings.")
 
+    # Result cache (LRU + shared Redis level); servers opt in via connection_config
+    result_cache = None
+    try:
+        from core.cache.redis_cache import get_cache
+
+        result_cache = ResultCache(redis_cache=get_cache())
+    except Exception as e:
+        logger.warning(f"Redis cache unavailable: {e}. Tool result cache is in-process only.")
+        result_cache = ResultCache()
+
     # Create and return the aggregator service
     service = AggregatorService(
         tool_repository=tool_repo,
@@ -118,6 +147,7 @@ async def create_aggregator_service(
         skill_classifier=skill_classifier,
         model_client=model_client,
         db_pool=db_pool,
+        result_cache=result_cache,
     )
 
     logger.info(
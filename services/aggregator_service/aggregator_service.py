@@ -6,6 +6,7 @@ and request routing for external MCP servers.
 """
 
 import asyncio
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 import logging
@@ -16,9 +17,20 @@ from .server_registry import ServerRegistry
 from .session_manager import SessionManager
 from .tool_aggregator import ToolAggregator
 from .request_router import RequestRouter
+from .health_monitor import HealthMonitor
 
 logger = logging.getLogger(__name__)
 
+# Last known statuses of servers that should be reconnected after a restart
+RECONNECT_STATUSES = (
+    ServerStatus.CONNECTED,
+    ServerStatus.CONNECTING,
+    ServerStatus.DEGRADED,
+    ServerStatus.ERROR,
+)
+
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
 
 class AggregatorService:
     """
@@ -40,6 +52,7 @@ class AggregatorService:
         skill_classifier=None,
         model_client=None,
         db_pool=None,
+        result_cache=None,
     ):
         """
         Initialize AggregatorService.
@@ -52,6 +65,7 @@ class AggregatorService:
             skill_classifier: SkillClassifier for tool classification
             model_client: Model client for embeddings
             db_pool: Optional database pool for new registry
+            result_cache: Optional ResultCache for read-only external tool results
         """
         # Use provided dependencies or create new ones
         self._registry = server_registry or ServerRegistry(db_pool=db_pool)
@@ -76,12 +90,30 @@ class AggregatorService:
             session_manager=self._session_mgr,
             server_registry=self._registry,
             tool_repository=self._tool_repo,
+            result_cache=result_cache,
+        )
+
+        # Health monitoring (concurrent pings, per-server jittered schedule)
+        self._health_monitor = HealthMonitor(
+            session_manager=self._session_mgr,
+            server_registry=self._registry,
+            max_consecutive_failures=3,
+            base_interval=30.0,
         )
 
-        # Health monitoring state
-        self._health_failures: Dict[str, int] = {}  # server_id -> consecutive failures
-        self._max_consecutive_failures = 3
-        self._health_check_interval = 30.0  # seconds
+        # Concurrent (re)connection of registered servers
+        self.connect_concurrency = 8
+        self.connect_timeout = 60.0  # seconds; connection_config["connect_timeout"] overrides
+        self.slow_connect_threshold = 5.0  # seconds; slower connects are logged as warnings
+        self._connect_timings: Dict[str, Dict[str, Any]] = {}
+        self._connect_task: Optional[asyncio.Task] = None
+
+        # Re-discovery on tools/list_changed, debounced per server
+        self.tool_refresh_debounce = 0.5  # seconds
+        self._refresh_pending: set = set()
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        if hasattr(self._session_mgr, "add_notification_listener"):
+            self._session_mgr.add_notification_listener(self._on_server_notification)
 
     # =========================================================================
     # Server Registration (BR-001)
@@ -130,12 +162,14 @@ class AggregatorService:
     # Server Connection (BR-002)
     # =========================================================================
 
-    async def connect_server(self, server_id: str) -> bool:
+    async def connect_server(self, server_id: str, timeout: Optional[float] = None) -> bool:
         """
         Connect to an external MCP server.
 
         Args:
             server_id: Server UUID
+            timeout: Optional limit in seconds for opening the session (tool
+                discovery afterwards is not included)
 
         Returns:
             True if connected successfully
@@ -160,13 +194,21 @@ class AggregatorService:
 
         try:
             # Create session
-            await self._session_mgr.connect(
-                {
-                    "id": server_id,
-                    "transport_type": server["transport_type"],
-                    "connection_config": server["connection_config"],
-                }
-            )
+            try:
+                await asyncio.wait_for(
+                    self._session_mgr.connect(
+                        {
+                            "id": server_id,
+                            "transport_type": server["transport_type"],
+                            "connection_config": server["connection_config"],
+                        }
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                # Don't leave behind a session the abandoned connect may have opened
+                await self._session_mgr.disconnect(server_id)
+                raise ConnectionError(f"Connect timed out after {timeout:.0f}s")
 
             # Trigger tool discovery
             try:
@@ -198,9 +240,52 @@ class AggregatorService:
             List of discovered tools
         """
         if server_id:
-            return await self._tool_aggregator.discover_tools(server_id)
-        else:
-            return await self._tool_aggregator.aggregate_tools()
+            tools = await self._tool_aggregator.discover_tools(server_id)
+            self._router.routing_table.set_server_tools(server_id, tools)
+            return tools
+
+        tools = await self._tool_aggregator.aggregate_tools()
+        by_server: Dict[str, List[Dict[str, Any]]] = {}
+        for tool in tools:
+            by_server.setdefault(tool["source_server_id"], []).append(tool)
+        for source_server_id, server_tools in by_server.items():
+            self._router.routing_table.set_server_tools(source_server_id, server_tools)
+        return tools
+
+    async def _on_server_notification(self, server_id: str, method: str) -> None:
+        """Handle a notification forwarded by the session manager."""
+        if method == TOOLS_LIST_CHANGED:
+            self._schedule_tool_refresh(server_id)
+
+    def _schedule_tool_refresh(self, server_id: str) -> None:
+        """Re-discover a server's tools after the debounce window."""
+        self._refresh_pending.add(server_id)
+        task = self._refresh_tasks.get(server_id)
+        if task is None or task.done():
+            self._refresh_tasks[server_id] = asyncio.create_task(self._refresh_tools(server_id))
+
+    async def _refresh_tools(self, server_id: str) -> None:
+        """
+        Coalesce list_changed notifications into as few re-discoveries as possible.
+
+        Notifications arriving during the debounce window are absorbed; one
+        arriving mid-discovery triggers another pass afterwards.
+        """
+        try:
+            while server_id in self._refresh_pending:
+                await asyncio.sleep(self.tool_refresh_debounce)
+                self._refresh_pending.discard(server_id)
+                try:
+                    await self.discover_tools(server_id)
+                    logger.info(
+                        f"Refreshed tools for {server_id}: "
+                        f"{self._tool_aggregator.last_diff.get(server_id)}"
+                    )
+                except Exception as e:
+                    logger.warning(f"Tool refresh failed for {server_id}: {e}")
+        finally:
+            if self._refresh_tasks.get(server_id) is asyncio.current_task():
+                del self._refresh_tasks[server_id]
 
     # =========================================================================
     # Skill Classification (BR-004)
@@ -223,7 +308,7 @@ class AggregatorService:
     # =========================================================================
 
     async def execute_tool(
-        self, tool_name: str, arguments: Dict[str, Any], server_id: str = None
+        self, tool_name: str, arguments: Dict[str, Any], server_id: str = None, user_id: str = None
     ) -> Dict[str, Any]:
         """
         Execute a tool on an external server.
@@ -232,12 +317,13 @@ class AggregatorService:
             tool_name: Namespaced or original tool name
             arguments: Tool arguments
             server_id: Optional explicit server ID
+            user_id: Optional caller, scopes cached results
 
         Returns:
             Tool execution result
         """
         return await self._router.route_and_execute(
-            tool_name=tool_name, arguments=arguments, server_id=server_id
+            tool_name=tool_name, arguments=arguments, server_id=server_id, user_id=user_id
         )
 
     # =========================================================================
@@ -265,65 +351,12 @@ class AggregatorService:
         if not server:
             raise ValueError(f"Server not found: {server_id}")
 
-        now = datetime.now(timezone.utc)
-        is_healthy = False
-
-        if server["status"] == ServerStatus.CONNECTED:
-            # Try session health check
-            is_healthy = await self._session_mgr.health_check(server_id)
-
-        # Update failure tracking
-        if is_healthy:
-            self._health_failures[server_id] = 0
-        else:
-            self._health_failures[server_id] = self._health_failures.get(server_id, 0) + 1
-
-        consecutive_failures = self._health_failures.get(server_id, 0)
-
-        # Update last health check time
-        await self._registry.update_last_health_check(server_id)
-
-        # If too many failures, mark as unhealthy
-        if consecutive_failures >= self._max_consecutive_failures:
-            if server["status"] == ServerStatus.CONNECTED:
-                await self._registry.update_status(
-                    server_id,
-                    ServerStatus.DEGRADED,
-                    f"Health check failed {consecutive_failures} times",
-                )
-
-        return {
-            "server_id": server_id,
-            "server_name": server["name"],
-            "status": server["status"],
-            "is_healthy": is_healthy,
-            "consecutive_failures": consecutive_failures,
-            "last_check": now,
-            "health_check_url": server.get("health_check_url"),
-        }
+        results = await self._health_monitor.check_servers([server])
+        return results[0]
 
     async def _health_check_all(self) -> List[Dict[str, Any]]:
-        """Health check all connected servers."""
-        servers = await self._registry.list(status=ServerStatus.CONNECTED)
-        results = []
-
-        for server in servers:
-            try:
-                result = await self._health_check_single(server["id"])
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Health check failed for {server['name']}: {e}")
-                results.append(
-                    {
-                        "server_id": server["id"],
-                        "server_name": server["name"],
-                        "status": server["status"],
-                        "is_healthy": False,
-                        "error": str(e),
-                    }
-                )
-
-        return results
+        """Health check all connected servers concurrently."""
+        return await self._health_monitor.run_cycle(force=True)
 
     # =========================================================================
     # Server Disconnection (BR-007)
@@ -382,13 +415,18 @@ class AggregatorService:
             await self.disconnect_server(server_id)
 
         # Delete tools
+        self._refresh_pending.discard(server_id)
+        refresh = self._refresh_tasks.pop(server_id, None)
+        if refresh:
+            refresh.cancel()
         await self._tool_aggregator.remove_server_tools(server_id)
 
         # Remove from registry
         await self._registry.remove(server_id)
 
         # Clean up health tracking
-        self._health_failures.pop(server_id, None)
+        self._health_monitor.forget(server_id)
+        self._connect_timings.pop(server_id, None)
 
         logger.info(f"Removed server: {server['name']}")
         return True
@@ -430,6 +468,14 @@ class AggregatorService:
                 }
                 for s in all_servers
             ],
+            "health": self._health_monitor.snapshot(),
+            "connect_timings": sorted(
+                self._connect_timings.values(), key=lambda t: t["seconds"], reverse=True
+            ),
+            "circuits": self._router.resilience.snapshot(),
+            "result_cache": (
+                self._router.result_cache.stats() if self._router.result_cache else None
+            ),
         }
 
     async def list_servers(
@@ -485,19 +531,12 @@ class AggregatorService:
         """
         Start background health monitoring.
 
+        Each server is checked on its own jittered schedule; see HealthMonitor.
+
         Returns:
             Health monitor task
         """
-
-        async def _monitor_loop():
-            while True:
-                try:
-                    await self.health_check()
-                except Exception as e:
-                    logger.error(f"Health monitor error: {e}")
-                await asyncio.sleep(self._health_check_interval)
-
-        task = asyncio.create_task(_monitor_loop())
+        task = asyncio.create_task(self._health_monitor.run_forever())
         logger.info("Started health monitor")
         return task
 
@@ -508,16 +547,90 @@ class AggregatorService:
         Returns:
             Dict mapping server_id to reconnect success
         """
-        results = {}
         unhealthy = await self._registry.list(status=ServerStatus.DEGRADED)
         error = await self._registry.list(status=ServerStatus.ERROR)
+        return await self.connect_servers(unhealthy + error)
 
-        for server in unhealthy + error:
-            try:
-                success = await self.connect_server(server["id"])
-                results[server["id"]] = success
-            except Exception as e:
-                logger.error(f"Reconnect failed for {server['name']}: {e}")
-                results[server["id"]] = False
+    def start_background_connect(self) -> asyncio.Task:
+        """
+        Reconnect registered servers in the background after startup.
+
+        Servers whose last known status was connected (or failing) are
+        connected concurrently; each becomes routable as soon as its own
+        connect and tool discovery finish, so callers need not wait.
+
+        Returns:
+            Connect task
+        """
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_task = asyncio.create_task(self.connect_servers())
+        return self._connect_task
 
-        return results
+    async def connect_servers(
+        self, servers: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, bool]:
+        """
+        Connect several servers concurrently.
+
+        At most ``connect_concurrency`` connects run at once and each is
+        bounded by its connect timeout.
+
+        Args:
+            servers: Server records to connect; defaults to registered servers
+                whose last status is in RECONNECT_STATUSES
+
+        Returns:
+            Dict mapping server_id to connect success
+        """
+        if servers is None:
+            servers = [s for s in await self._registry.list() if s["status"] in RECONNECT_STATUSES]
+        if not servers:
+            return {}
+
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.connect_concurrency)
+
+        async def connect_one(server: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._timed_connect(server)
+
+        results = await asyncio.gather(*(connect_one(s) for s in servers))
+        connected = sum(results)
+        logger.info(
+            f"Connected {connected}/{len(servers)} external servers "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        return {server["id"]: success for server, success in zip(servers, results)}
+
+    async def _timed_connect(self, server: Dict[str, Any]) -> bool:
+        """Connect one server under its timeout and record how long it took."""
+        timeout = (server.get("connection_config") or {}).get(
+            "connect_timeout", self.connect_timeout
+        )
+        error = None
+        started = time.monotonic()
+        try:
+            success = await self.connect_server(server["id"], timeout=timeout)
+            if not success:
+                error = ((await self._registry.get(server["id"])) or {}).get("error_message")
+        except Exception as e:
+            success, error = False, str(e)
+        elapsed = time.monotonic() - started
+
+        self._connect_timings[server["id"]] = {
+            "server_id": server["id"],
+            "name": server["name"],
+            "transport_type": getattr(server["transport_type"], "value", server["transport_type"]),
+            "seconds": round(elapsed, 3),
+            "success": success,
+            "error": error,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if elapsed >= self.slow_connect_threshold or not success:
+            logger.warning(
+                f"Connect to {server['name']} took {elapsed:.1f}s "
+                f"({'ok' if success else error or 'failed'})"
+            )
+        else:
+            logger.info(f"Connect to {server['name']} took {elapsed:.2f}s")
+        return success
@@ -33,3 +33,18 @@ class RoutingStrategy(str, Enum):
     NAMESPACE_RESOLVED = "namespace_resolved"
     EXPLICIT_SERVER = "explicit_server"
     FALLBACK = "fallback"
+
+
+class SessionSelection(str, Enum):
+    """How a call picks a session from a server's session pool."""
+
+    LEAST_OUTSTANDING = "least_outstanding"
+    POWER_OF_TWO = "power_of_two"
+
+
+class CircuitState(str, Enum):
+    """Per-server circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
@@ -0,0 +1,284 @@
+"""
+Health Monitor - Concurrent, adaptive health checking for external MCP servers.
+
+Checks run concurrently with a per-server timeout, so one slow or hung server
+does not delay the others; a full cycle takes roughly as long as the slowest
+single check. Each server has its own jittered schedule whose interval grows
+while the server is stable and resets after a failure. Registry timestamps are
+written once per cycle instead of once per server.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+
+from .domain import ServerStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServerHealthState:
+    """Health tracking for a single server."""
+
+    server_id: str
+    interval: float
+    next_check_at: float = 0.0  # time.monotonic() deadline
+    consecutive_failures: int = 0
+    consecutive_successes: int = 0
+    is_healthy: Optional[bool] = None
+    last_check: Optional[datetime] = None
+    last_latency_ms: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "server_id": self.server_id,
+            "is_healthy": self.is_healthy,
+            "consecutive_failures": self.consecutive_failures,
+            "consecutive_successes": self.consecutive_successes,
+            "interval_seconds": round(self.interval, 2),
+            "last_check": self.last_check.isoformat() if self.last_check else None,
+            "last_latency_ms": self.last_latency_ms,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class HealthCheckOutcome:
+    """Result of one health check."""
+
+    server: Dict[str, Any]
+    is_healthy: bool
+    latency_ms: float
+    error: Optional[str] = None
+    checked_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class HealthMonitor:
+    """
+    Schedules and runs health checks for connected external servers.
+
+    Cadence:
+    - New servers get a random offset within one interval so checks spread out
+    - Every check reschedules with +/- ``jitter`` of the current interval
+    - After ``stable_after`` consecutive successes the interval grows by
+      ``backoff_factor`` up to ``max_interval``
+    - Any failure resets the interval to ``min_interval``
+    """
+
+    def __init__(
+        self,
+        session_manager=None,
+        server_registry=None,
+        check_timeout: float = 5.0,
+        base_interval: float = 30.0,
+        min_interval: float = 10.0,
+        max_interval: float = 300.0,
+        jitter: float = 0.2,
+        stable_after: int = 3,
+        backoff_factor: float = 1.5,
+        max_consecutive_failures: int = 3,
+        max_concurrency: int = 100,
+    ):
+        """
+        Initialize HealthMonitor.
+
+        Args:
+            session_manager: SessionManager used to ping servers
+            server_registry: ServerRegistry for status and timestamp updates
+            check_timeout: Per-server check timeout in seconds
+            base_interval: Initial check interval in seconds
+            min_interval: Interval used after a failure
+            max_interval: Upper bound for stable servers
+            jitter: Fractional jitter applied to each reschedule
+            stable_after: Consecutive successes before the interval grows
+            backoff_factor: Growth factor for stable servers
+            max_consecutive_failures: Failures before a server is marked DEGRADED
+            max_concurrency: Maximum checks in flight at once
+        """
+        self._session_mgr = session_manager
+        self._registry = server_registry
+        self.check_timeout = check_timeout
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.stable_after = stable_after
+        self.backoff_factor = backoff_factor
+        self.max_consecutive_failures = max_consecutive_failures
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._states: Dict[str, ServerHealthState] = {}
+        self._last_cycle_ms: Optional[float] = None
+
+    # =========================================================================
+    # State
+    # =========================================================================
+
+    def get_state(self, server_id: str) -> ServerHealthState:
+        """Get (or create) the tracking state for a server."""
+        state = self._states.get(server_id)
+        if state is None:
+            state = ServerHealthState(
+                server_id=server_id,
+                interval=self.base_interval,
+                next_check_at=time.monotonic() + random.uniform(0, self.base_interval),
+            )
+            self._states[server_id] = state
+        return state
+
+    def forget(self, server_id: str) -> None:
+        """Drop tracking state for a removed server."""
+        self._states.pop(server_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Expose monitor state for the aggregator state endpoint."""
+        return {
+            "tracked_servers": len(self._states),
+            "last_cycle_ms": self._last_cycle_ms,
+            "servers": {sid: state.to_dict() for sid, state in self._states.items()},
+        }
+
+    def _reschedule(self, state: ServerHealthState) -> None:
+        spread = state.interval * self.jitter
+        state.next_check_at = time.monotonic() + state.interval + random.uniform(-spread, spread)
+
+    # =========================================================================
+    # Checks
+    # =========================================================================
+
+    async def _check_one(self, server: Dict[str, Any]) -> HealthCheckOutcome:
+        """Ping one server under the per-server timeout."""
+        started = time.perf_counter()
+        error = None
+        if server["status"] != ServerStatus.CONNECTED:
+            return HealthCheckOutcome(server=server, is_healthy=False, latency_ms=0.0)
+
+        async with self._semaphore:
+            try:
+                is_healthy = await asyncio.wait_for(
+                    self._session_mgr.health_check(server["id"]), timeout=self.check_timeout
+                )
+            except asyncio.TimeoutError:
+                is_healthy = False
+                error = f"Health check timed out after {self.check_timeout}s"
+            except Exception as e:
+                is_healthy = False
+                error = str(e)
+        latency_ms = (time.perf_counter() - started) * 1000
+        return HealthCheckOutcome(
+            server=server, is_healthy=bool(is_healthy), latency_ms=latency_ms, error=error
+        )
+
+    async def check_servers(self, servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Check the given servers concurrently and apply the results.
+
+        Registry timestamps are written in one batch; status is only written
+        for servers that cross the failure threshold.
+
+        Returns:
+            One result dict per server, in input order
+        """
+        if not servers:
+            return []
+
+        cycle_started = time.perf_counter()
+        outcomes = await asyncio.gather(*(self._check_one(server) for server in servers))
+
+        results = []
+        degraded = []
+        for outcome in outcomes:
+            server = outcome.server
+            state = self.get_state(server["id"])
+            self._apply(state, outcome)
+
+            if (
+                state.consecutive_failures >= self.max_consecutive_failures
+                and server["status"] == ServerStatus.CONNECTED
+            ):
+                degraded.append((server["id"], state.consecutive_failures))
+
+            results.append(
+                {
+                    "server_id": server["id"],
+                    "server_name": server["name"],
+                    "status": server["status"],
+                    "is_healthy": outcome.is_healthy,
+                    "consecutive_failures": state.consecutive_failures,
+                    "last_check": outcome.checked_at,
+                    "latency_ms": round(outcome.latency_ms, 2),
+                    "health_check_url": server.get("health_check_url"),
+                    **({"error": outcome.error} if outcome.error else {}),
+                }
+            )
+
+        if self._registry:
+            await self._registry.update_last_health_checks([s["id"] for s in servers])
+            for server_id, failures in degraded:
+                await self._registry.update_status(
+                    server_id,
+                    ServerStatus.DEGRADED,
+                    f"Health check failed {failures} times",
+                )
+
+        self._last_cycle_ms = round((time.perf_counter() - cycle_started) * 1000, 2)
+        return results
+
+    def _apply(self, state: ServerHealthState, outcome: HealthCheckOutcome) -> None:
+        state.is_healthy = outcome.is_healthy
+        state.last_check = outcome.checked_at
+        state.last_latency_ms = round(outcome.latency_ms, 2)
+        state.last_error = outcome.error
+
+        if outcome.is_healthy:
+            state.consecutive_failures = 0
+            state.consecutive_successes += 1
+            if state.consecutive_successes >= self.stable_after:
+                state.interval = min(self.max_interval, state.interval * self.backoff_factor)
+        else:
+            state.consecutive_successes = 0
+            state.consecutive_failures += 1
+            state.interval = self.min_interval
+
+        self._reschedule(state)
+
+    async def run_cycle(self, force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Check every connected server that is due (or all of them if ``force``).
+
+        Returns:
+            Results for the servers checked in this cycle
+        """
+        servers = await self._registry.list(status=ServerStatus.CONNECTED)
+
+        # Forget servers that are no longer connected
+        connected_ids = {s["id"] for s in servers}
+        for server_id in list(self._states):
+            if server_id not in connected_ids:
+                self.forget(server_id)
+
+        now = time.monotonic()
+        due = [s for s in servers if force or self.get_state(s["id"]).next_check_at <= now]
+        return await self.check_servers(due)
+
+    def seconds_until_next_check(self, default: float = None) -> float:
+        """Time until the earliest scheduled check."""
+        if not self._states:
+            return default if default is not None else self.base_interval
+        earliest = min(state.next_check_at for state in self._states.values())
+        return max(0.0, earliest - time.monotonic())
+
+    async def run_forever(self, tick: float = 1.0) -> None:
+        """Background loop: wake up when the next server is due and check it."""
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"Health monitor error: {e}")
+            delay = self.seconds_until_next_check(default=self.min_interval)
+            await asyncio.sleep(max(tick, delay))
@@ -9,7 +9,12 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Tuple
 import logging
 
+from core.tracing import traced
+
 from .domain import ServerStatus, RoutingStrategy
+from .resilience import CircuitOpenError, ResilienceConfig, ResilienceManager
+from .result_cache import ResultCache
+from .routing_table import RoutingTable, ServerRoute, ToolRoute
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +30,7 @@ class RoutingContext:
         server_name: str,
         arguments: Dict[str, Any],
         strategy: RoutingStrategy = RoutingStrategy.NAMESPACE_RESOLVED,
+        idempotent: bool = False,
     ):
         self.tool_name = tool_name
         self.original_name = original_name
@@ -32,6 +38,10 @@ class RoutingContext:
         self.server_name = server_name
         self.arguments = arguments
         self.strategy = strategy
+        self.idempotent = idempotent
+        self.user_id: Optional[str] = None
+        self.cache_ttl: Optional[float] = None  # set when the result may be cached
+        self.cache_scope = "user"
         self.created_at = datetime.now(timezone.utc)
         self.execution_started_at: Optional[datetime] = None
         self.execution_completed_at: Optional[datetime] = None
@@ -45,10 +55,18 @@ class RequestRouter:
     - Parse namespaced tool names
     - Resolve target server
     - Forward requests to external servers
-    - Handle timeouts and errors
+    - Handle timeouts and errors (per-server circuit breakers, adaptive
+      timeouts and hedging via ResilienceManager)
     """
 
-    def __init__(self, session_manager=None, server_registry=None, tool_repository=None):
+    def __init__(
+        self,
+        session_manager=None,
+        server_registry=None,
+        tool_repository=None,
+        resilience_config: Optional[ResilienceConfig] = None,
+        result_cache: Optional[ResultCache] = None,
+    ):
         """
         Initialize RequestRouter.
 
@@ -56,13 +74,78 @@ class RequestRouter:
             session_manager: SessionManager for MCP communication
             server_registry: ServerRegistry for server lookups
             tool_repository: Tool repository for tool metadata
+            resilience_config: Circuit breaker, timeout and hedging settings
+            result_cache: Optional cache for read-only tool results (used for
+                servers with ``connection_config["result_cache"]`` enabled)
         """
         self._session_manager = session_manager
         self._server_registry = server_registry
         self._tool_repo = tool_repository
-        self._execution_timeout = 60.0  # seconds
         self._retry_on_disconnect = True
+        self._resilience = ResilienceManager(resilience_config)
+        self._result_cache = result_cache
+
+        # Routing state, kept current by registry events instead of per-request queries
+        self._routing_table = RoutingTable()
+        if server_registry is not None:
+            server_registry.add_listener(self._routing_table.handle_event)
+            server_registry.add_listener(self._resilience.handle_event)
+            if result_cache is not None:
+                server_registry.add_listener(result_cache.handle_event)
+
+    @property
+    def routing_table(self) -> RoutingTable:
+        """In-memory routing table."""
+        return self._routing_table
+
+    @property
+    def resilience(self) -> ResilienceManager:
+        """Per-server circuit breakers."""
+        return self._resilience
+
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        """Tool result cache, if configured."""
+        return self._result_cache
+
+    async def _get_server(self, server_id: str) -> Optional[ServerRoute]:
+        """Resolve a server by ID from the routing table, loading it on a miss."""
+        route = self._routing_table.get_server(server_id)
+        if route is None:
+            server = await self._server_registry.get(server_id)
+            if server:
+                route = self._routing_table.upsert_server(server)
+        return route
+
+    async def _get_server_by_name(self, server_name: str) -> Optional[ServerRoute]:
+        """Resolve a server by name from the routing table, loading it on a miss."""
+        route = self._routing_table.get_server_by_name(server_name)
+        if route is None:
+            server = await self._server_registry.get_by_name(server_name)
+            if server:
+                route = self._routing_table.upsert_server(server)
+        return route
+
+    @staticmethod
+    def _ensure_connected(server: ServerRoute) -> None:
+        if server.status != ServerStatus.CONNECTED:
+            raise RuntimeError(f"Server unavailable: {server.server_name} ({server.status})")
+
+    def _apply_cache_policy(
+        self, context: RoutingContext, server: ServerRoute, tool_route: Optional[ToolRoute]
+    ) -> RoutingContext:
+        """Mark the request cacheable if its server and tool allow it."""
+        policy = server.cache_policy
+        if self._result_cache is not None and policy is not None:
+            context.cache_ttl = policy.ttl_for(
+                context.original_name,
+                read_only=bool(tool_route and tool_route.read_only),
+                annotated_ttl=tool_route.cache_ttl if tool_route else None,
+            )
+            context.cache_scope = policy.scope
+        return context
 
+    @traced("aggregator.route")
     async def route(
         self, tool_name: str, arguments: Dict[str, Any], server_id: str = None
     ) -> RoutingContext:
@@ -96,81 +179,104 @@ class RequestRouter:
         self, tool_name: str, arguments: Dict[str, Any], server_id: str
     ) -> RoutingContext:
         """Route with explicit server ID."""
-        server = await self._server_registry.get(server_id)
+        server = await self._get_server(server_id)
         if not server:
             raise ValueError(f"Server not found: {server_id}")
 
-        if server["status"] != ServerStatus.CONNECTED:
-            raise RuntimeError(f"Server unavailable: {server['name']} ({server['status']})")
+        self._ensure_connected(server)
 
         # Get original name from tool if available
         original_name = tool_name
-        if self._tool_repo:
-            tool = await self._tool_repo.get_tool_by_name(tool_name, server_id)
-            if tool:
-                original_name = tool.get("original_name", tool_name)
+        tool_route = self._routing_table.get_tool(tool_name)
+        if tool_route and tool_route.server_id == server_id:
+            original_name = tool_route.original_name
+        else:
+            tool_route = None
+            if self._tool_repo:
+                tool = await self._tool_repo.get_tool_by_name(tool_name, server_id)
+                if tool:
+                    original_name = tool.get("original_name", tool_name)
+                    self._routing_table.add_tool(
+                        tool_name, server_id, original_name, server_name=server.server_name
+                    )
 
-        return RoutingContext(
+        context = RoutingContext(
             tool_name=tool_name,
             original_name=original_name,
             server_id=server_id,
-            server_name=server["name"],
+            server_name=server.server_name,
             arguments=arguments,
             strategy=RoutingStrategy.EXPLICIT_SERVER,
+            idempotent=bool(tool_route and tool_route.idempotent),
         )
+        return self._apply_cache_policy(context, server, tool_route)
 
     async def _route_namespaced(self, tool_name: str, arguments: Dict[str, Any]) -> RoutingContext:
         """Route by parsing namespaced name."""
-        # Parse namespaced name - only first dot separates server from tool
-        parts = tool_name.split(".", 1)
-        server_name = parts[0]
-        original_name = parts[1] if len(parts) > 1 else tool_name
+        tool_route = self._routing_table.get_tool(tool_name)
+        if tool_route:
+            server = await self._get_server(tool_route.server_id)
+            server_name = tool_route.server_name or tool_route.server_id
+            original_name = tool_route.original_name
+        else:
+            # Parse namespaced name - only first dot separates server from tool
+            server_name, original_name = tool_name.split(".", 1)
+            server = await self._get_server_by_name(server_name)
 
-        # Find server by name
-        server = await self._server_registry.get_by_name(server_name)
         if not server:
             raise ValueError(f"Server not found: {server_name}")
 
-        if server["status"] != ServerStatus.CONNECTED:
-            raise RuntimeError(f"Server unavailable: {server_name} ({server['status']})")
+        self._ensure_connected(server)
 
-        return RoutingContext(
+        context = RoutingContext(
             tool_name=tool_name,
             original_name=original_name,
-            server_id=server["id"],
-            server_name=server_name,
+            server_id=server.server_id,
+            server_name=server.server_name,
             arguments=arguments,
             strategy=RoutingStrategy.NAMESPACE_RESOLVED,
+            idempotent=bool(tool_route and tool_route.idempotent),
         )
+        return self._apply_cache_policy(context, server, tool_route)
 
     async def _route_search(self, tool_name: str, arguments: Dict[str, Any]) -> RoutingContext:
         """Route by searching for tool across servers."""
-        if not self._tool_repo:
-            raise ValueError(f"Tool not found: {tool_name}")
-
-        # Search for tool by name
-        tool = await self._tool_repo.get_tool_by_name(tool_name)
-        if not tool:
-            raise ValueError(f"Tool not found: {tool_name}")
-
-        server_id = tool["source_server_id"]
-        server = await self._server_registry.get(server_id)
+        tool_route = self._routing_table.get_tool(tool_name)
+        if tool_route is None:
+            if not self._tool_repo:
+                raise ValueError(f"Tool not found: {tool_name}")
+
+            # Search for tool by name
+            tool = await self._tool_repo.get_tool_by_name(tool_name)
+            if not tool:
+                raise ValueError(f"Tool not found: {tool_name}")
+
+            self._routing_table.add_tool(
+                tool_name,
+                tool["source_server_id"],
+                tool.get("original_name", tool_name),
+                server_name=tool.get("source_server_name"),
+            )
+            tool_route = self._routing_table.get_tool(tool_name)
 
+        server = await self._get_server(tool_route.server_id)
         if not server:
             raise ValueError(f"Server not found for tool: {tool_name}")
 
-        if server["status"] != ServerStatus.CONNECTED:
-            raise RuntimeError(f"Server unavailable: {server['name']} ({server['status']})")
+        self._ensure_connected(server)
 
-        return RoutingContext(
+        context = RoutingContext(
             tool_name=tool_name,
-            original_name=tool.get("original_name", tool_name),
-            server_id=server_id,
-            server_name=server["name"],
+            original_name=tool_route.original_name,
+            server_id=server.server_id,
+            server_name=server.server_name,
             arguments=arguments,
             strategy=RoutingStrategy.FALLBACK,
+            idempotent=tool_route.idempotent,
         )
+        return self._apply_cache_policy(context, server, tool_route)
 
+    @traced("aggregator.execute")
     async def execute(self, context: RoutingContext) -> Dict[str, Any]:
         """
         Execute a routed tool request.
@@ -182,21 +288,33 @@ class RequestRouter:
             Tool execution result
 
         Raises:
+            CircuitOpenError: If the server's circuit is open
             RuntimeError: If execution fails
         """
         context.execution_started_at = datetime.now(timezone.utc)
 
-        try:
-            # Call tool on external server
-            result = await asyncio.wait_for(
-                self._session_manager.call_tool(
+        def call():
+            # Call tool on external server through its circuit breaker
+            return self._resilience.call(
+                context.server_id,
+                lambda: self._session_manager.call_tool(
                     server_id=context.server_id,
                     tool_name=context.original_name,
                     arguments=context.arguments,
                 ),
-                timeout=self._execution_timeout,
+                idempotent=context.idempotent,
+                tool=context.tool_name,
             )
 
+        try:
+            cache_key = self._cache_key(context)
+            if cache_key:
+                result, cached = await self._result_cache.get_or_call(
+                    cache_key, context.cache_ttl, call
+                )
+            else:
+                result, cached = await call(), False
+
             context.execution_completed_at = datetime.now(timezone.utc)
 
             return {
@@ -210,27 +328,50 @@ class RequestRouter:
                 "server_name": context.server_name,
                 "tool_name": context.tool_name,
                 "original_name": context.original_name,
+                "cached": cached,
             }
 
-        except asyncio.TimeoutError:
+        except CircuitOpenError:
+            logger.warning(f"Rejected {context.tool_name}: circuit open for {context.server_name}")
+            raise
+
+        except asyncio.TimeoutError as e:
             logger.error(f"Timeout executing {context.tool_name} on {context.server_name}")
-            raise RuntimeError(f"Tool execution timed out after {self._execution_timeout}s")
+            raise RuntimeError(f"Tool execution {e}")
 
         except Exception as e:
             logger.error(f"Error executing {context.tool_name} on {context.server_name}: {e}")
 
             # Check if server disconnected
             if self._retry_on_disconnect:
-                server = await self._server_registry.get(context.server_id)
-                if server and server["status"] != ServerStatus.CONNECTED:
+                server = await self._get_server(context.server_id)
+                if server and server.status != ServerStatus.CONNECTED:
                     raise RuntimeError(
                         f"Server disconnected during execution: {context.server_name}"
                     )
 
             raise RuntimeError(f"Tool execution failed: {e}")
 
+    def _cache_key(self, context: RoutingContext) -> Optional[str]:
+        """Result cache key, or None if the request must go to the server."""
+        if self._result_cache is None or not context.cache_ttl:
+            return None
+        if context.cache_scope == "shared":
+            scope = "*"
+        elif context.user_id:
+            scope = f"user:{context.user_id}"
+        else:
+            return None
+        return self._result_cache.make_key(
+            context.server_id, context.original_name, context.arguments, scope
+        )
+
     async def route_and_execute(
-        self, tool_name: str, arguments: Dict[str, Any], server_id: str = None
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        server_id: str = None,
+        user_id: str = None,
     ) -> Dict[str, Any]:
         """
         Convenience method to route and execute in one call.
@@ -239,11 +380,13 @@ class RequestRouter:
             tool_name: Namespaced or original tool name
             arguments: Tool arguments
             server_id: Optional explicit server ID
+            user_id: Optional caller, scopes cached results
 
         Returns:
             Tool execution result
         """
         context = await self.route(tool_name, arguments, server_id)
+        context.user_id = user_id
         return await self.execute(context)
 
     async def validate_tool_exists(
@@ -267,8 +410,8 @@ class RequestRouter:
             return False, None
 
         # Check server status
-        server = await self._server_registry.get(tool["source_server_id"])
-        if not server or server["status"] != ServerStatus.CONNECTED:
+        server = await self._get_server(tool["source_server_id"])
+        if not server or server.status != ServerStatus.CONNECTED:
             return True, {**tool, "available": False}
 
         return True, {**tool, "available": True}
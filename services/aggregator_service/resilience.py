@@ -0,0 +1,385 @@
+"""
+Resilience - Circuit breakers, adaptive timeouts and hedged calls per server.
+
+Every tool call to an external server is recorded in a rolling window (last
+``window_size`` calls within ``window_seconds``). When the error rate or the
+slow-call rate in that window crosses its threshold the server's circuit
+opens and calls fail fast with CircuitOpenError. After ``open_seconds`` a
+limited number of probe calls are let through (half-open); enough successful
+probes close the circuit again, a failed probe reopens it.
+
+The call timeout follows each tool's observed p99 latency instead of a fixed
+value, and calls to idempotent/read-only tools that run past the tool's p95
+latency are hedged with a second request; the first success wins. A call cut
+off by its timeout counts as a failure and is not a latency sample, so a hung
+server trips the breaker instead of stretching its own timeout.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+import logging
+
+from .domain import CircuitState
+from .session_pool import PoolBusyError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a server's circuit is open and the call is rejected."""
+
+
+class CallTimeoutError(asyncio.TimeoutError):
+    """Raised when a call exceeds the server's adaptive timeout."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"timed out after {timeout:.1f}s")
+        self.timeout = timeout
+
+
+@dataclass
+class ResilienceConfig:
+    """Breaker, timeout and hedging settings shared by all servers."""
+
+    window_size: int = 100  # most recent calls considered
+    window_seconds: float = 60.0  # calls older than this are dropped from the window
+    min_calls: int = 10  # calls in the window before the breaker or adaptive timeout apply
+    error_rate_threshold: float = 0.5
+    slow_call_seconds: float = 10.0
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 30.0  # fail-fast period before probing
+    half_open_probes: int = 1  # concurrent probe calls while half-open
+    close_after: int = 2  # successful probes needed to close
+    timeout_multiplier: float = 3.0  # adaptive timeout = p99 * multiplier
+    min_timeout: float = 5.0
+    max_timeout: float = 60.0  # also used until a tool has enough latency samples
+    tool_timeouts: Dict[str, float] = field(default_factory=dict)  # fixed, by tool name
+    hedge_enabled: bool = True
+    hedge_percentile: float = 95.0
+    min_hedge_delay: float = 0.05
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for one server, with latency tracked per tool.
+
+    Error and slow-call rates are computed over all of the server's calls;
+    timeouts and hedge delays use the latency samples of the called tool only,
+    so fast tools don't set the timeout of a slow one.
+    """
+
+    def __init__(
+        self,
+        server_id: str,
+        config: ResilienceConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.server_id = server_id
+        self.config = config
+        self._clock = clock
+        self._window: Deque[Tuple[float, float, bool]] = deque(maxlen=config.window_size)
+        self._tool_latencies: Dict[Optional[str], Deque[Tuple[float, float]]] = {}
+        self.state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.times_opened = 0
+        self.rejected = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    # =========================================================================
+    # Admission
+    # =========================================================================
+
+    def before_call(self) -> bool:
+        """
+        Admit a call.
+
+        Returns:
+            True if the call is a half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probe slots are taken
+        """
+        if (
+            self.state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.config.open_seconds
+        ):
+            self.state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+            logger.info(f"Circuit for {self.server_id} half-open, probing")
+
+        if self.state == CircuitState.CLOSED:
+            return False
+
+        if (
+            self.state == CircuitState.HALF_OPEN
+            and self._probes_in_flight < self.config.half_open_probes
+        ):
+            self._probes_in_flight += 1
+            return True
+
+        self.rejected += 1
+        retry_in = max(0.0, self._opened_at + self.config.open_seconds - self._clock())
+        raise CircuitOpenError(
+            f"Circuit open for server {self.server_id} (retry in {retry_in:.0f}s)"
+        )
+
+    def record(
+        self, latency: float, ok: bool, probe: bool = False, tool: Optional[str] = None
+    ) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        Only successful calls become latency samples of the tool; failures
+        (including timeouts) count towards the error rate.
+        """
+        now = self._clock()
+        if ok:
+            samples = self._tool_latencies.get(tool)
+            if samples is None:
+                samples = self._tool_latencies[tool] = deque(maxlen=self.config.window_size)
+            samples.append((now, latency))
+        self._window.append((now, latency, ok))
+
+        if probe:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if self.state != CircuitState.HALF_OPEN:
+                return
+            if not ok:
+                self._open("probe failed")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.config.close_after:
+                self.state = CircuitState.CLOSED
+                # Outcomes from before the outage would re-trip the breaker
+                self._window.clear()
+                logger.info(f"Circuit for {self.server_id} closed")
+            return
+
+        if self.state == CircuitState.CLOSED:
+            self._maybe_trip()
+
+    def abandon(self, probe: bool) -> None:
+        """Release an admitted call that finished without an outcome (cancelled)."""
+        if probe:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _maybe_trip(self) -> None:
+        calls = self._calls()
+        if len(calls) < self.config.min_calls:
+            return
+        error_rate, slow_rate = self._rates(calls)
+        if error_rate >= self.config.error_rate_threshold:
+            self._open(f"error rate {error_rate:.0%}")
+        elif slow_rate >= self.config.slow_call_rate_threshold:
+            self._open(f"slow call rate {slow_rate:.0%}")
+
+    def _open(self, reason: str) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        logger.warning(
+            f"Circuit for {self.server_id} opened ({reason}); "
+            f"failing fast for {self.config.open_seconds:.0f}s"
+        )
+
+    # =========================================================================
+    # Window statistics
+    # =========================================================================
+
+    def _calls(self) -> List[Tuple[float, float, bool]]:
+        cutoff = self._clock() - self.config.window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+        return list(self._window)
+
+    def _rates(self, calls: List[Tuple[float, float, bool]]) -> Tuple[float, float]:
+        if not calls:
+            return 0.0, 0.0
+        failures = sum(1 for _, _, ok in calls if not ok)
+        slow = sum(1 for _, latency, _ in calls if latency >= self.config.slow_call_seconds)
+        return failures / len(calls), slow / len(calls)
+
+    def _latencies(self, tool: Optional[str] = None) -> List[float]:
+        samples = self._tool_latencies.get(tool)
+        if not samples:
+            return []
+        cutoff = self._clock() - self.config.window_seconds
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+        return [latency for _, latency in samples]
+
+    def timeout(self, tool: Optional[str] = None) -> float:
+        """Call timeout for a tool: its configured override, else its p99 latency."""
+        override = self.config.tool_timeouts.get(tool) if tool else None
+        if override is not None:
+            return override
+        latencies = self._latencies(tool)
+        if len(latencies) < self.config.min_calls:
+            return self.config.max_timeout
+        adaptive = _percentile(latencies, 99) * self.config.timeout_multiplier
+        return min(self.config.max_timeout, max(self.config.min_timeout, adaptive))
+
+    def hedge_delay(self, tool: Optional[str] = None) -> Optional[float]:
+        """Latency after which an idempotent call is hedged, or None without enough samples."""
+        latencies = self._latencies(tool)
+        if len(latencies) < self.config.min_calls:
+            return None
+        return max(
+            self.config.min_hedge_delay, _percentile(latencies, self.config.hedge_percentile)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        calls = self._calls()
+        error_rate, slow_rate = self._rates(calls)
+        latencies = [latency for _, latency, ok in calls if ok]
+        tools = [tool for tool in self._tool_latencies if tool]
+        hedge_delays = {tool: self.hedge_delay(tool) for tool in tools}
+        return {
+            "server_id": self.server_id,
+            "state": self.state.value,
+            "calls_in_window": len(calls),
+            "error_rate": round(error_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 1) if latencies else None,
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 1) if latencies else None,
+            "tool_timeouts_seconds": {tool: round(self.timeout(tool), 2) for tool in tools},
+            "tool_hedge_delays_ms": {
+                tool: round(delay * 1000, 1) for tool, delay in hedge_delays.items() if delay
+            },
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class ResilienceManager:
+    """
+    Per-server resilience layer for external tool calls.
+
+    Owns one CircuitBreaker per server and runs calls through it with the
+    called tool's adaptive timeout, hedging idempotent calls when enabled.
+    """
+
+    def __init__(self, config: Optional[ResilienceConfig] = None):
+        self.config = config or ResilienceConfig()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, server_id: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a server."""
+        breaker = self._breakers.get(server_id)
+        if breaker is None:
+            breaker = self._breakers[server_id] = CircuitBreaker(server_id, self.config)
+        return breaker
+
+    def forget(self, server_id: str) -> None:
+        """Drop a server's breaker state."""
+        self._breakers.pop(server_id, None)
+
+    async def handle_event(self, event: str, payload: Dict[str, Any]) -> None:
+        """ServerRegistry listener: drop state for removed servers."""
+        if event == "server.removed":
+            self.forget(payload["server_id"])
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state per server."""
+        return {server_id: b.to_dict() for server_id, b in self._breakers.items()}
+
+    async def call(
+        self,
+        server_id: str,
+        call: Callable[[], Awaitable[Any]],
+        idempotent: bool = False,
+        tool: Optional[str] = None,
+    ) -> Any:
+        """
+        Run a call to a server through its breaker.
+
+        Args:
+            server_id: Server UUID
+            call: Zero-argument coroutine function performing the request; called
+                a second time when the request is hedged
+            idempotent: Whether the request is safe to send twice
+            tool: Tool name; timeouts and hedge delays use its latency samples
+
+        Raises:
+            CircuitOpenError: If the server's circuit is open
+            CallTimeoutError: If the call exceeds the adaptive timeout
+        """
+        breaker = self.breaker(server_id)
+        probe = breaker.before_call()
+        timeout = breaker.timeout(tool)
+
+        hedge_delay = None
+        if idempotent and self.config.hedge_enabled and not probe:
+            hedge_delay = breaker.hedge_delay(tool)
+            if hedge_delay is not None and hedge_delay >= timeout:
+                hedge_delay = None
+
+        started = time.monotonic()
+        try:
+            if hedge_delay is None:
+                result = await asyncio.wait_for(call(), timeout)
+            else:
+                result = await asyncio.wait_for(self._hedged(call, hedge_delay, breaker), timeout)
+        except asyncio.TimeoutError:
+            breaker.record(time.monotonic() - started, ok=False, probe=probe, tool=tool)
+            raise CallTimeoutError(timeout)
+        except PoolBusyError:
+            # Local backpressure, not a server failure
+            breaker.abandon(probe)
+            raise
+        except asyncio.CancelledError:
+            breaker.abandon(probe)
+            raise
+        except Exception:
+            breaker.record(time.monotonic() - started, ok=False, probe=probe, tool=tool)
+            raise
+
+        breaker.record(time.monotonic() - started, ok=True, probe=probe, tool=tool)
+        return result
+
+    async def _hedged(
+        self, call: Callable[[], Awaitable[Any]], delay: float, breaker: CircuitBreaker
+    ) -> Any:
+        """Send a backup request if the first is still running after ``delay``."""
+        primary = asyncio.ensure_future(call())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            breaker.hedges += 1
+            backup = asyncio.ensure_future(call())
+            tasks.append(backup)
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            breaker.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
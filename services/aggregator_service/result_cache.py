@@ -0,0 +1,247 @@
+"""
+Result Cache - Opt-in caching of read-only external tool results.
+
+Enabled per server via ``connection_config["result_cache"]``:
+
+    {"enabled": true, "ttl": 60, "scope": "user", "tools": {"search": 300}}
+
+Only tools annotated ``readOnlyHint`` (or listed under ``tools``) are cached.
+TTL resolution: per-tool override, then the tool's ``cacheTtl`` annotation,
+then the server default. With ``scope: "user"`` (the default) results are
+keyed per user and calls without a user are not cached; ``"shared"`` lets all
+callers share entries.
+
+Lookups go to an in-process LRU, then Redis (core.cache), then the server.
+Identical calls already in flight wait for the first one instead of being
+sent again, and payloads larger than ``max_entry_bytes`` are never stored.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachePolicy:
+    """Per-server result cache settings."""
+
+    enabled: bool = False
+    ttl: float = 60.0
+    scope: str = "user"  # "user" or "shared"
+    tools: Dict[str, float] = field(default_factory=dict)  # original tool name -> TTL
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["CachePolicy"]:
+        """Build from ``connection_config["result_cache"]``; None when absent."""
+        if not data:
+            return None
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def ttl_for(
+        self, tool_name: str, read_only: bool, annotated_ttl: Optional[float] = None
+    ) -> Optional[float]:
+        """TTL for a tool, or None if its results must not be cached."""
+        if not self.enabled:
+            return None
+        if tool_name in self.tools:
+            ttl = self.tools[tool_name]
+        elif read_only:
+            ttl = annotated_ttl if annotated_ttl is not None else self.ttl
+        else:
+            return None
+        return ttl if ttl and ttl > 0 else None
+
+
+@dataclass
+class _Entry:
+    value: Dict[str, Any]
+    size: int
+    expires_at: float
+
+
+class ResultCache:
+    """
+    Two-level (LRU + Redis) cache for external tool results with
+    single-flight coalescing of identical in-flight calls.
+    """
+
+    NAMESPACE = "tool_result"
+
+    def __init__(
+        self,
+        redis_cache=None,
+        max_entries: int = 2048,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 256 * 1024,
+    ):
+        """
+        Initialize ResultCache.
+
+        Args:
+            redis_cache: Optional core.cache RedisCache for the shared level
+            max_entries: LRU entry limit
+            max_bytes: LRU total payload limit
+            max_entry_bytes: Largest payload that is cached
+        """
+        self._redis = redis_cache
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.too_large = 0
+
+    @staticmethod
+    def make_key(
+        server_id: str, tool_name: str, arguments: Dict[str, Any], scope: str = "*"
+    ) -> str:
+        """Cache key from server, tool, canonical JSON arguments and user scope."""
+        canonical = json.dumps(
+            arguments or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        digest = hashlib.sha256(f"{scope}\x00{canonical}".encode()).hexdigest()[:32]
+        return f"{server_id}:{tool_name}:{digest}"
+
+    async def get_or_call(
+        self,
+        key: str,
+        ttl: float,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return a cached result or run ``call`` (once per key at a time).
+
+        Results with ``isError`` set are returned but not cached.
+
+        Returns:
+            Tuple of (result, served_from_cache)
+        """
+        entry = self._get_local(key)
+        if entry is not None:
+            self.hits += 1
+            self.bytes_saved += entry.size
+            return entry.value, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                result, size = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The first caller was cancelled; make the call ourselves
+                return await self.get_or_call(key, ttl, call)
+            self.coalesced += 1
+            self.bytes_saved += size
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, size, cached = await self._load(key, ttl, call)
+            future.set_result((result, size))
+            return result, cached
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # followers re-raise it; don't warn if there are none
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(
+        self, key: str, ttl: float, call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], int, bool]:
+        if self._redis is not None:
+            stored = await self._redis.get(self.NAMESPACE, key)
+            if stored is not None:
+                size = len(json.dumps(stored, default=str))
+                self._put_local(key, stored, size, ttl)
+                self.redis_hits += 1
+                self.bytes_saved += size
+                return stored, size, True
+
+        self.misses += 1
+        result = await call()
+        if result.get("isError"):
+            return result, 0, False
+
+        size = len(json.dumps(result, default=str))
+        if size > self._max_entry_bytes:
+            self.too_large += 1
+            return result, size, False
+
+        self._put_local(key, result, size, ttl)
+        if self._redis is not None:
+            await self._redis.set(self.NAMESPACE, key, result, ttl=max(1, int(ttl)))
+        return result, size, False
+
+    def _get_local(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put_local(self, key: str, value: Dict[str, Any], size: int, ttl: float) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = _Entry(value=value, size=size, expires_at=time.monotonic() + ttl)
+        self._bytes += size
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry.size
+
+    async def invalidate_server(self, server_id: str) -> None:
+        """Drop every cached result for a server."""
+        for key in [k for k in self._entries if k.startswith(f"{server_id}:")]:
+            self._drop(key)
+        if self._redis is not None:
+            await self._redis.invalidate_pattern(f"{self.NAMESPACE}:{server_id}:")
+
+    async def handle_event(self, event: str, payload: Dict[str, Any]) -> None:
+        """ServerRegistry listener: drop results for removed servers."""
+        if event == "server.removed":
+            await self.invalidate_server(payload["server_id"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, bytes saved and LRU usage."""
+        served = self.hits + self.redis_hits + self.coalesced
+        lookups = served + self.misses
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "too_large": self.too_large,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
@@ -0,0 +1,189 @@
+"""
+Routing Table - In-memory routing state for external tool requests.
+
+Maps server names/IDs to their current status and namespaced tool names to
+(server_id, server_name, original_name). Kept current by ServerRegistry events and tool
+discovery, so routing a request is a dictionary lookup instead of a query.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import logging
+
+from .domain import ServerStatus
+from .result_cache import CachePolicy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServerRoute:
+    """Routing entry for an external server."""
+
+    server_id: str
+    server_name: str
+    status: ServerStatus
+    cache_policy: Optional[CachePolicy] = None
+
+
+@dataclass
+class ToolRoute:
+    """Routing entry for a tool exposed by an external server."""
+
+    server_id: str
+    original_name: str
+    server_name: str = ""
+    idempotent: bool = False  # safe to hedge (MCP readOnlyHint / idempotentHint)
+    read_only: bool = False  # safe to cache (MCP readOnlyHint)
+    cache_ttl: Optional[float] = None  # seconds, from a "cacheTtl" annotation
+
+
+class RoutingTable:
+    """
+    In-memory routing table.
+
+    Server entries carry the live status, so a status change is one update
+    regardless of how many tools the server exposes. Tool entries only hold
+    the owning server and the original tool name.
+    """
+
+    def __init__(self):
+        self._servers: Dict[str, ServerRoute] = {}
+        self._server_ids_by_name: Dict[str, str] = {}
+        self._tools: Dict[str, ToolRoute] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # =========================================================================
+    # Lookups
+    # =========================================================================
+
+    def get_server(self, server_id: str) -> Optional[ServerRoute]:
+        """Get a server entry by ID."""
+        route = self._servers.get(server_id)
+        self._count(route)
+        return route
+
+    def get_server_by_name(self, server_name: str) -> Optional[ServerRoute]:
+        """Get a server entry by registered name."""
+        server_id = self._server_ids_by_name.get(server_name)
+        route = self._servers.get(server_id) if server_id else None
+        self._count(route)
+        return route
+
+    def get_tool(self, tool_name: str) -> Optional[ToolRoute]:
+        """Get a tool entry by (namespaced) name."""
+        route = self._tools.get(tool_name)
+        self._count(route)
+        return route
+
+    def _count(self, route) -> None:
+        if route is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def upsert_server(self, server: Dict[str, Any]) -> ServerRoute:
+        """Add or refresh a server entry from a registry record."""
+        previous = self._servers.get(server["id"])
+        if previous and previous.server_name != server["name"]:
+            self._server_ids_by_name.pop(previous.server_name, None)
+
+        route = ServerRoute(
+            server_id=server["id"],
+            server_name=server["name"],
+            status=server["status"],
+            cache_policy=CachePolicy.from_dict(
+                (server.get("connection_config") or {}).get("result_cache")
+            ),
+        )
+        self._servers[route.server_id] = route
+        self._server_ids_by_name[route.server_name] = route.server_id
+        return route
+
+    def set_status(self, server_id: str, status: ServerStatus) -> None:
+        """Update a server's status."""
+        route = self._servers.get(server_id)
+        if route:
+            route.status = status
+
+    def remove_server(self, server_id: str) -> None:
+        """Drop a server and every tool it exposes."""
+        route = self._servers.pop(server_id, None)
+        if route and self._server_ids_by_name.get(route.server_name) == server_id:
+            del self._server_ids_by_name[route.server_name]
+        self._remove_tools(server_id)
+
+    def add_tool(
+        self,
+        tool_name: str,
+        server_id: str,
+        original_name: str,
+        annotations: Optional[Dict[str, Any]] = None,
+        server_name: Optional[str] = None,
+    ) -> None:
+        """Add a single tool entry, with hints from its MCP annotations."""
+        annotations = annotations or {}
+        if server_name is None:
+            server = self._servers.get(server_id)
+            server_name = server.server_name if server else ""
+        read_only = bool(annotations.get("readOnlyHint"))
+        cache_ttl = annotations.get("cacheTtl")
+        self._tools[tool_name] = ToolRoute(
+            server_id=server_id,
+            original_name=original_name,
+            server_name=server_name,
+            idempotent=read_only or bool(annotations.get("idempotentHint")),
+            read_only=read_only,
+            cache_ttl=float(cache_ttl) if isinstance(cache_ttl, (int, float)) else None,
+        )
+
+    def set_server_tools(self, server_id: str, tools: List[Dict[str, Any]]) -> None:
+        """Replace a server's tool entries with the result of a discovery."""
+        self._remove_tools(server_id)
+        for tool in tools:
+            self.add_tool(
+                tool["name"],
+                server_id,
+                tool.get("original_name", tool["name"]),
+                annotations=tool.get("annotations"),
+                server_name=tool.get("source_server_name"),
+            )
+
+    def _remove_tools(self, server_id: str) -> None:
+        stale = [name for name, route in self._tools.items() if route.server_id == server_id]
+        for name in stale:
+            del self._tools[name]
+
+    async def handle_event(self, event: str, payload: Dict[str, Any]) -> None:
+        """ServerRegistry listener: apply registration, status and removal events."""
+        if event == "server.registered":
+            self.upsert_server(payload)
+        elif event == "server.status_changed":
+            # Unknown servers are loaded from the registry on their first route,
+            # since the event carries no name or connection config
+            status = payload["status"]
+            if not isinstance(status, ServerStatus):
+                status = ServerStatus(status)
+            self.set_status(payload["server_id"], status)
+        elif event == "server.removed":
+            self.remove_server(payload["server_id"])
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._servers.clear()
+        self._server_ids_by_name.clear()
+        self._tools.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Table size and hit/miss counters."""
+        return {
+            "servers": len(self._servers),
+            "tools": len(self._tools),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
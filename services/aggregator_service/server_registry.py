@@ -6,7 +6,7 @@ Manages server records in PostgreSQL with full CRUD operations.
 
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import logging
 
 from .domain import ServerTransportType, ServerStatus
@@ -31,9 +31,30 @@ class ServerRegistry:
         """
         self._db_pool = db_pool
         self._event_emitter = event_emitter
+        self._listeners: List[Callable[[str, Dict[str, Any]], Awaitable[None]]] = []
         # In-memory cache for fast lookups (used when db_pool is None)
         self._servers: Dict[str, Dict[str, Any]] = {}
 
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], Awaitable[None]]) -> None:
+        """
+        Register an in-process listener for registry events.
+
+        Listeners receive the same (event, payload) pairs as the event emitter:
+        server.registered, server.status_changed and server.removed.
+        """
+        self._listeners.append(listener)
+
+    async def _emit(self, event: str, payload: Dict[str, Any]) -> None:
+        """Send an event to the event emitter and all listeners."""
+        if self._event_emitter:
+            await self._event_emitter.emit(event, payload)
+
+        for listener in self._listeners:
+            try:
+                await listener(event, payload)
+            except Exception as e:
+                logger.warning(f"Registry listener failed for {event}: {e}")
+
     async def add(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Add a new server to the registry.
@@ -98,8 +119,7 @@ class ServerRegistry:
         logger.info(f"Registered server: {name} ({server_id})")
 
         # Emit event
-        if self._event_emitter:
-            await self._event_emitter.emit("server.registered", server)
+        await self._emit("server.registered", server)
 
         return server
 
@@ -306,14 +326,17 @@ class ServerRegistry:
             True if removed, False if not found
         """
         if self._db_pool:
-            return await self._remove_server_db(server_id)
-
-        if server_id not in self._servers:
-            return False
+            removed = await self._remove_server_db(server_id)
+        elif server_id in self._servers:
+            del self._servers[server_id]
+            logger.info(f"Removed server: {server_id}")
+            removed = True
+        else:
+            removed = False
 
-        del self._servers[server_id]
-        logger.info(f"Removed server: {server_id}")
-        return True
+        if removed:
+            await self._emit("server.removed", {"server_id": server_id})
+        return removed
 
     async def _remove_server_db(self, server_id: str) -> bool:
         """Remove server from database."""
@@ -401,8 +424,8 @@ class ServerRegistry:
 
         result = await self.update(server_id, **updates)
 
-        if result and self._event_emitter:
-            await self._event_emitter.emit(
+        if result:
+            await self._emit(
                 "server.status_changed",
                 {
                     "server_id": server_id,
@@ -439,6 +462,42 @@ class ServerRegistry:
         result = await self.update(server_id, last_health_check=datetime.now(timezone.utc))
         return result is not None
 
+    async def update_last_health_checks(self, server_ids: List[str]) -> int:
+        """
+        Update last health check timestamp for many servers in one write.
+
+        Args:
+            server_ids: Server UUIDs
+
+        Returns:
+            Number of servers updated
+        """
+        if not server_ids:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        if self._db_pool:
+            async with self._db_pool.acquire() as conn:
+                result = await conn.execute(
+                    """
+                    UPDATE mcp.external_servers
+                    SET last_health_check = $1
+                    WHERE id = ANY($2::uuid[])
+                    """,
+                    now,
+                    list(server_ids),
+                )
+            # asyncpg returns a status string such as "UPDATE 3"
+            return int(result.split()[-1]) if result else 0
+
+        updated = 0
+        for server_id in server_ids:
+            server = self._servers.get(server_id)
+            if server is not None:
+                server["last_health_check"] = now
+                updated += 1
+        return updated
+
     def _row_to_server(self, row) -> Dict[str, Any]:
         """Convert database row to server dict."""
         import json
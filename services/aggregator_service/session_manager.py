@@ -7,6 +7,7 @@ Key Design:
 - Sessions are kept alive by storing context managers and NOT exiting them
 - Supports STDIO, SSE, HTTP, and STREAMABLE_HTTP transports
 - Proper cleanup on disconnect via manual __aexit__ calls
+- Tool calls go through a per-server SessionPool (see session_pool.py)
 """
 
 import asyncio
@@ -14,10 +15,13 @@ import sys
 import traceback
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import logging
 
+from core.tracing import traced
+
 from .domain import ServerTransportType, ServerStatus
+from .session_pool import PoolConfig, SessionPool
 
 logger = logging.getLogger(__name__)
 
@@ -63,9 +67,38 @@ class SessionManager:
         self._server_registry = server_registry
         self._sessions: Dict[str, Any] = {}  # server_id -> ClientSession
         self._connections: Dict[str, ManagedConnection] = {}  # server_id -> ManagedConnection
+        self._pools: Dict[str, SessionPool] = {}  # server_id -> SessionPool
         self._connection_timeout = 30.0  # seconds
         self._retry_attempts = 3
         self._retry_delays = [1.0, 2.0, 4.0]  # exponential backoff
+        self._ping_unsupported: set = set()  # server_ids that reject MCP ping
+        self._notification_listeners: List[Callable[[str, str], Awaitable[None]]] = []
+
+    def add_notification_listener(self, listener: Callable[[str, str], Awaitable[None]]) -> None:
+        """
+        Register a listener for server notifications.
+
+        Listeners receive (server_id, method), e.g. notifications/tools/list_changed.
+        They run inside the session's receive loop, so must not block.
+        """
+        self._notification_listeners.append(listener)
+
+    def _message_handler(self, server_id: str):
+        """Build a ClientSession message handler that forwards notifications."""
+
+        async def handle(message: Any) -> None:
+            if isinstance(message, Exception):
+                return
+            method = getattr(getattr(message, "root", None), "method", None)
+            if not method or not method.startswith("notifications/"):
+                return
+            for listener in self._notification_listeners:
+                try:
+                    await listener(server_id, method)
+                except Exception as e:
+                    logger.warning(f"Notification listener failed for {method}: {e}")
+
+        return handle
 
     @staticmethod
     async def _cancel_task(task: asyncio.Task, description: str = "task") -> None:
@@ -102,6 +135,10 @@ class SessionManager:
 
         logger.info(f"Connecting to server {server_id} via {transport_type}")
 
+        # Close an existing connection and its pool so reconnecting doesn't leak sessions
+        if server_id in self._connections or server_id in self._pools:
+            await self._cleanup_connection(server_id)
+
         # Update status to CONNECTING
         if self._server_registry:
             await self._server_registry.update_status(server_id, ServerStatus.CONNECTING)
@@ -111,11 +148,25 @@ class SessionManager:
         for attempt in range(self._retry_attempts):
             try:
                 # Create transport and session
-                session = await self._create_session(server_id, transport_type, connection_config)
+                conn = await self._create_session(server_id, transport_type, connection_config)
+                session = conn.session
 
                 # Store session for quick access
+                self._connections[server_id] = conn
                 self._sessions[server_id] = session
 
+                # Pool additional sessions for concurrent tool calls
+                pool = SessionPool(
+                    server_id,
+                    factory=lambda: self._create_session(
+                        server_id, transport_type, connection_config
+                    ),
+                    closer=self._close_connection,
+                    config=PoolConfig.from_dict(connection_config.get("pool")),
+                )
+                self._pools[server_id] = pool
+                await pool.start(conn)
+
                 # Update status to CONNECTED
                 if self._server_registry:
                     await self._server_registry.update_status(server_id, ServerStatus.CONNECTED)
@@ -123,6 +174,11 @@ class SessionManager:
                 logger.info(f"Connected to server {server_id}")
                 return session
 
+            except asyncio.CancelledError:
+                # Connect timed out or was abandoned - don't leave a half-open session
+                await self._cleanup_connection(server_id)
+                raise
+
             except Exception as e:
                 last_error = e
                 logger.warning(f"Connection attempt {attempt + 1} failed for {server_id}: {e}")
@@ -146,7 +202,7 @@ class SessionManager:
 
     async def _create_session(
         self, server_id: str, transport_type: ServerTransportType, connection_config: Dict[str, Any]
-    ) -> Any:
+    ) -> ManagedConnection:
         """
         Create transport and session based on transport type.
 
@@ -191,7 +247,7 @@ class SessionManager:
 
     async def _create_stdio_session(
         self, server_id: str, connection_config: Dict[str, Any], stdio_client, ClientSession
-    ) -> Any:
+    ) -> ManagedConnection:
         """
         Create STDIO transport session with proper lifecycle management.
 
@@ -233,7 +289,9 @@ class SessionManager:
             try:
                 async with stdio_client(server_params) as (read_stream, write_stream):
                     # Create and initialize session within the context
-                    session = ClientSession(read_stream, write_stream)
+                    session = ClientSession(
+                        read_stream, write_stream, message_handler=self._message_handler(server_id)
+                    )
 
                     async with session:
                         # Initialize the MCP protocol
@@ -286,6 +344,9 @@ class SessionManager:
         except asyncio.TimeoutError:
             await self._cancel_task(background_task, f"STDIO session for {server_id}")
             raise TimeoutError(f"STDIO session creation timed out for {server_id}")
+        except asyncio.CancelledError:
+            await self._cancel_task(background_task, f"STDIO session for {server_id}")
+            raise
 
         # Check for errors
         if error_holder:
@@ -297,19 +358,15 @@ class SessionManager:
             await self._cancel_task(background_task, f"STDIO session for {server_id}")
             raise RuntimeError("STDIO session creation failed: no session returned")
 
-        session = session_holder[0]
         conn = connection_holder[0]
         conn.background_task = background_task
 
-        # Store the managed connection
-        self._connections[server_id] = conn
-
         logger.info(f"STDIO session created for {server_id} (background task running)")
-        return session
+        return conn
 
     async def _create_sse_session(
         self, server_id: str, connection_config: Dict[str, Any], sse_client, ClientSession
-    ) -> Any:
+    ) -> ManagedConnection:
         """Create SSE transport session with proper lifecycle management."""
         url = connection_config["url"]
         headers = connection_config.get("headers", {})
@@ -323,7 +380,9 @@ class SessionManager:
 
         try:
             # Create and initialize session
-            session = ClientSession(read_stream, write_stream)
+            session = ClientSession(
+                read_stream, write_stream, message_handler=self._message_handler(server_id)
+            )
             session_cm = session
 
             await session_cm.__aenter__()
@@ -335,7 +394,7 @@ class SessionManager:
                 await session_cm.__aexit__(*sys.exc_info())
                 raise
 
-            self._connections[server_id] = ManagedConnection(
+            conn = ManagedConnection(
                 server_id=server_id,
                 transport_type=ServerTransportType.SSE,
                 context_manager=transport_cm,
@@ -347,7 +406,7 @@ class SessionManager:
             )
 
             logger.info(f"SSE session created for {server_id}")
-            return session
+            return conn
 
         except Exception as e:
             await transport_cm.__aexit__(type(e), e, e.__traceback__)
@@ -359,7 +418,7 @@ class SessionManager:
         connection_config: Dict[str, Any],
         streamablehttp_client,
         ClientSession,
-    ) -> Any:
+    ) -> ManagedConnection:
         """Create Streamable HTTP transport session with proper lifecycle management."""
         # Support both 'url' and 'base_url' for flexibility
         url = connection_config.get("url") or connection_config.get("base_url")
@@ -381,7 +440,9 @@ class SessionManager:
 
         try:
             # Create and initialize session
-            session = ClientSession(read_stream, write_stream)
+            session = ClientSession(
+                read_stream, write_stream, message_handler=self._message_handler(server_id)
+            )
             session_cm = session
 
             await session_cm.__aenter__()
@@ -393,7 +454,7 @@ class SessionManager:
                 await session_cm.__aexit__(*sys.exc_info())
                 raise
 
-            self._connections[server_id] = ManagedConnection(
+            conn = ManagedConnection(
                 server_id=server_id,
                 transport_type=ServerTransportType.STREAMABLE_HTTP,
                 context_manager=transport_cm,
@@ -409,13 +470,13 @@ class SessionManager:
             logger.info(
                 f"Streamable HTTP session created for {server_id} (session_id: {session_id})"
             )
-            return session
+            return conn
 
         except Exception as e:
             await transport_cm.__aexit__(type(e), e, e.__traceback__)
             raise
 
-    def _create_mock_session(self, server_id: str) -> Any:
+    def _create_mock_session(self, server_id: str) -> ManagedConnection:
         """Create a mock session for testing when MCP SDK is unavailable."""
 
         class MockCompatibleSession:
@@ -460,8 +521,8 @@ class SessionManager:
 
         session = MockCompatibleSession(server_id)
 
-        # Store as managed connection (without real transport)
-        self._connections[server_id] = ManagedConnection(
+        # Managed connection without real transport
+        conn = ManagedConnection(
             server_id=server_id,
             transport_type=ServerTransportType.HTTP,  # placeholder
             context_manager=None,
@@ -473,15 +534,24 @@ class SessionManager:
         )
 
         logger.debug(f"Mock session created for {server_id}")
-        return session
+        return conn
 
     async def _cleanup_connection(self, server_id: str) -> None:
         """Clean up a connection's resources."""
         conn = self._connections.pop(server_id, None)
         self._sessions.pop(server_id, None)
+        self._ping_unsupported.discard(server_id)
 
-        if not conn:
-            return
+        pool = self._pools.pop(server_id, None)
+        if pool:
+            await pool.close()
+
+        if conn:
+            await self._close_connection(conn)
+
+    async def _close_connection(self, conn: ManagedConnection) -> None:
+        """Close one connection's session and transport."""
+        server_id = conn.server_id
 
         # For STDIO connections, cancel the background task (this closes contexts)
         if conn.background_task:
@@ -618,6 +688,7 @@ class SessionManager:
 
         return all_tools
 
+    @traced("aggregator.call_tool")
     async def call_tool(
         self, server_id: str, tool_name: str, arguments: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -633,12 +704,23 @@ class SessionManager:
             Tool execution result
 
         Raises:
+            PoolBusyError: If the server's call queue is full
             RuntimeError: If session not found or call fails
         """
-        session = self._sessions.get(server_id)
-        if not session:
-            raise RuntimeError(f"No active session for server: {server_id}")
+        pool = self._pools.get(server_id)
+        if pool is None:
+            session = self._sessions.get(server_id)
+            if not session:
+                raise RuntimeError(f"No active session for server: {server_id}")
+            return await self._call_session(session, server_id, tool_name, arguments)
 
+        async with pool.acquire() as session:
+            return await self._call_session(session, server_id, tool_name, arguments)
+
+    async def _call_session(
+        self, session: Any, server_id: str, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Call a tool on one session and normalize the result."""
         try:
             result = await session.call_tool(tool_name, arguments)
 
@@ -669,6 +751,9 @@ class SessionManager:
         """
         Check health of a server by pinging the session.
 
+        Uses the lightweight MCP ``ping`` request; servers that do not
+        implement it fall back to ``list_tools``.
+
         Args:
             server_id: Server UUID
 
@@ -679,14 +764,30 @@ class SessionManager:
         if not session:
             return False
 
+        if server_id not in self._ping_unsupported and hasattr(session, "send_ping"):
+            try:
+                await session.send_ping()
+                return True
+            except Exception as e:
+                if not self._is_method_not_found(e):
+                    logger.warning(f"Health check failed for {server_id}: {e}")
+                    return False
+                logger.debug(f"Server {server_id} does not support ping, using list_tools")
+                self._ping_unsupported.add(server_id)
+
         try:
-            # Try to list tools as a health check
             await session.list_tools()
             return True
         except Exception as e:
             logger.warning(f"Health check failed for {server_id}: {e}")
             return False
 
+    @staticmethod
+    def _is_method_not_found(error: Exception) -> bool:
+        """Detect a JSON-RPC 'method not found' (-32601) response."""
+        code = getattr(getattr(error, "error", None), "code", None)
+        return code == -32601 or "method not found" in str(error).lower()
+
     def is_connected(self, server_id: str) -> bool:
         """
         Check if server is currently connected.
@@ -730,9 +831,11 @@ class SessionManager:
         if not conn:
             return None
 
+        pool = self._pools.get(server_id)
         return {
             "server_id": conn.server_id,
             "transport_type": conn.transport_type.value,
             "connected_at": conn.connected_at.isoformat(),
             "session_id": conn.get_session_id() if conn.get_session_id else None,
+            "pool": pool.stats() if pool else None,
         }
@@ -0,0 +1,234 @@
+"""
+Session Pool - Multiple MCP sessions per external server.
+
+A single ClientSession serializes every call to a STDIO server through one
+subprocess. The pool keeps ``min_size`` sessions open, opens more (up to
+``max_size``) while calls are queuing, and closes idle extras again. Calls go
+to the session with the fewest outstanding requests (or the better of two
+random picks), under a per-server concurrency limit with a bounded wait queue.
+
+Configured per server via ``connection_config["pool"]``:
+
+    {"min_size": 1, "max_size": 4, "max_concurrency": 32,
+     "max_queue_depth": 128, "strategy": "least_outstanding"}
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, fields
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+
+from .domain import SessionSelection
+
+logger = logging.getLogger(__name__)
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when a server's wait queue is full."""
+
+
+@dataclass
+class PoolConfig:
+    """Sizing and admission settings for a session pool."""
+
+    min_size: int = 1
+    max_size: int = 1
+    max_concurrency: int = 32  # calls in flight per server
+    max_queue_depth: int = 128  # calls waiting for a slot before rejecting
+    scale_up_at: int = 2  # outstanding calls on the best session that trigger growth
+    idle_timeout: float = 300.0  # seconds before an idle extra session is closed
+    max_failures: int = 3  # consecutive failures before an extra session is dropped
+    strategy: SessionSelection = SessionSelection.LEAST_OUTSTANDING
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "PoolConfig":
+        """Build from ``connection_config["pool"]``, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        config = cls(**{k: v for k, v in (data or {}).items() if k in known})
+        config.strategy = SessionSelection(config.strategy)
+        config.min_size = max(1, config.min_size)
+        config.max_size = max(config.min_size, config.max_size)
+        return config
+
+
+@dataclass
+class PooledSession:
+    """A pool member and its load counters."""
+
+    connection: Any  # ManagedConnection
+    in_flight: int = 0
+    total_calls: int = 0
+    consecutive_failures: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def session(self) -> Any:
+        return self.connection.session
+
+
+class SessionPool:
+    """
+    Load-balanced pool of sessions to one external server.
+
+    The first member is the server's primary connection, owned by
+    SessionManager; the pool only opens and closes the extra members.
+    """
+
+    def __init__(
+        self,
+        server_id: str,
+        factory: Callable[[], Awaitable[Any]],
+        closer: Callable[[Any], Awaitable[None]],
+        config: Optional[PoolConfig] = None,
+    ):
+        """
+        Initialize SessionPool.
+
+        Args:
+            server_id: Server UUID
+            factory: Coroutine function that opens a new ManagedConnection
+            closer: Coroutine function that closes a ManagedConnection
+            config: Pool settings
+        """
+        self.server_id = server_id
+        self._factory = factory
+        self._closer = closer
+        self.config = config or PoolConfig()
+        self._members: List[PooledSession] = []
+        self._slots = asyncio.Semaphore(self.config.max_concurrency)
+        self._waiting = 0
+        self._growing: Optional[asyncio.Task] = None
+        self._closed = False
+        self.rejected = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._members)
+
+    async def start(self, primary: Any) -> None:
+        """Add the primary connection and open sessions up to ``min_size``."""
+        self._members.append(PooledSession(primary))
+        extra = self.config.min_size - 1
+        if extra > 0:
+            await asyncio.gather(*(self._grow() for _ in range(extra)))
+
+    async def close(self) -> None:
+        """Close all extra sessions (the primary is closed by SessionManager)."""
+        self._closed = True
+        if self._growing and not self._growing.done():
+            self._growing.cancel()
+        extras, self._members = self._members[1:], self._members[:1]
+        for member in extras:
+            await self._close_member(member)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Reserve a session for one call.
+
+        Raises:
+            PoolBusyError: If the server's wait queue is full
+        """
+        if self._slots.locked() and self._waiting >= self.config.max_queue_depth:
+            self.rejected += 1
+            raise PoolBusyError(
+                f"Server {self.server_id} is saturated "
+                f"({self.config.max_concurrency} in flight, {self._waiting} queued)"
+            )
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        member = self._select()
+        member.in_flight += 1
+        member.total_calls += 1
+        self._maybe_grow(member)
+        try:
+            yield member.session
+        except Exception:
+            member.consecutive_failures += 1
+            if member.consecutive_failures >= self.config.max_failures:
+                self._evict(member)
+            raise
+        else:
+            member.consecutive_failures = 0
+        finally:
+            member.in_flight -= 1
+            member.last_used = time.monotonic()
+            self._slots.release()
+            self._reap_idle()
+
+    def _select(self) -> PooledSession:
+        members = self._members
+        if len(members) == 1:
+            return members[0]
+        if self.config.strategy == SessionSelection.POWER_OF_TWO:
+            a, b = random.sample(members, 2)
+            return a if a.in_flight <= b.in_flight else b
+        return min(members, key=lambda m: (m.in_flight, m.total_calls))
+
+    def _maybe_grow(self, chosen: PooledSession) -> None:
+        if (
+            chosen.in_flight >= self.config.scale_up_at
+            and self.size < self.config.max_size
+            and not self._closed
+            and (self._growing is None or self._growing.done())
+        ):
+            self._growing = asyncio.create_task(self._grow())
+
+    async def _grow(self) -> None:
+        try:
+            connection = await self._factory()
+        except Exception as e:
+            logger.warning(f"Failed to open extra session for {self.server_id}: {e}")
+            return
+        if self._closed:
+            await self._closer(connection)
+            return
+        self._members.append(PooledSession(connection))
+        logger.info(f"Session pool for {self.server_id} grew to {self.size}")
+
+    def _evict(self, member: PooledSession) -> None:
+        if member is self._members[0] or member not in self._members:
+            return  # the primary is handled by health monitoring / reconnect
+        self._members.remove(member)
+        logger.warning(f"Dropping failing pooled session for {self.server_id}")
+        asyncio.create_task(self._close_member(member, wait_idle=True))
+
+    def _reap_idle(self) -> None:
+        if self.size <= self.config.min_size:
+            return
+        now = time.monotonic()
+        for member in self._members[self.config.min_size :]:
+            if member.in_flight == 0 and now - member.last_used > self.config.idle_timeout:
+                self._members.remove(member)
+                asyncio.create_task(self._close_member(member))
+                logger.info(f"Session pool for {self.server_id} shrank to {self.size}")
+                return
+
+    async def _close_member(self, member: PooledSession, wait_idle: bool = False) -> None:
+        while wait_idle and member.in_flight:
+            await asyncio.sleep(0.05)
+        try:
+            await self._closer(member.connection)
+        except Exception as e:
+            logger.warning(f"Error closing pooled session for {self.server_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and load."""
+        return {
+            "size": self.size,
+            "min_size": self.config.min_size,
+            "max_size": self.config.max_size,
+            "strategy": self.config.strategy.value,
+            "in_flight": sum(m.in_flight for m in self._members),
+            "queued": self._waiting,
+            "rejected": self.rejected,
+            "calls_per_session": [m.total_calls for m in self._members],
+        }
@@ -4,9 +4,14 @@ Tool Aggregator - Discovery and indexing of tools from external MCP servers.
 Handles tool discovery, namespacing, embedding generation, and skill classification.
 """
 
+import hashlib
+import json
 from typing import Any, Dict, List, Optional
 import logging
 
+from core.clients.embedding_batcher import EmbeddingBatcher, EmbeddingBatchError
+from services.search_service.schema_cache import get_schema_cache
+
 from .domain import ServerStatus
 
 logger = logging.getLogger(__name__)
@@ -51,6 +56,10 @@ class ToolAggregator:
         self._model_client = model_client
         self._classification_batch_size = 10
         self._classification_concurrency = 5
+        self._embedding_batcher: Optional[EmbeddingBatcher] = None
+        self._schema_cache = get_schema_cache()
+        # Per-server summary of the most recent discovery diff
+        self.last_diff: Dict[str, Dict[str, int]] = {}
 
     async def discover_tools(self, server_id: str) -> List[Dict[str, Any]]:
         """
@@ -85,116 +94,180 @@ class ToolAggregator:
 
         logger.info(f"Found {len(external_tools)} tools from {server['name']}")
 
-        # Process each tool
-        aggregated_tools = []
-        for ext_tool in external_tools:
-            try:
-                # Convert Tool Pydantic model to dict if needed
-                tool_data = (
-                    ext_tool
-                    if isinstance(ext_tool, dict)
-                    else {
-                        "name": ext_tool.name,
-                        "description": ext_tool.description or "",
-                        "inputSchema": (
-                            ext_tool.inputSchema if hasattr(ext_tool, "inputSchema") else {}
-                        ),
-                    }
-                )
-                tool = await self._aggregate_tool(server, tool_data)
-                aggregated_tools.append(tool)
-            except Exception as e:
-                tool_name = (
-                    ext_tool.get("name")
-                    if isinstance(ext_tool, dict)
-                    else getattr(ext_tool, "name", "unknown")
-                )
-                logger.error(f"Failed to aggregate tool {tool_name}: {e}")
-                continue
+        aggregated_tools = await self._index_tools(server, external_tools)
 
         # Update server tool count
         if self._server_registry:
             await self._server_registry.update_tool_count(server_id, len(aggregated_tools))
 
-        # Batch classify all discovered tools (same pattern as sync_service)
-        if aggregated_tools and self._skill_classifier:
-            await self._batch_classify_tools(aggregated_tools)
+        # Batch classify new/changed tools and any that are still unclassified
+        to_classify = [t for t in aggregated_tools if not t["is_classified"]]
+        if to_classify and self._skill_classifier:
+            await self._batch_classify_tools(to_classify)
 
         logger.info(f"Aggregated {len(aggregated_tools)} tools from {server['name']}")
         return aggregated_tools
 
-    async def _aggregate_tool(
-        self, server: Dict[str, Any], tool_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    async def _index_tools(
+        self, server: Dict[str, Any], external_tools: List[Any]
+    ) -> List[Dict[str, Any]]:
         """
-        Process a single tool from external server.
+        Store and index a server's tools in bulk.
 
-        Applies namespacing, stores in DB, generates embedding, and queues classification.
+        Flow: fingerprint -> diff by name and hash -> delete removed -> batch
+        embed changed -> multi-row upsert -> bulk Qdrant upsert. Tools whose
+        embedding or vector write fails are still stored (so they stay
+        routable) but keep no fingerprint, so the next discovery retries them.
+        Each returned tool carries ``changed`` so callers can skip unchanged ones.
         """
-        original_name = tool_data["name"]
-        namespaced_name = self.namespace_tool(original_name, server["name"])
-
-        description = tool_data.get("description", "")
-        input_schema = tool_data.get("inputSchema", {})
-
-        # Propagate org_id from server to tool (org-scoped servers → org-scoped tools)
         server_org_id = server.get("org_id")
         is_global = server.get("is_global", True)
 
-        # Store in PostgreSQL (if repo available)
-        tool_id = None
+        tools: List[Dict[str, Any]] = []
+        seen = set()
+        for ext_tool in external_tools:
+            # Convert Tool Pydantic model to dict if needed
+            tool_data = (
+                ext_tool
+                if isinstance(ext_tool, dict)
+                else {
+                    "name": ext_tool.name,
+                    "description": ext_tool.description or "",
+                    "inputSchema": (
+                        ext_tool.inputSchema if hasattr(ext_tool, "inputSchema") else {}
+                    ),
+                    "annotations": (
+                        ext_tool.annotations.model_dump(exclude_none=True)
+                        if getattr(ext_tool, "annotations", None)
+                        else None
+                    ),
+                }
+            )
+            original_name = tool_data.get("name")
+            if not original_name or original_name in seen:
+                logger.warning(f"Skipping unnamed or duplicate tool from {server['name']}")
+                continue
+            seen.add(original_name)
+
+            tool = {
+                "id": None,
+                "name": self.namespace_tool(original_name, server["name"]),
+                "original_name": original_name,
+                "description": tool_data.get("description") or "",
+                "input_schema": tool_data.get("inputSchema") or {},
+                "annotations": tool_data.get("annotations"),
+                "source_server_id": server["id"],
+                "source_server_name": server["name"],
+                "is_external": True,
+                "is_classified": False,
+                "org_id": server_org_id,
+                "is_global": is_global,
+            }
+            tool["content_hash"] = self._content_hash(tool)
+            tools.append(tool)
+
+        # Diff against the last discovery: skip unchanged tools, drop removed ones
+        existing: Dict[str, Dict[str, Any]] = {}
         if self._tool_repo:
-            tool_id = await self._tool_repo.create_external_tool(
-                name=namespaced_name,
-                description=description,
-                input_schema=input_schema,
-                source_server_id=server["id"],
-                original_name=original_name,
-                org_id=server_org_id,
-                is_global=is_global,
+            existing = await self._tool_repo.get_external_tool_fingerprints(server["id"])
+
+        changed = []
+        for tool in tools:
+            previous = existing.get(tool["name"])
+            tool["changed"] = not (
+                previous and previous.get("content_hash") == tool["content_hash"]
             )
+            if tool["changed"]:
+                changed.append(tool)
+            else:
+                tool["id"] = previous["id"]
+                tool["is_classified"] = bool(previous.get("is_classified"))
+
+        listed = {tool["name"] for tool in tools}
+        removed = [fp["id"] for name, fp in existing.items() if name not in listed]
+        if removed:
+            await self._delete_tools(removed)
+
+        added = sum(1 for tool in changed if tool["name"] not in existing)
+        self.last_diff[server["id"]] = {
+            "added": added,
+            "updated": len(changed) - added,
+            "unchanged": len(tools) - len(changed),
+            "removed": len(removed),
+        }
+        logger.info(
+            f"{len(changed)} new or changed tools from {server['name']} "
+            f"({len(tools) - len(changed)} unchanged, {len(removed)} removed)"
+        )
+        if not changed:
+            return tools
+
+        embeddings = await self._embed_texts(
+            [f"{tool['name']}: {tool['description']}" for tool in changed]
+        )
+        for tool, embedding in zip(changed, embeddings):
+            if embedding is None:
+                # Store without a fingerprint so the next discovery retries it
+                tool["content_hash"] = None
+
+        # Store in PostgreSQL (if repo available)
+        if self._tool_repo:
+            ids = await self._tool_repo.upsert_external_tools(changed)
         else:
             # No storage - use hash as pseudo-ID for in-memory operation
-            tool_id = hash(namespaced_name) % 1_000_000
+            ids = {tool["name"]: hash(tool["name"]) % 1_000_000 for tool in changed}
 
-        # Generate embedding
-        embedding_text = f"{namespaced_name}: {description}"
-        embedding = await self._generate_embedding(embedding_text)
+        for tool in changed:
+            tool["id"] = ids.get(tool["name"])
+            if tool["id"] is None:
+                logger.error(f"Failed to store tool {tool['name']}")
+        # Search re-reads changed schemas from PostgreSQL on next use
+        self._schema_cache.invalidate([tool["id"] for tool in changed if tool["id"] is not None])
 
         # Index in Qdrant
         if self._vector_repo:
-            await self._vector_repo.upsert_tool(
-                tool_id=tool_id,
-                name=namespaced_name,
-                description=description,
-                embedding=embedding,
-                metadata={
-                    "source_server_id": str(server["id"]),
-                    "source_server_name": server["name"],
-                    "original_name": original_name,
-                    "is_external": True,
-                    "is_classified": False,
-                    "org_id": server_org_id,
-                    "is_global": is_global,
-                },
-            )
-
-        # Note: Classification is done in batch after all tools are aggregated
-        # See discover_tools() -> _batch_classify_tools()
-
-        return {
-            "id": tool_id,
-            "name": namespaced_name,
-            "original_name": original_name,
-            "description": description,
-            "input_schema": input_schema,
-            "source_server_id": server["id"],
-            "source_server_name": server["name"],
-            "is_external": True,
-            "is_classified": False,
-            "org_id": server_org_id,
-            "is_global": is_global,
-        }
+            points = [
+                {
+                    "tool_id": tool["id"],
+                    "name": tool["name"],
+                    "description": tool["description"],
+                    "embedding": embedding,
+                    "metadata": {
+                        "source_server_id": str(server["id"]),
+                        "source_server_name": server["name"],
+                        "original_name": tool["original_name"],
+                        "is_external": True,
+                        "is_classified": False,
+                        "org_id": server_org_id,
+                        "is_global": is_global,
+                    },
+                }
+                for tool, embedding in zip(changed, embeddings)
+                if tool["id"] is not None and embedding is not None
+            ]
+            indexed = set(await self._vector_repo.upsert_tools(points)) if points else set()
+            failed = [p["tool_id"] for p in points if p["tool_id"] not in indexed]
+            if failed and self._tool_repo:
+                logger.warning(f"Vector indexing failed for {len(failed)} tools")
+                await self._tool_repo.clear_content_hashes(failed)
+
+        return [tool for tool in tools if tool["id"] is not None]
+
+    @staticmethod
+    def _content_hash(tool: Dict[str, Any]) -> str:
+        """Fingerprint of the fields that affect storage and the embedding."""
+        content = json.dumps(
+            [
+                tool["name"],
+                tool["description"],
+                tool["input_schema"],
+                tool["org_id"],
+                tool["is_global"],
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
     def namespace_tool(self, tool_name: str, server_name: str) -> str:
         """
@@ -232,6 +305,27 @@ class ToolAggregator:
         parts = namespaced.split(".", 1)
         return parts[0], parts[1]
 
+    async def _embed_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed texts in token-budgeted batches.
+
+        Returns:
+            Embeddings aligned with ``texts``; None where embedding failed
+        """
+        if not self._model_client or not hasattr(self._model_client, "embeddings"):
+            # Return mock embeddings if no model client
+            return [[0.1] * 1536 for _ in texts]
+
+        if self._embedding_batcher is None:
+            self._embedding_batcher = EmbeddingBatcher(
+                client=self._model_client, model="text-embedding-3-small"
+            )
+        try:
+            return await self._embedding_batcher.embed(texts)
+        except EmbeddingBatchError as e:
+            logger.warning(f"Embedding failed for {len(e.failed_indices)}/{len(texts)} tools: {e}")
+            return e.results
+
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for tool text."""
         if self._model_client:
@@ -423,12 +517,20 @@ class ToolAggregator:
         tool_ids = await self._tool_repo.get_tool_ids_by_server(server_id)
 
         # Remove from Qdrant
-        if self._vector_repo:
-            for tool_id in tool_ids:
-                await self._vector_repo.delete_tool(tool_id)
+        if self._vector_repo and tool_ids:
+            await self._vector_repo.delete_tools(tool_ids)
 
         # Remove from PostgreSQL
         count = await self._tool_repo.delete_tools_by_server(server_id)
+        self._schema_cache.invalidate(tool_ids)
 
+        self.last_diff.pop(server_id, None)
         logger.info(f"Removed {count} tools from server {server_id}")
         return count
+
+    async def _delete_tools(self, tool_ids: List[int]) -> None:
+        """Delete tools a server no longer lists from Qdrant and PostgreSQL."""
+        if self._vector_repo:
+            await self._vector_repo.delete_tools(tool_ids)
+        await self._tool_repo.delete_tools(tool_ids)
+        self._schema_cache.invalidate(tool_ids)
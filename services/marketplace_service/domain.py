@@ -9,7 +9,7 @@ import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -70,6 +70,36 @@ class PackageSpec:
             raise ValueError(f"Invalid package name format: {self.name}")
 
 
+@dataclass
+class VersionRange:
+    """
+    Semver constraints for version resolution.
+
+    PackageRepository.find_version pushes these into SQL and returns the
+    highest matching version; ``matches`` is the in-memory equivalent.
+    """
+
+    exact: Optional[str] = None
+    major: Optional[int] = None
+    minor: Optional[int] = None
+    minimum: Optional[Tuple[int, int, int]] = None
+    minimum_inclusive: bool = True
+    stable_only: bool = True
+
+    def matches(self, version: Dict[str, Any]) -> bool:
+        semver = (version["version_major"], version["version_minor"], version["version_patch"])
+        if self.exact is not None and version["version"] != self.exact:
+            return False
+        if self.major is not None and semver[0] != self.major:
+            return False
+        if self.minor is not None and semver[1] != self.minor:
+            return False
+        if self.minimum is not None:
+            if semver < self.minimum or (semver == self.minimum and not self.minimum_inclusive):
+                return False
+        return not (self.stable_only and version.get("prerelease"))
+
+
 @dataclass
 class InstallResult:
     """Result of package installation."""
@@ -345,18 +345,19 @@ class InstallManager:
             return 0
 
         try:
-            # Re-discover tools
+            # Re-discover tools (the aggregator diffs them against the last discovery)
             tools = await self._aggregator.discover_tools(server_id)
+            changed = [tool for tool in tools if tool.get("changed", True)]
 
-            # Sync to unified table
+            # Sync new/changed tools to unified table
             tool_ids = await self._sync_tools_to_unified_table(
-                tools=tools,
+                tools=changed,
                 server_id=server_id,
                 package_name=installation.get("package_name", "unknown"),
             )
 
             # Update tools with their IDs
-            for i, tool in enumerate(tools):
+            for i, tool in enumerate(changed):
                 if i < len(tool_ids) and tool_ids[i]:
                     tool["id"] = tool_ids[i]
 
@@ -368,8 +369,8 @@ class InstallManager:
                 package_name=installation.get("package_name", "unknown"),
             )
 
-            # Sync embeddings
-            await self._sync_tool_embeddings(tools)
+            # Sync embeddings for new/changed tools only
+            await self._sync_tool_embeddings(changed)
 
             return len(tools)
 
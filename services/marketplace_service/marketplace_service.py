@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional
 import logging
 
 from .domain import RegistrySource, InstallStatus, PackageSpec, InstallResult
+from .registry_search import RegistrySearchCoordinator
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +82,12 @@ class MarketplaceService:
         self._skill_service = skill_service
         self._search_service = search_service
 
+        # Deduplicated background registry searches for sparse local results
+        self._registry_search = RegistrySearchCoordinator(
+            fetcher=registry_fetcher,
+            repository=package_repository,
+        )
+
         # Background sync task
         self._sync_task: Optional[asyncio.Task] = None
         self._sync_interval = 3600  # 1 hour
@@ -98,6 +105,8 @@ class MarketplaceService:
         verified_only: bool = False,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        count: str = "exact",
     ) -> Dict[str, Any]:
         """
         Search for packages across all registries.
@@ -109,10 +118,13 @@ class MarketplaceService:
             registry: Filter by registry source
             verified_only: Only show verified packages
             limit: Maximum results
-            offset: Pagination offset
+            offset: Pagination offset (ignored when ``cursor`` is given)
+            cursor: ``next_cursor`` from the previous page
+            count: Total count mode: "exact" (default), "estimated" (planner
+                row estimate, cheaper on broad queries) or "none"
 
         Returns:
-            Search results with packages and metadata
+            Search results with packages, next_cursor and metadata
 
         Example:
             >>> results = await marketplace.search("video editing")
@@ -130,11 +142,13 @@ class MarketplaceService:
             verified_only=verified_only,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count=count,
         )
 
         # If few results, trigger background registry search
-        if results["total"] < limit:
-            asyncio.create_task(self._background_registry_search(query, category, tags))
+        if not cursor and not results["next_cursor"] and len(results["packages"]) < limit:
+            self._registry_search.schedule(query, category, tags)
 
         # Calculate search time
         search_time_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
@@ -572,28 +586,16 @@ class MarketplaceService:
             self._sync_task = None
             logger.info("Stopped background registry sync")
 
+    async def close(self):
+        """Stop background work and release registry connections."""
+        await self.stop_background_sync()
+        await self._registry_search.close()
+        await self._fetcher.close()
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
-    async def _background_registry_search(
-        self,
-        query: str,
-        category: Optional[str],
-        tags: Optional[List[str]],
-    ) -> None:
-        """Perform background search on registries to populate cache."""
-        try:
-            packages = await self._fetcher.search_registries(
-                query=query,
-                category=category,
-                tags=tags,
-            )
-            for pkg in packages:
-                await self._repo.upsert_package(pkg)
-        except Exception as e:
-            logger.debug(f"Background registry search failed: {e}")
-
     async def get_state(self) -> Dict[str, Any]:
         """
         Get current marketplace state.
@@ -606,4 +608,5 @@ class MarketplaceService:
             "installed_packages": await self._repo.count_installations(),
             "registries": [r["source"].value for r in self.DEFAULT_REGISTRIES],
             "sync_enabled": self._sync_task is not None,
+            "registry_search": self._registry_search.get_stats(),
         }
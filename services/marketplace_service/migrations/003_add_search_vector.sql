@@ -0,0 +1,62 @@
+-- Migration 003: Stored search vector, trigram indexes and keyset ordering
+-- Package search no longer computes to_tsvector() per row at query time:
+-- a generated, weighted tsvector column (name > display_name > description > tags)
+-- is kept with the row and GIN-indexed. Trigram indexes on name and
+-- display_name serve prefix and typo matching, and a composite index on the
+-- popularity ordering backs keyset (cursor) pagination.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- array_to_string() is only STABLE; generated columns need IMMUTABLE expressions
+CREATE OR REPLACE FUNCTION mcp.immutable_array_to_string(arr TEXT[], sep TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT array_to_string(arr, sep) $$;
+
+-- Package names are npm-style ("@scope/pkg-name"); split them into words
+ALTER TABLE mcp.marketplace_packages ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', regexp_replace(coalesce(name, ''), '[@/_.-]+', ' ', 'g')), 'A') ||
+        setweight(to_tsvector('english', coalesce(display_name, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('english', mcp.immutable_array_to_string(coalesce(tags, '{}'), ' ')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_marketplace_pkg_search_vector
+    ON mcp.marketplace_packages USING GIN (search_vector);
+
+-- Superseded by the stored column
+DROP INDEX IF EXISTS mcp.idx_marketplace_pkg_search;
+
+-- Prefix (ILIKE 'q%') and typo (similarity) matching
+CREATE INDEX IF NOT EXISTS idx_marketplace_pkg_name_trgm
+    ON mcp.marketplace_packages USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_marketplace_pkg_display_name_trgm
+    ON mcp.marketplace_packages USING GIN (display_name gin_trgm_ops);
+
+-- Keyset pagination compares (download_count, star_count, id) row values,
+-- which requires the ordering columns to be non-null
+UPDATE mcp.marketplace_packages SET download_count = 0 WHERE download_count IS NULL;
+UPDATE mcp.marketplace_packages SET star_count = 0 WHERE star_count IS NULL;
+ALTER TABLE mcp.marketplace_packages ALTER COLUMN download_count SET NOT NULL;
+ALTER TABLE mcp.marketplace_packages ALTER COLUMN star_count SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_marketplace_pkg_popularity_keyset
+    ON mcp.marketplace_packages (download_count DESC, star_count DESC, id DESC)
+    WHERE deprecated = FALSE;
+
+COMMENT ON COLUMN mcp.marketplace_packages.search_vector IS 'Weighted full-text vector: name (A), display_name (B), description (C), tags (D)';
+
+-- DOWN / ROLLBACK:
+-- DROP INDEX IF EXISTS mcp.idx_marketplace_pkg_popularity_keyset;
+-- ALTER TABLE mcp.marketplace_packages ALTER COLUMN star_count DROP NOT NULL;
+-- ALTER TABLE mcp.marketplace_packages ALTER COLUMN download_count DROP NOT NULL;
+-- DROP INDEX IF EXISTS mcp.idx_marketplace_pkg_display_name_trgm;
+-- DROP INDEX IF EXISTS mcp.idx_marketplace_pkg_name_trgm;
+-- DROP INDEX IF EXISTS mcp.idx_marketplace_pkg_search_vector;
+-- ALTER TABLE mcp.marketplace_packages DROP COLUMN IF EXISTS search_vector;
+-- DROP FUNCTION IF EXISTS mcp.immutable_array_to_string(TEXT[], TEXT);
+-- CREATE INDEX IF NOT EXISTS idx_marketplace_pkg_search ON mcp.marketplace_packages
+--     USING GIN (to_tsvector('english',
+--         coalesce(name, '') || ' ' || coalesce(display_name, '') || ' ' ||
+--         coalesce(description, '') || ' ' || coalesce(author, '')));
@@ -8,16 +8,80 @@ Manages CRUD operations for:
 - package_tool_mappings
 """
 
+import base64
 import json
+import re
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 import logging
 
-from .domain import RegistrySource, InstallStatus, UpdateChannel
+from .domain import RegistrySource, InstallStatus, UpdateChannel, VersionRange
 
 logger = logging.getLogger(__name__)
 
+SEARCH_COUNT_MODES = ("exact", "estimated", "none")
+
+# Mirrors the pkg_name_format CHECK on marketplace_packages.name
+PACKAGE_NAME_PATTERN = re.compile(r"^(@[a-z0-9-]+/)?[a-z0-9-]+$")
+
+# Registry-reported package fields written by upsert_packages
+_UPSERT_COLUMNS = {
+    "name": "text",
+    "display_name": "text",
+    "description": "text",
+    "author": "text",
+    "homepage_url": "text",
+    "repository_url": "text",
+    "license": "text",
+    "category": "text",
+    "tags": "text[]",
+    "registry_source": "text",
+    "registry_url": "text",
+    "download_count": "integer",
+    "weekly_downloads": "integer",
+    "star_count": "integer",
+    "latest_version": "text",
+}
+
+_UPSERT_INSERT_DEFAULTS = {
+    "display_name": "COALESCE(i.display_name, i.name)",
+    "tags": "COALESCE(i.tags, '{}')",
+    "registry_source": "COALESCE(i.registry_source, 'npm')",
+    "download_count": "COALESCE(i.download_count, 0)",
+    "weekly_downloads": "COALESCE(i.weekly_downloads, 0)",
+    "star_count": "COALESCE(i.star_count, 0)",
+}
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _popularity_key(package: Dict[str, Any]) -> tuple:
+    """Keyset ordering for package search: downloads, stars, then ID."""
+    return (
+        package.get("download_count") or 0,
+        package.get("star_count") or 0,
+        str(package["id"]),
+    )
+
+
+def _encode_cursor(package: Dict[str, Any]) -> str:
+    """Opaque cursor pointing after ``package`` in search order."""
+    raw = json.dumps(list(_popularity_key(package))).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> List[Any]:
+    """Decode a search cursor into [download_count, star_count, id]."""
+    try:
+        downloads, stars, package_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return [int(downloads), int(stars), str(package_id)]
+    except Exception:
+        raise ValueError("Invalid search cursor")
+
 
 class PackageRepository:
     """
@@ -230,6 +294,72 @@ class PackageRepository:
             return await self.update_package(existing["id"], data)
         return await self.create_package(data)
 
+    async def upsert_packages(self, packages: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update many registry packages in one statement.
+
+        Keyed by name; fields a registry did not report (None or missing)
+        keep their stored values. Later duplicates in ``packages`` win.
+        Packages whose name fails the ``pkg_name_format`` constraint are
+        skipped, since one such row would abort the whole statement.
+
+        Returns:
+            Number of distinct packages written
+        """
+        by_name = {}
+        invalid = []
+        for pkg in packages:
+            if PACKAGE_NAME_PATTERN.match(pkg.get("name") or ""):
+                by_name[pkg["name"]] = pkg
+            else:
+                invalid.append(pkg.get("name"))
+        if invalid:
+            logger.warning(f"Skipping {len(invalid)} packages with invalid names: {invalid[:5]}")
+        if not by_name:
+            return 0
+
+        if self._db_pool:
+            rows = [{col: pkg.get(col) for col in _UPSERT_COLUMNS} for pkg in by_name.values()]
+            record = ", ".join(f"{col} {sql_type}" for col, sql_type in _UPSERT_COLUMNS.items())
+            updates = ", ".join(
+                f"{col} = COALESCE(i.{col}, p.{col})" for col in _UPSERT_COLUMNS if col != "name"
+            )
+            insert_cols = ", ".join(_UPSERT_COLUMNS)
+            insert_values = ", ".join(
+                _UPSERT_INSERT_DEFAULTS.get(col, f"i.{col}") for col in _UPSERT_COLUMNS
+            )
+            async with self._db_pool.acquire() as conn:
+                await conn.execute(
+                    f"""
+                    WITH incoming AS (
+                        SELECT * FROM jsonb_to_recordset($1::jsonb) AS i({record})
+                    ),
+                    updated AS (
+                        UPDATE mcp.marketplace_packages p
+                        SET {updates}, updated_at = NOW(), last_synced_at = NOW()
+                        FROM incoming i
+                        WHERE p.name = i.name AND p.is_global = TRUE
+                        RETURNING p.name
+                    )
+                    INSERT INTO mcp.marketplace_packages ({insert_cols}, last_synced_at)
+                    SELECT {insert_values}, NOW()
+                    FROM incoming i
+                    WHERE i.name NOT IN (SELECT name FROM updated)
+                    ON CONFLICT (name) WHERE is_global = TRUE DO NOTHING
+                    """,
+                    json.dumps(rows, default=str),
+                )
+        else:
+            for pkg in by_name.values():
+                existing = await self.get_package_by_name(pkg["name"])
+                if existing:
+                    existing.update({k: v for k, v in pkg.items() if v is not None})
+                    existing["updated_at"] = existing["last_synced_at"] = datetime.now(timezone.utc)
+                else:
+                    await self.create_package(pkg)
+
+        return len(by_name)
+
     async def search_packages(
         self,
         query: str,
@@ -239,71 +369,106 @@ class PackageRepository:
         verified_only: bool = False,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        count: str = "exact",
     ) -> Dict[str, Any]:
-        """Search packages with filters."""
+        """
+        Search packages with filters, most popular first.
+
+        Text matches use the stored ``search_vector`` column, plus trigram
+        prefix/typo matching on name and display name. Pages are keyset-based:
+        pass the previous page's ``next_cursor`` as ``cursor``. ``offset`` is
+        still honoured when no cursor is given, but deep offsets scan every
+        skipped row.
+
+        Args:
+            count: "exact" (COUNT(*)), "estimated" (planner row estimate) or
+                "none" (total is None)
+
+        Returns:
+            Dict with packages, total, total_is_estimate, next_cursor, limit, offset
+        """
+        if count not in SEARCH_COUNT_MODES:
+            raise ValueError(f"Invalid count mode: {count}")
+        after = _decode_cursor(cursor) if cursor else None
+
         if self._db_pool:
-            # Build query with full-text search
             conditions = ["deprecated = FALSE"]
-            values = []
-            param_idx = 1
+            values: List[Any] = []
 
             if query:
-                conditions.append(f"""
-                    to_tsvector('english', coalesce(name, '') || ' ' ||
-                    coalesce(display_name, '') || ' ' ||
-                    coalesce(description, '')) @@ plainto_tsquery('english', ${param_idx})
-                """)
                 values.append(query)
-                param_idx += 1
+                q = f"${len(values)}"
+                values.append(_escape_like(query) + "%")
+                prefix = f"${len(values)}"
+                conditions.append(
+                    f"(search_vector @@ websearch_to_tsquery('english', {q})"
+                    f" OR name ILIKE {prefix} ESCAPE '\\'"
+                    f" OR display_name ILIKE {prefix} ESCAPE '\\'"
+                    f" OR name % {q} OR display_name % {q})"
+                )
 
             if category:
-                conditions.append(f"category = ${param_idx}")
                 values.append(category)
-                param_idx += 1
+                conditions.append(f"category = ${len(values)}")
 
             if tags:
-                conditions.append(f"tags && ${param_idx}")
                 values.append(tags)
-                param_idx += 1
+                conditions.append(f"tags && ${len(values)}")
 
             if registry:
-                conditions.append(f"registry_source = ${param_idx}")
                 values.append(registry)
-                param_idx += 1
+                conditions.append(f"registry_source = ${len(values)}")
 
             if verified_only:
                 conditions.append("verified = TRUE")
 
-            where_clause = " AND ".join(conditions)
+            filter_values = list(values)
+            filter_clause = " AND ".join(conditions)
 
-            async with self._db_pool.acquire() as conn:
-                # Get total count
-                count_query = f"""
-                    SELECT COUNT(*) FROM mcp.marketplace_packages
-                    WHERE {where_clause}
-                """
-                total = await conn.fetchval(count_query, *values)
+            if after:
+                values.extend(after)
+                n = len(values)
+                conditions.append(
+                    f"(download_count, star_count, id) < (${n - 2}, ${n - 1}, ${n}::uuid)"
+                )
 
-                # Get packages
-                search_query = f"""
-                    SELECT * FROM mcp.marketplace_packages
-                    WHERE {where_clause}
-                    ORDER BY download_count DESC, star_count DESC
-                    LIMIT ${param_idx} OFFSET ${param_idx + 1}
-                """
-                values.extend([limit, offset])
+            values.append(limit + 1)
+            search_query = f"""
+                SELECT * FROM mcp.marketplace_packages
+                WHERE {" AND ".join(conditions)}
+                ORDER BY download_count DESC, star_count DESC, id DESC
+                LIMIT ${len(values)}
+            """
+            if offset and not after:
+                values.append(offset)
+                search_query += f" OFFSET ${len(values)}"
+
+            async with self._db_pool.acquire() as conn:
                 rows = await conn.fetch(search_query, *values)
 
-                return {
-                    "total": total,
-                    "packages": [dict(row) for row in rows],
-                    "limit": limit,
-                    "offset": offset,
-                }
+                total = None
+                if count == "exact":
+                    total = await conn.fetchval(
+                        f"SELECT COUNT(*) FROM mcp.marketplace_packages WHERE {filter_clause}",
+                        *filter_values,
+                    )
+                elif count == "estimated":
+                    plan = await conn.fetchval(
+                        f"EXPLAIN (FORMAT JSON) SELECT 1 FROM mcp.marketplace_packages "
+                        f"WHERE {filter_clause}",
+                        *filter_values,
+                    )
+                    plan = json.loads(plan) if isinstance(plan, str) else plan
+                    total = int(plan[0]["Plan"]["Plan Rows"])
+
+            packages = [dict(row) for row in rows]
+            for package in packages:
+                package.pop("search_vector", None)
         else:
             # In-memory search
-            results = []
-            query_lower = query.lower()
+            query_lower = (query or "").lower()
+            matches = []
 
             for pkg in self._packages.values():
                 if pkg.get("deprecated"):
@@ -331,19 +496,28 @@ class PackageRepository:
                 if verified_only and not pkg.get("verified"):
                     continue
 
-                results.append(pkg)
+                matches.append(pkg)
 
-            # Sort by popularity
-            results.sort(
-                key=lambda p: (p.get("download_count", 0), p.get("star_count", 0)), reverse=True
-            )
+            # Sort by popularity, with the same keyset order as the database
+            matches.sort(key=_popularity_key, reverse=True)
 
-            return {
-                "total": len(results),
-                "packages": results[offset : offset + limit],
-                "limit": limit,
-                "offset": offset,
-            }
+            total = len(matches) if count != "none" else None
+            if after:
+                page = [p for p in matches if _popularity_key(p) < tuple(after)]
+            else:
+                page = matches[offset:]
+            packages = page[: limit + 1]
+
+        has_more = len(packages) > limit
+        packages = packages[:limit]
+        return {
+            "total": total,
+            "total_is_estimate": count == "estimated" and self._db_pool is not None,
+            "packages": packages,
+            "next_cursor": _encode_cursor(packages[-1]) if has_more else None,
+            "limit": limit,
+            "offset": offset,
+        }
 
     async def increment_download_count(self, package_id: str) -> None:
         """Increment package download count."""
@@ -434,11 +608,11 @@ class PackageRepository:
     # Version Operations
     # =========================================================================
 
-    async def create_version(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a package version."""
+    def _build_version(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Version record with defaults filled in."""
         version_id = data.get("id") or str(uuid.uuid4())
 
-        version = {
+        return {
             "id": version_id,
             "package_id": data["package_id"],
             "version": data["version"],
@@ -461,6 +635,10 @@ class PackageRepository:
             "created_at": datetime.now(timezone.utc),
         }
 
+    async def create_version(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a package version."""
+        version = self._build_version(data)
+
         if self._db_pool:
             async with self._db_pool.acquire() as conn:
                 await conn.execute(
@@ -499,10 +677,131 @@ class PackageRepository:
                     version["created_at"],
                 )
         else:
-            self._versions[version_id] = version
+            self._versions[version["id"]] = version
 
         return version
 
+    async def create_versions(self, versions: List[Dict[str, Any]]) -> int:
+        """
+        Insert many package versions in one statement.
+
+        Versions that already exist (same package and version string) are
+        skipped.
+
+        Returns:
+            Number of versions inserted
+        """
+        records = [self._build_version(data) for data in versions]
+        if not records:
+            return 0
+
+        if self._db_pool:
+            async with self._db_pool.acquire() as conn:
+                result = await conn.execute(
+                    """
+                    INSERT INTO mcp.package_versions (
+                        id, package_id, version,
+                        version_major, version_minor, version_patch, prerelease,
+                        mcp_config, declared_tools, tool_count,
+                        min_mcp_version, required_env_vars, dependencies,
+                        changelog, release_notes_url, published_at, published_by,
+                        deprecated, yanked, created_at
+                    )
+                    SELECT * FROM jsonb_to_recordset($1::jsonb) AS v(
+                        id uuid, package_id uuid, version text,
+                        version_major integer, version_minor integer, version_patch integer,
+                        prerelease text, mcp_config jsonb, declared_tools jsonb,
+                        tool_count integer, min_mcp_version text, required_env_vars text[],
+                        dependencies jsonb, changelog text, release_notes_url text,
+                        published_at timestamptz, published_by text,
+                        deprecated boolean, yanked boolean, created_at timestamptz
+                    )
+                    ON CONFLICT (package_id, version) DO NOTHING
+                    """,
+                    json.dumps(records, default=str),
+                )
+                return int(result.split()[-1])
+
+        inserted = 0
+        for record in records:
+            if await self.get_version(record["package_id"], record["version"]):
+                continue
+            self._versions[record["id"]] = record
+            inserted += 1
+        return inserted
+
+    async def has_versions(self, package_id: str) -> bool:
+        """Whether any non-yanked version is stored for a package."""
+        if self._db_pool:
+            async with self._db_pool.acquire() as conn:
+                return await conn.fetchval(
+                    """
+                    SELECT EXISTS (
+                        SELECT 1 FROM mcp.package_versions
+                        WHERE package_id = $1 AND yanked = FALSE
+                    )
+                    """,
+                    package_id,
+                )
+        return any(
+            v["package_id"] == package_id and not v.get("yanked") for v in self._versions.values()
+        )
+
+    async def find_version(
+        self, package_id: str, version_range: VersionRange
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Highest non-yanked version of a package within ``version_range``.
+
+        The constraints are evaluated in SQL against the (package_id, major,
+        minor, patch) index instead of loading every version.
+        """
+        if self._db_pool:
+            conditions = ["package_id = $1", "yanked = FALSE"]
+            values: List[Any] = [package_id]
+
+            if version_range.exact is not None:
+                values.append(version_range.exact)
+                conditions.append(f"version = ${len(values)}")
+            if version_range.major is not None:
+                values.append(version_range.major)
+                conditions.append(f"version_major = ${len(values)}")
+            if version_range.minor is not None:
+                values.append(version_range.minor)
+                conditions.append(f"version_minor = ${len(values)}")
+            if version_range.minimum is not None:
+                values.extend(version_range.minimum)
+                n = len(values)
+                op = ">=" if version_range.minimum_inclusive else ">"
+                conditions.append(
+                    f"(version_major, version_minor, version_patch) {op} (${n - 2}, ${n - 1}, ${n})"
+                )
+            if version_range.stable_only:
+                conditions.append("(prerelease IS NULL OR prerelease = '')")
+
+            async with self._db_pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    f"""
+                    SELECT * FROM mcp.package_versions
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY version_major DESC, version_minor DESC, version_patch DESC
+                    LIMIT 1
+                    """,
+                    *values,
+                )
+                return dict(row) if row else None
+
+        matching = [
+            v
+            for v in self._versions.values()
+            if v["package_id"] == package_id and not v.get("yanked") and version_range.matches(v)
+        ]
+        return max(
+            matching,
+            key=lambda v: (v["version_major"], v["version_minor"], v["version_patch"]),
+            default=None,
+        )
+
     async def get_package_versions(self, package_id: str) -> List[Dict[str, Any]]:
         """Get all versions for a package."""
         if self._db_pool:
@@ -737,6 +1036,72 @@ class PackageRepository:
                 return [dict(row) for row in rows]
         return list(self._installations.values())
 
+    async def list_update_candidates(
+        self,
+        user_id: Optional[str] = None,
+        org_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Installed, unpinned packages whose registry latest_version differs
+        from the installed version, with package details joined in.
+        """
+        if self._db_pool:
+            conditions = [
+                "i.status = $1",
+                "NOT COALESCE(i.pinned_version, FALSE)",
+                "p.latest_version IS NOT NULL",
+                "p.latest_version IS DISTINCT FROM v.version",
+            ]
+            values: List[Any] = [InstallStatus.INSTALLED.value]
+            if user_id:
+                values.append(user_id)
+                conditions.append(f"i.user_id = ${len(values)}")
+            elif org_id:
+                values.append(org_id)
+                conditions.append(f"i.org_id = ${len(values)}")
+
+            async with self._db_pool.acquire() as conn:
+                rows = await conn.fetch(
+                    f"""
+                    SELECT i.id, i.package_id, i.update_channel, v.version,
+                           p.name AS package_name, p.display_name, p.latest_version
+                    FROM mcp.installed_packages i
+                    JOIN mcp.marketplace_packages p ON i.package_id = p.id
+                    JOIN mcp.package_versions v ON i.version_id = v.id
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY i.installed_at DESC
+                    """,
+                    *values,
+                )
+                return [dict(row) for row in rows]
+
+        candidates = []
+        for inst in self._installations.values():
+            if user_id and inst.get("user_id") != user_id:
+                continue
+            if not user_id and org_id and inst.get("org_id") != org_id:
+                continue
+            if inst.get("pinned_version") or inst.get("status") != InstallStatus.INSTALLED.value:
+                continue
+            package = self._packages.get(inst["package_id"])
+            if not package or not package.get("latest_version"):
+                continue
+            version = self._versions.get(inst["version_id"], {}).get("version")
+            if package["latest_version"] == version:
+                continue
+            candidates.append(
+                {
+                    "id": inst["id"],
+                    "package_id": inst["package_id"],
+                    "update_channel": inst.get("update_channel"),
+                    "version": version,
+                    "package_name": package["name"],
+                    "display_name": package.get("display_name"),
+                    "latest_version": package["latest_version"],
+                }
+            )
+        return candidates
+
     async def update_installation_status(
         self,
         installation_id: str,
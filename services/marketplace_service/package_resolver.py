@@ -7,11 +7,11 @@ Handles:
 - Dependency resolution
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import logging
 import re
 
-from .domain import PackageSpec, RegistrySource
+from .domain import PackageSpec, RegistrySource, VersionRange
 
 logger = logging.getLogger(__name__)
 
@@ -79,15 +79,15 @@ class PackageResolver:
             # Store in cache
             await self._repo.upsert_package(package)
 
+            stored = await self._repo.get_package_by_name(name)
+
             # Also store versions if available
-            if "versions" in package:
-                for version_data in package["versions"]:
-                    version_data["package_id"] = package.get("id") or (
-                        await self._repo.get_package_by_name(name)
-                    ).get("id")
-                    await self._repo.create_version(version_data)
+            if stored and "versions" in package:
+                await self._repo.create_versions(
+                    [{**v, "package_id": stored["id"]} for v in package["versions"]]
+                )
 
-            return await self._repo.get_package_by_name(name)
+            return stored
 
         return None
 
@@ -106,19 +106,19 @@ class PackageResolver:
         """
         package_id = package["id"]
 
-        # Get all available versions
-        versions = await self._repo.get_package_versions(package_id)
+        has_versions = await self._repo.has_versions(package_id)
 
-        if not versions:
+        if not has_versions:
             # Try to fetch from registry
             full_package = await self._fetcher.fetch_package(package["name"])
             if full_package and "versions" in full_package:
-                for v in full_package["versions"]:
-                    v["package_id"] = package_id
-                    await self._repo.create_version(v)
-                versions = await self._repo.get_package_versions(package_id)
+                has_versions = bool(
+                    await self._repo.create_versions(
+                        [{**v, "package_id": package_id} for v in full_package["versions"]]
+                    )
+                )
 
-        if not versions:
+        if not has_versions:
             # Create a default version from latest_version
             if package.get("latest_version"):
                 major, minor, patch, prerelease = self._parse_semver(package["latest_version"])
@@ -146,89 +146,43 @@ class PackageResolver:
 
         # Resolve version spec
         if not version_spec or version_spec == "latest":
-            # Return latest stable version
-            stable = [v for v in versions if not v.get("prerelease")]
-            return stable[0] if stable else versions[0]
+            # Return latest stable version, else the latest prerelease
+            return await self._repo.find_version(
+                package_id, VersionRange()
+            ) or await self._repo.find_version(package_id, VersionRange(stable_only=False))
 
         # Exact version match
-        exact = [v for v in versions if v["version"] == version_spec]
+        exact = await self._repo.find_version(
+            package_id, VersionRange(exact=version_spec, stable_only=False)
+        )
         if exact:
-            return exact[0]
+            return exact
 
         # Semver range matching
-        return self._match_semver_range(versions, version_spec)
+        version_range = self._parse_range(version_spec)
+        if version_range is None:
+            return None
+        return await self._repo.find_version(package_id, version_range)
 
-    def _match_semver_range(
-        self,
-        versions: List[Dict[str, Any]],
-        range_spec: str,
-    ) -> Optional[Dict[str, Any]]:
-        """Match versions against semver range specification."""
-        # Parse range spec
+    def _parse_range(self, range_spec: str) -> Optional[VersionRange]:
+        """Parse a semver range; None for specs that only match exactly."""
         if range_spec.startswith("^"):
             # Caret: Compatible with version (major must match)
-            target = range_spec[1:]
-            major, minor, patch, _ = self._parse_semver(target)
-
-            matching = [
-                v
-                for v in versions
-                if v["version_major"] == major
-                and (v["version_minor"], v["version_patch"]) >= (minor, patch)
-                and not v.get("prerelease")
-            ]
-
-        elif range_spec.startswith("~"):
+            major, minor, patch, _ = self._parse_semver(range_spec[1:])
+            return VersionRange(major=major, minimum=(major, minor, patch))
+
+        if range_spec.startswith("~"):
             # Tilde: Approximately equivalent (major.minor must match)
-            target = range_spec[1:]
-            major, minor, patch, _ = self._parse_semver(target)
-
-            matching = [
-                v
-                for v in versions
-                if v["version_major"] == major
-                and v["version_minor"] == minor
-                and v["version_patch"] >= patch
-                and not v.get("prerelease")
-            ]
-
-        elif range_spec.startswith(">="):
-            # Greater than or equal
-            target = range_spec[2:]
-            major, minor, patch, _ = self._parse_semver(target)
-
-            matching = [
-                v
-                for v in versions
-                if (v["version_major"], v["version_minor"], v["version_patch"])
-                >= (major, minor, patch)
-                and not v.get("prerelease")
-            ]
-
-        elif range_spec.startswith(">"):
-            # Greater than
-            target = range_spec[1:]
-            major, minor, patch, _ = self._parse_semver(target)
-
-            matching = [
-                v
-                for v in versions
-                if (v["version_major"], v["version_minor"], v["version_patch"])
-                > (major, minor, patch)
-                and not v.get("prerelease")
-            ]
-
-        else:
-            # No special prefix, try exact match
-            matching = [v for v in versions if v["version"] == range_spec]
-
-        if matching:
-            # Return highest matching version
-            matching.sort(
-                key=lambda v: (v["version_major"], v["version_minor"], v["version_patch"]),
-                reverse=True,
-            )
-            return matching[0]
+            major, minor, patch, _ = self._parse_semver(range_spec[1:])
+            return VersionRange(major=major, minor=minor, minimum=(major, minor, patch))
+
+        if range_spec.startswith(">="):
+            major, minor, patch, _ = self._parse_semver(range_spec[2:])
+            return VersionRange(minimum=(major, minor, patch))
+
+        if range_spec.startswith(">"):
+            major, minor, patch, _ = self._parse_semver(range_spec[1:])
+            return VersionRange(minimum=(major, minor, patch), minimum_inclusive=False)
 
         return None
 
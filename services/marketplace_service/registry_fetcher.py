@@ -348,10 +348,14 @@ class RegistryFetcher:
             logger.error(f"GitHub search error: {e}")
             return []
 
-    def _normalize_github_repo(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+    def _normalize_github_repo(self, repo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normalize GitHub repo to package format."""
+        # Package names are lowercase [a-z0-9-]; "Owner/Repo.js" -> "owner-repo-js"
+        slug = re.sub(r"[^a-z0-9]+", "-", repo["full_name"].lower()).strip("-")
+        if not slug:
+            return None
         return {
-            "name": f"@github/{repo['full_name'].replace('/', '-')}",
+            "name": f"@github/{slug}",
             "display_name": repo["name"],
             "description": repo.get("description", ""),
             "author": repo["owner"]["login"],
@@ -0,0 +1,158 @@
+"""
+Registry Search Coordinator - Deduplicated background registry searches.
+
+MarketplaceService.search falls back to the npm/GitHub registries when the
+local catalog has too few results. This coordinator keeps that fallback from
+fanning out:
+
+- Single-flight: one fetch per normalized query (case, whitespace, tag order)
+- Recent/negative cache: a query is not re-fetched for ``recent_ttl`` seconds
+  after it returned packages, ``empty_ttl`` after it returned none, and
+  ``error_ttl`` after it failed
+- A global cap on concurrent registry fetches; queries beyond ``max_pending``
+  waiting fetches are dropped
+- Fetched packages are written with one bulk upsert
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RegistrySearchCoordinator:
+    """
+    Schedules background registry searches with single-flight, TTL caching
+    and bounded concurrency.
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        repository,
+        max_concurrent_fetches: int = 4,
+        max_pending: int = 64,
+        recent_ttl: float = 300.0,
+        empty_ttl: float = 900.0,
+        error_ttl: float = 60.0,
+    ):
+        """
+        Initialize RegistrySearchCoordinator.
+
+        Args:
+            fetcher: RegistryFetcher used for upstream searches
+            repository: PackageRepository receiving the fetched packages
+            max_concurrent_fetches: Registry searches allowed at once
+            max_pending: Scheduled searches (running or waiting) before new
+                queries are dropped
+            recent_ttl: Seconds a query that returned packages is not re-fetched
+            empty_ttl: Seconds a query that returned nothing is not re-fetched
+            error_ttl: Seconds a failed query is not re-fetched
+        """
+        self._fetcher = fetcher
+        self._repo = repository
+        self._semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        self._max_pending = max_pending
+        self.recent_ttl = recent_ttl
+        self.empty_ttl = empty_ttl
+        self.error_ttl = error_ttl
+
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self._recent: Dict[Tuple, float] = {}  # key -> monotonic expiry
+
+        self.fetches = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.dropped = 0
+
+    @staticmethod
+    def normalize(
+        query: str, category: Optional[str] = None, tags: Optional[List[str]] = None
+    ) -> Tuple:
+        """Single-flight/cache key for a search."""
+        return (
+            " ".join((query or "").lower().split()),
+            (category or "").lower(),
+            tuple(sorted({t.lower() for t in tags or []})),
+        )
+
+    def schedule(
+        self, query: str, category: Optional[str] = None, tags: Optional[List[str]] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        Start a background registry search unless one is running or cached.
+
+        Returns:
+            The search task (possibly one already in flight), or None if the
+            query is cached, blank or dropped
+        """
+        key = self.normalize(query, category, tags)
+        if not key[0]:
+            return None
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        expires_at = self._recent.get(key)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                self.cache_hits += 1
+                return None
+            del self._recent[key]
+
+        if len(self._inflight) >= self._max_pending:
+            self.dropped += 1
+            logger.debug(f"Registry search queue full, dropping '{query}'")
+            return None
+
+        task = asyncio.create_task(self._search(key, query, category, tags))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _search(
+        self, key: Tuple, query: str, category: Optional[str], tags: Optional[List[str]]
+    ) -> int:
+        ttl = self.error_ttl
+        try:
+            async with self._semaphore:
+                self.fetches += 1
+                packages = await self._fetcher.search_registries(
+                    query=query, category=category, tags=tags
+                )
+            written = await self._repo.upsert_packages(packages) if packages else 0
+            ttl = self.recent_ttl if written else self.empty_ttl
+            return written
+        except Exception as e:
+            logger.debug(f"Background registry search failed: {e}")
+            return 0
+        finally:
+            self._recent[key] = time.monotonic() + ttl
+            self._prune()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, expires_at in self._recent.items() if expires_at <= now]:
+            del self._recent[key]
+
+    async def close(self) -> None:
+        """Cancel scheduled searches."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        return {
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "dropped": self.dropped,
+            "in_flight": len(self._inflight),
+            "cached_queries": len(self._recent),
+        }
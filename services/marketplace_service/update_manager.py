@@ -7,6 +7,7 @@ Handles:
 - Rollback on failure
 """
 
+import asyncio
 from typing import Any, Dict, List, Optional
 import logging
 
@@ -30,6 +31,7 @@ class UpdateManager:
         repository,
         resolver,
         installer,
+        max_concurrent_updates: int = 4,
     ):
         """
         Initialize UpdateManager.
@@ -38,10 +40,12 @@ class UpdateManager:
             repository: PackageRepository for database operations
             resolver: PackageResolver for version resolution
             installer: InstallManager for installation operations
+            max_concurrent_updates: Packages updated at once by update_all
         """
         self._repo = repository
         self._resolver = resolver
         self._installer = installer
+        self._max_concurrent_updates = max_concurrent_updates
 
     async def check_updates(
         self,
@@ -60,43 +64,29 @@ class UpdateManager:
         """
         updates = []
 
-        # Get all installations
-        installations = await self._repo.list_installations(
+        # Installed, unpinned packages whose latest version differs, in one query
+        candidates = await self._repo.list_update_candidates(
             user_id=user_id,
             org_id=org_id,
         )
 
-        for inst in installations:
-            # Skip if pinned or not installed
-            if inst.get("pinned_version") or inst.get("status") != InstallStatus.INSTALLED.value:
-                continue
-
-            # Get package info
-            package = await self._repo.get_package(inst["package_id"])
-            if not package:
-                continue
-
-            # Get current version
+        for inst in candidates:
             current_version = inst.get("version")
-            latest_version = package.get("latest_version")
-
-            # Check if update available
-            if latest_version and latest_version != current_version:
-                # Parse versions to compare
-                if self._is_newer_version(latest_version, current_version):
-                    updates.append(
-                        {
-                            "package_id": package["id"],
-                            "package_name": package["name"],
-                            "display_name": package.get("display_name", package["name"]),
-                            "current_version": current_version,
-                            "latest_version": latest_version,
-                            "update_channel": inst.get(
-                                "update_channel", UpdateChannel.STABLE.value
-                            ),
-                            "installation_id": inst["id"],
-                        }
-                    )
+            latest_version = inst["latest_version"]
+
+            # Parse versions to compare
+            if self._is_newer_version(latest_version, current_version):
+                updates.append(
+                    {
+                        "package_id": inst["package_id"],
+                        "package_name": inst["package_name"],
+                        "display_name": inst.get("display_name") or inst["package_name"],
+                        "current_version": current_version,
+                        "latest_version": latest_version,
+                        "update_channel": inst.get("update_channel") or UpdateChannel.STABLE.value,
+                        "installation_id": inst["id"],
+                    }
+                )
 
         logger.info(f"Found {len(updates)} packages with updates available")
         return updates
@@ -268,24 +258,40 @@ class UpdateManager:
         """
         Update all packages with available updates.
 
+        Up to ``max_concurrent_updates`` packages are updated at once. Each
+        update rolls back its own installation on failure without affecting
+        the others.
+
         Args:
             user_id: User ID
             org_id: Organization ID
 
         Returns:
-            List of update results
+            List of update results, in check_updates order
         """
         updates = await self.check_updates(user_id=user_id, org_id=org_id)
+        semaphore = asyncio.Semaphore(self._max_concurrent_updates)
 
-        results = []
-        for update in updates:
-            result = await self.update_package(
-                package_name=update["package_name"],
-                target_version=update["latest_version"],
-                user_id=user_id,
-                org_id=org_id,
-            )
-            results.append(result)
+        async def _update(update: Dict[str, Any]) -> InstallResult:
+            async with semaphore:
+                try:
+                    return await self.update_package(
+                        package_name=update["package_name"],
+                        target_version=update["latest_version"],
+                        user_id=user_id,
+                        org_id=org_id,
+                    )
+                except Exception as e:
+                    logger.error(f"Update of {update['package_name']} failed: {e}")
+                    return InstallResult(
+                        success=False,
+                        package_id=update["package_id"],
+                        package_name=update["package_name"],
+                        version="",
+                        error=str(e),
+                    )
+
+        results = list(await asyncio.gather(*(_update(u) for u in updates)))
 
         successful = sum(1 for r in results if r.success)
         logger.info(f"Updated {successful}/{len(results)} packages")
@@ -4,6 +4,7 @@ Search Service - Semantic search using Qdrant.
 Provides:
 - SearchService: Flat semantic search
 - HierarchicalSearchService: Two-stage skill-based search
+- ToolSchemaCache: In-process schema cache for search enrichment
 """
 
 from .search_service import SearchService
@@ -15,6 +16,7 @@ from .hierarchical_search_service import (
     SearchMetadata,
     SearchStrategy,
 )
+from .schema_cache import ToolSchemaCache, ToolSchemas, get_schema_cache
 
 __all__ = [
     "SearchService",
@@ -24,4 +26,7 @@ __all__ = [
     "ToolMatch",
     "SearchMetadata",
     "SearchStrategy",
+    "ToolSchemaCache",
+    "ToolSchemas",
+    "get_schema_cache",
 ]
@@ -4,7 +4,8 @@ Hierarchical Search Service - Skill-based two-stage semantic search.
 Implements:
 - Stage 1: Query skills collection to find relevant skill categories
 - Stage 2: Search tools filtered by matched skill IDs
-- Stage 3: Enrich results with full schemas from PostgreSQL
+- Stage 3: Enrich results with full schemas (vector payload, schema cache,
+  then PostgreSQL for misses only)
 """
 
 import time
@@ -17,8 +18,11 @@ import json
 
 from core.config import get_settings
 from core.clients.model_client import get_model_client
+from core.tracing import traced
 from services.vector_service.vector_repository import VectorRepository
 
+from .schema_cache import ToolSchemaCache, ToolSchemas, get_schema_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,6 +79,27 @@ class SearchStrategy(str, Enum):
     HYBRID = "hybrid"  # Parallel skill + direct
 
 
+def _payload_schemas(payload: Dict[str, Any]) -> Optional[ToolSchemas]:
+    """Schemas stored in a tool's vector payload, if present and current."""
+    stored = payload.get("schemas")
+    if not isinstance(stored, dict) or not payload.get("schema_hash"):
+        return None
+    # Sync updates schema_hash on every schema change, but rewrites the stored
+    # schemas only while SCHEMAS_IN_VECTOR_PAYLOAD is enabled
+    if stored.get("schema_hash") != payload["schema_hash"]:
+        return None
+    try:
+        return ToolSchemas(**stored)
+    except TypeError:
+        return None
+
+
+def _apply_schemas(tool: "ToolMatch", schemas: ToolSchemas) -> None:
+    tool.input_schema = schemas.input_schema
+    tool.output_schema = schemas.output_schema
+    tool.annotations = schemas.annotations
+
+
 @dataclass
 class SkillMatch:
     """A matched skill from Stage 1."""
@@ -101,6 +126,9 @@ class ToolMatch:
     input_schema: Optional[Dict[str, Any]] = None
     output_schema: Optional[Dict[str, Any]] = None
     annotations: Optional[Dict[str, Any]] = None
+    # From the vector payload, used to validate cached schemas
+    schema_hash: Optional[str] = None
+    payload_schemas: Optional[ToolSchemas] = field(default=None, repr=False)
 
 
 @dataclass
@@ -146,6 +174,7 @@ class HierarchicalSearchService:
         model_client=None,
         db_pool=None,
         qdrant_client=None,
+        schema_cache: Optional[ToolSchemaCache] = None,
     ):
         """
         Initialize the hierarchical search service.
@@ -155,11 +184,13 @@ class HierarchicalSearchService:
             model_client: Optional model client for embeddings
             db_pool: Optional PostgreSQL pool for schema loading
             qdrant_client: Optional Qdrant client (for testing)
+            schema_cache: Optional schema cache (defaults to the process-wide one)
         """
         self._vector_repository = vector_repository
         self._model_client = model_client
         self._db_pool = db_pool
         self._qdrant_client = qdrant_client
+        self._schema_cache = schema_cache if schema_cache is not None else get_schema_cache()
         self._skill_collection = "mcp_skills"
         self._tool_collection = "mcp_unified_search"
         self._settings = get_settings()
@@ -189,6 +220,7 @@ class HierarchicalSearchService:
             )
         return self._db_pool
 
+    @traced("search.hierarchical")
     async def search(
         self,
         query: str,
@@ -311,6 +343,7 @@ class HierarchicalSearchService:
             logger.error(f"Hierarchical search failed: {e}")
             raise
 
+    @traced("search.embed")
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text."""
         model_client = await self._get_model_client()
@@ -330,6 +363,7 @@ class HierarchicalSearchService:
             user_id="mcp-search-service",
         )
 
+    @traced("search.skills")
     async def _search_skills(
         self, query_embedding: List[float], limit: int, threshold: float
     ) -> List[SkillMatch]:
@@ -383,6 +417,7 @@ class HierarchicalSearchService:
             logger.error(f"Skill search failed: {e}")
             return []
 
+    @traced("search.tools")
     async def _search_tools(
         self,
         query_embedding: List[float],
@@ -468,6 +503,8 @@ class HierarchicalSearchService:
                             score=score,
                             skill_ids=_parse_skill_ids(payload.get("skill_ids")),
                             primary_skill_id=payload.get("primary_skill_id"),
+                            schema_hash=payload.get("schema_hash"),
+                            payload_schemas=_payload_schemas(payload),
                         )
                     )
 
@@ -481,9 +518,15 @@ class HierarchicalSearchService:
             logger.error(f"Tool search failed: {e}")
             return []
 
+    @traced("search.enrich")
     async def _enrich_with_schemas(self, tools: List[ToolMatch]) -> List[ToolMatch]:
         """
-        Load full schemas from PostgreSQL for matched tools (Stage 3).
+        Attach full schemas to matched tools (Stage 3).
+
+        Sources, in order: schemas stored in the vector payload (written
+        together with their hash at sync time), the schema cache (validated
+        against the payload's ``schema_hash`` when present), then one batched
+        PostgreSQL query for the remaining tools, whose rows are cached.
 
         Args:
             tools: Tools to enrich
@@ -494,14 +537,28 @@ class HierarchicalSearchService:
         if not tools:
             return tools
 
+        missing: List[ToolMatch] = []
+        for tool in tools:
+            if not tool.db_id:
+                continue
+            schemas = tool.payload_schemas or self._schema_cache.get(
+                tool.db_id, expected_hash=tool.schema_hash
+            )
+            if schemas is not None:
+                _apply_schemas(tool, schemas)
+            else:
+                missing.append(tool)
+
+        if not missing:
+            return tools
+
         try:
             db_pool = await self._get_db_pool()
             settings = get_settings()
 
-            # Collect db_ids
-            db_ids = [t.db_id for t in tools if t.db_id]
-            if not db_ids:
-                return tools
+            # Writes during the query invalidate the cache; don't cache rows read before them
+            generation = self._schema_cache.generation
+            db_ids = list(dict.fromkeys(t.db_id for t in missing))
 
             # Query for schemas
             placeholders = ", ".join([f"${i+1}" for i in range(len(db_ids))])
@@ -515,15 +572,14 @@ class HierarchicalSearchService:
                 rows = await db_pool.query(query, params=db_ids)
 
             # Build lookup
-            schema_lookup = {row["id"]: row for row in (rows or [])}
+            schema_lookup = {row["id"]: ToolSchemas.from_row(row) for row in (rows or [])}
+            for db_id, schemas in schema_lookup.items():
+                self._schema_cache.put(db_id, schemas, generation=generation)
 
             # Enrich tools
-            for tool in tools:
+            for tool in missing:
                 if tool.db_id in schema_lookup:
-                    row = schema_lookup[tool.db_id]
-                    tool.input_schema = row.get("input_schema")
-                    tool.output_schema = row.get("output_schema")
-                    tool.annotations = row.get("annotations")
+                    _apply_schemas(tool, schema_lookup[tool.db_id])
 
             return tools
 
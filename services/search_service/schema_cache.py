@@ -0,0 +1,158 @@
+"""
+Schema Cache - In-process cache of tool schemas for search result enrichment.
+
+Stage 3 of hierarchical search attaches input/output schemas and annotations
+to every matched tool. Schemas only change when a tool is (re)registered, so
+they are cached per tool ID together with a hash of their content:
+
+- SyncService populates entries from the rows it has just written
+- SyncService and ToolAggregator invalidate entries when they change or
+  delete tools
+- Search enrichment reads the cache and fetches only misses from PostgreSQL
+
+When the vector payload carries a ``schema_hash`` an entry is only served if
+its hash matches, so a cache that missed an invalidation (e.g. a write from
+another process) falls back to the database instead of returning stale data.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def schema_hash(input_schema: Any, output_schema: Any = None, annotations: Any = None) -> str:
+    """Stable fingerprint of a tool's schemas (order of JSON keys is ignored)."""
+    content = json.dumps([input_schema, output_schema, annotations], sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ToolSchemas:
+    """Schemas of one tool as served by search enrichment."""
+
+    input_schema: Optional[Dict[str, Any]] = None
+    output_schema: Optional[Dict[str, Any]] = None
+    annotations: Optional[Dict[str, Any]] = None
+    schema_hash: str = ""
+
+    @classmethod
+    def build(
+        cls, input_schema: Any = None, output_schema: Any = None, annotations: Any = None
+    ) -> "ToolSchemas":
+        return cls(
+            input_schema=input_schema,
+            output_schema=output_schema,
+            annotations=annotations,
+            schema_hash=schema_hash(input_schema, output_schema, annotations),
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "ToolSchemas":
+        """Build from a tools table row (missing columns are treated as None)."""
+        return cls.build(row.get("input_schema"), row.get("output_schema"), row.get("annotations"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ToolSchemaCache:
+    """
+    Bounded LRU of tool ID -> ToolSchemas.
+
+    ``generation`` is bumped by every invalidation. Readers that fetch misses
+    from the database capture it before the query and pass it to ``put``, so
+    rows read before a concurrent write are not cached over the invalidation.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, ToolSchemas]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tool_id: int, expected_hash: Optional[str] = None) -> Optional[ToolSchemas]:
+        """
+        Cached schemas of a tool.
+
+        Args:
+            tool_id: PostgreSQL tool ID
+            expected_hash: Hash the caller knows to be current; a cached entry
+                with a different hash is dropped and treated as a miss
+
+        Returns:
+            ToolSchemas or None on a miss
+        """
+        entry = self._entries.get(tool_id)
+        if entry is not None and expected_hash and entry.schema_hash != expected_hash:
+            del self._entries[tool_id]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(tool_id)
+        self.hits += 1
+        return entry
+
+    def put(self, tool_id: int, schemas: ToolSchemas, generation: Optional[int] = None) -> bool:
+        """
+        Cache a tool's schemas.
+
+        Args:
+            tool_id: PostgreSQL tool ID
+            schemas: Schemas to cache
+            generation: Generation observed before the schemas were read; the
+                put is skipped if an invalidation happened since
+
+        Returns:
+            Whether the entry was stored
+        """
+        if not tool_id:
+            return False
+        if generation is not None and generation != self.generation:
+            return False
+        self._entries[tool_id] = schemas
+        self._entries.move_to_end(tool_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, tool_ids: Optional[Iterable[int]] = None) -> None:
+        """Drop the given tools, or every entry when ``tool_ids`` is None."""
+        self.generation += 1
+        if tool_ids is None:
+            self._entries.clear()
+            return
+        for tool_id in tool_ids:
+            self._entries.pop(tool_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "generation": self.generation,
+        }
+
+
+_schema_cache: Optional[ToolSchemaCache] = None
+
+
+def get_schema_cache() -> ToolSchemaCache:
+    """Process-wide schema cache shared by sync, aggregation and search."""
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = ToolSchemaCache()
+    return _schema_cache
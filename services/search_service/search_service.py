@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from core.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,6 +94,7 @@ class SearchService:
             logger.error(f"Failed to initialize SearchService: {e}")
             raise
 
+    @traced("search.query")
     async def search(
         self,
         query: str,
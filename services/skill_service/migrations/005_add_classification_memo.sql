@@ -0,0 +1,24 @@
+-- Migration 005: Add tool classification memo table
+-- Records the input each tool was last classified from, keyed by a hash of the
+-- tool name, description and the active skill catalog. Batch classification
+-- skips tools whose memo key is unchanged, so a sync no longer re-runs the LLM
+-- for tools that did not change.
+
+CREATE TABLE IF NOT EXISTS mcp.tool_classification_memo (
+    tool_id INTEGER PRIMARY KEY REFERENCES mcp.tools(id) ON DELETE CASCADE,
+
+    -- sha256(tool name + description + skill catalog version)
+    memo_key VARCHAR(64) NOT NULL,
+
+    -- Classification outcome, returned for memo hits without re-reading assignments
+    primary_skill_id VARCHAR(100),
+    assignments JSONB DEFAULT '[]'::jsonb,
+
+    classified_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE mcp.tool_classification_memo IS 'Last classification input hash per tool; unchanged tools skip LLM classification';
+COMMENT ON COLUMN mcp.tool_classification_memo.memo_key IS 'sha256 of tool name, description and skill catalog version';
+
+-- DOWN / ROLLBACK:
+-- DROP TABLE IF EXISTS mcp.tool_classification_memo;
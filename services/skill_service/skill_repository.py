@@ -26,6 +26,7 @@ class SkillRepository:
         - mcp.skill_categories: Skill category definitions
         - mcp.tool_skill_assignments: Tool-skill mappings with confidence
         - mcp.skill_suggestions: Pending skill suggestions from LLM
+        - mcp.tool_classification_memo: Input hash each tool was last classified from
     """
 
     def __init__(self, host: Optional[str] = None, port: Optional[int] = None):
@@ -45,6 +46,7 @@ class SkillRepository:
         self.skill_table = "skill_categories"
         self.assignment_table = "tool_skill_assignments"
         self.suggestion_table = "skill_suggestions"
+        self.memo_table = "tool_classification_memo"
 
         # Fields that should never be updated
         self._immutable_fields = ["id", "created_at"]
@@ -582,6 +584,85 @@ class SkillRepository:
             logger.error(f"Failed to check human override for tool {tool_id}: {e}")
             return False
 
+    # =========================================================================
+    # Classification Memo Operations
+    # =========================================================================
+
+    async def get_classification_memos(self, tool_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the classification memo for each of the given tools.
+
+        Args:
+            tool_ids: Tool database IDs
+
+        Returns:
+            Dict mapping tool_id to {memo_key, primary_skill_id, assignments}
+        """
+        if not tool_ids:
+            return {}
+
+        try:
+            async with self.db:
+                results = await self.db.query(
+                    f"""
+                    SELECT tool_id, memo_key, primary_skill_id, assignments
+                    FROM {self.schema}.{self.memo_table}
+                    WHERE tool_id = ANY($1)
+                    """,
+                    params=[list(tool_ids)],
+                )
+            memos = {}
+            for row in results or []:
+                assignments = row.get("assignments") or []
+                if isinstance(assignments, str):
+                    assignments = json.loads(assignments)
+                memos[row["tool_id"]] = {**row, "assignments": assignments}
+            return memos
+        except Exception as e:
+            logger.error(f"Failed to get classification memos for {len(tool_ids)} tools: {e}")
+            return {}
+
+    async def upsert_classification_memos(self, memos: List[Dict[str, Any]]) -> bool:
+        """
+        Insert or update classification memos in one statement.
+
+        Args:
+            memos: Dicts with tool_id, memo_key, primary_skill_id and assignments
+
+        Returns:
+            True if successful
+        """
+        if not memos:
+            return True
+
+        try:
+            async with self.db:
+                await self.db.execute(
+                    f"""
+                    INSERT INTO {self.schema}.{self.memo_table}
+                    (tool_id, memo_key, primary_skill_id, assignments, classified_at)
+                    SELECT m.tool_id, m.memo_key, m.primary_skill_id, m.assignments::jsonb, $5
+                    FROM unnest($1::int[], $2::text[], $3::text[], $4::text[])
+                        AS m(tool_id, memo_key, primary_skill_id, assignments)
+                    ON CONFLICT (tool_id) DO UPDATE SET
+                        memo_key = EXCLUDED.memo_key,
+                        primary_skill_id = EXCLUDED.primary_skill_id,
+                        assignments = EXCLUDED.assignments,
+                        classified_at = EXCLUDED.classified_at
+                    """,
+                    params=[
+                        [m["tool_id"] for m in memos],
+                        [m["memo_key"] for m in memos],
+                        [m.get("primary_skill_id") for m in memos],
+                        [json.dumps(m.get("assignments", [])) for m in memos],
+                        datetime.now(timezone.utc),
+                    ],
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(memos)} classification memos: {e}")
+            return False
+
     # =========================================================================
     # Skill Suggestion Operations
     # =========================================================================
@@ -1000,3 +1081,110 @@ class SkillRepository:
         except Exception as e:
             logger.error(f"Failed to atomically reassign tool {tool_id}: {e}")
             return False
+
+    async def replace_tool_assignments(
+        self, classifications: List[Dict[str, Any]], source: str = "llm_auto"
+    ) -> Optional[Dict[str, List]]:
+        """
+        Atomically replace the skill assignments of many tools.
+
+        TRANSACTION BOUNDARY: Delete Old Assignments + Insert New + Update Counts (atomic)
+
+        Tools with a human_manual or human_override assignment are left untouched.
+        Skill tool counts are adjusted once per skill by the net change.
+
+        Args:
+            classifications: Dicts with tool_id and assignments, a list of
+                {skill_id, confidence} ordered by confidence (first is primary)
+            source: Assignment source
+
+        Returns:
+            {"tool_ids": tools written, "skill_ids": skills whose assignments
+            changed}, or None on failure
+        """
+        if not classifications:
+            return {"tool_ids": [], "skill_ids": []}
+
+        try:
+            await self.db._ensure_connected()
+
+            async with self.db._pool.acquire() as conn:
+                async with conn.transaction():
+                    now = datetime.now(timezone.utc)
+                    tool_ids = [c["tool_id"] for c in classifications]
+
+                    # Step 1: Skip tools a human has classified
+                    rows = await conn.fetch(
+                        f"""
+                        SELECT DISTINCT tool_id FROM {self.schema}.{self.assignment_table}
+                        WHERE tool_id = ANY($1::int[])
+                          AND source IN ('human_manual', 'human_override')
+                        """,
+                        tool_ids,
+                    )
+                    protected = {row["tool_id"] for row in rows}
+                    classifications = [c for c in classifications if c["tool_id"] not in protected]
+                    tool_ids = [c["tool_id"] for c in classifications]
+
+                    # Step 2: Delete old assignments
+                    old_rows = await conn.fetch(
+                        f"""
+                        DELETE FROM {self.schema}.{self.assignment_table}
+                        WHERE tool_id = ANY($1::int[])
+                        RETURNING skill_id
+                        """,
+                        tool_ids,
+                    )
+
+                    # Step 3: Insert new assignments
+                    new_rows = [
+                        (c["tool_id"], a["skill_id"], a["confidence"], i == 0)
+                        for c in classifications
+                        for i, a in enumerate(c["assignments"])
+                    ]
+                    if new_rows:
+                        await conn.execute(
+                            f"""
+                            INSERT INTO {self.schema}.{self.assignment_table}
+                            (tool_id, skill_id, confidence, is_primary, source, created_at)
+                            SELECT a.tool_id, a.skill_id, a.confidence, a.is_primary, $5, $6
+                            FROM unnest($1::int[], $2::text[], $3::numeric[], $4::bool[])
+                                AS a(tool_id, skill_id, confidence, is_primary)
+                            """,
+                            [r[0] for r in new_rows],
+                            [r[1] for r in new_rows],
+                            [r[2] for r in new_rows],
+                            [r[3] for r in new_rows],
+                            source,
+                            now,
+                        )
+
+                    # Step 4: Apply the net tool count change per skill
+                    deltas: Dict[str, int] = {}
+                    for row in old_rows:
+                        deltas[row["skill_id"]] = deltas.get(row["skill_id"], 0) - 1
+                    for row in new_rows:
+                        deltas[row[1]] = deltas.get(row[1], 0) + 1
+                    deltas = {k: v for k, v in deltas.items() if v}
+                    if deltas:
+                        await conn.execute(
+                            f"""
+                            UPDATE {self.schema}.{self.skill_table} AS s
+                            SET tool_count = GREATEST(0, s.tool_count + d.delta), updated_at = $3
+                            FROM unnest($1::text[], $2::int[]) AS d(skill_id, delta)
+                            WHERE s.id = d.skill_id
+                            """,
+                            list(deltas),
+                            list(deltas.values()),
+                            now,
+                        )
+
+            skill_ids = {row["skill_id"] for row in old_rows} | {row[1] for row in new_rows}
+            logger.debug(
+                f"Replaced assignments for {len(tool_ids)} tools ({len(new_rows)} assignments)"
+            )
+            return {"tool_ids": tool_ids, "skill_ids": sorted(skill_ids)}
+
+        except Exception as e:
+            logger.error(f"Failed to replace assignments for {len(classifications)} tools: {e}")
+            return None
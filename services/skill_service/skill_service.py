@@ -8,6 +8,8 @@ Provides:
 - Manual assignment overrides
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import uuid
@@ -15,6 +17,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from .skill_repository import SkillRepository
+from core.clients.embedding_batcher import estimate_tokens
 from core.clients.model_client import get_model_client
 from core.config import get_settings
 
@@ -24,6 +27,8 @@ logger = logging.getLogger(__name__)
 MIN_CONFIDENCE_THRESHOLD = 0.5
 MAX_ASSIGNMENTS_PER_TOOL = 3
 MAX_DESCRIPTION_LENGTH = 2000  # Truncate for LLM context
+CLASSIFICATION_CONCURRENCY = 4  # Batch LLM calls in flight
+CLASSIFICATION_BATCH_TOKENS = 2000  # Estimated tool-list tokens per batch prompt
 
 
 class SkillService:
@@ -514,17 +519,30 @@ Description: {tool_description}
             raise RuntimeError(f"Classification failed: {e}")
 
     async def classify_tools_batch(
-        self, tools: List[Dict[str, Any]], batch_size: int = 20
+        self,
+        tools: List[Dict[str, Any]],
+        batch_size: int = 20,
+        force_reclassify: bool = False,
+        concurrency: int = CLASSIFICATION_CONCURRENCY,
     ) -> List[Dict[str, Any]]:
         """
         Classify multiple tools in batched LLM calls.
 
+        Tools whose name, description and the skill catalog are unchanged since
+        their last classification are served from the classification memo.
+        The rest are packed into batches by estimated prompt tokens and
+        classified concurrently. Assignments are then written in one
+        transaction, and each affected skill's embedding is updated once.
+
         Args:
             tools: List of tool dicts with 'tool_id', 'tool_name', 'description'
-            batch_size: Number of tools per LLM call (default: 20)
+            batch_size: Maximum tools per LLM call (default: 20)
+            force_reclassify: Ignore the classification memo
+            concurrency: Maximum LLM calls in flight
 
         Returns:
-            List of classification results
+            List of classification results (same order as input); memo hits
+            have ``cached`` set and their assignments are still written
         """
         if not tools:
             return []
@@ -538,58 +556,173 @@ Description: {tool_description}
                 for t in tools
             ]
 
-        results = []
+        catalog_version = self._skill_catalog_version(skills)
+        memo_keys = {
+            t["tool_id"]: self._classification_memo_key(
+                t["tool_name"], t.get("description", ""), catalog_version
+            )
+            for t in tools
+        }
+        memos = (
+            {}
+            if force_reclassify
+            else await self.repository.get_classification_memos(list(memo_keys))
+        )
 
-        # Process in batches
-        for i in range(0, len(tools), batch_size):
-            batch = tools[i : i + batch_size]
-            logger.debug(f"Classifying batch {i // batch_size + 1} ({len(batch)} tools)...")
+        results: Dict[int, Dict[str, Any]] = {}
+        # Memo hits skip the LLM call but are written like fresh results
+        classified = []
+        pending = []
+        for tool in tools:
+            memo = memos.get(tool["tool_id"])
+            if memo and memo.get("memo_key") == memo_keys[tool["tool_id"]]:
+                result = {
+                    "tool_id": tool["tool_id"],
+                    "tool_name": tool["tool_name"],
+                    "assignments": memo.get("assignments") or [],
+                    "primary_skill_id": memo.get("primary_skill_id"),
+                    "cached": True,
+                }
+                classified.append(result)
+                results[tool["tool_id"]] = result
+            else:
+                pending.append(tool)
 
-            try:
-                # Call LLM for batch
-                batch_results = await self._llm_classify_batch(batch, skills)
+        batches = self._pack_classification_batches(pending, batch_size)
+        logger.info(
+            f"Classifying {len(pending)} tools in {len(batches)} batches "
+            f"({len(tools) - len(pending)} unchanged)"
+        )
 
-                # Process each result
-                for tool, classification in zip(batch, batch_results):
-                    tool_id = tool["tool_id"]
-                    tool_name = tool["tool_name"]
+        semaphore = asyncio.Semaphore(concurrency)
 
-                    try:
-                        # Filter and store assignments
-                        result = await self._store_classification(
-                            tool_id=tool_id,
-                            tool_name=tool_name,
-                            classification=classification,
-                            skills=skills,
-                        )
-                        results.append(result)
-                    except Exception as e:
-                        logger.error(f"Failed to store classification for {tool_name}: {e}")
-                        results.append(
-                            {
-                                "tool_id": tool_id,
-                                "tool_name": tool_name,
-                                "assignments": [],
-                                "primary_skill_id": None,
-                                "error": str(e),
-                            }
-                        )
+        async def classify(batch: List[Dict[str, Any]]) -> List[Any]:
+            async with semaphore:
+                try:
+                    return await self._llm_classify_batch(batch, skills)
+                except Exception as e:
+                    logger.error(f"Batch classification failed: {e}")
+                    return [e] * len(batch)
 
-            except Exception as e:
-                logger.error(f"Batch classification failed: {e}")
-                # Return empty results for failed batch
-                for tool in batch:
-                    results.append(
-                        {
-                            "tool_id": tool["tool_id"],
-                            "tool_name": tool["tool_name"],
-                            "assignments": [],
-                            "primary_skill_id": None,
-                            "error": str(e),
-                        }
+        outcomes = await asyncio.gather(*(classify(batch) for batch in batches))
+
+        # Collect all valid assignments for one bulk write
+        skill_ids = {s["id"] for s in skills}
+        memoize = set()
+        for batch, batch_results in zip(batches, outcomes):
+            for tool, classification in zip(batch, batch_results):
+                result = {
+                    "tool_id": tool["tool_id"],
+                    "tool_name": tool["tool_name"],
+                    "assignments": [],
+                    "primary_skill_id": None,
+                }
+                if isinstance(classification, Exception):
+                    result["error"] = str(classification)
+                else:
+                    result["assignments"] = self._valid_assignments(classification, skill_ids)
+                    if result["assignments"]:
+                        result["primary_skill_id"] = result["assignments"][0]["skill_id"]
+                    # Placeholder results for unparseable responses have no tool_name
+                    if classification.get("tool_name"):
+                        memoize.add(tool["tool_id"])
+                    classified.append(result)
+                results[tool["tool_id"]] = result
+
+        written = await self.repository.replace_tool_assignments(
+            [
+                {"tool_id": r["tool_id"], "assignments": r["assignments"]}
+                for r in classified
+                if r["assignments"]
+            ]
+        )
+        if written is None:
+            for result in classified:
+                if result["assignments"]:
+                    memoize.discard(result["tool_id"])
+                    result.update(assignments=[], primary_skill_id=None)
+                    result["error"] = "Failed to store classification"
+            written = {"tool_ids": [], "skill_ids": []}
+
+        # Update Qdrant payloads for tools whose assignments were written
+        written_ids = set(written["tool_ids"])
+
+        async def update_payload(result: Dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    await self._update_tool_qdrant_payload(
+                        tool_id=result["tool_id"],
+                        skill_ids=[a["skill_id"] for a in result["assignments"]],
+                        primary_skill_id=result["primary_skill_id"],
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to update Qdrant payload for tool {result['tool_id']}: {e}"
                     )
 
-        return results
+        await asyncio.gather(
+            *(update_payload(r) for r in classified if r["tool_id"] in written_ids)
+        )
+
+        # Re-embed each affected skill once
+        for skill_id in written["skill_ids"]:
+            await self._trigger_skill_embedding_update(skill_id)
+
+        await self.repository.upsert_classification_memos(
+            [
+                {
+                    "tool_id": r["tool_id"],
+                    "memo_key": memo_keys[r["tool_id"]],
+                    "primary_skill_id": r["primary_skill_id"],
+                    "assignments": r["assignments"],
+                }
+                for r in classified
+                if r["tool_id"] in memoize
+            ]
+        )
+
+        return [results[t["tool_id"]] for t in tools]
+
+    @staticmethod
+    def _skill_catalog_version(skills: List[Dict[str, Any]]) -> str:
+        """Fingerprint of the skill catalog shown to the classifier."""
+        catalog = sorted((s["id"], s["name"], s.get("description", "")) for s in skills)
+        return hashlib.sha256(json.dumps(catalog).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _classification_memo_key(tool_name: str, description: str, catalog_version: str) -> str:
+        """Memo key for a tool's classification input."""
+        content = json.dumps([tool_name, description or "", catalog_version])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _pack_classification_batches(
+        tools: List[Dict[str, Any]], batch_size: int
+    ) -> List[List[Dict[str, Any]]]:
+        """Pack tools into batches bounded by count and estimated prompt tokens."""
+        batches: List[List[Dict[str, Any]]] = []
+        batch: List[Dict[str, Any]] = []
+        tokens = 0
+        for tool in tools:
+            # Matches the per-tool line in the batch prompt
+            cost = estimate_tokens(f"{tool['tool_name']}: {(tool.get('description') or '')[:200]}")
+            if batch and (len(batch) >= batch_size or tokens + cost > CLASSIFICATION_BATCH_TOKENS):
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(tool)
+            tokens += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _valid_assignments(classification: Dict[str, Any], skill_ids: set) -> List[Dict[str, Any]]:
+        """Known-skill assignments above the confidence threshold; the first is primary."""
+        return [
+            {"skill_id": a["skill_id"], "confidence": a.get("confidence", 0.8)}
+            for a in classification.get("assignments", [])
+            if a.get("skill_id") in skill_ids and a.get("confidence", 0) >= MIN_CONFIDENCE_THRESHOLD
+        ][:MAX_ASSIGNMENTS_PER_TOOL]
 
     async def _llm_classify_batch(
         self, tools: List[Dict[str, Any]], available_skills: List[Dict[str, Any]]
@@ -689,76 +822,6 @@ Return exactly {len(tools)} classifications. Most tools should have only 1 assig
             logger.error(f"Batch LLM classification failed: {e}")
             raise
 
-    async def _store_classification(
-        self,
-        tool_id: int,
-        tool_name: str,
-        classification: Dict[str, Any],
-        skills: List[Dict[str, Any]],
-    ) -> Dict[str, Any]:
-        """
-        Store classification results in PostgreSQL and update Qdrant.
-
-        Args:
-            tool_id: Tool database ID
-            tool_name: Tool name
-            classification: LLM classification result
-            skills: Available skills for validation
-
-        Returns:
-            Stored classification result
-        """
-        # Validate skill IDs
-        skill_ids = {s["id"] for s in skills}
-        valid_assignments = [
-            a
-            for a in classification.get("assignments", [])
-            if a.get("skill_id") in skill_ids and a.get("confidence", 0) >= MIN_CONFIDENCE_THRESHOLD
-        ][:MAX_ASSIGNMENTS_PER_TOOL]
-
-        # Delete existing assignments
-        if valid_assignments:
-            await self.repository.delete_assignments_for_tool(tool_id)
-
-        # Store new assignments
-        stored_assignments = []
-        primary_skill_id = None
-
-        for i, assignment in enumerate(valid_assignments):
-            is_primary = i == 0
-            stored = await self.repository.create_assignment(
-                tool_id=tool_id,
-                skill_id=assignment["skill_id"],
-                confidence=assignment.get("confidence", 0.8),
-                is_primary=is_primary,
-                source="llm_auto",
-            )
-            if stored:
-                stored_assignments.append(stored)
-                if is_primary:
-                    primary_skill_id = assignment["skill_id"]
-
-                # Update skill tool count
-                await self.repository.increment_tool_count(assignment["skill_id"], 1)
-
-        # Update Qdrant payload
-        if stored_assignments:
-            try:
-                await self._update_tool_qdrant_payload(
-                    tool_id=tool_id,
-                    skill_ids=[a["skill_id"] for a in valid_assignments],
-                    primary_skill_id=primary_skill_id,
-                )
-            except Exception as e:
-                logger.warning(f"Failed to update Qdrant payload for tool {tool_id}: {e}")
-
-        return {
-            "tool_id": tool_id,
-            "tool_name": tool_name,
-            "assignments": stored_assignments,
-            "primary_skill_id": primary_skill_id,
-        }
-
     # =========================================================================
     # Generic Entity Classification (for resources, prompts, etc.)
     # =========================================================================
@@ -13,6 +13,10 @@ import os
 import uuid
 from typing import Any, Dict, List, Optional, Tuple
 
+from core.config import get_settings
+from core.tracing import traced
+from services.search_service.schema_cache import ToolSchemas, get_schema_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -135,6 +139,7 @@ class SyncService:
             logger.error(f"Failed to initialize SyncService: {e}")
             raise
 
+    @traced("sync.all")
     async def sync_all(self) -> Dict[str, Any]:
         """
         Sync all tools, prompts, resources, and skills with automatic cleanup
@@ -170,6 +175,7 @@ class SyncService:
             "details": results,
         }
 
+    @traced("sync.tools")
     async def sync_tools(self) -> Dict[str, Any]:
         """
         Sync tools from MCP Server API to database with BATCH embeddings
@@ -244,6 +250,9 @@ class SyncService:
             items_to_classify_only = (
                 []
             )  # List of (db_record, tool_data) - need classification but not embedding
+            synced_schemas: Dict[int, ToolSchemas] = {}  # db_id -> schemas written this run
+            stale_payloads = []  # (db_id, schemas) - tools keeping their vector, new schemas
+            schemas_in_payload = get_settings().schemas_in_vector_payload
             skipped = 0
             failed = 0
             errors = []
@@ -266,6 +275,24 @@ class SyncService:
                         needs_classification,
                     ) = await self._prepare_tool_for_sync(tool.name, tool_info, existing_qdrant)
 
+                    db_id = _normalize_db_id(db_record["id"])
+                    schemas = ToolSchemas.from_row(db_record)
+                    if db_id is not None:
+                        synced_schemas[db_id] = schemas
+                        if (
+                            not needs_embedding
+                            and existing_qdrant
+                            and (
+                                existing_qdrant.get("schema_hash") != schemas.schema_hash
+                                or (
+                                    schemas_in_payload
+                                    and existing_qdrant.get("payload_schemas_hash")
+                                    != schemas.schema_hash
+                                )
+                            )
+                        ):
+                            stale_payloads.append((db_id, schemas))
+
                     if needs_embedding:
                         # Needs full sync (embed + classify)
                         search_text = self._build_search_text(tool_data)
@@ -288,6 +315,25 @@ class SyncService:
                     failed += 1
                     errors.append({"tool": tool.name, "error": str(e)})
 
+            # Refresh the search schema cache from the rows just written
+            orphaned_db_ids = [
+                _normalize_db_id(t.get("db_id"))
+                for t in qdrant_tools_dict.values()
+                if t["name"] not in mcp_tool_names
+            ]
+            schema_cache = get_schema_cache()
+            schema_cache.invalidate(
+                [i for i in orphaned_db_ids if i is not None] + list(synced_schemas)
+            )
+            for db_id, schemas in synced_schemas.items():
+                schema_cache.put(db_id, schemas)
+
+            # Schema-only changes keep the embedding; just refresh the payload
+            for db_id, schemas in stale_payloads:
+                await self.vector_repo.update_tool_schemas(
+                    db_id, self._schema_payload(schemas, schemas_in_payload)
+                )
+
             # 6. Generate embeddings concurrently via ISA Model
             synced = 0
             if items_to_embed:
@@ -347,6 +393,9 @@ class SyncService:
                                     "has_schema": bool(tool_data.get("input_schema")),
                                     "org_id": db_record.get("org_id"),
                                     "is_global": db_record.get("is_global", True),
+                                    **self._schema_payload(
+                                        ToolSchemas.from_row(db_record), schemas_in_payload
+                                    ),
                                 },
                             )
                             if success:
@@ -465,6 +514,14 @@ class SyncService:
                 "errors": [str(e)],
             }
 
+    @staticmethod
+    def _schema_payload(schemas: ToolSchemas, include_schemas: bool) -> Dict[str, Any]:
+        """Schema fields of a tool's vector payload; full schemas only if configured."""
+        fields: Dict[str, Any] = {"schema_hash": schemas.schema_hash}
+        if include_schemas:
+            fields["schemas"] = schemas.to_dict()
+        return fields
+
     async def _prepare_tool_for_sync(
         self,
         tool_name: str,
@@ -567,6 +624,7 @@ class SyncService:
         """Build search-friendly text for resources."""
         return self._build_search_text(item_data)
 
+    @traced("sync.prompts")
     async def sync_prompts(self) -> Dict[str, Any]:
         """Sync prompts from MCP Server API to database with BATCH embeddings"""
         logger.debug("Syncing prompts from MCP Server...")
@@ -811,6 +869,7 @@ class SyncService:
 
         return db_record, prompt_data, needs_update
 
+    @traced("sync.resources")
     async def sync_resources(self) -> Dict[str, Any]:
         """Sync resources from MCP Server API with BATCH embeddings"""
         logger.debug("Syncing resources from MCP Server...")
@@ -1053,6 +1112,7 @@ class SyncService:
 
         return db_record, resource_data, needs_update
 
+    @traced("sync.skills")
     async def sync_skills(self) -> Dict[str, Any]:
         """
         Sync skill categories from PostgreSQL to Qdrant mcp_skills collection.
@@ -1325,47 +1385,40 @@ class SyncService:
                     "errors": [],
                 }
 
-            classified = 0
-            failed = 0
-            errors = []
-
-            for idx, tool in enumerate(tools_to_classify):
+            tools_for_batch = []
+            for tool in tools_to_classify:
                 tool_id = tool.get("db_id") or tool.get("id")
                 tool_name = tool.get("name", "unknown")
-                description = tool.get("description", "")
 
+                # Skip if not a valid tool ID (must be int for PostgreSQL FK)
                 try:
-                    # Skip if not a valid tool ID (must be int for PostgreSQL FK)
-                    if not isinstance(tool_id, int):
-                        try:
-                            tool_id = int(tool_id)
-                        except (ValueError, TypeError):
-                            logger.warning(f"  Skipping tool '{tool_name}' - invalid ID: {tool_id}")
-                            continue
-
-                    logger.info(
-                        f"  [{idx + 1}/{len(tools_to_classify)}] Classifying '{tool_name}' (ID: {tool_id})..."
-                    )
+                    tool_id = int(tool_id)
+                except (ValueError, TypeError):
+                    logger.warning(f"  Skipping tool '{tool_name}' - invalid ID: {tool_id}")
+                    continue
 
-                    result = await self.skill_service.classify_tool(
-                        tool_id=tool_id,
-                        tool_name=tool_name,
-                        tool_description=description,
-                        force_reclassify=force_reclassify,
-                    )
+                tools_for_batch.append(
+                    {
+                        "tool_id": tool_id,
+                        "tool_name": tool_name,
+                        "description": tool.get("description", ""),
+                    }
+                )
 
-                    if result.get("primary_skill_id"):
-                        classified += 1
-                        logger.info(f"    ✅ Classified as: {result['primary_skill_id']}")
-                    elif result.get("skipped"):
-                        logger.info("    ⏭️  Skipped (already classified)")
-                    else:
-                        logger.warning(f"    ⚠️  No skill matched for '{tool_name}'")
+            # Concurrent batches; unchanged tools are served from the classification memo
+            batch_results = await self.skill_service.classify_tools_batch(
+                tools_for_batch, force_reclassify=force_reclassify
+            )
 
-                except Exception as e:
-                    logger.error(f"    ❌ Failed to classify '{tool_name}': {e}")
-                    failed += 1
-                    errors.append({"tool": tool_name, "id": tool_id, "error": str(e)})
+            classified = sum(1 for r in batch_results if r.get("primary_skill_id"))
+            errors = [
+                {"tool": r.get("tool_name"), "id": r["tool_id"], "error": r["error"]}
+                for r in batch_results
+                if r.get("error")
+            ]
+            failed = len(errors)
+            cached = sum(1 for r in batch_results if r.get("cached"))
+            logger.info(f"  {cached} tools unchanged since their last classification")
 
             logger.info(
                 f"🎯 Bulk classification completed: {classified} classified, {failed} failed"
@@ -341,6 +341,137 @@ class ToolRepository:
             logger.error(f"Failed to upsert external tool {name}: {e}")
             return None
 
+    async def get_external_tool_fingerprints(self, server_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the content fingerprint of every tool from an external server.
+
+        Used by tool discovery to skip tools that have not changed.
+
+        Args:
+            server_id: External server UUID
+
+        Returns:
+            Dict mapping tool name to {id, content_hash, is_classified}
+        """
+        try:
+            sql = f"""
+                SELECT id, name, is_classified, metadata->>'content_hash' AS content_hash
+                FROM {self.schema}.{self.table}
+                WHERE source_server_id = $1
+            """
+
+            async with self.db:
+                results = await self.db.query(sql, params=[server_id])
+
+            return {
+                row["name"]: {
+                    "id": row["id"],
+                    "content_hash": row.get("content_hash"),
+                    "is_classified": row.get("is_classified", False),
+                }
+                for row in results or []
+            }
+        except Exception as e:
+            logger.error(f"Failed to get tool fingerprints for server {server_id}: {e}")
+            return {}
+
+    async def upsert_external_tools(
+        self, tools: List[Dict[str, Any]], chunk_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Upsert many external tools with multi-row INSERT ... ON CONFLICT statements.
+
+        Args:
+            tools: Tool dicts with name, description, input_schema, source_server_id,
+                original_name, org_id, is_global and optional content_hash
+            chunk_size: Rows per statement (keeps the bind parameter count bounded)
+
+        Returns:
+            Dict mapping tool name to tool ID for rows written
+        """
+        ids: Dict[str, int] = {}
+        columns = 8
+
+        for start in range(0, len(tools), chunk_size):
+            chunk = tools[start : start + chunk_size]
+            values_sql = []
+            params: List[Any] = []
+
+            for i, tool in enumerate(chunk):
+                base = i * columns
+                values_sql.append(
+                    f"(${base + 1}, ${base + 2}, ${base + 3}::jsonb, ${base + 4}, ${base + 5}, "
+                    f"TRUE, FALSE, TRUE, ${base + 6}, ${base + 7}, ${base + 8}::jsonb)"
+                )
+                input_schema = tool.get("input_schema", {})
+                content_hash = tool.get("content_hash")
+                params.extend(
+                    [
+                        tool["name"],
+                        tool.get("description", ""),
+                        (
+                            json.dumps(input_schema)
+                            if isinstance(input_schema, dict)
+                            else input_schema
+                        ),
+                        tool["source_server_id"],
+                        tool["original_name"],
+                        tool.get("org_id"),
+                        tool.get("is_global", True),
+                        json.dumps({"content_hash": content_hash} if content_hash else {}),
+                    ]
+                )
+
+            sql = f"""
+                INSERT INTO {self.schema}.{self.table}
+                (name, description, input_schema, source_server_id, original_name, is_external, is_classified, is_active, org_id, is_global, metadata)
+                VALUES {', '.join(values_sql)}
+                ON CONFLICT (name) DO UPDATE SET
+                    description = EXCLUDED.description,
+                    input_schema = EXCLUDED.input_schema,
+                    source_server_id = EXCLUDED.source_server_id,
+                    original_name = EXCLUDED.original_name,
+                    org_id = EXCLUDED.org_id,
+                    is_global = EXCLUDED.is_global,
+                    metadata = (COALESCE({self.table}.metadata, '{{}}'::jsonb) - 'content_hash')
+                        || EXCLUDED.metadata,
+                    updated_at = NOW()
+                RETURNING id, name
+            """
+
+            try:
+                async with self.db:
+                    results = await self.db.query(sql, params=params)
+                for row in results or []:
+                    ids[row["name"]] = row["id"]
+            except Exception as e:
+                logger.error(f"Failed to upsert {len(chunk)} external tools: {e}")
+
+        if ids:
+            cache = get_cache()
+            await cache.invalidate_pattern("tool_list:")
+        return ids
+
+    async def clear_content_hashes(self, tool_ids: List[int]) -> None:
+        """
+        Clear stored content fingerprints so the next discovery re-indexes these tools.
+
+        Args:
+            tool_ids: Tool IDs whose vector indexing failed
+        """
+        if not tool_ids:
+            return
+        try:
+            sql = f"""
+                UPDATE {self.schema}.{self.table}
+                SET metadata = COALESCE(metadata, '{{}}'::jsonb) - 'content_hash'
+                WHERE id = ANY($1)
+            """
+            async with self.db:
+                await self.db.execute(sql, params=[list(tool_ids)])
+        except Exception as e:
+            logger.error(f"Failed to clear content hashes for {len(tool_ids)} tools: {e}")
+
     async def update_tool(self, tool_id: int, updates: Dict[str, Any]) -> bool:
         """Update tool (invalidates cache)"""
         try:
@@ -620,6 +751,38 @@ class ToolRepository:
             logger.error(f"Failed to delete tools for server {server_id}: {e}")
             return 0
 
+    async def delete_tools(self, tool_ids: List[int]) -> int:
+        """
+        Delete specific tools in one statement.
+
+        Args:
+            tool_ids: Tool IDs to delete
+
+        Returns:
+            Number of tools deleted
+        """
+        if not tool_ids:
+            return 0
+
+        try:
+            delete_sql = f"""
+                WITH deleted AS (
+                    DELETE FROM {self.schema}.{self.table}
+                    WHERE id = ANY($1)
+                    RETURNING 1
+                )
+                SELECT COUNT(*) as count FROM deleted
+            """
+            async with self.db:
+                result = await self.db.query_row(delete_sql, params=[list(tool_ids)])
+                count = result.get("count", 0) if result else 0
+
+            logger.info(f"Deleted {count} tools")
+            return count
+        except Exception as e:
+            logger.error(f"Failed to delete {len(tool_ids)} tools: {e}")
+            return 0
+
     async def update_tool_classification(
         self, tool_id: int, skill_ids: List[str], primary_skill_id: Optional[str] = None
     ) -> bool:
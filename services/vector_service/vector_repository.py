@@ -20,6 +20,10 @@ _OVERFLOW_WARNING_THRESHOLD = 900_000  # Warn at 90% capacity
 _MAX_RETRIES = 3
 _RETRY_BASE_DELAY = 0.5  # seconds
 
+# Metadata keys stored at the top level of the payload: tenant fields for Qdrant
+# filtering, schema fields so search can validate or skip schema enrichment
+_TOP_LEVEL_METADATA_KEYS = ("org_id", "is_global", "schema_hash", "schemas")
+
 
 async def _retry_qdrant(coro_factory, operation_name: str, max_retries: int = _MAX_RETRIES):
     """Retry a Qdrant operation with exponential backoff.
@@ -201,11 +205,10 @@ class VectorRepository:
 
             # Add metadata if provided
             if metadata:
-                # Promote org_id and is_global to top-level payload for Qdrant filtering
-                if "org_id" in metadata:
-                    payload["org_id"] = metadata.pop("org_id")
-                if "is_global" in metadata:
-                    payload["is_global"] = metadata.pop("is_global")
+                # Promote filter and schema fields to the top-level payload
+                for key in _TOP_LEVEL_METADATA_KEYS:
+                    if key in metadata:
+                        payload[key] = metadata.pop(key)
                 payload["metadata"] = metadata
 
             # Compute unique point ID using type offset to prevent collisions
@@ -282,6 +285,75 @@ class VectorRepository:
             metadata=metadata,
         )
 
+    async def upsert_tools(self, tools: List[Dict[str, Any]], batch_size: int = 256) -> List[int]:
+        """
+        Upsert many tool vectors with batched ``upsert_points`` calls.
+
+        Used by ToolAggregator to index a whole server's tools at once.
+
+        Args:
+            tools: Dicts with tool_id, name, description, embedding and optional metadata
+            batch_size: Points per Qdrant request
+
+        Returns:
+            Tool IDs that were upserted
+        """
+        points = []
+        for tool in tools:
+            embedding = tool["embedding"]
+            if len(embedding) != self.vector_dimension:
+                logger.error(
+                    f"Vector dimension mismatch for tool {tool['tool_id']}: "
+                    f"expected {self.vector_dimension}, got {len(embedding)}"
+                )
+                continue
+
+            payload = {
+                "type": "tool",
+                "name": tool["name"],
+                "description": tool["description"],
+                "db_id": tool["tool_id"],
+                "is_active": True,
+            }
+            metadata = dict(tool.get("metadata") or {})
+            if metadata:
+                # Promote filter and schema fields to the top-level payload
+                for key in _TOP_LEVEL_METADATA_KEYS:
+                    if key in metadata:
+                        payload[key] = metadata.pop(key)
+                payload["metadata"] = metadata
+
+            points.append(
+                {
+                    "id": self._compute_point_id("tool", tool["tool_id"]),
+                    "vector": embedding,
+                    "payload": payload,
+                }
+            )
+
+        upserted: List[int] = []
+        for start in range(0, len(points), batch_size):
+            batch = points[start : start + batch_size]
+            try:
+                operation_id = await _retry_qdrant(
+                    lambda: self.client.upsert_points(self.collection_name, batch),
+                    operation_name=f"upsert {len(batch)} tool points",
+                )
+            except Exception as e:
+                logger.error(f"❌ [VectorRepo] Batch upsert of {len(batch)} tools failed: {e}")
+                continue
+
+            if operation_id:
+                upserted.extend(point["payload"]["db_id"] for point in batch)
+            else:
+                logger.error(
+                    f"❌ [VectorRepo] Batch upsert of {len(batch)} tools failed - "
+                    f"Qdrant returned None"
+                )
+
+        logger.debug(f"✅ [VectorRepo] Upserted {len(upserted)}/{len(tools)} tool vectors")
+        return upserted
+
     async def update_tool_skills(
         self,
         tool_id: int,
@@ -311,6 +383,22 @@ class VectorRepository:
             },
         )
 
+    async def update_tool_schemas(self, tool_id: int, schema_fields: Dict[str, Any]) -> bool:
+        """
+        Update a tool's schema fields (``schema_hash``, ``schemas``) in its payload.
+
+        Called by sync when a tool's schemas change but its embedding does not.
+
+        Args:
+            tool_id: PostgreSQL tool ID
+            schema_fields: Payload fields to set
+
+        Returns:
+            Success status
+        """
+        point_id = self._compute_point_id("tool", tool_id)
+        return await self.update_payload(item_id=point_id, payload_updates=schema_fields)
+
     async def delete_tool(self, tool_id: int) -> bool:
         """
         Delete a tool vector by its PostgreSQL ID.
@@ -324,6 +412,20 @@ class VectorRepository:
         point_id = self._compute_point_id("tool", tool_id)
         return await self.delete_vector(point_id)
 
+    async def delete_tools(self, tool_ids: List[int]) -> int:
+        """
+        Delete many tool vectors in one request.
+
+        Args:
+            tool_ids: PostgreSQL tool IDs
+
+        Returns:
+            Number of vectors deleted
+        """
+        return await self.delete_multiple_vectors(
+            [self._compute_point_id("tool", tool_id) for tool_id in tool_ids]
+        )
+
     async def search_vectors(
         self,
         query_embedding: List[float],
@@ -544,6 +646,10 @@ class VectorRepository:
                             "metadata": point["payload"].get("metadata", {}),
                             "primary_skill_id": point["payload"].get("primary_skill_id"),
                             "skill_ids": point["payload"].get("skill_ids", []),
+                            "schema_hash": point["payload"].get("schema_hash"),
+                            "payload_schemas_hash": (point["payload"].get("schemas") or {}).get(
+                                "schema_hash"
+                            ),
                         }
                     )
 
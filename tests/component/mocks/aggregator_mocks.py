@@ -130,6 +130,15 @@ class MockServerRegistry:
     def __init__(self):
         self.servers: Dict[str, Dict[str, Any]] = {}
         self._calls: List[Dict[str, Any]] = []
+        self._listeners: List[Any] = []
+
+    def add_listener(self, listener) -> None:
+        """Register a listener for registry events."""
+        self._listeners.append(listener)
+
+    async def _emit(self, event: str, payload: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            await listener(event, payload)
 
     def _record_call(self, method: str, **kwargs):
         """Record a method call."""
@@ -176,6 +185,7 @@ class MockServerRegistry:
         }
 
         self.servers[server_id] = server
+        await self._emit("server.registered", server)
         return server
 
     async def get(self, server_id: str) -> Optional[Dict[str, Any]]:
@@ -213,6 +223,7 @@ class MockServerRegistry:
             return False
 
         del self.servers[server_id]
+        await self._emit("server.removed", {"server_id": server_id})
         return True
 
     async def list(self, status: ServerStatus = None) -> List[Dict[str, Any]]:
@@ -243,6 +254,13 @@ class MockServerRegistry:
         if status == ServerStatus.CONNECTED:
             self.servers[server_id]["connected_at"] = datetime.now(timezone.utc)
 
+        await self._emit(
+            "server.status_changed",
+            {
+                "server_id": server_id,
+                "status": status,
+            },
+        )
         return True
 
     async def update_tool_count(self, server_id: str, count: int) -> bool:
@@ -265,6 +283,18 @@ class MockServerRegistry:
         self.servers[server_id]["last_health_check"] = datetime.now(timezone.utc)
         return True
 
+    async def update_last_health_checks(self, server_ids: List[str]) -> int:
+        """Update last health check timestamp for many servers."""
+        self._record_call("update_last_health_checks", server_ids=list(server_ids))
+
+        now = datetime.now(timezone.utc)
+        updated = 0
+        for server_id in server_ids:
+            if server_id in self.servers:
+                self.servers[server_id]["last_health_check"] = now
+                updated += 1
+        return updated
+
 
 class MockExternalServer:
     """
@@ -423,6 +453,7 @@ class MockSessionManager:
         self._calls: List[Dict[str, Any]] = []
         self._should_fail_connect: Dict[str, bool] = {}
         self._server_registry = server_registry
+        self._notification_listeners: List[Any] = []
 
     def _record_call(self, method: str, **kwargs):
         """Record a method call."""
@@ -434,6 +465,15 @@ class MockSessionManager:
             return [c for c in self._calls if c["method"] == method]
         return self._calls
 
+    def add_notification_listener(self, listener) -> None:
+        """Register a listener for server notifications."""
+        self._notification_listeners.append(listener)
+
+    async def notify(self, server_id: str, method: str) -> None:
+        """Deliver a server notification to listeners."""
+        for listener in self._notification_listeners:
+            await listener(server_id, method)
+
     def set_should_fail_connect(self, server_id: str, should_fail: bool = True):
         """Configure connection to fail for a server."""
         self._should_fail_connect[server_id] = should_fail
@@ -618,6 +658,55 @@ class MockToolRepository:
 
         return tool_id
 
+    async def get_external_tool_fingerprints(self, server_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get name -> {id, content_hash, is_classified} for a server's tools."""
+        self._record_call("get_external_tool_fingerprints", server_id=server_id)
+
+        return {
+            tool["name"]: {
+                "id": tool["id"],
+                "content_hash": tool.get("content_hash"),
+                "is_classified": tool["is_classified"],
+            }
+            for tool in self.tools.values()
+            if tool["source_server_id"] == server_id
+        }
+
+    async def upsert_external_tools(self, tools: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or update many external tools; returns name -> id."""
+        self._record_call("upsert_external_tools", names=[t["name"] for t in tools])
+
+        by_name = {tool["name"]: tool for tool in self.tools.values()}
+        ids = {}
+        for data in tools:
+            tool = by_name.get(data["name"])
+            if tool is None:
+                tool_id = self._next_id
+                self._next_id += 1
+                tool = {"id": tool_id, "is_classified": False, "skill_ids": []}
+                tool["primary_skill_id"] = None
+                self.tools[tool_id] = tool
+            tool.update(
+                {
+                    "name": data["name"],
+                    "description": data.get("description", ""),
+                    "input_schema": data.get("input_schema", {}),
+                    "source_server_id": data["source_server_id"],
+                    "original_name": data["original_name"],
+                    "is_external": True,
+                    "content_hash": data.get("content_hash"),
+                }
+            )
+            ids[data["name"]] = tool["id"]
+        return ids
+
+    async def clear_content_hashes(self, tool_ids: List[int]) -> None:
+        """Clear stored fingerprints."""
+        self._record_call("clear_content_hashes", tool_ids=list(tool_ids))
+        for tool_id in tool_ids:
+            if tool_id in self.tools:
+                self.tools[tool_id]["content_hash"] = None
+
     async def get_tool(self, tool_id: int) -> Optional[Dict[str, Any]]:
         """Get a tool by ID."""
         self._record_call("get_tool", tool_id=tool_id)
@@ -668,6 +757,13 @@ class MockToolRepository:
 
         return len(to_delete)
 
+    async def delete_tools(self, tool_ids: List[int]) -> int:
+        """Delete specific tools."""
+        self._record_call("delete_tools", tool_ids=list(tool_ids))
+
+        deleted = [tool_id for tool_id in tool_ids if self.tools.pop(tool_id, None)]
+        return len(deleted)
+
     async def list_tools(
         self, server_id: str = None, is_classified: bool = None
     ) -> List[Dict[str, Any]]:
@@ -732,6 +828,21 @@ class MockVectorRepository:
 
         return True
 
+    async def upsert_tools(self, tools: List[Dict[str, Any]]) -> List[int]:
+        """Upsert many tool vectors."""
+        self._record_call("upsert_tools", tool_ids=[t["tool_id"] for t in tools])
+
+        for tool in tools:
+            self.vectors[str(tool["tool_id"])] = {
+                "id": str(tool["tool_id"]),
+                "name": tool["name"],
+                "description": tool["description"],
+                "embedding": tool["embedding"],
+                "metadata": tool.get("metadata") or {},
+            }
+
+        return [tool["tool_id"] for tool in tools]
+
     async def delete_tool(self, tool_id: int) -> bool:
         """Delete a tool vector."""
         self._record_call("delete_tool", tool_id=tool_id)
@@ -742,6 +853,13 @@ class MockVectorRepository:
             return True
         return False
 
+    async def delete_tools(self, tool_ids: List[int]) -> int:
+        """Delete many tool vectors."""
+        self._record_call("delete_tools", tool_ids=list(tool_ids))
+
+        deleted = [tool_id for tool_id in tool_ids if self.vectors.pop(str(tool_id), None)]
+        return len(deleted)
+
     async def update_tool_skills(
         self, tool_id: int, skill_ids: List[str], primary_skill_id: str
     ) -> bool:
@@ -20,6 +20,7 @@ class MockSkillRepository:
         self.skills: Dict[str, Dict[str, Any]] = {}
         self.assignments: List[Dict[str, Any]] = []
         self.suggestions: List[Dict[str, Any]] = []
+        self.memos: Dict[int, Dict[str, Any]] = {}
         self._calls: List[Dict[str, Any]] = []
         self._next_suggestion_id = 1
 
@@ -38,6 +39,7 @@ class MockSkillRepository:
         self.skills = {}
         self.assignments = []
         self.suggestions = []
+        self.memos = {}
         self._calls = []
 
     # =========================================================================
@@ -347,6 +349,71 @@ class MockSkillRepository:
                 return True
         return False
 
+    async def replace_tool_assignments(
+        self, classifications: List[Dict[str, Any]], source: str = "llm_auto"
+    ) -> Optional[Dict[str, List]]:
+        """Replace assignments for many tools, skipping human-classified ones."""
+        self._record_call(
+            "replace_tool_assignments", classifications=classifications, source=source
+        )
+
+        protected = {
+            a["tool_id"]
+            for a in self.assignments
+            if a["source"] in ("human_manual", "human_override")
+        }
+        classifications = [c for c in classifications if c["tool_id"] not in protected]
+        tool_ids = {c["tool_id"] for c in classifications}
+
+        old = [a for a in self.assignments if a["tool_id"] in tool_ids]
+        self.assignments = [a for a in self.assignments if a["tool_id"] not in tool_ids]
+        for a in old:
+            if a["skill_id"] in self.skills:
+                skill = self.skills[a["skill_id"]]
+                skill["tool_count"] = max(0, skill["tool_count"] - 1)
+
+        now = datetime.now(timezone.utc)
+        new_skill_ids = set()
+        for c in classifications:
+            for i, a in enumerate(c["assignments"]):
+                self.assignments.append(
+                    {
+                        "tool_id": c["tool_id"],
+                        "skill_id": a["skill_id"],
+                        "confidence": a["confidence"],
+                        "is_primary": i == 0,
+                        "source": source,
+                        "org_id": None,
+                        "is_global": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                new_skill_ids.add(a["skill_id"])
+                if a["skill_id"] in self.skills:
+                    self.skills[a["skill_id"]]["tool_count"] += 1
+
+        return {
+            "tool_ids": [c["tool_id"] for c in classifications],
+            "skill_ids": sorted({a["skill_id"] for a in old} | new_skill_ids),
+        }
+
+    # =========================================================================
+    # Classification Memo Operations
+    # =========================================================================
+
+    async def get_classification_memos(self, tool_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get classification memos by tool ID."""
+        self._record_call("get_classification_memos", tool_ids=tool_ids)
+        return {tool_id: self.memos[tool_id] for tool_id in tool_ids if tool_id in self.memos}
+
+    async def upsert_classification_memos(self, memos: List[Dict[str, Any]]) -> bool:
+        """Insert or update classification memos."""
+        self._record_call("upsert_classification_memos", memos=memos)
+        for memo in memos:
+            self.memos[memo["tool_id"]] = dict(memo)
+        return True
+
     # =========================================================================
     # Suggestion Operations
     # =========================================================================
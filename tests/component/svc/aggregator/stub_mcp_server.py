@@ -0,0 +1,26 @@
+"""
+Stub STDIO MCP server for session pool tests.
+
+``work`` blocks the server's event loop for ``seconds``, like a CPU-bound or
+single-threaded external server, so one process handles one call at a time.
+
+Usage: python stub_mcp_server.py
+"""
+
+import os
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("stub")
+
+
+@mcp.tool()
+def work(seconds: float = 0.1) -> str:
+    """Block for ``seconds`` and report the serving process."""
+    time.sleep(seconds)
+    return str(os.getpid())
+
+
+if __name__ == "__main__":
+    mcp.run("stdio")
@@ -0,0 +1,237 @@
+"""
+HealthMonitor component tests.
+
+Covers concurrent checks, per-server timeouts, adaptive interval, jittered
+scheduling and the single batched registry write per cycle.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.aggregator_service import ServerRegistry, SessionManager
+from services.aggregator_service.domain import ServerStatus
+from services.aggregator_service.health_monitor import HealthMonitor
+
+
+class FakeSessionManager:
+    """Session manager whose health checks take a configurable time."""
+
+    def __init__(self):
+        self.delays = {}
+        self.healthy = {}
+        self.calls = []
+
+    async def health_check(self, server_id: str) -> bool:
+        self.calls.append(server_id)
+        await asyncio.sleep(self.delays.get(server_id, 0))
+        return self.healthy.get(server_id, True)
+
+
+class CountingRegistry(ServerRegistry):
+    """In-memory registry that counts timestamp writes."""
+
+    def __init__(self):
+        super().__init__(db_pool=None)
+        self.batch_writes = 0
+        self.single_writes = 0
+
+    async def update_last_health_checks(self, server_ids):
+        self.batch_writes += 1
+        return await super().update_last_health_checks(server_ids)
+
+    async def update_last_health_check(self, server_id):
+        self.single_writes += 1
+        return await super().update_last_health_check(server_id)
+
+
+async def _register_connected(registry, count):
+    ids = []
+    for i in range(count):
+        server = await registry.add(
+            {
+                "name": f"server-{i}",
+                "transport_type": "SSE",
+                "connection_config": {"url": f"http://server-{i}"},
+            }
+        )
+        await registry.update_status(server["id"], ServerStatus.CONNECTED)
+        ids.append(server["id"])
+    return ids
+
+
+@pytest.fixture
+def registry():
+    return CountingRegistry()
+
+
+@pytest.fixture
+def sessions():
+    return FakeSessionManager()
+
+
+@pytest.mark.asyncio
+class TestHealthMonitorCycle:
+    async def test_cycle_time_bounded_by_slowest_server(self, registry, sessions):
+        ids = await _register_connected(registry, 20)
+        for server_id in ids:
+            sessions.delays[server_id] = 0.05
+
+        monitor = HealthMonitor(session_manager=sessions, server_registry=registry)
+        started = time.perf_counter()
+        results = await monitor.run_cycle(force=True)
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 20
+        assert all(r["is_healthy"] for r in results)
+        # Sequential checks would take ~1s
+        assert elapsed < 0.5
+
+    async def test_timeout_isolates_hung_server(self, registry, sessions):
+        fast, hung = await _register_connected(registry, 2)
+        sessions.delays[hung] = 10
+
+        monitor = HealthMonitor(
+            session_manager=sessions, server_registry=registry, check_timeout=0.1
+        )
+        started = time.perf_counter()
+        results = {r["server_id"]: r for r in await monitor.run_cycle(force=True)}
+
+        assert time.perf_counter() - started < 1
+        assert results[fast]["is_healthy"] is True
+        assert results[hung]["is_healthy"] is False
+        assert "timed out" in results[hung]["error"]
+
+    async def test_single_batched_timestamp_write(self, registry, sessions):
+        ids = await _register_connected(registry, 5)
+        monitor = HealthMonitor(session_manager=sessions, server_registry=registry)
+
+        await monitor.run_cycle(force=True)
+
+        assert registry.batch_writes == 1
+        assert registry.single_writes == 0
+        for server_id in ids:
+            assert (await registry.get(server_id))["last_health_check"] is not None
+
+    async def test_degraded_after_consecutive_failures(self, registry, sessions):
+        (server_id,) = await _register_connected(registry, 1)
+        sessions.healthy[server_id] = False
+        monitor = HealthMonitor(
+            session_manager=sessions, server_registry=registry, max_consecutive_failures=3
+        )
+
+        for _ in range(2):
+            await monitor.run_cycle(force=True)
+        assert (await registry.get(server_id))["status"] == ServerStatus.CONNECTED
+
+        results = await monitor.run_cycle(force=True)
+        assert results[0]["consecutive_failures"] == 3
+        assert (await registry.get(server_id))["status"] == ServerStatus.DEGRADED
+
+        # Degraded servers drop out of the connected set and are no longer tracked
+        assert await monitor.run_cycle(force=True) == []
+        assert monitor.snapshot()["tracked_servers"] == 0
+
+
+@pytest.mark.asyncio
+class TestHealthMonitorScheduling:
+    async def test_interval_grows_when_stable_and_resets_on_failure(self, registry, sessions):
+        (server_id,) = await _register_connected(registry, 1)
+        monitor = HealthMonitor(
+            session_manager=sessions,
+            server_registry=registry,
+            base_interval=10,
+            min_interval=5,
+            max_interval=20,
+            stable_after=2,
+            backoff_factor=2,
+        )
+
+        await monitor.run_cycle(force=True)
+        assert monitor.get_state(server_id).interval == 10
+        await monitor.run_cycle(force=True)
+        assert monitor.get_state(server_id).interval == 20
+        await monitor.run_cycle(force=True)
+        assert monitor.get_state(server_id).interval == 20  # capped
+
+        sessions.healthy[server_id] = False
+        await monitor.run_cycle(force=True)
+        assert monitor.get_state(server_id).interval == 5
+
+    async def test_only_due_servers_are_checked(self, registry, sessions):
+        ids = await _register_connected(registry, 10)
+        monitor = HealthMonitor(
+            session_manager=sessions, server_registry=registry, base_interval=60, jitter=0.2
+        )
+
+        await monitor.run_cycle(force=True)
+        sessions.calls.clear()
+
+        # Every server was just rescheduled 48-72s out
+        assert await monitor.run_cycle() == []
+        assert sessions.calls == []
+
+        monitor.get_state(ids[0]).next_check_at = 0
+        results = await monitor.run_cycle()
+        assert [r["server_id"] for r in results] == [ids[0]]
+
+    async def test_schedule_is_jittered(self, registry, sessions):
+        ids = await _register_connected(registry, 20)
+        monitor = HealthMonitor(
+            session_manager=sessions, server_registry=registry, base_interval=60, jitter=0.2
+        )
+
+        # Initial offsets are spread across the interval
+        initial = {monitor.get_state(sid).next_check_at for sid in ids}
+        assert len(initial) > 1
+
+        await monitor.run_cycle(force=True)
+        now = time.monotonic()
+        delays = [monitor.get_state(sid).next_check_at - now for sid in ids]
+        assert all(47 <= d <= 72 for d in delays)
+        assert max(delays) - min(delays) > 1
+
+
+@pytest.mark.asyncio
+class TestSessionManagerPing:
+    async def test_uses_ping_when_supported(self):
+        class PingSession:
+            def __init__(self):
+                self.pings = 0
+                self.lists = 0
+
+            async def send_ping(self):
+                self.pings += 1
+
+            async def list_tools(self):
+                self.lists += 1
+
+        manager = SessionManager()
+        session = PingSession()
+        manager._sessions["s1"] = session
+
+        assert await manager.health_check("s1") is True
+        assert (session.pings, session.lists) == (1, 0)
+
+    async def test_falls_back_to_list_tools_when_ping_unsupported(self):
+        class NoPingSession:
+            def __init__(self):
+                self.pings = 0
+                self.lists = 0
+
+            async def send_ping(self):
+                self.pings += 1
+                raise RuntimeError("Method not found")
+
+            async def list_tools(self):
+                self.lists += 1
+
+        manager = SessionManager()
+        session = NoPingSession()
+        manager._sessions["s1"] = session
+
+        assert await manager.health_check("s1") is True
+        assert await manager.health_check("s1") is True
+        # Ping is not retried once the server has rejected it
+        assert (session.pings, session.lists) == (1, 2)
@@ -0,0 +1,307 @@
+"""
+Resilience layer tests.
+
+Circuit breakers trip on a rolling error/slow-call window and recover through
+half-open probes, timeouts follow observed latency, and idempotent calls are
+hedged.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.aggregator_service import RequestRouter, ServerRegistry
+from services.aggregator_service.domain import CircuitState, ServerStatus
+from services.aggregator_service.resilience import (
+    CallTimeoutError,
+    CircuitOpenError,
+    ResilienceConfig,
+    ResilienceManager,
+)
+from services.aggregator_service.session_pool import PoolBusyError
+
+SERVER = "srv-1"
+
+
+def _config(**overrides):
+    values = dict(
+        min_calls=4,
+        open_seconds=0.05,
+        close_after=2,
+        min_timeout=0.05,
+        max_timeout=5.0,
+        min_hedge_delay=0.01,
+    )
+    values.update(overrides)
+    return ResilienceConfig(**values)
+
+
+class FakeServer:
+    """Scriptable external server: each call pops the next behavior."""
+
+    def __init__(self, delay: float = 0.005):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+        self.hang_first = 0
+
+    async def call(self):
+        self.calls += 1
+        if self.hang_first:
+            self.hang_first -= 1
+            await asyncio.sleep(10)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Tool call failed: connection reset")
+        return {"content": [], "isError": False, "call": self.calls}
+
+
+async def _warm(manager, server, n=6):
+    for _ in range(n):
+        await manager.call(SERVER, server.call)
+
+
+async def _fail(manager, server, n):
+    for _ in range(n):
+        with pytest.raises(RuntimeError):
+            await manager.call(SERVER, server.call)
+
+
+@pytest.mark.asyncio
+class TestCircuitBreaker:
+    async def test_error_rate_opens_circuit_and_fails_fast(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        server.fail = True
+
+        await _fail(manager, server, 4)
+        assert manager.breaker(SERVER).state == CircuitState.OPEN
+
+        calls_before = server.calls
+        with pytest.raises(CircuitOpenError):
+            await manager.call(SERVER, server.call)
+        assert server.calls == calls_before
+        assert manager.breaker(SERVER).rejected == 1
+
+    async def test_below_min_calls_does_not_trip(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        server.fail = True
+
+        await _fail(manager, server, 3)
+
+        assert manager.breaker(SERVER).state == CircuitState.CLOSED
+
+    async def test_slow_calls_open_circuit(self):
+        manager = ResilienceManager(_config(slow_call_seconds=0.01, slow_call_rate_threshold=0.5))
+        server = FakeServer(delay=0.02)
+
+        await _warm(manager, server, 4)
+
+        assert manager.breaker(SERVER).state == CircuitState.OPEN
+
+    async def test_half_open_probes_close_circuit(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        server.fail = True
+        await _fail(manager, server, 4)
+
+        await asyncio.sleep(0.06)
+        server.fail = False
+        await manager.call(SERVER, server.call)
+        assert manager.breaker(SERVER).state == CircuitState.HALF_OPEN
+        await manager.call(SERVER, server.call)
+
+        assert manager.breaker(SERVER).state == CircuitState.CLOSED
+
+    async def test_failed_probe_reopens_circuit(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        server.fail = True
+        await _fail(manager, server, 4)
+
+        await asyncio.sleep(0.06)
+        await _fail(manager, server, 1)
+
+        breaker = manager.breaker(SERVER)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.times_opened == 2
+
+    async def test_half_open_limits_concurrent_probes(self):
+        manager, server = ResilienceManager(_config()), FakeServer(delay=0.02)
+        server.fail = True
+        await _fail(manager, server, 4)
+        await asyncio.sleep(0.06)
+        server.fail = False
+
+        results = await asyncio.gather(
+            *(manager.call(SERVER, server.call) for _ in range(3)), return_exceptions=True
+        )
+
+        assert sum(isinstance(r, CircuitOpenError) for r in results) == 2
+
+    async def test_pool_backpressure_is_not_a_server_failure(self):
+        manager = ResilienceManager(_config())
+
+        async def busy():
+            raise PoolBusyError("saturated")
+
+        for _ in range(6):
+            with pytest.raises(PoolBusyError):
+                await manager.call(SERVER, busy)
+
+        assert manager.breaker(SERVER).state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+class TestAdaptiveTimeout:
+    async def test_timeout_defaults_to_max_until_enough_samples(self):
+        manager = ResilienceManager(_config())
+        assert manager.breaker(SERVER).timeout() == 5.0
+
+    async def test_timeout_follows_observed_latency(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        await _warm(manager, server)
+
+        timeout = manager.breaker(SERVER).timeout()
+        assert 0.05 <= timeout < 1.0
+
+        server.hang_first = 1
+        started = time.perf_counter()
+        with pytest.raises(CallTimeoutError):
+            await manager.call(SERVER, server.call)
+        assert time.perf_counter() - started < 1.0
+
+    async def test_timeout_is_tracked_per_tool(self):
+        manager = ResilienceManager(_config())
+        fast, slow = FakeServer(delay=0.005), FakeServer(delay=0.1)
+        for _ in range(6):
+            await manager.call(SERVER, fast.call, tool="fast")
+            await manager.call(SERVER, slow.call, tool="slow")
+
+        breaker = manager.breaker(SERVER)
+        assert breaker.timeout("fast") < 0.1
+        assert breaker.timeout("slow") >= 0.3
+        assert breaker.timeout("new") == 5.0
+
+    async def test_timed_out_calls_are_failures_not_samples(self):
+        manager, server = ResilienceManager(_config(min_calls=10)), FakeServer()
+        await _warm(manager, server, n=10)
+        breaker = manager.breaker(SERVER)
+        first = breaker.timeout()
+
+        server.hang_first = 1
+        with pytest.raises(CallTimeoutError):
+            await manager.call(SERVER, server.call)
+
+        assert breaker.timeout() == first
+        assert breaker.to_dict()["error_rate"] > 0
+
+    async def test_repeated_timeouts_open_the_breaker(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        await _warm(manager, server, n=4)
+        timeout = manager.breaker(SERVER).timeout()
+
+        server.hang_first = 4
+        for _ in range(4):
+            with pytest.raises(CallTimeoutError):
+                await manager.call(SERVER, server.call)
+
+        breaker = manager.breaker(SERVER)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.timeout() == timeout
+        with pytest.raises(CircuitOpenError):
+            await manager.call(SERVER, server.call)
+
+    async def test_stats_report_per_tool_timeouts(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        for _ in range(4):
+            await manager.call(SERVER, server.call, tool="search")
+
+        stats = manager.breaker(SERVER).to_dict()
+        assert "timeout_seconds" not in stats
+        assert stats["tool_timeouts_seconds"]["search"] < 5.0
+        assert stats["tool_hedge_delays_ms"]["search"] > 0
+
+    async def test_configured_tool_timeout_overrides_adaptive(self):
+        manager = ResilienceManager(_config(tool_timeouts={"report": 30.0}))
+        server = FakeServer()
+        for _ in range(6):
+            await manager.call(SERVER, server.call, tool="report")
+
+        assert manager.breaker(SERVER).timeout("report") == 30.0
+
+
+@pytest.mark.asyncio
+class TestHedging:
+    async def test_idempotent_call_is_hedged(self):
+        manager, server = ResilienceManager(_config()), FakeServer()
+        await _warm(manager, server)
+        server.hang_first = 1
+
+        started = time.perf_counter()
+        result = await manager.call(SERVER, server.call, idempotent=True)
+
+        assert time.perf_counter() - started < 0.5
+        assert result["call"] == server.calls
+        breaker = manager.breaker(SERVER)
+        assert breaker.hedges == 1
+        assert breaker.hedge_wins == 1
+
+    async def test_non_idempotent_call_is_not_hedged(self):
+        manager = ResilienceManager(_config(min_timeout=0.2))
+        server = FakeServer()
+        await _warm(manager, server)
+        server.hang_first = 1
+
+        with pytest.raises(CallTimeoutError):
+            await manager.call(SERVER, server.call)
+
+        assert manager.breaker(SERVER).hedges == 0
+
+
+class FailingSessionManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def call_tool(self, server_id, tool_name, arguments):
+        self.calls += 1
+        raise RuntimeError("Tool call failed: server not responding")
+
+
+@pytest.mark.asyncio
+async def test_router_fails_fast_for_degraded_server():
+    registry = ServerRegistry(db_pool=None)
+    session_manager = FailingSessionManager()
+    router = RequestRouter(
+        session_manager=session_manager,
+        server_registry=registry,
+        resilience_config=_config(open_seconds=30),
+    )
+    server = await registry.add(
+        {"name": "flaky", "transport_type": "SSE", "connection_config": {"url": "http://x"}}
+    )
+    await registry.update_status(server["id"], ServerStatus.CONNECTED)
+
+    for _ in range(4):
+        with pytest.raises(RuntimeError, match="Tool execution failed"):
+            await router.route_and_execute("flaky.search", {})
+
+    with pytest.raises(CircuitOpenError):
+        await router.route_and_execute("flaky.search", {})
+    assert session_manager.calls == 4
+    assert router.resilience.snapshot()[server["id"]]["state"] == "open"
+
+    await registry.remove(server["id"])
+    assert router.resilience.snapshot() == {}
+
+
+def test_read_only_tools_are_marked_idempotent():
+    router = RequestRouter()
+    router.routing_table.set_server_tools(
+        SERVER,
+        [
+            {"name": "gh.list", "original_name": "list", "annotations": {"readOnlyHint": True}},
+            {"name": "gh.create", "original_name": "create", "annotations": {}},
+        ],
+    )
+
+    assert router.routing_table.get_tool("gh.list").idempotent is True
+    assert router.routing_table.get_tool("gh.create").idempotent is False
@@ -0,0 +1,261 @@
+"""
+Result cache tests.
+
+Read-only tool results are cached per (server, tool, canonical arguments,
+user scope) for servers that opt in, identical in-flight calls are coalesced,
+and the Redis level is shared between aggregator instances.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from services.aggregator_service import RequestRouter, ResultCache, ServerRegistry
+from services.aggregator_service.domain import ServerStatus
+from tools.meta_tools.aggregator_tools import register_aggregator_tools
+
+
+class CountingSessionManager:
+    def __init__(self, delay: float = 0.0, payload: str = "ok", is_error: bool = False):
+        self.delay = delay
+        self.payload = payload
+        self.is_error = is_error
+        self.calls = 0
+
+    async def call_tool(self, server_id, tool_name, arguments):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"content": [{"type": "text", "text": self.payload}], "isError": self.is_error}
+
+
+def _request_ctx(**state):
+    """Stand-in for the tool Context of an HTTP request with ``state``."""
+    request = SimpleNamespace(state=SimpleNamespace(**state))
+    return SimpleNamespace(request_context=SimpleNamespace(request=request))
+
+
+class FakeRedis:
+    """Dict-backed stand-in for core.cache RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, namespace, key):
+        return self.data.get(f"{namespace}:{key}")
+
+    async def set(self, namespace, key, value, ttl=None):
+        self.data[f"{namespace}:{key}"] = value
+        return True
+
+    async def invalidate_pattern(self, pattern):
+        stale = [k for k in self.data if k.startswith(pattern)]
+        for key in stale:
+            del self.data[key]
+        return len(stale)
+
+
+TOOLS = [
+    {"name": "docs.search", "original_name": "search", "annotations": {"readOnlyHint": True}},
+    {"name": "docs.write", "original_name": "write", "annotations": {}},
+    {
+        "name": "docs.quote",
+        "original_name": "quote",
+        "annotations": {"readOnlyHint": True, "cacheTtl": 0.05},
+    },
+]
+
+
+async def _setup(policy, session_manager=None, cache=None):
+    registry = ServerRegistry(db_pool=None)
+    session_manager = session_manager or CountingSessionManager()
+    cache = cache or ResultCache()
+    router = RequestRouter(
+        session_manager=session_manager, server_registry=registry, result_cache=cache
+    )
+    server = await registry.add(
+        {
+            "name": "docs",
+            "transport_type": "SSE",
+            "connection_config": {"url": "http://docs", "result_cache": policy},
+        }
+    )
+    await registry.update_status(server["id"], ServerStatus.CONNECTED)
+    router.routing_table.set_server_tools(server["id"], TOOLS)
+    return router, session_manager, cache, registry, server
+
+
+SHARED = {"enabled": True, "scope": "shared", "ttl": 60}
+
+
+def test_key_uses_canonical_arguments_and_scope():
+    a = ResultCache.make_key("s", "search", {"q": "x", "limit": 5})
+    b = ResultCache.make_key("s", "search", {"limit": 5, "q": "x"})
+    assert a == b
+    assert a != ResultCache.make_key("s", "search", {"q": "x", "limit": 6})
+    assert ResultCache.make_key("s", "search", {}, "user:1") != ResultCache.make_key(
+        "s", "search", {}, "user:2"
+    )
+
+
+@pytest.mark.asyncio
+class TestResultCache:
+    async def test_read_only_result_served_from_cache(self):
+        router, sessions, cache, _, _ = await _setup(SHARED)
+
+        first = await router.route_and_execute("docs.search", {"q": "mcp", "n": 1})
+        second = await router.route_and_execute("docs.search", {"n": 1, "q": "mcp"})
+
+        assert sessions.calls == 1
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert second["content"] == first["content"]
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["bytes_saved"] > 0
+
+    async def test_tools_without_read_only_hint_are_not_cached(self):
+        router, sessions, _, _, _ = await _setup(SHARED)
+
+        await router.route_and_execute("docs.write", {"text": "a"})
+        await router.route_and_execute("docs.write", {"text": "a"})
+
+        assert sessions.calls == 2
+
+    async def test_servers_without_policy_are_not_cached(self):
+        router, sessions, _, _, _ = await _setup(None)
+
+        await router.route_and_execute("docs.search", {"q": "a"})
+        await router.route_and_execute("docs.search", {"q": "a"})
+
+        assert sessions.calls == 2
+
+    async def test_per_server_tool_override_enables_caching(self):
+        policy = {"enabled": True, "scope": "shared", "tools": {"write": 30}}
+        router, sessions, _, _, _ = await _setup(policy)
+
+        await router.route_and_execute("docs.write", {"text": "a"})
+        await router.route_and_execute("docs.write", {"text": "a"})
+
+        assert sessions.calls == 1
+
+    async def test_user_scope_keys_results_per_user(self):
+        router, sessions, _, _, _ = await _setup({"enabled": True})
+
+        await router.route_and_execute("docs.search", {"q": "a"}, user_id="alice")
+        await router.route_and_execute("docs.search", {"q": "a"}, user_id="alice")
+        await router.route_and_execute("docs.search", {"q": "a"}, user_id="bob")
+        await router.route_and_execute("docs.search", {"q": "a"})
+        await router.route_and_execute("docs.search", {"q": "a"})
+
+        assert sessions.calls == 4  # alice once, bob once, anonymous never cached
+
+    async def test_execute_external_tool_scopes_cache_to_authenticated_caller(self):
+        router, sessions, _, _, _ = await _setup({"enabled": True})
+
+        class Service:
+            async def execute_tool(self, tool_name, arguments, server_id=None, user_id=None):
+                return await router.route_and_execute(
+                    tool_name, arguments, server_id=server_id, user_id=user_id
+                )
+
+        mcp = FastMCP("test")
+        register_aggregator_tools(mcp, Service())
+        execute = mcp._tool_manager._tools["execute_external_tool"].fn
+        alice = _request_ctx(authenticated=True, user_id="alice")
+
+        await execute("docs.search", {"q": "a"}, ctx=alice)
+        await execute("docs.search", {"q": "a"}, ctx=alice)
+        # Without an authenticated request nothing is cached per user
+        await execute("docs.search", {"q": "a"}, ctx=_request_ctx(user_id="alice"))
+        await execute("docs.search", {"q": "a"})
+
+        assert sessions.calls == 3
+
+    async def test_annotated_ttl_expires(self):
+        router, sessions, _, _, _ = await _setup(SHARED)
+
+        await router.route_and_execute("docs.quote", {})
+        await router.route_and_execute("docs.quote", {})
+        await asyncio.sleep(0.06)
+        await router.route_and_execute("docs.quote", {})
+
+        assert sessions.calls == 2
+
+    async def test_identical_in_flight_calls_are_coalesced(self):
+        router, sessions, cache, _, _ = await _setup(
+            SHARED, session_manager=CountingSessionManager(delay=0.05)
+        )
+
+        results = await asyncio.gather(
+            *(router.route_and_execute("docs.search", {"q": "a"}) for _ in range(10))
+        )
+
+        assert sessions.calls == 1
+        assert sum(r["cached"] for r in results) == 9
+        assert cache.stats()["coalesced"] == 9
+
+    async def test_errors_are_not_cached(self):
+        router, sessions, _, _, _ = await _setup(
+            SHARED, session_manager=CountingSessionManager(is_error=True)
+        )
+
+        await router.route_and_execute("docs.search", {"q": "a"})
+        await router.route_and_execute("docs.search", {"q": "a"})
+
+        assert sessions.calls == 2
+
+    async def test_oversized_payloads_are_not_cached(self):
+        router, sessions, cache, _, _ = await _setup(
+            SHARED,
+            session_manager=CountingSessionManager(payload="x" * 2000),
+            cache=ResultCache(max_entry_bytes=1000),
+        )
+
+        await router.route_and_execute("docs.search", {"q": "a"})
+        await router.route_and_execute("docs.search", {"q": "a"})
+
+        assert sessions.calls == 2
+        assert cache.stats()["too_large"] == 2
+
+    async def test_lru_evicts_least_recently_used(self):
+        router, sessions, cache, _, _ = await _setup(SHARED, cache=ResultCache(max_entries=2))
+
+        for q in ("a", "b", "a", "c", "a", "b"):
+            await router.route_and_execute("docs.search", {"q": q})
+
+        assert sessions.calls == 4  # a, b, c, then b again after eviction
+        assert cache.stats()["entries"] == 2
+
+    async def test_redis_level_shared_between_instances(self):
+        redis = FakeRedis()
+        router_a, sessions_a, _, registry, server = await _setup(
+            SHARED, cache=ResultCache(redis_cache=redis)
+        )
+        # A second aggregator instance for the same server
+        sessions_b, cache_b = CountingSessionManager(), ResultCache(redis_cache=redis)
+        router_b = RequestRouter(session_manager=sessions_b, result_cache=cache_b)
+        router_b.routing_table.upsert_server(await registry.get(server["id"]))
+        router_b.routing_table.set_server_tools(server["id"], TOOLS)
+
+        await router_a.route_and_execute("docs.search", {"q": "a"})
+        result = await router_b.route_and_execute("docs.search", {"q": "a"})
+
+        assert sessions_a.calls == 1
+        assert sessions_b.calls == 0
+        assert result["cached"] is True
+        assert cache_b.stats()["redis_hits"] == 1
+
+    async def test_removed_server_results_are_dropped(self):
+        redis = FakeRedis()
+        router, _, cache, registry, server = await _setup(
+            SHARED, cache=ResultCache(redis_cache=redis)
+        )
+        await router.route_and_execute("docs.search", {"q": "a"})
+
+        await registry.remove(server["id"])
+
+        assert cache.stats()["entries"] == 0
+        assert redis.data == {}
@@ -0,0 +1,174 @@
+"""
+RequestRouter routing table tests.
+
+Routes resolve from the in-memory table, which follows registry events, and
+only fall back to the registry/tool repository on a miss.
+"""
+
+import asyncio
+
+import pytest
+
+from services.aggregator_service import RequestRouter, ServerRegistry
+from services.aggregator_service.domain import ServerStatus
+from tests.component.mocks.aggregator_mocks import MockToolRepository
+
+
+class SlowRegistry(ServerRegistry):
+    """In-memory registry with database-like lookup latency."""
+
+    def __init__(self, latency: float = 0.001):
+        super().__init__(db_pool=None)
+        self.latency = latency
+        self.lookups = 0
+
+    async def get(self, server_id):
+        self.lookups += 1
+        await asyncio.sleep(self.latency)
+        return await super().get(server_id)
+
+    async def get_by_name(self, name):
+        self.lookups += 1
+        await asyncio.sleep(self.latency)
+        return await super().get_by_name(name)
+
+
+@pytest.fixture
+async def setup():
+    registry = SlowRegistry()
+    tool_repo = MockToolRepository()
+    router = RequestRouter(server_registry=registry, tool_repository=tool_repo)
+    server = await registry.add(
+        {"name": "github", "transport_type": "SSE", "connection_config": {"url": "http://gh"}}
+    )
+    await registry.update_status(server["id"], ServerStatus.CONNECTED)
+    registry.lookups = 0
+    return registry, tool_repo, router, server
+
+
+@pytest.mark.asyncio
+class TestRoutingTable:
+    async def test_namespaced_route_needs_no_registry_lookup(self, setup):
+        registry, _, router, server = setup
+
+        context = await router.route("github.create_issue", {})
+
+        assert context.server_id == server["id"]
+        assert context.original_name == "create_issue"
+        assert registry.lookups == 0
+
+    async def test_status_change_event_updates_routing(self, setup):
+        registry, _, router, server = setup
+
+        await registry.update_status(server["id"], ServerStatus.DEGRADED)
+        with pytest.raises(RuntimeError, match="Server unavailable"):
+            await router.route("github.create_issue", {})
+
+        await registry.update_status(server["id"], ServerStatus.CONNECTED)
+        assert (await router.route("github.create_issue", {})).server_id == server["id"]
+        assert registry.lookups == 0
+
+    async def test_status_change_event_carries_no_connection_config(self):
+        class Emitter:
+            def __init__(self):
+                self.events = []
+
+            async def emit(self, event, payload):
+                self.events.append((event, payload))
+
+        emitter = Emitter()
+        registry = ServerRegistry(db_pool=None, event_emitter=emitter)
+        server = await registry.add(
+            {
+                "name": "github",
+                "transport_type": "SSE",
+                "connection_config": {"url": "http://gh", "headers": {"Authorization": "secret"}},
+            }
+        )
+        # A router created after registration learns about the server on its first route
+        router = RequestRouter(server_registry=registry)
+
+        await registry.update_status(server["id"], ServerStatus.CONNECTED)
+
+        assert emitter.events[-1] == (
+            "server.status_changed",
+            {"server_id": server["id"], "status": ServerStatus.CONNECTED.value},
+        )
+        assert (await router.route("github.create_issue", {})).server_id == server["id"]
+
+    async def test_removed_server_drops_routes(self, setup):
+        registry, _, router, server = setup
+        router.routing_table.set_server_tools(
+            server["id"], [{"name": "github.create_issue", "original_name": "create_issue"}]
+        )
+
+        await registry.remove(server["id"])
+
+        assert router.routing_table.stats()["servers"] == 0
+        assert router.routing_table.stats()["tools"] == 0
+        with pytest.raises(ValueError, match="Server not found"):
+            await router.route("github.create_issue", {})
+
+    async def test_discovered_tools_keep_dotted_original_names(self, setup):
+        _, _, router, server = setup
+        router.routing_table.set_server_tools(
+            server["id"], [{"name": "github.repos.list", "original_name": "repos.list"}]
+        )
+
+        context = await router.route("github.repos.list", {})
+        assert context.original_name == "repos.list"
+
+    async def test_tool_routes_carry_server_name(self, setup):
+        _, _, router, server = setup
+        router.routing_table.set_server_tools(
+            server["id"], [{"name": "github.create_issue", "original_name": "create_issue"}]
+        )
+        router.routing_table.set_server_tools(
+            "missing-id",
+            [{"name": "gitlab.list", "original_name": "list", "source_server_name": "gitlab"}],
+        )
+
+        assert router.routing_table.get_tool("github.create_issue").server_name == "github"
+        with pytest.raises(ValueError, match="Server not found: gitlab$"):
+            await router.route("gitlab.list", {})
+
+    async def test_search_route_cached_after_first_lookup(self, setup):
+        registry, tool_repo, router, server = setup
+        await tool_repo.create_tool(
+            name="search_code",
+            description="",
+            input_schema={},
+            source_server_id=server["id"],
+            original_name="search_code",
+        )
+
+        await router.route("search_code", {})
+        await router.route("search_code", {})
+
+        assert len(tool_repo.get_calls("get_tool_by_name")) == 1
+        assert registry.lookups == 0
+
+    async def test_unknown_server_falls_back_to_registry(self, setup):
+        registry, _, _, server = setup
+        # A router created after the server registered starts with an empty table
+        router = RequestRouter(server_registry=registry)
+
+        await router.route("github.create_issue", {})
+        await router.route("github.create_issue", {})
+
+        assert registry.lookups == 1
+
+    async def test_table_hits_skip_registry_after_clear(self, setup):
+        registry, _, router, _ = setup
+        iterations = 20
+
+        # An emptied table falls back to the registry on every route
+        for _ in range(iterations):
+            router.routing_table.clear()
+            await router.route("github.create_issue", {})
+        assert registry.lookups == iterations
+
+        # Once repopulated, routes resolve from the table
+        for _ in range(iterations):
+            await router.route("github.create_issue", {})
+        assert registry.lookups == iterations
@@ -0,0 +1,209 @@
+"""
+SessionPool component tests.
+
+Covers session selection, growth under load, idle shrink, backpressure and
+call spreading across a local stub STDIO MCP server, and reconnect cleanup.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from services.aggregator_service import SessionManager
+from services.aggregator_service.domain import SessionSelection
+from services.aggregator_service.session_pool import PoolBusyError, PoolConfig, SessionPool
+
+STUB_SERVER = Path(__file__).with_name("stub_mcp_server.py")
+
+
+class SerialSession:
+    """Session that handles one call at a time, like a single STDIO process."""
+
+    def __init__(self, name: str, delay: float = 0.02):
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+        self._lock = asyncio.Lock()
+
+    async def call_tool(self, name, arguments):
+        async with self._lock:
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            return {"content": [{"type": "text", "text": self.name}], "isError": False}
+
+
+class Factory:
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.opened = []
+        self.closed = []
+
+    async def open(self):
+        conn = SimpleNamespace(session=SerialSession(f"s{len(self.opened)}", self.delay))
+        self.opened.append(conn)
+        return conn
+
+    async def close(self, conn):
+        self.closed.append(conn)
+
+
+async def _pool(factory, **config):
+    pool = SessionPool("srv", factory.open, factory.close, PoolConfig(**config))
+    await pool.start(await factory.open())
+    return pool
+
+
+async def _call(pool):
+    async with pool.acquire() as session:
+        return await session.call_tool("work", {})
+
+
+@pytest.mark.asyncio
+class TestSessionPool:
+    async def test_min_size_sessions_opened_at_start(self):
+        factory = Factory()
+        pool = await _pool(factory, min_size=3, max_size=3)
+        assert pool.size == 3
+
+    async def test_least_outstanding_spreads_concurrent_calls(self):
+        factory = Factory()
+        pool = await _pool(factory, min_size=4, max_size=4)
+
+        await asyncio.gather(*(_call(pool) for _ in range(8)))
+
+        assert [conn.session.calls for conn in factory.opened] == [2, 2, 2, 2]
+
+    async def test_power_of_two_uses_every_session(self):
+        factory = Factory()
+        pool = await _pool(factory, min_size=4, max_size=4, strategy=SessionSelection.POWER_OF_TWO)
+
+        await asyncio.gather(*(_call(pool) for _ in range(40)))
+
+        assert all(conn.session.calls > 0 for conn in factory.opened)
+
+    async def test_grows_under_load_up_to_max_size(self):
+        factory = Factory(delay=0.05)
+        pool = await _pool(factory, min_size=1, max_size=3, scale_up_at=2)
+
+        for _ in range(3):
+            await asyncio.gather(*(_call(pool) for _ in range(6)))
+
+        assert pool.size == 3
+        assert all(conn.session.calls > 0 for conn in factory.opened)
+
+    async def test_idle_extra_sessions_are_closed(self):
+        factory = Factory()
+        pool = await _pool(factory, min_size=1, max_size=3, idle_timeout=0)
+        await pool._grow()
+        await pool._grow()
+
+        await _call(pool)
+        await asyncio.sleep(0)
+
+        assert pool.size < 3
+        assert factory.closed
+
+    async def test_queue_depth_backpressure(self):
+        factory = Factory(delay=0.1)
+        pool = await _pool(factory, max_concurrency=1, max_queue_depth=2)
+
+        results = await asyncio.gather(*(_call(pool) for _ in range(5)), return_exceptions=True)
+
+        rejected = [r for r in results if isinstance(r, PoolBusyError)]
+        assert len(rejected) == 2
+        assert pool.stats()["rejected"] == 2
+
+    async def test_failing_extra_session_is_evicted(self):
+        factory = Factory()
+        pool = await _pool(factory, min_size=2, max_size=2, max_failures=2)
+        bad = factory.opened[1].session
+
+        async def broken(name, arguments):
+            raise ConnectionError("process exited")
+
+        bad.call_tool = broken
+        for _ in range(6):
+            try:
+                await _call(pool)
+            except ConnectionError:
+                pass
+
+        assert pool.size == 1
+
+    async def test_close_leaves_primary_to_session_manager(self):
+        factory = Factory()
+        pool = await _pool(factory, min_size=3, max_size=3)
+
+        await pool.close()
+
+        assert pool.size == 1
+        assert factory.closed == factory.opened[1:]
+
+
+@pytest.mark.asyncio
+async def test_connect_closes_existing_pool():
+    factory = Factory()
+    manager = SessionManager()
+
+    async def create_session(server_id, transport_type, connection_config):
+        return await factory.open()
+
+    manager._create_session = create_session
+    manager._close_connection = factory.close
+    config = {
+        "id": "srv",
+        "transport_type": "SSE",
+        "connection_config": {"url": "http://srv", "pool": {"min_size": 2, "max_size": 2}},
+    }
+
+    await manager.connect(config)
+    first = list(factory.opened)
+    await manager.connect(config)
+
+    assert len(factory.opened) == 4
+    assert factory.closed == [first[1], first[0]]
+    await manager.disconnect("srv")
+    assert len(factory.closed) == 4
+
+
+def test_pool_config_from_connection_config():
+    config = PoolConfig.from_dict({"min_size": 2, "max_size": 1, "strategy": "power_of_two"})
+    assert config.max_size == 2
+    assert config.strategy == SessionSelection.POWER_OF_TWO
+    assert PoolConfig.from_dict(None).max_size == 1
+
+
+@pytest.mark.asyncio
+async def test_stdio_calls_spread_over_pooled_processes():
+    pytest.importorskip("mcp.server.fastmcp")
+    calls, seconds = 12, 0.1
+    pids = {}
+
+    for size in (1, 3):
+        manager = SessionManager()
+        server_id = f"stub-{size}"
+        await manager.connect(
+            {
+                "id": server_id,
+                "transport_type": "STDIO",
+                "connection_config": {
+                    "command": sys.executable,
+                    "args": [str(STUB_SERVER)],
+                    "pool": {"min_size": size, "max_size": size},
+                },
+            }
+        )
+        try:
+            results = await asyncio.gather(
+                *(manager.call_tool(server_id, "work", {"seconds": seconds}) for _ in range(calls))
+            )
+            pids[size] = {r["content"][0]["text"] for r in results}
+        finally:
+            await manager.disconnect(server_id)
+
+    # Concurrent calls are spread over every pooled STDIO process
+    assert len(pids[1]) == 1
+    assert len(pids[3]) == 3
@@ -0,0 +1,189 @@
+"""
+Concurrent startup connection tests.
+
+Registered servers reconnect concurrently under a bounded limit and a
+per-server timeout, each becoming routable as soon as it connects, with the
+time each connect took recorded in the aggregator state.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from services.aggregator_service import AggregatorService, SessionManager
+from services.aggregator_service.domain import ServerStatus
+from tests.component.mocks.aggregator_mocks import (
+    MockModelClient,
+    MockServerRegistry,
+    MockSessionManager,
+    MockToolRepository,
+    MockVectorRepository,
+)
+
+
+class SlowSessionManager(MockSessionManager):
+    """Session manager whose connects take a per-server amount of time."""
+
+    def __init__(self, server_registry, delays):
+        super().__init__(server_registry=server_registry)
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+
+    async def connect(self, config):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(config["id"], 0.1))
+            session = await super().connect(config)
+            session.set_tools([{"name": "ping", "description": "Ping", "inputSchema": {}}])
+            return session
+        finally:
+            self.active -= 1
+
+
+async def _setup(count, delay=0.1, status=ServerStatus.CONNECTED):
+    registry = MockServerRegistry()
+    servers = []
+    for i in range(count):
+        server = await registry.add(
+            {
+                "name": f"ext{i}",
+                "transport_type": "SSE",
+                "connection_config": {"url": f"http://ext{i}"},
+            }
+        )
+        server["status"] = status  # last known status from a previous run
+        servers.append(server)
+    sessions = SlowSessionManager(registry, {s["id"]: delay for s in servers})
+    service = AggregatorService(
+        server_registry=registry,
+        session_manager=sessions,
+        tool_repository=MockToolRepository(),
+        vector_repository=MockVectorRepository(),
+        model_client=MockModelClient(),
+    )
+    return service, sessions, servers
+
+
+@pytest.mark.asyncio
+class TestStartupConnect:
+    async def test_servers_connect_concurrently(self):
+        service, sessions, _ = await _setup(8, delay=0.2)
+
+        results = await service.connect_servers()
+
+        assert all(results.values()) and len(results) == 8
+        assert sessions.peak == 8
+
+    async def test_concurrency_is_bounded(self):
+        service, sessions, _ = await _setup(6, delay=0.05)
+        service.connect_concurrency = 2
+
+        await service.connect_servers()
+
+        assert sessions.peak == 2
+
+    async def test_hung_server_times_out_without_blocking_others(self):
+        service, sessions, servers = await _setup(3, delay=0.05)
+        sessions.delays[servers[0]["id"]] = 10
+        servers[0]["connection_config"]["connect_timeout"] = 0.2
+
+        started = time.perf_counter()
+        results = await service.connect_servers()
+
+        assert time.perf_counter() - started < 1.0
+        assert results[servers[0]["id"]] is False
+        assert results[servers[1]["id"]] and results[servers[2]["id"]]
+        assert servers[0]["status"] == ServerStatus.ERROR
+
+        timings = {t["name"]: t for t in (await service.get_state())["connect_timings"]}
+        assert timings["ext0"]["success"] is False
+        assert "timed out" in timings["ext0"]["error"]
+        assert timings["ext1"]["success"] is True
+
+    async def test_timeout_covers_session_only(self):
+        service, sessions, servers = await _setup(1, delay=0.05)
+        servers[0]["connection_config"]["connect_timeout"] = 0.2
+        discover_tools = service.discover_tools
+
+        async def slow_discovery(server_id=None):
+            await asyncio.sleep(0.3)
+            return await discover_tools(server_id)
+
+        service.discover_tools = slow_discovery
+
+        assert (await service.connect_servers())[servers[0]["id"]] is True
+        assert servers[0]["status"] == ServerStatus.CONNECTED
+
+    async def test_timed_out_connect_is_cleaned_up(self):
+        service, sessions, servers = await _setup(1, delay=10)
+        servers[0]["connection_config"]["connect_timeout"] = 0.1
+
+        assert (await service.connect_servers())[servers[0]["id"]] is False
+        assert [c["args"]["server_id"] for c in sessions.get_calls("disconnect")] == [
+            servers[0]["id"]
+        ]
+        assert await sessions.get_session(servers[0]["id"]) is None
+        assert servers[0]["status"] == ServerStatus.ERROR
+
+    async def test_tools_routable_as_each_server_connects(self):
+        service, sessions, servers = await _setup(2, delay=0.02)
+        sessions.delays[servers[1]["id"]] = 0.5
+
+        task = service.start_background_connect()
+        await asyncio.sleep(0.2)
+
+        assert not task.done()
+        table = service._router.routing_table
+        assert table.get_tool("ext0.ping") is not None
+        assert table.get_tool("ext1.ping") is None
+
+        await task
+        assert table.get_tool("ext1.ping") is not None
+
+    async def test_startup_skips_disconnected_servers(self):
+        service, sessions, _ = await _setup(2, status=ServerStatus.DISCONNECTED)
+
+        assert await service.connect_servers() == {}
+        assert sessions.get_calls("connect") == []
+
+    async def test_connect_timings_sorted_slowest_first(self):
+        service, sessions, servers = await _setup(3, delay=0.01)
+        sessions.delays[servers[2]["id"]] = 0.1
+
+        await service.connect_servers()
+        timings = (await service.get_state())["connect_timings"]
+
+        assert timings[0]["name"] == "ext2"
+        assert [t["seconds"] for t in timings] == sorted(
+            (t["seconds"] for t in timings), reverse=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_timed_out_stdio_connect_leaves_nothing_behind():
+    pytest.importorskip("mcp.server.fastmcp")
+    manager = SessionManager()
+    stub = Path(__file__).with_name("stub_mcp_server.py")
+    before = {t for t in asyncio.all_tasks() if not t.done()}
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            manager.connect(
+                {
+                    "id": "stub",
+                    "transport_type": "STDIO",
+                    "connection_config": {"command": sys.executable, "args": [str(stub)]},
+                }
+            ),
+            timeout=0.2,
+        )
+
+    leftover = {t for t in asyncio.all_tasks() if not t.done()} - before
+    leftover.discard(asyncio.current_task())
+    assert leftover == set()
+    assert manager._connections == {} and manager._pools == {}
@@ -0,0 +1,131 @@
+"""
+ToolAggregator batch discovery tests.
+
+Discovery stores, embeds and indexes a server's tools in bulk and skips tools
+whose name, description and schema are unchanged since the last discovery.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.clients.embedding_batcher import EmbeddingBatcher
+from services.aggregator_service.tool_aggregator import ToolAggregator
+from tests.component.mocks.aggregator_mocks import (
+    MockMCPSession,
+    MockServerRegistry,
+    MockSessionManager,
+    MockSkillClassifier,
+    MockToolRepository,
+    MockVectorRepository,
+)
+
+
+class FakeEmbeddingClient:
+    """OpenAI-compatible client that records each embeddings request."""
+
+    def __init__(self, fail_texts=()):
+        self.requests = []
+        self.fail_texts = set(fail_texts)
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    async def _create(self, input, model):
+        self.requests.append(list(input))
+        if self.fail_texts.intersection(input):
+            raise ValueError("invalid input")
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[0.2] * 1536) for _ in input])
+
+
+def _tools(count, description="Tool {i}"):
+    return [
+        {"name": f"tool_{i}", "description": description.format(i=i), "inputSchema": {}}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def setup():
+    registry = MockServerRegistry()
+    sessions = MockSessionManager(server_registry=registry)
+    tool_repo = MockToolRepository()
+    vector_repo = MockVectorRepository()
+    client = FakeEmbeddingClient()
+    aggregator = ToolAggregator(
+        session_manager=sessions,
+        server_registry=registry,
+        tool_repository=tool_repo,
+        vector_repository=vector_repo,
+        skill_classifier=MockSkillClassifier(),
+        model_client=client,
+    )
+    server = await registry.add(
+        {"name": "big-server", "transport_type": "SSE", "connection_config": {}}
+    )
+    session = MockMCPSession(tools=_tools(300))
+    await session.connect()
+    sessions._sessions[server["id"]] = session
+    return SimpleNamespace(
+        aggregator=aggregator,
+        server_id=server["id"],
+        session=session,
+        tool_repo=tool_repo,
+        vector_repo=vector_repo,
+        client=client,
+    )
+
+
+@pytest.mark.asyncio
+class TestBatchDiscovery:
+    async def test_discovery_uses_bulk_operations(self, setup):
+        tools = await setup.aggregator.discover_tools(setup.server_id)
+
+        assert len(tools) == 300
+        assert all(t["id"] is not None for t in tools)
+        assert len(setup.tool_repo.get_calls("upsert_external_tools")) == 1
+        assert len(setup.vector_repo.get_calls("upsert_tools")) == 1
+        assert setup.vector_repo.get_calls("upsert_tool") == []
+        # 300 short descriptions fit in one token-budgeted request
+        assert len(setup.client.requests) == 1
+        assert len(setup.vector_repo.vectors) == 300
+
+    async def test_unchanged_tools_are_skipped(self, setup):
+        first = await setup.aggregator.discover_tools(setup.server_id)
+        second = await setup.aggregator.discover_tools(setup.server_id)
+
+        assert [t["id"] for t in second] == [t["id"] for t in first]
+        assert len(setup.client.requests) == 1
+        assert len(setup.tool_repo.get_calls("upsert_external_tools")) == 1
+        assert len(setup.vector_repo.get_calls("upsert_tools")) == 1
+
+    async def test_only_changed_tools_are_reindexed(self, setup):
+        await setup.aggregator.discover_tools(setup.server_id)
+
+        tools = _tools(300)
+        tools[7]["description"] = "Now does something else"
+        tools[8]["inputSchema"] = {"type": "object", "properties": {"q": {"type": "string"}}}
+        setup.session.set_tools(tools)
+        await setup.aggregator.discover_tools(setup.server_id)
+
+        assert len(setup.client.requests[-1]) == 2
+        reindexed = setup.vector_repo.get_calls("upsert_tools")[-1]["args"]["tool_ids"]
+        assert len(reindexed) == 2
+        stored = setup.tool_repo.tools[reindexed[0]]
+        assert stored["description"] == "Now does something else"
+
+    async def test_failed_embeddings_are_retried_next_discovery(self, setup):
+        setup.session.set_tools(_tools(3))
+        setup.client.fail_texts = {"big-server.tool_1: Tool 1"}
+        # One text per request so only the bad one fails; no retry delay
+        setup.aggregator._embedding_batcher = EmbeddingBatcher(
+            client=setup.client, max_retries=1, max_batch_inputs=1
+        )
+        tools = await setup.aggregator.discover_tools(setup.server_id)
+
+        # The tool is still stored and routable, but not indexed
+        assert len(tools) == 3
+        assert len(setup.vector_repo.vectors) == 2
+
+        setup.client.fail_texts = set()
+        await setup.aggregator.discover_tools(setup.server_id)
+        assert setup.client.requests[-1] == ["big-server.tool_1: Tool 1"]
+        assert len(setup.vector_repo.vectors) == 3
@@ -0,0 +1,155 @@
+"""
+Incremental re-aggregation tests.
+
+A server's tools/list_changed notification triggers a debounced re-discovery
+that is diffed against the stored tools by name and content hash: only new or
+changed tools are embedded and upserted, and tools the server no longer lists
+are deleted from PostgreSQL, Qdrant and the routing table.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp import types
+
+from services.aggregator_service import AggregatorService, SessionManager
+from tests.component.mocks.aggregator_mocks import (
+    MockMCPSession,
+    MockServerRegistry,
+    MockSessionManager,
+    MockToolRepository,
+    MockVectorRepository,
+)
+from tests.component.svc.aggregator.test_tool_discovery_batch import FakeEmbeddingClient, _tools
+
+
+@pytest.fixture
+async def setup():
+    registry = MockServerRegistry()
+    sessions = MockSessionManager(server_registry=registry)
+    tool_repo = MockToolRepository()
+    vector_repo = MockVectorRepository()
+    client = FakeEmbeddingClient()
+    service = AggregatorService(
+        server_registry=registry,
+        session_manager=sessions,
+        tool_repository=tool_repo,
+        vector_repository=vector_repo,
+        model_client=client,
+    )
+    service.tool_refresh_debounce = 0.05
+    server = await registry.add({"name": "big", "transport_type": "SSE", "connection_config": {}})
+    session = MockMCPSession(tools=_tools(500))
+    await session.connect()
+    sessions.add_session(server["id"], session)
+
+    await service.discover_tools(server["id"])
+    client.requests.clear()
+    return SimpleNamespace(
+        service=service,
+        server_id=server["id"],
+        sessions=sessions,
+        session=session,
+        tool_repo=tool_repo,
+        vector_repo=vector_repo,
+        client=client,
+        table=service._router.routing_table,
+    )
+
+
+def _diff(setup):
+    return setup.service._tool_aggregator.last_diff[setup.server_id]
+
+
+@pytest.mark.asyncio
+class TestIncrementalDiscovery:
+    async def test_one_added_tool_embeds_one_text(self, setup):
+        setup.session.set_tools(_tools(501))
+
+        tools = await setup.service.discover_tools(setup.server_id)
+
+        assert setup.client.requests == [["big.tool_500: Tool 500"]]
+        assert [t["name"] for t in tools if t["changed"]] == ["big.tool_500"]
+        assert _diff(setup) == {"added": 1, "updated": 0, "unchanged": 500, "removed": 0}
+        assert setup.table.get_tool("big.tool_500") is not None
+
+    async def test_changed_description_re_embeds_only_that_tool(self, setup):
+        tools = _tools(500)
+        tools[7]["description"] = "Now does something else"
+        setup.session.set_tools(tools)
+
+        await setup.service.discover_tools(setup.server_id)
+
+        assert setup.client.requests == [["big.tool_7: Now does something else"]]
+        assert _diff(setup)["updated"] == 1
+
+    async def test_removed_tools_are_deleted_everywhere(self, setup):
+        removed_id = next(
+            t["id"] for t in setup.tool_repo.tools.values() if t["name"] == "big.tool_3"
+        )
+        setup.session.set_tools([t for t in _tools(500) if t["name"] != "tool_3"])
+
+        await setup.service.discover_tools(setup.server_id)
+
+        assert setup.client.requests == []
+        assert _diff(setup)["removed"] == 1
+        assert removed_id not in setup.tool_repo.tools
+        assert str(removed_id) not in setup.vector_repo.vectors
+        assert setup.table.get_tool("big.tool_3") is None
+        assert len(setup.tool_repo.tools) == 499
+
+    async def test_empty_listing_removes_all_tools(self, setup):
+        setup.session.set_tools([])
+
+        await setup.service.discover_tools(setup.server_id)
+
+        assert setup.tool_repo.tools == {}
+        assert setup.vector_repo.vectors == {}
+
+
+@pytest.mark.asyncio
+class TestListChangedNotification:
+    async def test_notification_triggers_refresh(self, setup):
+        setup.session.set_tools(_tools(501))
+
+        await setup.sessions.notify(setup.server_id, "notifications/tools/list_changed")
+        await asyncio.sleep(0.15)
+
+        assert setup.table.get_tool("big.tool_500") is not None
+        assert setup.client.requests == [["big.tool_500: Tool 500"]]
+
+    async def test_notification_burst_coalesces(self, setup):
+        calls = setup.session.get_calls("list_tools")
+        before = len(calls)
+
+        for _ in range(10):
+            await setup.sessions.notify(setup.server_id, "notifications/tools/list_changed")
+        await asyncio.sleep(0.15)
+
+        assert len(setup.session.get_calls("list_tools")) - before == 1
+
+    async def test_other_notifications_are_ignored(self, setup):
+        before = len(setup.session.get_calls("list_tools"))
+
+        await setup.sessions.notify(setup.server_id, "notifications/resources/list_changed")
+        await asyncio.sleep(0.1)
+
+        assert len(setup.session.get_calls("list_tools")) == before
+
+
+@pytest.mark.asyncio
+async def test_session_message_handler_forwards_notifications():
+    manager = SessionManager()
+    received = []
+
+    async def listener(server_id, method):
+        received.append((server_id, method))
+
+    manager.add_notification_listener(listener)
+    handle = manager._message_handler("srv")
+
+    await handle(types.ServerNotification(types.ToolListChangedNotification()))
+    await handle(RuntimeError("transport hiccup"))
+
+    assert received == [("srv", "notifications/tools/list_changed")]
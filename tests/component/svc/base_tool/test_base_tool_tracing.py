@@ -0,0 +1,127 @@
+"""
+Component tests for the tracing built into BaseTool.register_tool.
+
+Tests verify:
+1. Tool calls record nothing when tracing is off
+2. A sampled tool call produces one trace: tool.call with auth, limiter wait,
+   tool body, model invocation, billing and progress spans beneath it
+3. Phase histograms hold self times that add up to the call's duration
+"""
+
+import pytest
+
+from core.security import SecurityManager
+from core.tracing import InMemorySpanExporter, configure_tracing, get_tracer
+from tools.base_tool import BaseTool
+
+
+class FakeMCP:
+    """Stands in for FastMCP: records the registered callables"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self, **kwargs):
+        def decorator(func):
+            self.tools[kwargs.get("name") or func.__name__] = func
+            return func
+
+        return decorator
+
+
+class TracedTool(BaseTool):
+    def __init__(self):
+        super().__init__()
+        self._security_manager = SecurityManager()
+
+    async def summarize(self, text: str, user_id: str = "u1"):
+        await self.report_progress(None, 1, 2, "summarizing")
+        await self._publish_billing_event(user_id=user_id, service_type="text", operation="chat")
+        return {"summary": text[:5]}
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(sample_rate=1.0, exporter=exporter)
+    yield exporter
+    configure_tracing(sample_rate=0.0)
+
+
+@pytest.fixture
+def tool_fn():
+    tool = TracedTool()
+    mcp = FakeMCP()
+    tool.register_tool(mcp, tool.summarize, rate_limit_calls=100, rate_limit_period=1.0)
+    return mcp.tools["summarize"]
+
+
+def by_name(spans):
+    return {span.name: span for span in spans}
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(sample_rate=1.0, exporter=exporter)
+    yield exporter
+    configure_tracing(sample_rate=0.0)
+
+
+@pytest.fixture
+def tool_fn():
+    tool = TracedTool()
+    mcp = FakeMCP()
+    tool.register_tool(mcp, tool.summarize, rate_limit_calls=100, rate_limit_period=1.0)
+    return mcp.tools["summarize"]
+
+
+def by_name(spans):
+    return {span.name: span for span in spans}
+
+
+class TestTracingOff:
+    async def test_no_spans_when_sample_rate_is_zero(self, tool_fn):
+        exporter = InMemorySpanExporter()
+        tracer = configure_tracing(sample_rate=0.0, exporter=exporter)
+
+        result = await tool_fn(text="hello world", user_id="u1")
+
+        assert result == {"summary": "hello"}
+        assert exporter.get_finished_spans() == []
+        assert tracer.get_phase_latency() == {}
+
+
+class TestToolCallTrace:
+    async def test_span_tree(self, exporter, tool_fn):
+        await tool_fn(text="hello world", user_id="u1")
+
+        spans = by_name(exporter.get_finished_spans())
+        root = spans["tool.call"]
+        assert root.parent_id is None
+        assert root.attributes["tool.name"] == "summarize"
+        assert {s.trace_id for s in spans.values()} == {root.trace_id}
+
+        for name in ("tool.auth", "tool.rate_limit", "tool.execute"):
+            assert spans[name].parent_id == root.span_id
+        for name in ("progress.report", "billing.publish"):
+            assert spans[name].parent_id == spans["tool.execute"].span_id
+
+    async def test_model_invocation_span(self, exporter):
+        tool = TracedTool()
+        await tool._invoke_isa_model(None, "hi", task="unknown", service_type="text")
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "isa_model.invoke"
+
+    async def test_phase_self_times_add_up(self, exporter, tool_fn):
+        await tool_fn(text="hello world", user_id="u1")
+
+        spans = exporter.get_finished_spans()
+        root = by_name(spans)["tool.call"]
+        total_self = sum(span.self_time_ms for span in spans)
+        assert total_self == pytest.approx(root.duration_ms, rel=1e-6)
+
+        phases = get_tracer().get_phase_latency()
+        assert set(phases) == {span.name for span in spans}
+        assert all(summary["count"] == 1 for summary in phases.values())
@@ -0,0 +1,109 @@
+"""
+Component tests for embedding-based chunkers.
+
+Covers the vectorized boundary detection in SemanticChunker and TopicChunker:
+- Embeddings are fetched in batches sized to the embedder's per-request limit
+- Similarities are computed on one float32 matrix
+- Boundaries fall where the topic changes
+"""
+
+import numpy as np
+import pytest
+
+from tools.services.intelligence_service.vector_db.chunking_service import (
+    Chunk,
+    ChunkConfig,
+    ChunkingStrategy,
+    SemanticChunker,
+    adjacent_similarities,
+    embed_texts_to_matrix,
+)
+from tools.services.intelligence_service.vector_db.advanced_chunkers import TopicChunker
+
+
+class FakeEmbedder:
+    """Embeds sentences about cats and databases onto two orthogonal axes."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def embed_batch(self, texts, model=None, **kwargs):
+        self.calls.append(len(texts))
+        return [[1.0, 0.0, 0.0] if "cat" in t.lower() else [0.0, 1.0, 0.0] for t in texts]
+
+
+CAT_THEN_DB = (
+    "The cat sleeps on the mat. A cat likes warm places. Every cat purrs loudly. "
+    "Postgres stores rows in pages. Indexes speed up lookups. Vacuum reclaims space."
+)
+
+
+@pytest.mark.unit
+class TestEmbeddingMatrixHelpers:
+    async def test_embed_texts_to_matrix_is_contiguous_float32(self):
+        embedder = FakeEmbedder()
+        matrix = await embed_texts_to_matrix(embedder, ["cat", "db", "cat"])
+
+        assert matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"]
+        assert matrix.shape == (3, 3)
+        assert embedder.calls == [3]
+
+    async def test_embed_texts_to_matrix_rejects_row_mismatch(self):
+        class ShortEmbedder(FakeEmbedder):
+            async def embed_batch(self, texts, model=None, **kwargs):
+                return [[1.0, 0.0]]
+
+        with pytest.raises(ValueError):
+            await embed_texts_to_matrix(ShortEmbedder(), ["a", "b"])
+
+    def test_adjacent_similarities(self):
+        matrix = np.array([[1, 0], [2, 0], [0, 3], [0, 0]], dtype=np.float32)
+        sims = adjacent_similarities(matrix)
+
+        assert sims.dtype == np.float32
+        np.testing.assert_allclose(sims, [1.0, 0.0, 0.0])
+
+
+@pytest.mark.unit
+class TestSemanticChunker:
+    async def test_groups_split_at_topic_change(self):
+        config = ChunkConfig(
+            strategy=ChunkingStrategy.SEMANTIC,
+            chunk_size=1000,
+            chunk_overlap=0,
+            use_embeddings=True,
+            similarity_threshold=0.8,
+        )
+        chunker = SemanticChunker(config)
+        sentences = [Chunk(text=t) for t in CAT_THEN_DB.split(". ")]
+        matrix = await embed_texts_to_matrix(FakeEmbedder(), [s.text for s in sentences])
+
+        chunks = await chunker._group_by_similarity(sentences, matrix)
+
+        assert len(chunks) == 2
+        assert chunks[0].metadata["sentence_count"] == 3
+        assert chunks[1].metadata["sentence_count"] == 3
+        assert chunks[0].metadata["avg_similarity"] == pytest.approx(1.0)
+        assert "cat" in chunks[0].text.lower() and "postgres" in chunks[1].text.lower()
+
+    async def test_chunk_size_forces_boundary(self):
+        config = ChunkConfig(chunk_size=60, use_embeddings=True, similarity_threshold=0.5)
+        chunker = SemanticChunker(config)
+        sentences = [Chunk(text="cat " * 10), Chunk(text="cat " * 10)]
+        matrix = np.ones((2, 3), dtype=np.float32)
+
+        chunks = await chunker._group_by_similarity(sentences, matrix)
+
+        assert len(chunks) == 2
+
+
+@pytest.mark.unit
+class TestTopicChunker:
+    def test_boundaries_from_similarity_drops(self):
+        chunker = TopicChunker(ChunkConfig(similarity_threshold=0.5))
+        embeddings = np.array([[1, 0], [1, 0], [0, 1], [0, 1], [1, 0]], dtype=np.float32)
+
+        boundaries = chunker._detect_topic_boundaries(["s"] * 5, embeddings)
+
+        assert boundaries == [2, 4, 5]
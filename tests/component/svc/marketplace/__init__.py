@@ -0,0 +1,3 @@
+"""
+Marketplace Service Component Tests Package.
+"""
@@ -0,0 +1,256 @@
+"""
+Background registry search coordination tests.
+
+MarketplaceService.search falls back to npm/GitHub when local results are
+sparse. Identical searches share one upstream fetch, recently searched and
+empty queries are not re-fetched, concurrent fetches are capped, and fetched
+packages are written with one bulk upsert. Upstream is a local stub registry.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from services.marketplace_service import MarketplaceService, PackageRepository, RegistryFetcher
+from services.marketplace_service import registry_fetcher
+from services.marketplace_service.package_repository import PACKAGE_NAME_PATTERN
+from services.marketplace_service.registry_search import RegistrySearchCoordinator
+
+
+class StubRegistry:
+    """npm + GitHub search endpoints serving canned MCP packages, with latency."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        app = web.Application()
+        app.router.add_get("/-/v1/search", self._npm)
+        app.router.add_get("/search/repositories", self._github)
+        self.runner = web.AppRunner(app)
+
+    async def start(self) -> str:
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}"
+
+    async def _serve(self, kind, request):
+        self.requests.append((kind, request.query.get("text") or request.query.get("q")))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def _npm(self, request):
+        await self._serve("npm", request)
+        term = request.query["text"].split()[0]
+        if term == "nothing":
+            return web.json_response({"objects": []})
+        return web.json_response(
+            {
+                "objects": [
+                    {
+                        "package": {
+                            "name": f"@stub/{term}-{i}",
+                            "description": f"{term} server {i}",
+                            "keywords": ["mcp-server", term],
+                            "version": "1.0.0",
+                        }
+                    }
+                    for i in range(3)
+                ]
+            }
+        )
+
+    async def _github(self, request):
+        await self._serve("github", request)
+        return web.json_response({"items": []})
+
+
+class CountingRepository(PackageRepository):
+    """In-memory repository that records write calls."""
+
+    def __init__(self):
+        super().__init__(db_pool=None)
+        self.bulk_upserts = []
+        self.single_upserts = 0
+
+    async def upsert_packages(self, packages):
+        self.bulk_upserts.append(len(packages))
+        return await super().upsert_packages(packages)
+
+    async def upsert_package(self, data):
+        self.single_upserts += 1
+        return await super().upsert_package(data)
+
+
+@pytest.fixture
+async def setup(monkeypatch):
+    stub = StubRegistry()
+    base_url = await stub.start()
+    # The stub listens on loopback, which the SSRF allowlist rejects
+    monkeypatch.setattr(registry_fetcher, "_validate_url", lambda url: None)
+
+    repo = CountingRepository()
+    fetcher = RegistryFetcher(repository=repo)
+    fetcher.NPM_SEARCH_URL = f"{base_url}/-/v1/search"
+    fetcher.GITHUB_API_URL = base_url
+    service = MarketplaceService(
+        package_repository=repo,
+        registry_fetcher=fetcher,
+        package_resolver=None,
+        install_manager=None,
+        update_manager=None,
+    )
+
+    async def settle():
+        while service._registry_search._inflight:
+            await asyncio.gather(*service._registry_search._inflight.values())
+
+    yield SimpleNamespace(
+        service=service,
+        repo=repo,
+        stub=stub,
+        coordinator=service._registry_search,
+        settle=settle,
+    )
+    await service.close()
+    await stub.runner.cleanup()
+
+
+def _npm_requests(stub):
+    return [q for kind, q in stub.requests if kind == "npm"]
+
+
+@pytest.mark.asyncio
+class TestRegistrySearchCoordination:
+    async def test_identical_concurrent_searches_fetch_once(self, setup):
+        await asyncio.gather(*(setup.service.search("video") for _ in range(100)))
+        await setup.settle()
+
+        assert len(_npm_requests(setup.stub)) == 1
+        assert setup.coordinator.get_stats()["fetches"] == 1
+        assert setup.repo.bulk_upserts == [3]
+        assert setup.repo.single_upserts == 0
+
+        results = await setup.service.search("video")
+        assert results["total"] == 3
+
+    async def test_near_identical_queries_share_a_fetch(self, setup):
+        await asyncio.gather(
+            setup.service.search("Video  Editing", tags=["b", "a"]),
+            setup.service.search("video editing", tags=["A", "B"]),
+            setup.service.search(" video editing ", tags=["a", "b"]),
+        )
+        await setup.settle()
+
+        assert len(_npm_requests(setup.stub)) == 1
+
+    async def test_recent_query_is_not_refetched(self, setup):
+        await setup.service.search("nothing")
+        await setup.settle()
+        await setup.service.search("nothing")
+        await setup.settle()
+
+        assert len(_npm_requests(setup.stub)) == 1
+        assert setup.coordinator.get_stats()["cache_hits"] == 1
+        assert setup.repo.bulk_upserts == []
+
+    async def test_query_is_refetched_after_ttl(self, setup):
+        setup.coordinator.empty_ttl = 0.05
+        await setup.service.search("nothing")
+        await setup.settle()
+        await asyncio.sleep(0.06)
+
+        await setup.service.search("nothing")
+        await setup.settle()
+
+        assert len(_npm_requests(setup.stub)) == 2
+
+    async def test_concurrent_fetches_are_capped(self, setup):
+        setup.service._registry_search = RegistrySearchCoordinator(
+            fetcher=setup.service._fetcher,
+            repository=setup.repo,
+            max_concurrent_fetches=2,
+        )
+
+        await asyncio.gather(*(setup.service.search(f"topic{i}") for i in range(8)))
+        await setup.settle()
+
+        assert len(_npm_requests(setup.stub)) == 8
+        # Each fetch hits npm and GitHub concurrently
+        assert setup.stub.peak <= 4
+
+    async def test_queue_overflow_is_dropped(self, setup):
+        setup.coordinator._max_pending = 2
+
+        await asyncio.gather(*(setup.service.search(f"topic{i}") for i in range(5)))
+        await setup.settle()
+
+        assert len(_npm_requests(setup.stub)) == 2
+        assert setup.coordinator.get_stats()["dropped"] == 3
+
+    async def test_close_cancels_background_searches(self, setup):
+        await setup.service.search("video")
+        assert setup.coordinator.get_stats()["in_flight"] == 1
+
+        await setup.service.close()
+
+        assert setup.coordinator.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_keeps_unreported_fields():
+    repo = PackageRepository(db_pool=None)
+    await repo.create_package({"name": "@stub/a", "download_count": 500, "star_count": 9})
+
+    written = await repo.upsert_packages(
+        [
+            {"name": "@stub/a", "description": "updated", "star_count": None},
+            {"name": "@stub/b", "description": "new"},
+            {"name": "@stub/b", "description": "newer"},
+        ]
+    )
+
+    a = await repo.get_package_by_name("@stub/a")
+    b = await repo.get_package_by_name("@stub/b")
+    assert written == 2
+    assert (a["description"], a["download_count"], a["star_count"]) == ("updated", 500, 9)
+    assert b["description"] == "newer"
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_skips_invalid_names():
+    repo = PackageRepository(db_pool=None)
+
+    written = await repo.upsert_packages(
+        [{"name": "@stub/ok"}, {"name": "lodash.merge"}, {"name": "@GitHub/Owner-Repo.js"}]
+    )
+
+    assert written == 1
+    assert await repo.get_package_by_name("@stub/ok") is not None
+    assert await repo.get_package_by_name("lodash.merge") is None
+
+
+def test_github_repo_names_satisfy_name_constraint():
+    fetcher = RegistryFetcher(repository=None)
+    repo = {
+        "full_name": "Owner/Repo.js",
+        "name": "Repo.js",
+        "owner": {"login": "Owner"},
+        "html_url": "https://github.com/Owner/Repo.js",
+        "stargazers_count": 1,
+    }
+
+    package = fetcher._normalize_github_repo(repo)
+
+    assert package["name"] == "@github/owner-repo-js"
+    assert PACKAGE_NAME_PATTERN.match(package["name"])
+    assert fetcher._normalize_github_repo({**repo, "full_name": "__/.."}) is None
@@ -0,0 +1,120 @@
+"""
+Component tests for the async plan state stores.
+
+Covers:
+- Plan round trip with field-level task status overlays
+- 1,000 concurrent task updates without lost writes
+- Pipelined history appends and the active-plans index
+- Parity between RedisStateStore and InMemoryStateStore
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from tools.plan_tools.plan_state_manager import InMemoryStateStore, RedisStateStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def make_plan(task_count: int):
+    return {
+        "solution_hypothesis": "test",
+        "total_tasks": task_count,
+        "tasks": [
+            {"id": i + 1, "title": f"Task {i + 1}", "status": "pending"} for i in range(task_count)
+        ],
+    }
+
+
+@pytest.fixture
+async def redis_store():
+    store = RedisStateStore(client=fakeredis.FakeAsyncRedis(decode_responses=True))
+    yield store
+    await store.close()
+
+
+@pytest.fixture(params=["redis", "memory"])
+async def store(request):
+    if request.param == "memory":
+        yield InMemoryStateStore()
+        return
+    store = RedisStateStore(client=fakeredis.FakeAsyncRedis(decode_responses=True))
+    yield store
+    await store.close()
+
+
+@pytest.mark.unit
+class TestPlanStateStore:
+    async def test_round_trip_with_task_updates(self, store):
+        assert await store.save_plan("p1", make_plan(3))
+        assert await store.update_task_status("p1", 2, "completed", {"output": "done"})
+
+        plan = await store.get_plan("p1")
+        assert plan["plan_id"] == "p1"
+        assert plan["solution_hypothesis"] == "test"
+        assert [t["status"] for t in plan["tasks"]] == ["pending", "completed", "pending"]
+        assert plan["tasks"][1]["result"] == {"output": "done"}
+
+        task = await store.get_task("p1", 2)
+        assert task["status"] == "completed"
+        assert await store.get_task("p1", 99) is None
+
+        events = await store.get_execution_history("p1")
+        assert [e["event_type"] for e in events] == ["plan_created", "task_status_updated"]
+
+    async def test_missing_plan(self, store):
+        assert await store.get_plan("nope") is None
+        assert await store.update_task_status("nope", 1, "completed") is False
+
+    async def test_branches_and_delete(self, store):
+        await store.save_plan("p1", make_plan(1))
+        assert await store.create_branch("p1", "b1", {"branch_from_task": 1, "tasks": []})
+
+        assert [b["branch_id"] for b in await store.get_branches("p1")] == ["b1"]
+        assert await store.list_active_plans() == ["p1"]
+
+        assert await store.delete_plan("p1")
+        assert await store.get_plan("p1") is None
+        assert await store.get_branches("p1") == []
+        assert await store.list_active_plans() == []
+
+
+@pytest.mark.unit
+class TestRedisStateStore:
+    async def test_missing_plan_update_leaves_no_keys(self, redis_store):
+        assert await redis_store.update_task_status("nope", 1, "completed") is False
+        assert await redis_store.redis.keys("*") == []
+
+    async def test_active_plans_use_index_not_keys(self, redis_store, monkeypatch):
+        await redis_store.save_plan("p1", make_plan(1))
+        await redis_store.save_plan("p2", make_plan(1))
+
+        # Expire p1 in the index
+        await redis_store.redis.zadd(redis_store.ACTIVE_PLANS_KEY, {"p1": time.time() - 1})
+
+        async def no_keys(*args, **kwargs):
+            raise AssertionError("KEYS must not be used")
+
+        monkeypatch.setattr(redis_store.redis, "keys", no_keys)
+        assert await redis_store.list_active_plans() == ["p2"]
+
+    @pytest.mark.performance
+    async def test_concurrent_task_updates(self, redis_store):
+        task_count = 1000
+        await redis_store.save_plan("bench", make_plan(task_count))
+
+        results = await asyncio.gather(
+            *(
+                redis_store.update_task_status("bench", i + 1, "completed", {"n": i})
+                for i in range(task_count)
+            )
+        )
+
+        assert all(results)
+        plan = await redis_store.get_plan("bench")
+        # Field-level writes: no update is lost to a concurrent read-modify-write
+        assert all(t["status"] == "completed" for t in plan["tasks"])
+        assert [t["result"]["n"] for t in plan["tasks"]] == list(range(task_count))
+        assert len(await redis_store.get_execution_history("bench")) == task_count + 1
@@ -25,6 +25,7 @@ from tests.contracts.search.data_contract import (
 
 # Import service and mocks
 from services.search_service import HierarchicalSearchService
+from services.search_service.schema_cache import ToolSchemaCache
 from tests.component.mocks.search_mocks import (
     MockQdrantSearchClient,
     MockDbPool,
@@ -111,6 +112,7 @@ def search_service(mock_vector_repository, mock_model_client, mock_db_pool, mock
         model_client=mock_model_client,
         db_pool=mock_db_pool,
         qdrant_client=mock_qdrant_search,  # Inject mock Qdrant client
+        schema_cache=ToolSchemaCache(),
     )
     return service
 
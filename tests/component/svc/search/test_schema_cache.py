@@ -0,0 +1,184 @@
+"""
+Schema enrichment cache tests.
+
+Tests verify:
+1. Cached entries are served only while their hash matches the payload's
+2. Rows read before an invalidation are not cached over it
+3. Enrichment queries PostgreSQL for cache misses only
+4. Schemas stored in the vector payload skip enrichment queries entirely
+5. ToolAggregator writes invalidate the affected entries
+"""
+
+import pytest
+
+from services.aggregator_service.tool_aggregator import ToolAggregator
+from services.search_service import HierarchicalSearchService
+from services.search_service.schema_cache import ToolSchemaCache, ToolSchemas, schema_hash
+from tests.component.mocks.search_mocks import (
+    MockDbPool,
+    MockQdrantSearchClient,
+    MockSearchModelClient,
+    MockVectorRepository,
+)
+
+SCHEMA_1 = {"type": "object", "properties": {"title": {"type": "string"}}}
+SCHEMA_2 = {"type": "object", "properties": {"date": {"type": "string"}}}
+
+
+@pytest.fixture
+def qdrant():
+    client = MockQdrantSearchClient()
+    client.seed_tool(
+        tool_id="tool-1", db_id=1, name="create_event", description="Create", score=0.9
+    )
+    client.seed_tool(tool_id="tool-2", db_id=2, name="list_events", description="List", score=0.8)
+    return client
+
+
+@pytest.fixture
+def db_pool():
+    pool = MockDbPool()
+    pool.seed_schema(1, input_schema=SCHEMA_1)
+    pool.seed_schema(2, input_schema=SCHEMA_2)
+    return pool
+
+
+@pytest.fixture
+def cache():
+    return ToolSchemaCache()
+
+
+@pytest.fixture
+def service(qdrant, db_pool, cache):
+    repo = MockVectorRepository()
+    repo.set_client(qdrant)
+    return HierarchicalSearchService(
+        vector_repository=repo,
+        model_client=MockSearchModelClient(),
+        db_pool=db_pool,
+        qdrant_client=qdrant,
+        schema_cache=cache,
+    )
+
+
+async def _search(service):
+    result = await service.search(query="calendar", include_schemas=True, strategy="direct")
+    return {tool.db_id: tool.input_schema for tool in result.tools}
+
+
+class TestToolSchemaCache:
+    def test_hash_ignores_key_order(self):
+        assert schema_hash({"a": 1, "b": 2}) == schema_hash({"b": 2, "a": 1})
+        assert schema_hash({"a": 1}) != schema_hash({"a": 2})
+
+    def test_hash_mismatch_is_a_miss(self, cache):
+        schemas = ToolSchemas.build(SCHEMA_1)
+        cache.put(1, schemas)
+
+        assert cache.get(1, expected_hash=schemas.schema_hash) == schemas
+        assert cache.get(1, expected_hash="other") is None
+        assert cache.get(1) is None  # stale entry was dropped
+
+    def test_put_after_invalidation_is_skipped(self, cache):
+        generation = cache.generation
+        cache.invalidate([1])
+
+        assert not cache.put(1, ToolSchemas.build(SCHEMA_1), generation=generation)
+        assert cache.get(1) is None
+
+    def test_bounded(self):
+        cache = ToolSchemaCache(max_entries=2)
+        for tool_id in (1, 2, 3):
+            cache.put(tool_id, ToolSchemas.build({}))
+
+        assert len(cache) == 2
+        assert cache.get(1) is None
+
+
+class TestEnrichment:
+    async def test_second_search_skips_database(self, service, db_pool):
+        first = await _search(service)
+        second = await _search(service)
+
+        assert first == second == {1: SCHEMA_1, 2: SCHEMA_2}
+        assert len(db_pool.get_calls()) == 1
+
+    async def test_only_misses_are_fetched(self, service, db_pool, cache):
+        cache.put(1, ToolSchemas.build(SCHEMA_1))
+
+        schemas = await _search(service)
+
+        assert schemas == {1: SCHEMA_1, 2: SCHEMA_2}
+        assert [call["params"] for call in db_pool.get_calls()] == [[2]]
+
+    async def test_entry_with_outdated_hash_is_refetched(self, service, qdrant, db_pool, cache):
+        cache.put(1, ToolSchemas.build({"type": "object"}))
+        qdrant.collections["mcp_unified_search"][0]["payload"]["schema_hash"] = schema_hash(
+            SCHEMA_1
+        )
+
+        schemas = await _search(service)
+
+        assert schemas[1] == SCHEMA_1
+        assert db_pool.get_calls()[0]["params"] == [1, 2]
+
+    async def test_payload_schemas_skip_database(self, service, qdrant, db_pool):
+        for point, schema in zip(qdrant.collections["mcp_unified_search"], (SCHEMA_1, SCHEMA_2)):
+            stored = ToolSchemas.build(schema)
+            point["payload"].update(schema_hash=stored.schema_hash, schemas=stored.to_dict())
+
+        schemas = await _search(service)
+
+        assert schemas == {1: SCHEMA_1, 2: SCHEMA_2}
+        assert db_pool.get_calls() == []
+
+    async def test_outdated_payload_schemas_are_ignored(self, service, qdrant, db_pool):
+        point = qdrant.collections["mcp_unified_search"][0]
+        point["payload"].update(
+            schema_hash=schema_hash(SCHEMA_1), schemas=ToolSchemas.build({}).to_dict()
+        )
+
+        schemas = await _search(service)
+
+        assert schemas[1] == SCHEMA_1
+        assert db_pool.get_calls()[0]["params"] == [1, 2]
+
+
+class _ToolRepo:
+    def __init__(self, fingerprints):
+        self.fingerprints = fingerprints
+
+    async def get_external_tool_fingerprints(self, server_id):
+        return self.fingerprints
+
+    async def upsert_external_tools(self, tools):
+        return {tool["name"]: 7 for tool in tools}
+
+    async def delete_tools(self, tool_ids):
+        return len(tool_ids)
+
+
+class TestAggregatorInvalidation:
+    async def test_changed_and_removed_tools_are_invalidated(self):
+        aggregator = ToolAggregator(
+            tool_repository=_ToolRepo(
+                {
+                    "srv.old": {"id": 5, "content_hash": "x"},
+                    "srv.search": {"id": 7, "content_hash": "stale"},
+                }
+            )
+        )
+        aggregator._schema_cache = cache = ToolSchemaCache()
+        for tool_id in (5, 6, 7):
+            cache.put(tool_id, ToolSchemas.build({}))
+
+        async def embed(texts):
+            return [[0.0] for _ in texts]
+
+        aggregator._embed_texts = embed
+        server = {"id": "s1", "name": "srv"}
+        await aggregator._index_tools(server, [{"name": "search", "inputSchema": SCHEMA_1}])
+
+        assert cache.get(5) is None
+        assert cache.get(7) is None
+        assert cache.get(6) is not None
@@ -0,0 +1,213 @@
+"""
+Batch skill classification tests.
+
+Batches are packed by estimated prompt tokens and classified concurrently,
+unchanged tools are served from the classification memo, and assignments,
+tool counts and skill embeddings are written once per run.
+"""
+
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.skill_service import SkillService
+from tests.component.mocks.skill_mocks import (
+    MockAsyncQdrantClient,
+    MockOpenAIEmbeddings,
+    MockSkillRepository,
+)
+
+SKILLS = [
+    {"id": "calendar-management", "name": "Calendar", "description": "Calendar events"},
+    {"id": "file-operations", "name": "Files", "description": "Read and write files"},
+]
+
+
+class ClassifyingModelClient:
+    """Chat client that classifies each tool in the prompt by name, with latency."""
+
+    def __init__(self, delay: float = 0.05, reply: str = None):
+        self.delay = delay
+        self.reply = reply
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+        self.embeddings = MockOpenAIEmbeddings()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, temperature, max_tokens):
+        names = re.findall(r"^\d+\. \*\*(.+?)\*\*:", messages[-1]["content"], re.M)
+        self.batches.append(names)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        content = self.reply or json.dumps(
+            [
+                {
+                    "tool_name": name,
+                    "assignments": [
+                        {
+                            "skill_id": (
+                                "calendar-management" if "event" in name else "file-operations"
+                            ),
+                            "confidence": 0.9,
+                        }
+                    ],
+                }
+                for name in names
+            ]
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _tools(count, description="Does thing {i}"):
+    return [
+        {
+            "tool_id": i,
+            "tool_name": f"event_tool_{i}" if i % 2 else f"file_tool_{i}",
+            "description": description.format(i=i),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def setup():
+    repo = MockSkillRepository()
+    for skill in SKILLS:
+        await repo.create_skill_category(skill)
+    qdrant = MockAsyncQdrantClient()
+    model = ClassifyingModelClient()
+    service = SkillService(repository=repo, qdrant_client=qdrant, model_client=model)
+    payloads = []
+
+    async def update_payload(tool_id, skill_ids, primary_skill_id):
+        payloads.append(tool_id)
+
+    service._update_tool_qdrant_payload = update_payload
+    return SimpleNamespace(
+        service=service, repo=repo, qdrant=qdrant, model=model, payloads=payloads
+    )
+
+
+@pytest.mark.asyncio
+class TestBatchClassification:
+    async def test_batches_run_concurrently(self, setup):
+        started = time.perf_counter()
+        results = await setup.service.classify_tools_batch(_tools(100), concurrency=4)
+        elapsed = time.perf_counter() - started
+
+        assert len(setup.model.batches) == 5
+        assert setup.model.peak == 4
+        assert elapsed < 0.2  # five sequential batches take 0.25s
+        assert all(r["primary_skill_id"] for r in results)
+        assert [r["tool_id"] for r in results] == list(range(100))
+
+    async def test_batches_are_packed_by_tokens(self, setup):
+        await setup.service.classify_tools_batch(
+            _tools(50, description="x" * 200 + "{i}"), batch_size=50
+        )
+
+        # 50 tools fit the count limit but not the token budget
+        assert len(setup.model.batches) > 1
+        assert sum(len(b) for b in setup.model.batches) == 50
+
+    async def test_unchanged_tools_are_served_from_memo(self, setup):
+        first = await setup.service.classify_tools_batch(_tools(40))
+        setup.model.batches.clear()
+
+        second = await setup.service.classify_tools_batch(_tools(40))
+
+        assert setup.model.batches == []
+        assert all(r["cached"] for r in second)
+        assert [r["primary_skill_id"] for r in second] == [r["primary_skill_id"] for r in first]
+
+    async def test_memo_hits_still_write_assignments(self, setup):
+        await setup.service.classify_tools_batch(_tools(10))
+        # Assignments and payloads lost since the memo was recorded
+        setup.repo.assignments.clear()
+        setup.payloads.clear()
+        setup.model.batches.clear()
+
+        await setup.service.classify_tools_batch(_tools(10))
+
+        assert setup.model.batches == []
+        assert sorted({a["tool_id"] for a in setup.repo.assignments}) == list(range(10))
+        assert sorted(setup.payloads) == list(range(10))
+
+    async def test_changed_description_reclassifies_only_that_tool(self, setup):
+        await setup.service.classify_tools_batch(_tools(40))
+        setup.model.batches.clear()
+        tools = _tools(40)
+        tools[5]["description"] = "Now does something else"
+
+        await setup.service.classify_tools_batch(tools)
+
+        assert setup.model.batches == [["event_tool_5"]]
+
+    async def test_skill_catalog_change_invalidates_memo(self, setup):
+        await setup.service.classify_tools_batch(_tools(10))
+        setup.model.batches.clear()
+        await setup.repo.create_skill_category(
+            {"id": "web-search", "name": "Search", "description": "Search the web"}
+        )
+
+        await setup.service.classify_tools_batch(_tools(10))
+
+        assert sum(len(b) for b in setup.model.batches) == 10
+
+    async def test_force_reclassify_ignores_memo(self, setup):
+        await setup.service.classify_tools_batch(_tools(10))
+        setup.model.batches.clear()
+
+        await setup.service.classify_tools_batch(_tools(10), force_reclassify=True)
+
+        assert sum(len(b) for b in setup.model.batches) == 10
+
+    async def test_writes_are_coalesced(self, setup):
+        await setup.service.classify_tools_batch(_tools(100))
+
+        assert len(setup.repo.get_calls("replace_tool_assignments")) == 1
+        assert setup.repo.get_calls("create_assignment") == []
+        assert len(setup.repo.get_calls("upsert_classification_memos")) == 1
+        # One skill re-embedding per affected skill, not per tool
+        assert len(setup.model.embeddings._calls) == 2
+        assert sorted(setup.payloads) == list(range(100))
+
+    async def test_tool_counts_do_not_drift_on_reclassification(self, setup):
+        await setup.service.classify_tools_batch(_tools(10))
+        await setup.service.classify_tools_batch(_tools(10), force_reclassify=True)
+
+        assert setup.repo.skills["calendar-management"]["tool_count"] == 5
+        assert setup.repo.skills["file-operations"]["tool_count"] == 5
+        assert len(setup.repo.assignments) == 10
+
+    async def test_human_overrides_are_kept(self, setup):
+        await setup.repo.create_assignment(
+            tool_id=0, skill_id="calendar-management", confidence=1.0, source="human_override"
+        )
+
+        await setup.service.classify_tools_batch(_tools(2))
+
+        tool_0 = [a for a in setup.repo.assignments if a["tool_id"] == 0]
+        assert [(a["skill_id"], a["source"]) for a in tool_0] == [
+            ("calendar-management", "human_override")
+        ]
+
+    async def test_unparseable_responses_are_not_memoized(self, setup):
+        setup.model.reply = "not json"
+        results = await setup.service.classify_tools_batch(_tools(4))
+        assert all(r["primary_skill_id"] is None for r in results)
+
+        setup.model.reply = None
+        setup.model.batches.clear()
+        await setup.service.classify_tools_batch(_tools(4))
+
+        assert sum(len(b) for b in setup.model.batches) == 4
@@ -0,0 +1,187 @@
+"""
+Component tests for ranged read_file.
+
+Covers:
+- Line offset/limit reads seeking via the sparse line index
+- Index reuse and rebuild when the file changes
+- Byte budget with a continuation offset for text
+- Byte ranges with a continuation offset for binary files
+- Overlong lines and non-ASCII-compatible encodings
+- Constant memory when reading near the end of a large file
+"""
+
+import base64
+import tracemalloc
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from tools.system_tools import file_tools
+from tools.system_tools.file_reader import LINE_INDEX_STRIDE, get_line_index_cache, read_lines
+
+
+@pytest.fixture
+def read_file():
+    mcp = FastMCP("test")
+    file_tools.register_file_tools(mcp)
+    get_line_index_cache().clear()
+    return mcp._tool_manager._tools["read_file"].fn
+
+
+@pytest.fixture
+def numbered_file(tmp_path):
+    path = tmp_path / "numbered.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 5001)))
+    return path
+
+
+@pytest.mark.unit
+class TestLineRanges:
+    async def test_offset_and_limit(self, read_file, numbered_file):
+        result = await read_file(file_path=str(numbered_file), offset=3500, limit=3)
+
+        data = result["data"]
+        assert data["content"].splitlines() == [
+            "  3500\tline 3500",
+            "  3501\tline 3501",
+            "  3502\tline 3502",
+        ]
+        assert data["total_lines"] == 5000
+        assert data["lines_read"] == 3
+        assert data["next_offset"] == 3503
+        assert data["truncated"] is True
+
+    @pytest.mark.parametrize("offset", [1, LINE_INDEX_STRIDE, LINE_INDEX_STRIDE + 1, 4999, 5000])
+    async def test_offsets_around_index_checkpoints(self, read_file, numbered_file, offset):
+        result = await read_file(file_path=str(numbered_file), offset=offset, limit=2)
+
+        first = result["data"]["content"].splitlines()[0]
+        assert first.endswith(f"\tline {offset}")
+
+    async def test_end_of_file(self, read_file, numbered_file):
+        last = await read_file(file_path=str(numbered_file), offset=4999)
+        beyond = await read_file(file_path=str(numbered_file), offset=6000)
+
+        assert last["data"]["lines_read"] == 2
+        assert last["data"]["next_offset"] is None
+        assert beyond["data"]["lines_read"] == 0
+        assert beyond["data"]["content"] == ""
+
+    async def test_index_rebuilt_when_file_changes(self, read_file, tmp_path):
+        path = tmp_path / "changing.txt"
+        path.write_text("a\nb\n")
+        assert (await read_file(file_path=str(path)))["data"]["total_lines"] == 2
+
+        path.write_text("a\nb\nc")
+        result = await read_file(file_path=str(path), offset=3)
+
+        assert result["data"]["total_lines"] == 3
+        assert result["data"]["content"] == "     3\tc"
+
+    async def test_byte_budget_continues_at_next_offset(
+        self, read_file, numbered_file, monkeypatch
+    ):
+        monkeypatch.setattr(file_tools, "MAX_READ_BYTES", 1024)
+
+        lines, offset = [], 1
+        while offset is not None:
+            data = (await read_file(file_path=str(numbered_file), offset=offset, limit=5000))[
+                "data"
+            ]
+            assert len(data["content"].encode()) <= 1024
+            lines.extend(data["content"].splitlines())
+            offset = data["next_offset"]
+
+        assert len(lines) == 5000
+        assert lines[-1] == "  5000\tline 5000"
+
+    async def test_overlong_line_is_truncated(self, read_file, tmp_path):
+        path = tmp_path / "long.txt"
+        path.write_text("x" * 100_000 + "\nshort\n")
+
+        result = await read_file(file_path=str(path))
+
+        first, second = result["data"]["content"].splitlines()
+        assert first.endswith("x" * 10 + "... [truncated]")
+        assert len(first) < file_tools.MAX_LINE_LENGTH + 50
+        assert second == "     2\tshort"
+
+    def test_utf16_falls_back_to_decoded_reads(self, tmp_path):
+        path = tmp_path / "utf16.txt"
+        path.write_text("one\ntwo\nthree\n", encoding="utf-16")
+
+        result = read_lines(path, 1, 1, 1024, 100, encoding="utf-16")
+
+        assert result.lines == [(2, "two")]
+        assert result.total_lines == 3
+        assert result.next_line == 3
+
+
+@pytest.mark.unit
+class TestByteRanges:
+    async def test_binary_ranges_reassemble_file(self, read_file, tmp_path):
+        path = tmp_path / "blob.bin"
+        payload = bytes(range(256)) * 40
+        path.write_bytes(payload)
+
+        chunks, cursor = [], 0
+        while cursor is not None:
+            data = (await read_file(file_path=str(path), byte_offset=cursor, byte_limit=3000))[
+                "data"
+            ]
+            assert data["bytes_read"] <= 3000
+            chunks.append(base64.b64decode(data["content"]))
+            cursor = data["next_byte_offset"]
+
+        assert b"".join(chunks) == payload
+        assert len(chunks) == 4
+
+    async def test_whole_small_binary_by_default(self, read_file, tmp_path):
+        path = tmp_path / "image.png"
+        path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100)
+
+        data = (await read_file(file_path=str(path)))["data"]
+
+        assert data["content_type"] == "image"
+        assert data["bytes_read"] == 108
+        assert data["next_byte_offset"] is None
+        assert data["truncated"] is False
+
+    async def test_byte_limit_capped_by_budget(self, read_file, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_tools, "MAX_READ_BYTES", 512)
+        path = tmp_path / "blob.bin"
+        path.write_bytes(b"\x00" * 2048)
+
+        data = (await read_file(file_path=str(path), byte_limit=10_000))["data"]
+
+        # The base64 content, not the raw bytes, is held to the budget
+        assert data["bytes_read"] == 384
+        assert len(data["content"]) == 512
+        assert data["next_byte_offset"] == 384
+        assert data["truncated"] is True
+
+
+@pytest.mark.performance
+class TestLargeFiles:
+    async def test_memory_independent_of_offset(self, read_file, tmp_path):
+        path = tmp_path / "large.log"
+        line = b"2026-10-18T00:00:00 INFO request handled in 12ms path=/api/v1/items\n"
+        block = line * 16_384
+        with open(path, "wb") as f:
+            for _ in range(32):  # ~35MB, 524,288 lines
+                f.write(block)
+        total = 32 * 16_384
+
+        # First read builds the index (streamed in fixed-size chunks)
+        tracemalloc.start()
+        result = await read_file(file_path=str(path), offset=total - 1, limit=10)
+        _, build_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await read_file(file_path=str(path), offset=1, limit=10)
+        _, read_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert result["data"]["lines_read"] == 2
+        assert result["data"]["total_lines"] == total
+        assert build_peak < 8 * 1024 * 1024
+        assert read_peak < 2 * 1024 * 1024
@@ -0,0 +1,405 @@
+"""
+Component tests for IncrementalUpdateService's change pipeline.
+
+Covers:
+- Changes survive a restart in the SQLite change log
+- insert -> update -> delete sequences coalesce per record
+- All changed records are re-embedded in one batcher call and written in bulk
+- Shrinking updates and deletes remove stale chunks
+- Failed passes leave changes in the log for retry, isolate bad records,
+  back off and eventually move changes to the failed table
+- Backpressure once the backlog reaches max_backlog
+- Per-user freshness lag; reads only wait for the reader's due changes
+- The pending count is kept in memory instead of queried per write
+- store_knowledge_local queues knowledge instead of embedding it inline
+- Qdrant bulk deletes only remove the caller's points
+"""
+
+import asyncio
+
+import pytest
+
+from tools.intelligent_tools.language import embedding_generator
+from tools.services.intelligence_service.vector_db import incremental_update_service
+from tools.services.intelligence_service.vector_db.base_vector_db import BaseVectorDB
+from tools.services.intelligence_service.vector_db.change_log import ChangeLog
+from tools.services.intelligence_service.vector_db.incremental_update_service import (
+    IncrementalUpdateService,
+    UpdatePolicy,
+    UpdateStrategy,
+    chunk_point_id,
+)
+from tools.services.intelligence_service.vector_db.qdrant_vector_db import QdrantVectorDB
+
+
+class FakeEmbedder:
+    """EmbeddingBatcher stand-in recording each embed call"""
+
+    def __init__(self, fail=False, reject=None):
+        self.calls = []
+        self.fail = fail
+        self.reject = reject
+
+    async def embed(self, texts, model=None):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("embedding service unavailable")
+        if self.reject in texts:
+            raise ValueError(f"cannot embed {self.reject!r}")
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class MemoryVectorDB(BaseVectorDB):
+    """In-memory vector store that counts bulk writes"""
+
+    def __init__(self):
+        super().__init__()
+        self.points = {}
+        self.bulk_stores = 0
+        self.bulk_deletes = 0
+
+    async def store_vectors(self, items):
+        self.bulk_stores += 1
+        return await super().store_vectors(items)
+
+    async def delete_vectors(self, ids, user_id):
+        self.bulk_deletes += 1
+        return await super().delete_vectors(ids, user_id)
+
+    async def store_vector(self, id, text, embedding, user_id, metadata=None):
+        self.points[id] = {"text": text, "user_id": user_id, "metadata": metadata}
+        return True
+
+    async def delete_vector(self, id, user_id):
+        return self.points.pop(id, None) is not None
+
+    async def search_vectors(self, query_embedding, user_id, config):
+        return []
+
+    async def search_text(self, query_text, user_id, config):
+        return []
+
+    async def get_vector(self, id, user_id):
+        return None
+
+    async def list_vectors(self, user_id, limit=100, offset=0):
+        return []
+
+    async def get_stats(self, user_id=None):
+        return {"count": len(self.points)}
+
+    def records(self):
+        return {p["metadata"]["record_id"] for p in self.points.values()}
+
+
+@pytest.fixture
+async def make_service(tmp_path):
+    services = []
+
+    def _make(strategy=UpdateStrategy.LAZY, vector_db=None, embedder=None, **policy):
+        service = IncrementalUpdateService(
+            policy=UpdatePolicy(
+                strategy=strategy,
+                change_log_dir=str(tmp_path / "changes"),
+                chunk_size=40,
+                chunk_overlap=0,
+                **policy,
+            ),
+            vector_db=vector_db or MemoryVectorDB(),
+            embedder=embedder or FakeEmbedder(),
+        )
+        services.append(service)
+        return service
+
+    yield _make
+    for service in services:
+        await service.close()
+
+
+LONG_TEXT = " ".join(f"Sentence number {i} about vector indexes." for i in range(8))
+
+
+@pytest.mark.unit
+class TestIncrementalUpdatePipeline:
+    async def test_changes_survive_restart(self, make_service):
+        first = make_service()
+        await first.record_change("doc-1", "alice", "insert", text="hello world")
+        await first.close()
+
+        db = MemoryVectorDB()
+        second = make_service(vector_db=db)
+        status = await second.get_freshness_status("alice")
+        assert status["user_pending_changes"] == 1
+
+        result = await second.process_pending_changes(force=True)
+        assert result["changes_processed"] == 1
+        assert db.records() == {"doc-1"}
+        assert (await second.get_freshness_status())["pending_changes"] == 0
+
+    async def test_coalesces_per_record_and_batches_embeddings(self, make_service):
+        db = MemoryVectorDB()
+        embedder = FakeEmbedder()
+        service = make_service(vector_db=db, embedder=embedder)
+
+        await service.record_change("a", "alice", "insert", text="first draft")
+        await service.record_change("a", "alice", "update", text="final text")
+        await service.record_change("b", "alice", "insert", text="short lived")
+        await service.record_change("b", "alice", "update", text="still short lived")
+        await service.record_change("b", "alice", "delete")
+        await service.record_change("c", "bob", "insert", text="bob's note")
+
+        result = await service.process_pending_changes(force=True)
+
+        assert result["changes_processed"] == 6
+        assert result["records_upserted"] == 2
+        assert result["records_deleted"] == 0
+        assert embedder.calls == [["final text", "bob's note"]]
+        assert db.bulk_stores == 1
+        assert db.records() == {"a", "c"}
+        assert service.changes_coalesced == 3
+
+    async def test_shrinking_update_and_delete_remove_stale_chunks(self, make_service):
+        db = MemoryVectorDB()
+        service = make_service(vector_db=db)
+
+        await service.record_change("doc", "alice", "insert", text=LONG_TEXT)
+        await service.process_pending_changes(force=True)
+        chunk_count = len(db.points)
+        assert chunk_count > 1
+
+        await service.record_change("doc", "alice", "update", text="tiny")
+        await service.process_pending_changes(force=True)
+        assert set(db.points) == {chunk_point_id(("user_knowledge", "alice", "doc"), 0)}
+
+        await service.record_change("doc", "alice", "delete")
+        result = await service.process_pending_changes(force=True)
+        assert result["records_deleted"] == 1
+        assert db.points == {}
+
+    async def test_failed_pass_keeps_changes_for_retry(self, make_service):
+        db = MemoryVectorDB()
+        embedder = FakeEmbedder(fail=True)
+        service = make_service(vector_db=db, embedder=embedder, retry_backoff_seconds=0)
+
+        await service.record_change("doc", "alice", "insert", text="hello")
+        result = await service.process_pending_changes(force=True)
+        assert result["changes_failed"] == 1
+        assert (await service.get_freshness_status())["pending_changes"] == 1
+
+        embedder.fail = False
+        result = await service.process_pending_changes(force=True)
+        assert result["changes_processed"] == 1
+        assert db.records() == {"doc"}
+
+    async def test_bad_record_does_not_block_its_batch(self, make_service):
+        db = MemoryVectorDB()
+        service = make_service(vector_db=db, embedder=FakeEmbedder(reject="poison"))
+
+        await service.record_change("good-1", "alice", "insert", text="fine")
+        await service.record_change("bad", "alice", "insert", text="poison")
+        await service.record_change("good-2", "bob", "insert", text="also fine")
+
+        result = await service.process_pending_changes(force=True)
+
+        assert result["changes_processed"] == 2
+        assert result["changes_failed"] == 1
+        assert db.records() == {"good-1", "good-2"}
+
+    async def test_failed_record_backs_off_and_holds_later_changes(self, make_service):
+        db = MemoryVectorDB()
+        embedder = FakeEmbedder(reject="poison")
+        service = make_service(vector_db=db, embedder=embedder, retry_backoff_seconds=60)
+
+        await service.record_change("doc", "alice", "insert", text="poison")
+        await service.process_pending_changes(force=True)
+        await service.record_change("doc", "alice", "update", text="fixed")
+        await service.record_change("other", "alice", "insert", text="fine")
+
+        embedder.reject = None
+        result = await service.process_pending_changes(force=True)
+
+        # "doc" waits for its backoff so its changes stay in order
+        assert result["changes_processed"] == 1
+        assert db.records() == {"other"}
+        assert (await service.get_freshness_status())["pending_changes"] == 2
+
+    async def test_exhausted_changes_move_to_failed_table(self, make_service):
+        db = MemoryVectorDB()
+        service = make_service(
+            vector_db=db,
+            embedder=FakeEmbedder(reject="poison"),
+            max_attempts=3,
+            retry_backoff_seconds=0,
+        )
+        await service.record_change("bad", "alice", "insert", text="poison")
+
+        dead_lettered = 0
+        for _ in range(3):
+            result = await service.process_pending_changes(force=True)
+            dead_lettered += result["changes_dead_lettered"]
+
+        status = await service.get_freshness_status()
+        assert dead_lettered == 1
+        assert status["pending_changes"] == 0
+        assert status["failed_changes"] == 1
+
+    async def test_content_loader_supplies_missing_text(self, make_service):
+        db = MemoryVectorDB()
+        service = make_service(vector_db=db)
+        loaded = []
+
+        async def loader(table_name, user_id, ids):
+            loaded.append((table_name, user_id, sorted(ids)))
+            return {i: f"text of {i}" for i in ids if i != "gone"}
+
+        service._content_loader = loader
+        await service.record_change("x", "alice", "update")
+        await service.record_change("gone", "alice", "update")
+
+        result = await service.process_pending_changes(force=True)
+        assert loaded == [("user_knowledge", "alice", ["gone", "x"])]
+        assert result["records_skipped"] == 1
+        assert db.records() == {"x"}
+
+    async def test_backpressure_drains_backlog(self, make_service):
+        db = MemoryVectorDB()
+        service = make_service(
+            strategy=UpdateStrategy.SCHEDULED, vector_db=db, max_backlog=3, batch_size=2
+        )
+
+        for i in range(2):
+            await service.record_change(f"doc-{i}", "alice", "insert", text=f"text {i}")
+        assert service.backpressure_waits == 0
+        assert db.points == {}
+
+        await service.record_change("doc-2", "alice", "insert", text="text 2")
+        assert service.backpressure_waits == 1
+        assert db.records() == {"doc-0", "doc-1", "doc-2"}
+        assert (await service.get_freshness_status())["pending_changes"] == 0
+
+    async def test_immediate_strategy_applies_on_record(self, make_service):
+        db = MemoryVectorDB()
+        service = make_service(strategy=UpdateStrategy.IMMEDIATE, vector_db=db)
+
+        await service.record_change("doc", "alice", "insert", text="now")
+        assert db.records() == {"doc"}
+
+    async def test_freshness_lag_per_user(self, make_service):
+        service = make_service()
+
+        await service.record_change("a", "alice", "insert", text="alice text")
+        await asyncio.sleep(0.05)
+        await service.record_change("b", "bob", "insert", text="bob text")
+
+        lag = await service.get_freshness_lag()
+        assert lag["alice"]["pending_changes"] == 1
+        assert lag["alice"]["freshness_lag_seconds"] >= lag["bob"]["freshness_lag_seconds"] > 0
+
+        await service.ensure_fresh("alice")
+        lag = await service.get_freshness_lag()
+        assert lag["alice"]["freshness_lag_seconds"] == 0.0
+        assert lag["alice"]["changes_applied"] == 1
+        assert lag["alice"]["last_applied_lag_seconds"] >= 0.05
+        # Only the reader's changes are applied
+        assert lag["bob"]["pending_changes"] == 1
+        assert lag["bob"]["changes_applied"] == 0
+
+        status = await service.get_freshness_status("alice")
+        assert status["user_pending_changes"] == 0
+        assert status["is_stale"] is False
+
+    async def test_ensure_fresh_skips_changes_in_backoff(self, make_service):
+        db = MemoryVectorDB()
+        embedder = FakeEmbedder(reject="poison")
+        service = make_service(vector_db=db, embedder=embedder, retry_backoff_seconds=60)
+
+        await service.record_change("doc", "alice", "insert", text="poison")
+        await service.ensure_fresh("alice")
+        embedder.calls.clear()
+
+        result = await service.ensure_fresh("alice")
+
+        assert result["changes_processed"] == 0
+        assert embedder.calls == []
+        assert (await service.get_freshness_status("alice"))["user_pending_changes"] == 1
+
+    async def test_pending_count_is_not_queried_per_write(self, make_service, monkeypatch):
+        service = make_service()
+        counts = []
+        original_count = ChangeLog.count
+
+        def count(log):
+            counts.append(1)
+            return original_count(log)
+
+        monkeypatch.setattr(ChangeLog, "count", count)
+        for i in range(20):
+            await service.record_change(f"doc-{i}", "alice", "insert", text=f"text {i}")
+        assert (await service.process_pending_changes(force=True))["changes_processed"] == 20
+        await service.record_change("late", "alice", "insert", text="late")
+
+        assert len(counts) == 1
+        assert service._pending == 1
+
+    async def test_store_knowledge_local_queues_the_change(self, make_service, monkeypatch):
+        db = MemoryVectorDB()
+        embedder = FakeEmbedder()
+        service = make_service(vector_db=db, embedder=embedder)
+        monkeypatch.setattr(incremental_update_service, "incremental_update_service", service)
+
+        result = await embedding_generator.store_knowledge_local("alice", "remember this")
+
+        assert result["success"] is True
+        assert embedder.calls == []
+        await service.ensure_fresh("alice")
+        assert db.records() == {result["id"]}
+        assert embedder.calls == [["remember this"]]
+
+    async def test_rejects_unknown_operation(self, make_service):
+        service = make_service()
+        assert await service.record_change("doc", "alice", "upsert", text="x") is False
+
+
+class FakeQdrantClient:
+    """Sync isa_common QdrantClient stand-in with payload-filtered scroll"""
+
+    def __init__(self, points):
+        self.points = points  # id -> payload
+        self.deleted = []
+
+    def scroll(self, collection_name, filter_conditions=None, limit=100, **kwargs):
+        def matches(cond, payload):
+            return payload.get(cond["field"]) == cond["match"]["keyword"]
+
+        hits = [
+            {"id": id, "payload": payload}
+            for id, payload in self.points.items()
+            if all(matches(c, payload) for c in filter_conditions.get("must", []))
+            and any(matches(c, payload) for c in filter_conditions.get("should", []))
+        ]
+        return {"points": hits[:limit], "next_offset": None}
+
+    def delete_points(self, collection_name, ids):
+        self.deleted.extend(ids)
+        return "op-1"
+
+
+@pytest.mark.unit
+class TestQdrantBulkDelete:
+    async def test_only_owned_points_are_deleted(self):
+        db = QdrantVectorDB.__new__(QdrantVectorDB)
+        db.collection_name = "user_knowledge"
+        db.client = FakeQdrantClient(
+            {
+                "a1": {"id": "a1", "user_id": "alice"},
+                "a2": {"id": "a2", "user_id": "alice"},
+                "b1": {"id": "b1", "user_id": "bob"},
+            }
+        )
+
+        deleted = await db.delete_vectors(["a1", "b1", "missing", "a2"], "alice")
+
+        assert deleted == 2
+        assert db.client.deleted == ["a1", "a2"]
+        assert await db.delete_vectors(["b1"], "alice") == 0
+        assert db.client.deleted == ["a1", "a2"]
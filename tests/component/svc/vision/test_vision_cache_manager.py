@@ -0,0 +1,122 @@
+"""
+Component tests for VisionCacheManager's SQLite-backed LRU store.
+
+Covers:
+- Cache hits served from the in-memory index
+- Batched hit-count persistence
+- LRU eviction at max_cache_entries
+- TTL expiry and O(1) stats
+- Persistence across instances and legacy JSON import
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from tools.intelligent_tools.vision.helper.vision_cache_manager import VisionCacheManager
+
+URL = "https://example.com/login"
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+
+    def _make(**kwargs):
+        manager = VisionCacheManager(
+            cache_dir=str(tmp_path / "cache"), preconfig_dir=str(tmp_path / "sites"), **kwargs
+        )
+        managers.append(manager)
+        return manager
+
+    yield _make
+    for manager in managers:
+        manager.flush_hits()
+
+
+@pytest.mark.unit
+class TestVisionCacheStore:
+    async def test_save_and_hit(self, make_manager):
+        manager = make_manager(hit_flush_interval=3600)
+        await manager.save_detection_result(URL, "login", {"user": [1, 2]}, confidence=0.9)
+
+        assert await manager.get_cached_detection(URL, "login") == {"user": [1, 2]}
+        assert await manager.get_cached_detection(URL, "login") == {"user": [1, 2]}
+
+        stats = await manager.get_cache_stats()
+        assert stats["total_entries"] == 1
+        assert stats["by_type"] == {"login": 1}
+        assert stats["average_hits"] == 2.0
+        assert stats["pending_hit_updates"] == 1
+
+    async def test_low_confidence_not_cached(self, make_manager):
+        manager = make_manager()
+        await manager.save_detection_result(URL, "login", {"a": 1}, confidence=0.1)
+
+        assert await manager.get_cached_detection(URL, "login") is None
+
+    async def test_hit_counts_flushed_in_batch(self, make_manager):
+        manager = make_manager(hit_flush_interval=3600)
+        await manager.save_detection_result(URL, "login", {"a": 1}, confidence=0.9)
+        for _ in range(5):
+            await manager.get_cached_detection(URL, "login")
+
+        assert manager.flush_hits() == 1
+
+        reopened = make_manager()
+        stats = await reopened.get_cache_stats()
+        assert stats["average_hits"] == 5.0
+
+    async def test_lru_eviction(self, make_manager):
+        manager = make_manager(max_cache_entries=2, hit_flush_interval=3600)
+        await manager.save_detection_result(f"{URL}/1", "login", {"n": 1}, confidence=0.9)
+        await manager.save_detection_result(f"{URL}/2", "login", {"n": 2}, confidence=0.9)
+
+        # Touch entry 1 so entry 2 becomes least recently used
+        await manager.get_cached_detection(f"{URL}/1", "login")
+        await manager.save_detection_result(f"{URL}/3", "login", {"n": 3}, confidence=0.9)
+
+        assert await manager.get_cached_detection(f"{URL}/2", "login") is None
+        assert await manager.get_cached_detection(f"{URL}/1", "login") == {"n": 1}
+        stats = await manager.get_cache_stats()
+        assert stats["total_entries"] == 2
+        assert stats["evictions"] == 1
+
+    async def test_expired_entries_removed(self, make_manager):
+        manager = make_manager()
+        manager.default_cache_duration = timedelta(seconds=-1)
+        await manager.save_detection_result(URL, "search", {"a": 1}, confidence=0.9)
+
+        assert await manager.cleanup_expired_cache() == 1
+        assert (await manager.get_cache_stats())["total_entries"] == 0
+
+    async def test_clear_cache_by_type(self, make_manager):
+        manager = make_manager()
+        await manager.save_detection_result(URL, "login", {"a": 1}, confidence=0.9)
+        await manager.save_detection_result(URL, "search", {"b": 1}, confidence=0.9)
+
+        assert await manager.clear_cache("login") == 1
+        assert (await manager.get_cache_stats())["by_type"] == {"search": 1}
+
+    async def test_imports_legacy_json_files(self, tmp_path, make_manager):
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        legacy = {
+            "elements": {"legacy": True},
+            "detection_type": "login",
+            "confidence": 0.9,
+            "timestamp": datetime.now().isoformat(),
+            "url_pattern": "example.com",
+            "page_hash": "",
+            "expires_at": (datetime.now() + timedelta(hours=1)).isoformat(),
+            "hit_count": 3,
+        }
+        probe = make_manager()
+        key = probe._generate_cache_key(URL, "login")
+        (cache_dir / f"{key}.json").write_text(json.dumps(legacy))
+
+        manager = make_manager()
+
+        assert await manager.get_cached_detection(URL, "login") == {"legacy": True}
+        assert not list(cache_dir.glob("*.json"))
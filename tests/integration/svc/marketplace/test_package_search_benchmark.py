@@ -0,0 +1,142 @@
+"""
+Marketplace package search benchmark.
+
+Compares the previous search query (per-row to_tsvector, COUNT(*) and deep
+OFFSET) with the stored search_vector column, keyset pagination and planner
+row estimates over a synthetic 100k-package catalog.
+
+Requirements:
+    - PostgreSQL with the ``mcp`` schema (TEST_DATABASE_URL)
+
+Everything runs inside one transaction that is rolled back, so the catalog,
+indexes and migration 003 never persist.
+
+Run:
+    pytest tests/integration/svc/marketplace/test_package_search_benchmark.py -m performance -s
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+MIGRATIONS = Path(__file__).parents[4] / "services" / "marketplace_service" / "migrations"
+CATALOG_SIZE = 100_000
+PAGE_SIZE = 20
+DEEP_PAGE = 200
+RUNS = 5
+
+SEED_CATALOG = """
+INSERT INTO mcp.marketplace_packages
+    (name, display_name, description, tags, registry_source, download_count, star_count)
+SELECT
+    '@bench-' || (i % 500) || '/' || (ARRAY['video', 'calendar', 'notion', 'design', 'search'])[1 + i % 5] || '-server-' || i,
+    'Bench Server ' || i,
+    'MCP server ' || i || ' for ' || (ARRAY['video editing', 'calendar events', 'notion pages', 'ui design', 'web search'])[1 + i % 5],
+    ARRAY[(ARRAY['video', 'calendar', 'notion', 'design', 'search'])[1 + i % 5]],
+    'npm',
+    (random() * 100000)::int,
+    (random() * 1000)::int
+FROM generate_series(1, $1) AS i
+"""
+
+OLD_SEARCH = """
+SELECT * FROM mcp.marketplace_packages
+WHERE deprecated = FALSE AND
+    to_tsvector('english', coalesce(name, '') || ' ' ||
+    coalesce(display_name, '') || ' ' ||
+    coalesce(description, '')) @@ plainto_tsquery('english', $1)
+ORDER BY download_count DESC, star_count DESC
+LIMIT $2 OFFSET $3
+"""
+
+OLD_COUNT = """
+SELECT COUNT(*) FROM mcp.marketplace_packages
+WHERE deprecated = FALSE AND
+    to_tsvector('english', coalesce(name, '') || ' ' ||
+    coalesce(display_name, '') || ' ' ||
+    coalesce(description, '')) @@ plainto_tsquery('english', $1)
+"""
+
+NEW_FILTER = """
+deprecated = FALSE AND (search_vector @@ websearch_to_tsquery('english', $1)
+    OR name ILIKE $1 || '%' OR display_name ILIKE $1 || '%'
+    OR name % $1 OR display_name % $1)
+"""
+
+NEW_SEARCH = f"""
+SELECT * FROM mcp.marketplace_packages
+WHERE {NEW_FILTER} AND (download_count, star_count, id) < ($2, $3, $4::uuid)
+ORDER BY download_count DESC, star_count DESC, id DESC
+LIMIT $5
+"""
+
+NEW_ESTIMATE = f"EXPLAIN (FORMAT JSON) SELECT 1 FROM mcp.marketplace_packages WHERE {NEW_FILTER}"
+
+
+async def _time(conn, sql, *args) -> float:
+    """Median wall time of ``sql`` in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await conn.fetch(sql, *args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[RUNS // 2]
+
+
+@pytest.mark.integration
+@pytest.mark.performance
+@pytest.mark.requires_db
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_package_search_benchmark(db_pool):
+    async with db_pool.acquire() as conn:
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            for migration in ("001", "002"):
+                await conn.execute(next(MIGRATIONS.glob(f"{migration}_*.sql")).read_text())
+            await conn.execute("TRUNCATE mcp.marketplace_packages CASCADE")
+            await conn.execute(SEED_CATALOG, CATALOG_SIZE)
+            await conn.execute("ANALYZE mcp.marketplace_packages")
+
+            query = "video"
+            old_first = await _time(conn, OLD_SEARCH, query, PAGE_SIZE, 0)
+            old_deep = await _time(conn, OLD_SEARCH, query, PAGE_SIZE, DEEP_PAGE * PAGE_SIZE)
+            old_count = await _time(conn, OLD_COUNT, query)
+
+            await conn.execute(next(MIGRATIONS.glob("003_*.sql")).read_text())
+            await conn.execute("ANALYZE mcp.marketplace_packages")
+
+            # Keyset position equivalent to the deep OFFSET page
+            anchor = await conn.fetchrow(
+                f"SELECT download_count, star_count, id FROM mcp.marketplace_packages "
+                f"WHERE {NEW_FILTER} ORDER BY download_count DESC, star_count DESC, id DESC "
+                f"OFFSET $2 LIMIT 1",
+                query,
+                DEEP_PAGE * PAGE_SIZE,
+            )
+            first_page = (query, 2**31 - 1, 2**31 - 1, "ffffffff-ffff-ffff-ffff-ffffffffffff")
+            new_first = await _time(conn, NEW_SEARCH, *first_page, PAGE_SIZE + 1)
+            new_deep = await _time(conn, NEW_SEARCH, query, *anchor, PAGE_SIZE + 1)
+            new_estimate = await _time(conn, NEW_ESTIMATE, query)
+
+            exact = await conn.fetchval(
+                f"SELECT COUNT(*) FROM mcp.marketplace_packages WHERE {NEW_FILTER}", query
+            )
+            plan = json.loads(await conn.fetchval(NEW_ESTIMATE, query))
+            estimated = plan[0]["Plan"]["Plan Rows"]
+        finally:
+            await transaction.rollback()
+
+    print(
+        f"\n{CATALOG_SIZE} packages, query={query!r}, median of {RUNS} runs (ms)\n"
+        f"  first page  old {old_first:8.2f}  keyset {new_first:8.2f}\n"
+        f"  page {DEEP_PAGE:<5}  old {old_deep:8.2f}  keyset {new_deep:8.2f}\n"
+        f"  total       old {old_count:8.2f}  estimate {new_estimate:6.2f}"
+        f"  ({estimated} estimated vs {exact} exact)"
+    )
+
+    assert new_deep < old_deep
+    assert new_estimate < old_count
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the queued Loki log shipper.
+
+Tests verify:
+1. emit() only enqueues; records reach a local HTTP sink in gzip batches
+2. Batches are cut by size and by time
+3. Failed pushes are retried
+4. Overload drops records with a counter instead of blocking
+5. close() ships everything still queued
+6. A slow sink receives batches, not one push per line
+7. The tenant header is sent and concurrent drops are all counted
+8. setup_logging only uses HTTP when the transport asks for it
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.logging as core_logging
+from core.logging import LokiHttpSender, QueuedLokiHandler, setup_logging
+
+LABELS = {"service": "mcp_service", "environment": "test", "job": "mcp_service"}
+
+
+class LokiSink:
+    """Local HTTP server recording Loki push requests"""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.pushes = []
+        self.tenants = []
+        self.delay = delay
+        self.failures = failures
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(sink.delay)
+                if sink.failures > 0:
+                    sink.failures -= 1
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                assert self.headers["Content-Encoding"] == "gzip"
+                sink.tenants.append(self.headers.get("X-Scope-OrgID"))
+                sink.pushes.append(json.loads(gzip.decompress(body)))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def lines(self):
+        return [v[1] for push in self.pushes for s in push["streams"] for v in s["values"]]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def sink():
+    sink = LokiSink()
+    yield sink
+    sink.close()
+
+
+def make_logger(handler, name="loki-test"):
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(f"{name}.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+class TestQueuedLokiHandler:
+    def test_records_are_batched_and_compressed(self, sink):
+        handler = QueuedLokiHandler(
+            LokiHttpSender(sink.url), LABELS, "mcp_service", batch_size=50, flush_interval=5
+        )
+        logger = make_logger(handler)
+        for i in range(120):
+            logger.info(f"line {i}")
+        logger.warning("warned")
+        handler.flush()
+
+        assert sink.lines() == [f"line {i}" for i in range(120)] + ["warned"]
+        assert len(sink.pushes) == 3  # 50 + 50 by size, remainder by flush
+        streams = [s["stream"] for push in sink.pushes for s in push["streams"]]
+        assert {s["level"] for s in streams} == {"info", "warning"}
+        assert all(s["service"] == "mcp_service" for s in streams)
+        handler.close()
+
+    def test_partial_batch_ships_after_flush_interval(self, sink):
+        handler = QueuedLokiHandler(
+            LokiHttpSender(sink.url), LABELS, "mcp_service", flush_interval=0.05
+        )
+        make_logger(handler).info("lonely")
+
+        deadline = time.monotonic() + 2
+        while not sink.pushes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.lines() == ["lonely"]
+        handler.close()
+
+    def test_failed_push_is_retried(self, sink):
+        sink.failures = 2
+        handler = QueuedLokiHandler(
+            LokiHttpSender(sink.url), LABELS, "mcp_service", retry_backoff=0.01
+        )
+        make_logger(handler).info("eventually")
+        handler.flush()
+
+        assert sink.lines() == ["eventually"]
+        assert handler.get_stats()["dropped"] == 0
+        handler.close()
+
+    def test_overload_drops_instead_of_blocking(self):
+        release = threading.Event()
+
+        def blocked_sender(streams):
+            release.wait()
+
+        handler = QueuedLokiHandler(
+            blocked_sender, LABELS, "mcp_service", max_queue_size=10, batch_size=1
+        )
+        logger = make_logger(handler)
+
+        started = time.perf_counter()
+        for i in range(1000):
+            logger.info(f"line {i}")
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        # At most one record in the stuck sender plus a full queue got through
+        assert handler.get_stats()["dropped"] >= 1000 - 11
+        release.set()
+        handler.close()
+
+    def test_close_ships_remaining_records(self, sink):
+        handler = QueuedLokiHandler(
+            LokiHttpSender(sink.url), LABELS, "mcp_service", flush_interval=60
+        )
+        logger = make_logger(handler)
+        for i in range(10):
+            logger.info(f"line {i}")
+        handler.close()
+
+        assert sink.lines() == [f"line {i}" for i in range(10)]
+        assert handler.get_stats()["shipped"] == 10
+
+    def test_slow_sink_receives_batches_not_lines(self):
+        sink = LokiSink(delay=0.05)
+        handler = QueuedLokiHandler(LokiHttpSender(sink.url), LABELS, "mcp_service", batch_size=500)
+        logger = make_logger(handler)
+        count = 5000
+
+        for i in range(count):
+            logger.info(f"request {i} handled")
+        handler.close()
+        sink.close()
+
+        stats = handler.get_stats()
+        assert stats["shipped"] + stats["dropped"] == count
+        assert len(sink.pushes) <= count // 500 + 1
+
+    def test_tenant_is_sent_with_pushes(self, sink):
+        handler = QueuedLokiHandler(
+            LokiHttpSender(sink.url, tenant_id="isa-staging"), LABELS, "mcp_service"
+        )
+        make_logger(handler).info("tenanted")
+        handler.close()
+
+        assert sink.tenants == ["isa-staging"]
+
+    def test_concurrent_drops_are_all_counted(self):
+        release = threading.Event()
+        handler = QueuedLokiHandler(
+            lambda streams: release.wait(), LABELS, "mcp_service", max_queue_size=1, batch_size=1
+        )
+        logger = make_logger(handler)
+        threads, per_thread = 8, 2000
+
+        def flood():
+            for i in range(per_thread):
+                logger.info(f"line {i}")
+
+        workers = [threading.Thread(target=flood) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        release.set()
+        handler.close()
+
+        stats = handler.get_stats()
+        assert stats["shipped"] + stats["dropped"] == threads * per_thread
+
+
+class TestSetupLoggingTransport:
+    @pytest.fixture
+    def senders(self, monkeypatch):
+        created = []
+
+        class Recorder:
+            def __init__(self, kind):
+                self.kind = kind
+
+            def __call__(self, *args, **kwargs):
+                created.append((self.kind, args, kwargs))
+                return lambda streams: None
+
+        monkeypatch.setattr(core_logging, "LokiHttpSender", Recorder("http"))
+        monkeypatch.setattr(core_logging, "LokiGrpcSender", Recorder("grpc"))
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        yield created
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+
+    def test_loki_url_alone_keeps_grpc(self, senders):
+        setup_logging(enable_console=False, loki_enabled=True, loki_url="http://loki:3100")
+
+        assert [kind for kind, _, _ in senders] == ["grpc"]
+
+    def test_http_transport_passes_tenant(self, senders):
+        setup_logging(
+            enable_console=False,
+            loki_enabled=True,
+            loki_url="http://loki:3100",
+            loki_transport="http",
+            loki_tenant_id="isa-prod",
+        )
+
+        assert senders == [("http", ("http://loki:3100",), {"tenant_id": "isa-prod"})]
+
+    def test_http_transport_without_url_falls_back_to_grpc(self, senders):
+        setup_logging(enable_console=False, loki_enabled=True, loki_transport="http")
+
+        assert [kind for kind, _, _ in senders] == ["grpc"]
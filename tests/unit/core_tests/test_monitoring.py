@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MonitoringManager's bounded hot-path structures.
+
+Tests verify:
+1. Request history is a fixed-size ring buffer
+2. GCRA rate limiting allows bursts, refills over time and evicts idle keys
+3. Latency sketches stay within their relative accuracy
+4. Memory stays bounded as history, keys and samples grow
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from core.monitoring import GCRARateLimiter, LatencySketch, MonitoringManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_policy(calls=5, window=10):
+    return SimpleNamespace(rate_limits={"default": {"calls": calls, "window": window}})
+
+
+class TestRequestHistory:
+    def test_history_is_bounded_ring_buffer(self):
+        manager = MonitoringManager(history_size=3)
+        for i in range(5):
+            manager.log_request(f"tool{i}", "u", True, 0.01, "LOW")
+
+        assert [r["tool_name"] for r in manager.get_request_history()] == [
+            "tool2",
+            "tool3",
+            "tool4",
+        ]
+        assert [r["tool_name"] for r in manager.get_request_history(2)] == ["tool3", "tool4"]
+        assert manager.metrics["total_requests"] == 5
+
+    def test_metrics_include_recent_requests_and_latency(self):
+        manager = MonitoringManager()
+        manager.log_request("search", "u", True, 0.02, "LOW")
+        manager.log_request("search", "u", False, 0, "HIGH")  # rejected, never ran
+
+        metrics = manager.get_metrics()
+        assert len(metrics["recent_requests"]) == 2
+        assert metrics["tool_latency"]["search"]["count"] == 1
+        assert metrics["tool_latency"]["search"]["p50_ms"] == pytest.approx(20, rel=0.01)
+
+
+class TestGCRARateLimiter:
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(clock=clock)
+
+        assert all(limiter.allow("k", 5, 10) for _ in range(5))
+        assert limiter.allow("k", 5, 10) is False
+
+        # One emission interval (window / calls) frees one slot
+        clock.now += 2
+        assert limiter.allow("k", 5, 10) is True
+        assert limiter.allow("k", 5, 10) is False
+
+    def test_keys_are_independent(self):
+        limiter = GCRARateLimiter(clock=FakeClock())
+        assert limiter.allow("a", 1, 60)
+        assert not limiter.allow("a", 1, 60)
+        assert limiter.allow("b", 1, 60)
+
+    def test_idle_keys_are_evicted(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(clock=clock)
+        for i in range(100):
+            limiter.allow(f"user{i}", 10, 1)
+        assert len(limiter) == 100
+
+        clock.now += 1
+        limiter.allow("fresh", 10, 1)
+        assert len(limiter) == 1
+
+    def test_max_keys_bounds_state(self):
+        limiter = GCRARateLimiter(max_keys=10, clock=FakeClock())
+        for i in range(50):
+            limiter.allow(f"user{i}", 1, 3600)
+        assert len(limiter) == 10
+
+    def test_manager_counts_rate_limit_hits(self):
+        manager = MonitoringManager()
+        policy = make_policy(calls=2, window=3600)
+
+        assert manager.check_rate_limit("tool", "u", policy)
+        assert manager.check_rate_limit("tool", "u", policy)
+        assert not manager.check_rate_limit("tool", "u", policy)
+        assert manager.metrics["rate_limit_hits"] == 1
+
+
+class TestLatencySketch:
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(42)
+        values = [rng.lognormvariate(-4, 1) for _ in range(20_000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_empty_and_tiny_values(self):
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.to_dict() == {"count": 0}
+
+        sketch.add(0.0)
+        sketch.add(1e-9)
+        assert sketch.quantile(0.5) == 0.0
+
+
+class TestBoundedState:
+    def test_state_stays_bounded_as_keys_and_samples_grow(self):
+        policy = make_policy(calls=1_000_000, window=3600)
+        manager = MonitoringManager(history_size=100)
+        manager.rate_limiter.max_keys = 5_000
+
+        for i in range(20_000):
+            user = f"user{i}"
+            assert manager.check_rate_limit("tool", user, policy)
+            manager.log_request("tool", user, True, 0.001 + (i % 100) / 1000, "LOW")
+
+        assert len(manager.request_history) == 100
+        assert len(manager.rate_limiter) <= 5_000
+        sketch = manager.tool_latency["tool"]
+        assert sketch.count == 20_000
+        # 1ms..100ms at 1% accuracy spans ~230 logarithmic buckets
+        assert len(sketch._buckets) < 250
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for request tracing.
+
+Tests verify:
+1. Unsampled calls get the shared no-op span
+2. Exceptions are recorded on the span
+3. Sampling is decided per trace and the context follows asyncio tasks
+4. Instrumented calls stay within a few microseconds when tracing is off
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.tracing import (
+    INVALID_SPAN,
+    InMemorySpanExporter,
+    configure_tracing,
+    get_current_span,
+    get_tracer,
+    traced,
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(sample_rate=1.0, exporter=exporter)
+    yield exporter
+    configure_tracing(sample_rate=0.0)
+
+
+class TestSpans:
+    async def test_yields_invalid_span_when_off(self):
+        configure_tracing(sample_rate=0.0)
+        with get_tracer().start_as_current_span("x") as span:
+            assert span is INVALID_SPAN
+            assert not span.is_recording()
+            span.set_attribute("k", "v")  # No-op
+
+    async def test_errors_are_recorded(self, exporter):
+        @traced("failing")
+        async def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await failing()
+
+        (span,) = exporter.get_finished_spans()
+        assert span.status == "ERROR"
+        assert span.events[0]["attributes"]["exception.type"] == "ValueError"
+
+
+class TestPropagation:
+    async def test_sampling_is_per_trace(self):
+        exporter = InMemorySpanExporter()
+        tracer = configure_tracing(sample_rate=0.5, exporter=exporter)
+
+        @traced("child")
+        async def child():
+            pass
+
+        for _ in range(200):
+            with tracer.start_as_current_span("root"):
+                await child()
+
+        spans = exporter.get_finished_spans()
+        roots = [s for s in spans if s.name == "root"]
+        children = [s for s in spans if s.name == "child"]
+        assert 0 < len(roots) < 200
+        assert len(children) == len(roots)
+        assert {c.parent_id for c in children} == {r.span_id for r in roots}
+        configure_tracing(sample_rate=0.0)
+
+    async def test_context_follows_tasks(self, exporter):
+        async def background():
+            with get_tracer().start_as_current_span("background"):
+                return get_current_span()
+
+        with get_tracer().start_as_current_span("root") as root:
+            child = await asyncio.create_task(background())
+
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+
+
+@pytest.mark.performance
+class TestOverhead:
+    async def test_tracing_off_overhead_per_call(self):
+        configure_tracing(sample_rate=0.0)
+
+        async def plain():
+            return 1
+
+        instrumented = traced("bench")(plain)
+        n = 20000
+
+        async def run(fn):
+            start = time.perf_counter()
+            for _ in range(n):
+                await fn()
+            return (time.perf_counter() - start) / n
+
+        await run(instrumented)  # Warm up
+        baseline = min([await run(plain) for _ in range(3)])
+        traced_cost = min([await run(instrumented) for _ in range(3)])
+        overhead_us = (traced_cost - baseline) * 1e6
+
+        print(f"\nTracing-off overhead: {overhead_us:.2f}µs per span")
+        assert overhead_us < 3.0
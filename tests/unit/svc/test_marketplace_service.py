@@ -9,6 +9,7 @@ Tests:
 - Registry fetching
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime, timezone
@@ -20,6 +21,7 @@ from services.marketplace_service.install_manager import InstallManager
 from services.marketplace_service.update_manager import UpdateManager
 from tests.contracts.marketplace import (
     PackageSpec,
+    InstallResult,
     InstallStatus,
     RegistrySource,
 )
@@ -251,6 +253,63 @@ class TestPackageRepository:
         assert installation["status"] == InstallStatus.INSTALLED.value
         assert "id" in installation
 
+    @pytest.mark.asyncio
+    async def test_search_keyset_pagination(self):
+        """Test walking search results with next_cursor."""
+        repo = PackageRepository(db_pool=None)
+        for i in range(7):
+            # Ties on download_count are broken by star_count, then ID
+            await repo.create_package(
+                {"name": f"pkg-{i}", "download_count": i // 2, "star_count": i % 2}
+            )
+
+        seen = []
+        cursor = None
+        while True:
+            page = await repo.search_packages(query="pkg", limit=3, cursor=cursor)
+            seen.extend(p["name"] for p in page["packages"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        offset_page = await repo.search_packages(query="pkg", limit=7)
+        assert seen == [p["name"] for p in offset_page["packages"]]
+        assert len(set(seen)) == 7
+        assert page["total"] == 7
+
+    @pytest.mark.asyncio
+    async def test_search_count_modes(self):
+        """Test count="none" and invalid cursors."""
+        repo = PackageRepository(db_pool=None)
+        await repo.create_package({"name": "pkg-a"})
+
+        results = await repo.search_packages(query="pkg", count="none")
+        assert results["total"] is None
+        assert results["next_cursor"] is None
+
+        with pytest.raises(ValueError):
+            await repo.search_packages(query="pkg", cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            await repo.search_packages(query="pkg", count="approximate")
+
+    @pytest.mark.asyncio
+    async def test_search_prefix_match_escapes_wildcards(self):
+        """Test LIKE wildcards in the query are matched literally."""
+        conn = MagicMock()
+        conn.fetch = AsyncMock(return_value=[])
+        conn.fetchval = AsyncMock(return_value=0)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        repo = PackageRepository(db_pool=pool)
+
+        await repo.search_packages(query="50%_off\\")
+
+        sql, *args = conn.fetch.call_args.args
+        assert "ILIKE $2 ESCAPE '\\'" in sql
+        assert args[:2] == ["50%_off\\", "50\\%\\_off\\\\%"]
+        assert conn.fetchval.call_args.args[0].startswith("SELECT COUNT(*)")
+
 
 # ═══════════════════════════════════════════════════════════════
 # PackageResolver Tests
@@ -354,9 +413,72 @@ class TestPackageResolver:
             {"version": "2.0.0", "version_major": 2, "version_minor": 0, "version_patch": 0},
         ]
 
-        # ^1.2.0 should match 1.2.0 and 1.3.0, return highest
-        result = resolver._match_semver_range(versions, "^1.2.0")
-        assert result["version"] == "1.3.0"
+        # ^1.2.0 should match 1.2.0 and 1.3.0
+        version_range = resolver._parse_range("^1.2.0")
+        matching = [v["version"] for v in versions if version_range.matches(v)]
+        assert matching == ["1.2.0", "1.3.0"]
+
+    @pytest.mark.asyncio
+    async def test_resolve_ranges_in_repository(self, mock_package):
+        """Test range specs resolved through PackageRepository.find_version."""
+        repo = PackageRepository(db_pool=None)
+        fetcher = MagicMock(spec=RegistryFetcher)
+        fetcher.fetch_package = AsyncMock(return_value=None)
+        resolver = PackageResolver(repository=repo, fetcher=fetcher)
+
+        await repo.create_package(mock_package)
+        for version in ["1.0.0", "1.2.0", "1.2.5", "1.3.0", "2.0.0", "2.1.0-beta.1"]:
+            major, minor, patch, prerelease = resolver._parse_semver(version)
+            await repo.create_version(
+                {
+                    "package_id": mock_package["id"],
+                    "version": version,
+                    "version_major": major,
+                    "version_minor": minor,
+                    "version_patch": patch,
+                    "prerelease": prerelease,
+                }
+            )
+
+        async def resolve(spec):
+            version = await resolver._resolve_version(mock_package, spec)
+            return version["version"] if version else None
+
+        assert await resolve(None) == "2.0.0"
+        assert await resolve("^1.2.0") == "1.3.0"
+        assert await resolve("~1.2.0") == "1.2.5"
+        assert await resolve(">=1.3.0") == "2.0.0"
+        assert await resolve(">2.0.0") is None
+        assert await resolve("2.1.0-beta.1") == "2.1.0-beta.1"
+        assert await resolve("3.0.0") is None
+        fetcher.fetch_package.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fetched_versions_are_bulk_inserted(self, mock_package):
+        """Test versions fetched from the registry are stored in one call."""
+        repo = PackageRepository(db_pool=None)
+        await repo.create_package(mock_package)
+        fetcher = MagicMock(spec=RegistryFetcher)
+        fetcher.fetch_package = AsyncMock(
+            return_value={
+                "versions": [
+                    {"version": f"1.{i}.0", "version_major": 1, "version_minor": i}
+                    for i in range(5)
+                ]
+            }
+        )
+        repo.create_version = AsyncMock(side_effect=AssertionError("one at a time"))
+        resolver = PackageResolver(repository=repo, fetcher=fetcher)
+
+        version = await resolver._resolve_version(mock_package, "^1.1.0")
+
+        assert version["version"] == "1.4.0"
+        assert len(await repo.get_package_versions(mock_package["id"])) == 5
+        # Already stored versions are skipped
+        assert (
+            await repo.create_versions([{"package_id": mock_package["id"], "version": "1.0.0"}])
+            == 0
+        )
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -553,6 +675,66 @@ class TestUpdateManager:
         assert manager._parse_version("10.20.30") == (10, 20, 30)
         assert manager._parse_version("1.2.3-beta") == (1, 2, 3)
 
+    async def _installed(self, repo, name, installed, latest, pinned=False):
+        package = await repo.create_package({"name": name, "latest_version": latest})
+        version = await repo.create_version(
+            {"package_id": package["id"], "version": installed, "version_major": 1}
+        )
+        installation = await repo.create_installation(
+            package_id=package["id"], version_id=version["id"], user_id="user-1"
+        )
+        installation["pinned_version"] = pinned
+        return package
+
+    @pytest.mark.asyncio
+    async def test_check_updates_single_query(self):
+        """Test update checking uses the joined candidate query only."""
+        repo = PackageRepository(db_pool=None)
+        await self._installed(repo, "pkg-a", "1.0.0", "1.1.0")
+        await self._installed(repo, "pkg-b", "1.0.0", "1.0.0")
+        await self._installed(repo, "pkg-c", "1.0.0", "2.0.0", pinned=True)
+        await self._installed(repo, "pkg-d", "1.2.0", "1.1.0")
+        repo.get_package = AsyncMock(side_effect=AssertionError("per-installation lookup"))
+
+        manager = UpdateManager(repository=repo, resolver=MagicMock(), installer=MagicMock())
+        updates = await manager.check_updates(user_id="user-1")
+
+        assert [
+            (u["package_name"], u["current_version"], u["latest_version"]) for u in updates
+        ] == [("pkg-a", "1.0.0", "1.1.0")]
+
+    @pytest.mark.asyncio
+    async def test_update_all_bounded_concurrency(self):
+        """Test update_all runs updates concurrently up to the bound."""
+        repo = PackageRepository(db_pool=None)
+        for i in range(6):
+            await self._installed(repo, f"pkg-{i}", "1.0.0", "1.1.0")
+        manager = UpdateManager(
+            repository=repo, resolver=MagicMock(), installer=MagicMock(), max_concurrent_updates=2
+        )
+        running = 0
+        peak = 0
+
+        async def update_package(package_name, target_version, user_id, org_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if package_name == "pkg-3":
+                raise RuntimeError("boom")
+            return InstallResult(
+                success=True, package_id="", package_name=package_name, version=target_version
+            )
+
+        manager.update_package = update_package
+        results = await manager.update_all(user_id="user-1")
+
+        assert peak == 2
+        assert [r.package_name for r in results] == [f"pkg-{i}" for i in range(6)]
+        assert [r.success for r in results] == [True, True, True, False, True, True]
+        assert results[3].error == "boom"
+
 
 # ═══════════════════════════════════════════════════════════════
 # RegistryFetcher Tests
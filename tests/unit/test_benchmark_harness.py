@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the benchmark harness and its in-process stand-ins.
+
+Tests verify:
+1. Percentiles interpolate between sorted samples
+2. measure() times the requested number of calls, concurrently if asked
+3. compare() flags regressions beyond tolerance and ignores sub-noise changes
+4. Stand-in Qdrant filters follow must/should/must_not semantics
+5. The SQLite stand-in accepts Postgres placeholders, ANY() and JSON columns
+"""
+
+import pytest
+
+from benchmarks.harness import compare, measure, percentile
+from benchmarks.standins import HashEmbeddingClient, LocalQdrantClient, SQLitePostgresClient
+
+
+def _report(**metrics):
+    return {"benchmarks": {"case": metrics}}
+
+
+class TestHarness:
+    def test_percentile_interpolates(self):
+        samples = [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert percentile(samples, 0) == 1.0
+        assert percentile(samples, 50) == 3.0
+        assert percentile(samples, 90) == pytest.approx(4.6)
+        assert percentile(samples, 100) == 5.0
+        assert percentile([], 50) == 0.0
+
+    async def test_measure_counts_calls(self):
+        calls = 0
+
+        async def op():
+            nonlocal calls
+            calls += 1
+
+        result = await measure("op", op, iterations=40, warmup=5, concurrency=4)
+
+        assert calls == 45
+        assert result.iterations == 40
+        assert result.min_ms <= result.p50_ms <= result.p95_ms <= result.max_ms
+        assert result.throughput_ops > 0
+
+    async def test_measure_rejects_setup_with_concurrency(self):
+        async def noop():
+            pass
+
+        with pytest.raises(ValueError):
+            await measure("op", noop, concurrency=2, before_each=noop)
+
+    def test_compare_flags_regressions(self):
+        baseline = _report(p50_ms=10.0, throughput_ops=100.0)
+
+        slower = compare(baseline, _report(p50_ms=12.0, throughput_ops=80.0), tolerance=0.15)
+        assert all(c.regressed for c in slower)
+
+        within = compare(baseline, _report(p50_ms=11.0, throughput_ops=95.0), tolerance=0.15)
+        assert not any(c.regressed for c in within)
+
+    def test_compare_ignores_changes_below_noise_floor(self):
+        baseline = _report(p50_ms=0.010, throughput_ops=100000.0)
+        current = _report(p50_ms=0.020, throughput_ops=50000.0)
+
+        changes = compare(baseline, current, tolerance=0.15, noise_floor_ms=0.05)
+
+        assert len(changes) == 2
+        assert not any(c.regressed for c in changes)
+
+
+class TestStandins:
+    async def test_qdrant_filters(self):
+        client = LocalQdrantClient()
+        embedder = HashEmbeddingClient(dimension=64)
+        await client.create_collection("c", 64, "Cosine")
+        await client.upsert_points(
+            "c",
+            [
+                {"id": 1, "vector": embedder.embed("read file"), "payload": {"type": "tool"}},
+                {"id": 2, "vector": embedder.embed("read file"), "payload": {"type": "prompt"}},
+                {"id": 3, "vector": embedder.embed("read file"), "payload": {"type": "resource"}},
+            ],
+        )
+
+        results = await client.search_with_filter(
+            "c",
+            embedder.embed("read file"),
+            filter_conditions={
+                "must": [
+                    {
+                        "should": [
+                            {"field": "type", "match": {"keyword": "tool"}},
+                            {"field": "type", "match": {"keyword": "prompt"}},
+                        ]
+                    }
+                ],
+                "must_not": [{"field": "type", "match": {"keyword": "prompt"}}],
+            },
+        )
+
+        assert [r["id"] for r in results] == [1]
+        assert results[0]["score"] == pytest.approx(1.0)
+
+    async def test_sqlite_accepts_postgres_sql(self):
+        db = SQLitePostgresClient()
+        await db.insert_into(
+            "tools",
+            [
+                {"name": "a", "description": "A", "input_schema": {"type": "object"}},
+                {"name": "b", "description": "B", "input_schema": {}},
+            ],
+            schema="mcp",
+        )
+
+        rows = await db.query("SELECT * FROM mcp.tools WHERE name = ANY($1)", [["a"]])
+
+        assert [r["name"] for r in rows] == ["a"]
+        assert rows[0]["input_schema"] == {"type": "object"}
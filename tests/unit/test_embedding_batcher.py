@@ -0,0 +1,139 @@
+"""
+Unit tests for the token-budgeted embedding batcher.
+
+Covers:
+- Packing by token budget and input cap
+- Deduplication of identical texts
+- Bounded requests in flight
+- Retry with budget shrink on throttling
+- Failure reporting instead of zero vectors
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.clients.embedding_batcher import (
+    EmbeddingBatcher,
+    EmbeddingBatchError,
+    is_throttle_error,
+)
+
+
+class ThrottleError(Exception):
+    status_code = 429
+
+
+class FakeEmbeddingsClient:
+    """OpenAI-compatible stub: embeds a text as [len(text)]"""
+
+    def __init__(self, delay: float = 0.0, fail_times: int = 0, error=None):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.error = error or ThrottleError("Too Many Requests")
+        self.requests = []
+        self.in_flight = 0
+        self.max_seen_in_flight = 0
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    async def _create(self, input, model):
+        self.requests.append(list(input))
+        self.in_flight += 1
+        self.max_seen_in_flight = max(self.max_seen_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                raise self.error
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(t))]) for t in input])
+        finally:
+            self.in_flight -= 1
+
+
+def make_batcher(client, **kwargs):
+    defaults = dict(
+        client=client,
+        max_batch_tokens=10,
+        min_batch_tokens=2,
+        base_backoff=0,
+        token_counter=len,
+    )
+    defaults.update(kwargs)
+    return EmbeddingBatcher(**defaults)
+
+
+class TestPacking:
+    @pytest.mark.asyncio
+    async def test_packs_by_token_budget(self):
+        client = FakeEmbeddingsClient()
+        batcher = make_batcher(client, max_in_flight=1)
+
+        result = await batcher.embed(["aaaa", "bbbb", "cccc", "dddddddd"])
+
+        assert result == [[4.0], [4.0], [4.0], [8.0]]
+        assert [len(r) for r in client.requests] == [2, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_respects_input_cap(self):
+        client = FakeEmbeddingsClient()
+        batcher = make_batcher(client, max_batch_tokens=1000, max_batch_inputs=3)
+
+        await batcher.embed([f"t{i}" for i in range(7)])
+
+        assert sorted(len(r) for r in client.requests) == [1, 3, 3]
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_identical_texts(self):
+        client = FakeEmbeddingsClient()
+        batcher = make_batcher(client, max_batch_tokens=1000)
+
+        result = await batcher.embed(["same", "other", "same", "same"])
+
+        assert result == [[4.0], [5.0], [4.0], [4.0]]
+        assert client.requests == [["same", "other"]]
+        assert batcher.stats.deduplicated == 2
+
+
+class TestConcurrency:
+    @pytest.mark.asyncio
+    async def test_bounds_requests_in_flight(self):
+        client = FakeEmbeddingsClient(delay=0.01)
+        batcher = make_batcher(client, max_in_flight=3)
+
+        await batcher.embed([f"text-{i:03d}" for i in range(40)])
+
+        assert len(client.requests) == 40
+        assert client.max_seen_in_flight == 3
+
+
+class TestRetries:
+    @pytest.mark.asyncio
+    async def test_throttle_shrinks_budget_and_resplits(self):
+        client = FakeEmbeddingsClient(fail_times=1)
+        batcher = make_batcher(client, max_in_flight=1)
+
+        result = await batcher.embed(["aaaa", "bbbb"])
+
+        assert result == [[4.0], [4.0]]
+        assert batcher.stats.throttled == 1
+        # First request carried both texts; retries were re-packed under budget 5
+        assert client.requests[0] == ["aaaa", "bbbb"]
+        assert all(len(r) == 1 for r in client.requests[1:])
+
+    @pytest.mark.asyncio
+    async def test_reports_failures_instead_of_zero_vectors(self):
+        client = FakeEmbeddingsClient(fail_times=100, error=RuntimeError("boom"))
+        batcher = make_batcher(client, max_retries=2)
+
+        with pytest.raises(EmbeddingBatchError) as exc_info:
+            await batcher.embed(["aaaa", "bbbb"])
+
+        assert exc_info.value.failed_indices == [0, 1]
+        assert exc_info.value.results == [None, None]
+        assert len(client.requests) == 2
+
+    def test_is_throttle_error(self):
+        assert is_throttle_error(ThrottleError())
+        assert is_throttle_error(Exception("Rate limit exceeded"))
+        assert not is_throttle_error(ValueError("bad input"))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AsyncMCPClient transport.
+
+Tests verify:
+1. The SSE decoder emits events incrementally across arbitrary chunk splits
+2. Each request carries its own JSON-RPC id and responses are matched by id
+3. JSON-RPC batches are sent in one round trip and returned in request order
+4. Progress streams are decoded event by event over the shared session
+5. Tool listings are cached, revalidated by version and dropped on list_changed
+6. The tool cache persists across client instances via its file
+7. 1,000 concurrent call_tool requests complete over the pooled session
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from isa_mcp.mcp_client import AsyncMCPClient, SSEDecoder
+from isa_mcp.tool_cache import ToolListCache
+
+
+def _sse(*events: str) -> bytes:
+    return "".join(events).encode()
+
+
+def _tool_response(message):
+    args = message["params"]["arguments"]
+    return {
+        "jsonrpc": "2.0",
+        "id": message["id"],
+        "result": {"content": [{"type": "text", "text": json.dumps({"echo": args})}]},
+    }
+
+
+class StubMCPServer:
+    """Minimal streamable-HTTP MCP endpoint answering tools/call over SSE"""
+
+    def __init__(self):
+        self.request_ids = []
+        self.batches = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.wrong_ids = False
+        self.tools = [{"name": "echo", "description": "Echo", "inputSchema": {"type": "object"}}]
+        self.version = "v1"
+        self.list_calls = 0
+        self.version_calls = 0
+        self.announce_list_changed = False
+
+    async def tools_version(self, request: web.Request) -> web.Response:
+        self.version_calls += 1
+        etag = f'"{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response({"version": self.version}, headers={"ETag": etag})
+
+    async def mcp(self, request: web.Request) -> web.StreamResponse:
+        message = await request.json()
+        if isinstance(message, dict) and message["method"] == "tools/list":
+            self.list_calls += 1
+            return web.json_response(
+                {"jsonrpc": "2.0", "id": message["id"], "result": {"tools": self.tools}}
+            )
+        if isinstance(message, list):
+            self.batches += 1
+            self.request_ids.extend(m["id"] for m in message)
+            return web.json_response([_tool_response(m) for m in reversed(message)])
+
+        self.request_ids.append(message["id"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            response = _tool_response(message)
+            if self.wrong_ids:
+                response["id"] = message["id"] + 10_000
+
+            stream = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await stream.prepare(request)
+            method = (
+                "notifications/tools/list_changed"
+                if self.announce_list_changed
+                else "notifications/progress"
+            )
+            notification = {"jsonrpc": "2.0", "method": method, "params": {}}
+            await stream.write(_sse(f"event: message\ndata: {json.dumps(notification)}\n\n"))
+            await stream.write(_sse(f"event: message\ndata: {json.dumps(response)}\n\n"))
+            await stream.write_eof()
+            return stream
+        finally:
+            self.in_flight -= 1
+
+    async def progress(self, request: web.Request) -> web.StreamResponse:
+        stream = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await stream.prepare(request)
+        for step in (1, 2, 3):
+            await stream.write(_sse(f'event: progress\r\ndata: {{"step": {step}}}\r\n\r\n'))
+        await stream.write(_sse(": keep-alive\n\nevent: done\ndata: {}\n\n"))
+        await stream.write_eof()
+        return stream
+
+
+@pytest.fixture
+async def stub():
+    handler = StubMCPServer()
+    app = web.Application()
+    app.router.add_post("/mcp", handler.mcp)
+    app.router.add_get("/progress/{operation_id}/stream", handler.progress)
+    app.router.add_get("/api/v1/tools/version", handler.tools_version)
+    server = TestServer(app)
+    await server.start_server()
+    handler.base_url = str(server.make_url("")).rstrip("/")
+    yield handler
+    await server.close()
+
+
+class TestSSEDecoder:
+    def test_events_split_across_chunks(self):
+        decoder = SSEDecoder()
+        stream = 'event: progress\r\ndata: {"a":\r\ndata: 1}\r\n\r\n: ping\n\ndata: x\n\n'
+        events = []
+        for i in range(len(stream)):
+            events.extend(decoder.feed(stream[i]))
+
+        assert [(e.event, e.data) for e in events] == [
+            ("progress", '{"a":\n1}'),
+            ("message", "x"),
+        ]
+
+    def test_event_emitted_before_stream_ends(self):
+        decoder = SSEDecoder()
+        assert decoder.feed("data: first\n\ndata: sec") != []
+        assert [e.data for e in decoder.end()] == ["sec"]
+
+
+class TestTransport:
+    async def test_request_ids_are_unique(self, stub):
+        async with AsyncMCPClient(stub.base_url) as client:
+            results = await asyncio.gather(*(client.call_tool("echo", {"n": i}) for i in range(20)))
+
+        assert [r["echo"]["n"] for r in results] == list(range(20))
+        assert len(set(stub.request_ids)) == 20
+        assert client._pending == {}
+
+    async def test_unmatched_response_is_an_error(self, stub):
+        stub.wrong_ids = True
+        async with AsyncMCPClient(stub.base_url) as client:
+            result = await client.call_tool("echo", {"n": 1})
+
+        assert result["status"] == "error"
+        assert "No response to request" in result["error"]
+
+    async def test_batch_returns_results_in_call_order(self, stub):
+        async with AsyncMCPClient(stub.base_url) as client:
+            results = await client.call_tools([("echo", {"n": i}) for i in range(5)], batch=True)
+
+        assert stub.batches == 1
+        assert [r["echo"]["n"] for r in results] == list(range(5))
+
+    async def test_stream_progress(self, stub):
+        updates = []
+        async with AsyncMCPClient(stub.base_url) as client:
+            final = await client.stream_progress("op-1", callback=updates.append)
+
+        assert updates == [{"step": 1}, {"step": 2}, {"step": 3}]
+        assert final == {"step": 3}
+
+
+class TestToolCache:
+    async def test_fresh_listing_is_served_locally(self, stub):
+        async with AsyncMCPClient(stub.base_url, tool_cache=ToolListCache()) as client:
+            first = await client.list_tools()
+            second = await client.list_tools()
+            schema = await client.get_tool_schema("echo")
+
+        assert first == second == stub.tools
+        assert schema["input_schema"] == {"type": "object"}
+        assert stub.list_calls == 1
+        assert stub.version_calls == 1
+
+    async def test_returned_listing_is_a_copy(self, stub):
+        async with AsyncMCPClient(stub.base_url, tool_cache=ToolListCache()) as client:
+            (await client.list_tools()).append({"name": "injected"})
+            tools = await client.list_tools()
+
+        assert tools == stub.tools
+
+    async def test_stale_listing_is_revalidated(self, stub):
+        cache = ToolListCache(max_age_seconds=0)
+        async with AsyncMCPClient(stub.base_url, tool_cache=cache) as client:
+            await client.list_tools()
+            await client.list_tools()  # 304, listing not downloaded
+            assert stub.list_calls == 1
+
+            stub.version = "v2"
+            stub.tools = stub.tools + [{"name": "new_tool", "inputSchema": {}}]
+            tools = await client.list_tools()
+
+        assert [t["name"] for t in tools] == ["echo", "new_tool"]
+        assert stub.list_calls == 2
+
+    async def test_list_changed_notification_invalidates(self, stub):
+        cache = ToolListCache()
+        async with AsyncMCPClient(stub.base_url, tool_cache=cache) as client:
+            await client.list_tools()
+            stub.announce_list_changed = True
+            await client.call_tool("echo", {"n": 1})
+
+            assert cache.get(stub.base_url) is None
+            await client.list_tools()
+
+        assert stub.list_calls == 2
+
+    async def test_cache_persists_between_clients(self, stub, tmp_path):
+        path = tmp_path / "tools.json"
+        async with AsyncMCPClient(stub.base_url, tool_cache=ToolListCache(path=path)) as client:
+            await client.list_tools()
+
+        async with AsyncMCPClient(stub.base_url, tool_cache=ToolListCache(path=path)) as client:
+            tools = await client.list_tools()
+
+        assert tools == stub.tools
+        assert stub.list_calls == 1
+        assert stub.version_calls == 1
+
+
+@pytest.mark.performance
+class TestThroughput:
+    async def test_thousand_concurrent_calls(self, stub):
+        n = 1000
+        async with AsyncMCPClient(stub.base_url, max_connections=100) as client:
+            start = time.perf_counter()
+            results = await client.call_tools([("echo", {"n": i}) for i in range(n)])
+            elapsed = time.perf_counter() - start
+
+        assert [r["echo"]["n"] for r in results] == list(range(n))
+        assert len(set(stub.request_ids)) == n
+        assert 1 < stub.max_in_flight <= 100
+        assert elapsed < 30
@@ -90,6 +90,7 @@ except ImportError:
 
 from isa_model.client import ISAModelClient
 from core.security import SecurityLevel, get_security_manager
+from core.tracing import get_tracer, traced
 
 logger = logging.getLogger(__name__)
 
@@ -184,6 +185,7 @@ class BaseTool:
             self._isa_client = await get_isa_client()
         return self._isa_client
 
+    @traced("isa_model.invoke")
     async def _invoke_isa_model(
         self,
         client,
@@ -438,6 +440,7 @@ class BaseTool:
             logger.error(f"ISA API call failed: {e}")
             raise
 
+    @traced("billing.publish")
     async def _publish_billing_event(
         self,
         user_id: str,
@@ -559,6 +562,7 @@ class BaseTool:
     #   # Client monitors via SSE: GET /progress/{operation_id}/stream
     # ============================================================================
 
+    @traced("progress.report")
     async def create_progress_operation(
         self, operation_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None
     ) -> str:
@@ -608,6 +612,7 @@ class BaseTool:
         logger.info(f"Created progress operation: {operation_id}")
         return operation_id
 
+    @traced("progress.report")
     async def update_progress_operation(
         self,
         operation_id: str,
@@ -644,6 +649,7 @@ class BaseTool:
 
         logger.debug(f"Updated progress {operation_id}: {progress}% - {message}")
 
+    @traced("progress.report")
     async def complete_progress_operation(
         self, operation_id: str, result: Optional[Dict[str, Any]] = None, message: str = "Completed"
     ):
@@ -662,6 +668,7 @@ class BaseTool:
 
         logger.info(f"Completed progress operation: {operation_id}")
 
+    @traced("progress.report")
     async def fail_progress_operation(self, operation_id: str, error: str, message: str = "Failed"):
         """
         Mark operation as failed (NEW RECOMMENDED WAY)
@@ -687,6 +694,7 @@ class BaseTool:
     #   3. complete_progress_operation(operation_id, result)
     # ============================================================================
 
+    @traced("progress.report")
     async def report_progress(self, ctx: Optional[Context], current: int, total: int, message: str):
         """
         Backward compatibility method for progress reporting
@@ -1286,8 +1294,9 @@ class BaseTool:
                 limiter = self._rate_limiters[limit_key]
 
                 # Apply rate limit
-                async with limiter:
-                    return await func(*args, **kwargs)
+                with get_tracer().start_as_current_span("tool.rate_limit"):
+                    await limiter.acquire()
+                return await func(*args, **kwargs)
 
             return wrapper
 
@@ -1519,14 +1528,15 @@ class BaseTool:
             # Don't use *args/**kwargs as it hides parameters from FastMCP
             async def execute_with_error_handling(**kwargs_only):
                 try:
-                    if timeout:
-                        result = await self.with_timeout(
-                            func(**kwargs_only),
-                            timeout_seconds=timeout,
-                            operation_name=func.__name__,
-                        )
-                    else:
-                        result = await func(**kwargs_only)
+                    with get_tracer().start_as_current_span("tool.execute"):
+                        if timeout:
+                            result = await self.with_timeout(
+                                func(**kwargs_only),
+                                timeout_seconds=timeout,
+                                operation_name=func.__name__,
+                            )
+                        else:
+                            result = await func(**kwargs_only)
 
                     # Convert Pydantic models
                     if hasattr(result, "model_dump"):
@@ -1567,14 +1577,15 @@ class BaseTool:
             async def wrapped_func(*args, **kwargs):
                 """Standard wrapper for non-Context tools"""
                 try:
-                    if timeout:
-                        result = await self.with_timeout(
-                            func(*args, **kwargs),
-                            timeout_seconds=timeout,
-                            operation_name=func.__name__,
-                        )
-                    else:
-                        result = await func(*args, **kwargs)
+                    with get_tracer().start_as_current_span("tool.execute"):
+                        if timeout:
+                            result = await self.with_timeout(
+                                func(*args, **kwargs),
+                                timeout_seconds=timeout,
+                                operation_name=func.__name__,
+                            )
+                        else:
+                            result = await func(*args, **kwargs)
 
                     # Convert Pydantic models
                     if hasattr(result, "model_dump"):
@@ -1621,6 +1632,15 @@ class BaseTool:
         else:
             wrapped_func = self.security_manager.security_check(wrapped_func)
 
+        # Root span per invocation: auth, limiter wait and the tool body are its children
+        secured_func = wrapped_func
+        span_attributes = {"tool.name": kwargs.get("name") or func.__name__}
+
+        @wraps(secured_func)
+        async def wrapped_func(*call_args, **call_kwargs):
+            with get_tracer().start_as_current_span("tool.call", span_attributes):
+                return await secured_func(*call_args, **call_kwargs)
+
         # CRITICAL FIX: Remove Context from type annotations to prevent serialization issues
         # FastMCP reads __annotations__ to generate schema, but Context type causes problems
         # This allows FastMCP to properly inject Context while avoiding serialization errors
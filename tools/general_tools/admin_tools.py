@@ -131,11 +131,7 @@ def register_admin_tools(mcp):
             raise McpError("Unauthorized: Admin access required")
 
         # Get from monitoring manager's request history
-        recent_logs = (
-            monitor_manager.request_history[-limit:]
-            if limit > 0
-            else monitor_manager.request_history
-        )
+        recent_logs = monitor_manager.get_request_history(limit)
 
         result = {
             "status": "success",
@@ -150,7 +150,7 @@ def register_client_interaction_tools(mcp):
 
             if include_metrics:
                 status_data["detailed_metrics"] = metrics
-                status_data["recent_logs"] = monitor_manager.request_history[-10:]
+                status_data["recent_logs"] = monitor_manager.get_request_history(10)
 
             result = {
                 "status": "success",
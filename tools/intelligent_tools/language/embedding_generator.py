@@ -14,8 +14,12 @@ logger = logging.getLogger(__name__)
 class EmbeddingGenerator:
     """Simple embedding generation service using ISA client"""
 
+    # Maximum number of inputs accepted by a single embeddings request
+    max_batch_inputs = 2048
+
     def __init__(self):
         self._client = None
+        self._batcher = None
 
     async def _get_client(self):
         """Lazy load ISA client with optional authentication"""
@@ -165,11 +169,15 @@ class EmbeddingGenerator:
         self,
         texts: List[str],
         model: Optional[str] = None,
-        max_concurrent: int = 5,  # Limit concurrent requests for ISA stability
+        max_concurrent: int = 4,  # Requests in flight against the ISA service
         **kwargs,
     ) -> List[List[float]]:
         """
-        Generate embeddings for multiple texts with enhanced error handling
+        Generate embeddings for multiple texts
+
+        Texts are deduplicated, packed into token-budgeted requests and sent with
+        at most ``max_concurrent`` requests in flight. Throttled requests are
+        retried with backoff and a smaller batch budget.
 
         Args:
             texts: List of texts to embed
@@ -179,46 +187,27 @@ class EmbeddingGenerator:
 
         Returns:
             List of embedding vectors
+
+        Raises:
+            EmbeddingBatchError: If some texts could not be embedded after retries
         """
         if not texts:
             return []
 
-        # For large batches, use controlled concurrent processing
-        if len(texts) > max_concurrent:
-            import asyncio
-
-            logger.info(
-                f"Processing {len(texts)} texts in batches of {max_concurrent} for ISA stability"
-            )
-            all_embeddings = []
-
-            # Process in chunks to avoid overloading ISA service
-            for i in range(0, len(texts), max_concurrent):
-                chunk = texts[i : i + max_concurrent]
-                try:
-                    chunk_embeddings = await self.embed(chunk, model=model, **kwargs)
-                    all_embeddings.extend(chunk_embeddings)
-                except Exception as e:
-                    logger.warning(
-                        f"Batch chunk {i//max_concurrent + 1} failed: {e}, using fallback embeddings"
-                    )
-                    # Provide fallback embeddings for failed chunk
-                    fallback_embeddings = [[0.0] * 1536 for _ in chunk]
-                    all_embeddings.extend(fallback_embeddings)
+        batcher = await self._get_batcher(max_concurrent)
+        return await batcher.embed(texts, model=model or "text-embedding-3-small")
 
-                # Small delay between chunks to prevent ISA overload
-                if i + max_concurrent < len(texts):
-                    await asyncio.sleep(0.1)
+    async def _get_batcher(self, max_in_flight: int):
+        """Lazy load the embedding batcher (one per concurrency setting)"""
+        from core.clients.embedding_batcher import EmbeddingBatcher
 
-            return all_embeddings
-        else:
-            # For small batches, use direct processing
-            result = await self.embed(texts, model=model, **kwargs)
-            if isinstance(result, list) and len(result) > 0 and isinstance(result[0], list):
-                return result
-            else:
-                logger.warning("Batch embedding returned unexpected format, using fallback")
-                return [[0.0] * 1536 for _ in texts]
+        if self._batcher is None or self._batcher.max_in_flight != max_in_flight:
+            self._batcher = EmbeddingBatcher(
+                client=await self._get_client(),
+                max_batch_inputs=self.max_batch_inputs,
+                max_in_flight=max_in_flight,
+            )
+        return self._batcher
 
     async def compute_similarity(
         self, text1: str, text2: str, model: Optional[str] = None, **kwargs
@@ -653,6 +642,12 @@ async def hybrid_search_local(
             SearchMode,
             RankingMethod,
         )
+        from tools.services.intelligence_service.vector_db.incremental_update_service import (
+            incremental_update_service,
+        )
+
+        # Apply the user's queued knowledge changes so results include them
+        await incremental_update_service.ensure_fresh(user_id)
 
         # Generate embedding for the query
         query_embedding = await embedding_generator.embed_single(query_text)
@@ -746,7 +741,9 @@ async def store_knowledge_local(
     Store knowledge in local vector database.
 
     This complements the existing RAG service by providing direct access
-    to the vector database layer.
+    to the vector database layer. The text is recorded in the incremental
+    update service's change log; it is chunked, embedded and indexed with
+    the next batch of changes (or before the user's next local search).
 
     Args:
         user_id: User identifier
@@ -758,30 +755,26 @@ async def store_knowledge_local(
         Storage result dictionary
     """
     try:
-        from tools.services.intelligence_service.vector_db.hybrid_search_service import (
-            hybrid_search_service,
+        from tools.services.intelligence_service.vector_db.incremental_update_service import (
+            record_knowledge_change,
         )
         import uuid
 
-        # Generate embedding for the text
-        embedding = await embedding_generator.embed_single(text)
-
         # Generate unique ID
         knowledge_id = str(uuid.uuid4())
 
-        # Store in vector database
-        result = await hybrid_search_service.store_knowledge(
-            id=knowledge_id, text=text, embedding=embedding, user_id=user_id, metadata=metadata
+        # Queue for batched embedding and indexing
+        success = await record_knowledge_change(
+            id=knowledge_id, user_id=user_id, operation="insert", metadata=metadata, text=text
         )
 
         return {
-            "success": result.get("success", False),
+            "success": success,
             "id": knowledge_id,
             "user_id": user_id,
             "text_length": len(text),
-            "embedding_dimensions": len(embedding),
-            "method": result.get("method", "local_db"),
-            "error": result.get("error"),
+            "method": "change_log",
+            "error": None if success else "Failed to record change",
         }
 
     except Exception as e:
@@ -1316,11 +1309,15 @@ async def _process_single_large_file(
                 "error": "No extractable text content found",
             }
 
-        # Generate chunks with embeddings
-        chunks_data = await embedding_generator.chunk_text(
+        # Split into chunks; they are embedded when the queued changes are applied
+        from tools.services.intelligence_service.vector_db.chunking_service import (
+            chunking_service,
+        )
+
+        chunks = await chunking_service.chunk_text(
             text=text_content,
             chunk_size=chunk_size,
-            overlap=overlap_size,
+            chunk_overlap=overlap_size,
             metadata={
                 "source_file": file_name,
                 "file_path": file_path,
@@ -1329,6 +1326,7 @@ async def _process_single_large_file(
                 "user_id": user_id,
             },
         )
+        chunks_data = [chunk.to_dict() for chunk in chunks]
 
         # Store chunks in vector database
         stored_chunks = []
@@ -1346,7 +1344,6 @@ async def _process_single_large_file(
                             "chunk_id": i,
                             "storage_id": store_result.get("id"),
                             "text_length": len(chunk.get("text", "")),
-                            "embedding_dimensions": store_result.get("embedding_dimensions", 0),
                         }
                     )
                 else:
@@ -2,11 +2,19 @@
 """
 Vision Analysis Cache Manager
 Provides caching and pre-configured element detection to reduce omniparser dependency
+
+Detections are persisted in a single SQLite database (WAL mode) and mirrored in
+an in-memory LRU index, so a cache hit is a dict lookup. Hit counters are
+accumulated in memory and written back in batches by a background flush.
 """
 
 import json
 import hashlib
 import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
@@ -32,6 +40,15 @@ class CachedDetectionResult:
     hit_count: int = 0
 
 
+@dataclass
+class _IndexEntry:
+    """In-memory index entry for a cached detection"""
+
+    result: CachedDetectionResult
+    expires_ts: float
+    size: int
+
+
 @dataclass
 class PreConfiguredSite:
     """Pre-configured site element definitions"""
@@ -49,7 +66,15 @@ class PreConfiguredSite:
 class VisionCacheManager:
     """Manager for caching vision analysis results and pre-configured sites"""
 
-    def __init__(self, cache_dir: str = "cache/vision", preconfig_dir: str = "config/sites"):
+    DB_FILENAME = "vision_cache.db"
+
+    def __init__(
+        self,
+        cache_dir: str = "cache/vision",
+        preconfig_dir: str = "config/sites",
+        max_cache_entries: int = 1000,
+        hit_flush_interval: float = 5.0,
+    ):
         self.cache_dir = Path(cache_dir)
         self.preconfig_dir = Path(preconfig_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -57,17 +82,198 @@ class VisionCacheManager:
 
         # Cache settings
         self.default_cache_duration = timedelta(hours=24)
-        self.max_cache_entries = 1000
+        self.max_cache_entries = max_cache_entries
         self.min_confidence_threshold = 0.7
+        self.hit_flush_interval = hit_flush_interval
+
+        # Detection store: SQLite file + in-memory LRU index (oldest first)
+        self.db_path = self.cache_dir / self.DB_FILENAME
+        self._db_lock = threading.Lock()
+        self._db = self._open_db()
+        self._index: "OrderedDict[str, _IndexEntry]" = OrderedDict()
+        self._pending_hits: Dict[str, int] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # O(1) statistics maintained on every mutation
+        self._total_size = 0
+        self._total_hits = 0
+        self._type_counts: Dict[str, int] = {}
+        self._evictions = 0
+
+        self._load_index()
+        self._import_legacy_json_entries()
 
         # Pre-configured sites registry
         self.preconfig_sites: Dict[str, PreConfiguredSite] = {}
         self._load_preconfig_sites()
 
         logger.debug(
-            f"Vision Cache Manager initialized: cache={self.cache_dir}, preconfig_sites={len(self.preconfig_sites)}"
+            f"Vision Cache Manager initialized: cache={self.db_path}, entries={len(self._index)}, "
+            f"preconfig_sites={len(self.preconfig_sites)}"
         )
 
+    # ============ Detection Store ============
+
+    def _open_db(self) -> sqlite3.Connection:
+        """Open the cache database in WAL mode"""
+        db = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS detections (
+                cache_key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_ts REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """)
+        return db
+
+    def _db_execute(self, sql: str, params=()):
+        with self._db_lock:
+            return self._db.execute(sql, params)
+
+    def _db_executemany(self, sql: str, rows):
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(sql, rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _load_index(self):
+        """Load persisted entries into the LRU index, least recently used first"""
+        now = time.time()
+        self._db_execute("DELETE FROM detections WHERE expires_ts <= ?", (now,))
+        rows = self._db_execute(
+            "SELECT cache_key, data, expires_ts FROM detections ORDER BY last_access"
+        ).fetchall()
+        for cache_key, data, expires_ts in rows:
+            try:
+                result = CachedDetectionResult(**json.loads(data))
+            except (json.JSONDecodeError, TypeError):
+                continue
+            self._index_put(cache_key, result, expires_ts, len(data))
+        self._enforce_capacity()
+
+    def _import_legacy_json_entries(self):
+        """Move entries from the old one-JSON-file-per-entry layout into the database"""
+        legacy_files = list(self.cache_dir.glob("*.json"))
+        if not legacy_files:
+            return
+
+        imported = 0
+        for cache_file in legacy_files:
+            try:
+                with cache_file.open("r", encoding="utf-8") as f:
+                    result = CachedDetectionResult(**json.load(f))
+                expires_ts = datetime.fromisoformat(result.expires_at).timestamp()
+                if expires_ts > time.time():
+                    self._store(cache_file.stem, result, expires_ts)
+                    imported += 1
+                cache_file.unlink()
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError, OSError):
+                continue
+
+        logger.info(f"Imported {imported} legacy vision cache entries into {self.db_path}")
+
+    def _index_put(self, cache_key: str, result: CachedDetectionResult, expires_ts: float, size):
+        self._index_remove(cache_key)
+        self._index[cache_key] = _IndexEntry(result=result, expires_ts=expires_ts, size=size)
+        self._total_size += size
+        self._total_hits += result.hit_count
+        self._type_counts[result.detection_type] = (
+            self._type_counts.get(result.detection_type, 0) + 1
+        )
+
+    def _index_remove(self, cache_key: str) -> Optional[_IndexEntry]:
+        entry = self._index.pop(cache_key, None)
+        if entry is None:
+            return None
+        self._total_size -= entry.size
+        self._total_hits -= entry.result.hit_count
+        detection_type = entry.result.detection_type
+        self._type_counts[detection_type] -= 1
+        if self._type_counts[detection_type] <= 0:
+            del self._type_counts[detection_type]
+        self._pending_hits.pop(cache_key, None)
+        return entry
+
+    def _store(self, cache_key: str, result: CachedDetectionResult, expires_ts: float):
+        """Write an entry to the database and index, evicting LRU entries if full"""
+        data = json.dumps(asdict(result), ensure_ascii=False)
+        self._db_execute(
+            "INSERT OR REPLACE INTO detections (cache_key, data, expires_ts, last_access) "
+            "VALUES (?, ?, ?, ?)",
+            (cache_key, data, expires_ts, time.time()),
+        )
+        self._index_put(cache_key, result, expires_ts, len(data))
+        self._enforce_capacity()
+
+    def _delete(self, cache_keys: List[str]):
+        for cache_key in cache_keys:
+            self._index_remove(cache_key)
+        if cache_keys:
+            self._db_executemany(
+                "DELETE FROM detections WHERE cache_key = ?", [(k,) for k in cache_keys]
+            )
+
+    def _enforce_capacity(self):
+        overflow = len(self._index) - self.max_cache_entries
+        if overflow <= 0:
+            return
+        victims = [key for key, _ in zip(self._index, range(overflow))]
+        self._delete(victims)
+        self._evictions += len(victims)
+        logger.debug(f"Evicted {len(victims)} LRU vision cache entries")
+
+    def _record_hit(self, cache_key: str):
+        """Count a hit in memory; the database is updated by a batched flush"""
+        self._pending_hits[cache_key] = self._pending_hits.get(cache_key, 0) + 1
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_hits_later())
+            except RuntimeError:
+                self.flush_hits()
+
+    async def _flush_hits_later(self):
+        await asyncio.sleep(self.hit_flush_interval)
+        rows = self._collect_hit_rows()
+        if rows:
+            await asyncio.to_thread(self._write_hit_rows, rows)
+
+    def _collect_hit_rows(self) -> List[Tuple[str, float, str]]:
+        pending, self._pending_hits = self._pending_hits, {}
+        now = time.time()
+        rows = []
+        for cache_key in pending:
+            entry = self._index.get(cache_key)
+            if entry is not None:
+                rows.append((json.dumps(asdict(entry.result), ensure_ascii=False), now, cache_key))
+        return rows
+
+    def _write_hit_rows(self, rows: List[Tuple[str, float, str]]):
+        self._db_executemany(
+            "UPDATE detections SET data = ?, last_access = ? WHERE cache_key = ?", rows
+        )
+
+    def flush_hits(self) -> int:
+        """Persist pending hit counts and access times in one transaction"""
+        rows = self._collect_hit_rows()
+        if rows:
+            self._write_hit_rows(rows)
+        return len(rows)
+
+    async def close(self):
+        """Flush pending hit counts and close the database"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self.flush_hits()
+        with self._db_lock:
+            self._db.close()
+
     def _generate_cache_key(
         self, url: str, detection_type: str, additional_context: Dict[str, Any] = None
     ) -> str:
@@ -99,23 +305,18 @@ class VisionCacheManager:
         """Retrieve cached detection result if available and valid"""
         try:
             cache_key = self._generate_cache_key(url, detection_type, additional_context)
-            cache_file = self.cache_dir / f"{cache_key}.json"
+            entry = self._index.get(cache_key)
 
-            if not cache_file.exists():
+            if entry is None:
                 logger.debug(f"🔍 No cache entry for key: {cache_key}")
                 return None
 
-            # Load cached result
-            with cache_file.open("r", encoding="utf-8") as f:
-                cached_data = json.load(f)
-
-            cached_result = CachedDetectionResult(**cached_data)
+            cached_result = entry.result
 
             # Check if cache is expired
-            expires_at = datetime.fromisoformat(cached_result.expires_at)
-            if datetime.now() > expires_at:
+            if time.time() > entry.expires_ts:
                 logger.info(f"⏰ Cache expired for {url} ({detection_type})")
-                cache_file.unlink()  # Remove expired cache
+                self._delete([cache_key])  # Remove expired cache
                 return None
 
             # Validate page content if provided
@@ -125,9 +326,11 @@ class VisionCacheManager:
                     logger.info(f"📄 Page content changed for {url}, cache invalid")
                     return None
 
-            # Update hit count
+            # Update hit count and recency
             cached_result.hit_count += 1
-            await self._save_cache_entry(cache_key, cached_result)
+            self._total_hits += 1
+            self._index.move_to_end(cache_key)
+            self._record_hit(cache_key)
 
             logger.info(
                 f"✅ Cache hit for {url} ({detection_type}) - hits: {cached_result.hit_count}"
@@ -157,6 +360,7 @@ class VisionCacheManager:
             cache_key = self._generate_cache_key(url, detection_type, additional_context)
 
             # Create cache entry
+            expires_at = datetime.now() + self.default_cache_duration
             cached_result = CachedDetectionResult(
                 elements=elements,
                 detection_type=detection_type,
@@ -164,22 +368,16 @@ class VisionCacheManager:
                 timestamp=datetime.now().isoformat(),
                 url_pattern=self._extract_url_pattern(url),
                 page_hash=self._generate_page_hash(page_content),
-                expires_at=(datetime.now() + self.default_cache_duration).isoformat(),
+                expires_at=expires_at.isoformat(),
                 hit_count=0,
             )
 
-            await self._save_cache_entry(cache_key, cached_result)
+            self._store(cache_key, cached_result, expires_at.timestamp())
             logger.info(f"💾 Cached detection result for {url} ({detection_type})")
 
         except Exception as e:
             logger.error(f"❌ Cache save error: {e}")
 
-    async def _save_cache_entry(self, cache_key: str, cached_result: CachedDetectionResult):
-        """Save cache entry to file"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with cache_file.open("w", encoding="utf-8") as f:
-            json.dump(asdict(cached_result), f, indent=2, ensure_ascii=False)
-
     def _extract_url_pattern(self, url: str) -> str:
         """Extract URL pattern for classification"""
         parsed = urlparse(url)
@@ -283,35 +481,17 @@ class VisionCacheManager:
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            total_entries = len(cache_files)
-
-            # Calculate cache size
-            total_size = sum(f.stat().st_size for f in cache_files)
-
-            # Count by detection type
-            type_counts = {}
-            hit_counts = []
-
-            for cache_file in cache_files:
-                try:
-                    with cache_file.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
-
-                    detection_type = data.get("detection_type", "unknown")
-                    type_counts[detection_type] = type_counts.get(detection_type, 0) + 1
-                    hit_counts.append(data.get("hit_count", 0))
-
-                except (json.JSONDecodeError, KeyError, OSError):
-                    continue
-
-            avg_hits = sum(hit_counts) / len(hit_counts) if hit_counts else 0
+            total_entries = len(self._index)
+            avg_hits = self._total_hits / total_entries if total_entries else 0
 
             return {
                 "total_entries": total_entries,
-                "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "by_type": type_counts,
+                "max_entries": self.max_cache_entries,
+                "total_size_mb": round(self._total_size / (1024 * 1024), 2),
+                "by_type": dict(self._type_counts),
                 "average_hits": round(avg_hits, 1),
+                "evictions": self._evictions,
+                "pending_hit_updates": len(self._pending_hits),
                 "preconfig_sites": len(self.preconfig_sites),
                 "cache_directory": str(self.cache_dir),
                 "preconfig_directory": str(self.preconfig_dir),
@@ -324,24 +504,13 @@ class VisionCacheManager:
     async def cleanup_expired_cache(self):
         """Remove expired cache entries"""
         try:
-            removed_count = 0
-            cache_files = list(self.cache_dir.glob("*.json"))
-
-            for cache_file in cache_files:
-                try:
-                    with cache_file.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
-
-                    expires_at = datetime.fromisoformat(data["expires_at"])
-                    if datetime.now() > expires_at:
-                        cache_file.unlink()
-                        removed_count += 1
+            now = time.time()
+            expired = [key for key, entry in self._index.items() if entry.expires_ts <= now]
+            self._delete(expired)
+            self._db_execute("DELETE FROM detections WHERE expires_ts <= ?", (now,))
 
-                except (json.JSONDecodeError, KeyError, OSError):
-                    continue
-
-            logger.info(f"🧹 Cleaned up {removed_count} expired cache entries")
-            return removed_count
+            logger.info(f"🧹 Cleaned up {len(expired)} expired cache entries")
+            return len(expired)
 
         except Exception as e:
             logger.error(f"❌ Cache cleanup error: {e}")
@@ -350,29 +519,18 @@ class VisionCacheManager:
     async def clear_cache(self, detection_type: str = None):
         """Clear cache entries (optionally filtered by type)"""
         try:
-            removed_count = 0
-            cache_files = list(self.cache_dir.glob("*.json"))
-
-            for cache_file in cache_files:
-                should_remove = True
-
-                if detection_type:
-                    try:
-                        with cache_file.open("r", encoding="utf-8") as f:
-                            data = json.load(f)
-                        should_remove = data.get("detection_type") == detection_type
-                    except (json.JSONDecodeError, KeyError, OSError):
-                        should_remove = False
-
-                if should_remove:
-                    cache_file.unlink()
-                    removed_count += 1
+            victims = [
+                key
+                for key, entry in self._index.items()
+                if not detection_type or entry.result.detection_type == detection_type
+            ]
+            self._delete(victims)
 
             logger.info(
-                f"🧹 Cleared {removed_count} cache entries"
+                f"🧹 Cleared {len(victims)} cache entries"
                 + (f" for type '{detection_type}'" if detection_type else "")
             )
-            return removed_count
+            return len(victims)
 
         except Exception as e:
             logger.error(f"❌ Cache clear error: {e}")
@@ -7,11 +7,25 @@ Exposes aggregator service functionality as MCP tools.
 from typing import Any, Dict, List, Optional
 import logging
 
+from mcp.server.fastmcp import Context
+
 from tools.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
 
+def _authenticated_user_id(ctx: Optional[Context]) -> Optional[str]:
+    """User ID the auth middleware set on the HTTP request, or None."""
+    try:
+        request = ctx.request_context.request
+    except (AttributeError, ValueError):
+        return None
+    state = getattr(request, "state", None)
+    if not getattr(state, "authenticated", False):
+        return None
+    return getattr(state, "user_id", None)
+
+
 class AggregatorTools(BaseTool):
     """
     MCP tools for managing external MCP server aggregation.
@@ -242,13 +256,17 @@ class AggregatorTools(BaseTool):
             },
         ]
 
-    async def execute(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(
+        self, name: str, arguments: Dict[str, Any], user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Execute an aggregator tool.
 
         Args:
             name: Tool name
             arguments: Tool arguments
+            user_id: Authenticated caller (never taken from ``arguments``);
+                scopes cached external tool results
 
         Returns:
             Tool execution result
@@ -277,7 +295,7 @@ class AggregatorTools(BaseTool):
             elif name == "refresh_server_tools":
                 return await self._refresh_tools(arguments)
             elif name == "execute_external_tool":
-                return await self._execute_external_tool(arguments)
+                return await self._execute_external_tool(arguments, user_id)
             else:
                 return {
                     "content": [{"type": "text", "text": f"Unknown tool: {name}"}],
@@ -492,7 +510,9 @@ class AggregatorTools(BaseTool):
             "isError": False,
         }
 
-    async def _execute_external_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_external_tool(
+        self, args: Dict[str, Any], user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Execute a tool on an external server."""
         tool_name = args.get("tool_name")
         arguments = args.get("arguments", {})
@@ -513,7 +533,7 @@ class AggregatorTools(BaseTool):
             }
 
         try:
-            result = await self._service.execute_tool(tool_name, arguments)
+            result = await self._service.execute_tool(tool_name, arguments, user_id=user_id)
             return result
         except Exception as e:
             return {
@@ -649,7 +669,7 @@ def register_aggregator_tools(mcp_server, aggregator_service):
 
     @mcp_server.tool()
     async def execute_external_tool(
-        tool_name: str, arguments: Dict[str, Any] = None
+        tool_name: str, arguments: Dict[str, Any] = None, ctx: Optional[Context] = None
     ) -> Dict[str, Any]:
         """
         ▶️ EXECUTE EXTERNAL TOOL - Run a tool on an external MCP server.
@@ -663,8 +683,11 @@ def register_aggregator_tools(mcp_server, aggregator_service):
         Returns:
             Tool execution result from the external server
         """
+        # Per-user cached results are only served to the authenticated caller
         return await _aggregator_tools.execute(
-            "execute_external_tool", {"tool_name": tool_name, "arguments": arguments or {}}
+            "execute_external_tool",
+            {"tool_name": tool_name, "arguments": arguments or {}},
+            user_id=_authenticated_user_id(ctx),
         )
 
     logger.info("Registered 7 aggregator tools for external MCP server management")
@@ -7,6 +7,7 @@ Supports multiple backends: In-Memory, Redis, etc.
 
 import json
 import os
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -17,54 +18,59 @@ logger = get_logger(__name__)
 
 
 class PlanStateManager(ABC):
-    """Abstract base class for plan state storage"""
+    """Abstract base class for plan state storage (all operations are async)"""
 
     @abstractmethod
-    def save_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> bool:
+    async def save_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> bool:
         """Save complete plan state"""
         pass
 
     @abstractmethod
-    def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
+    async def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve plan by ID"""
         pass
 
     @abstractmethod
-    def update_task_status(
+    async def get_task(self, plan_id: str, task_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a single task with its current status"""
+        pass
+
+    @abstractmethod
+    async def update_task_status(
         self, plan_id: str, task_id: int, status: str, result: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Update status of a specific task"""
         pass
 
     @abstractmethod
-    def add_execution_event(self, plan_id: str, event: Dict[str, Any]) -> bool:
+    async def add_execution_event(self, plan_id: str, event: Dict[str, Any]) -> bool:
         """Add execution event to history"""
         pass
 
     @abstractmethod
-    def get_execution_history(self, plan_id: str) -> List[Dict[str, Any]]:
+    async def get_execution_history(self, plan_id: str) -> List[Dict[str, Any]]:
         """Get execution history for a plan"""
         pass
 
     @abstractmethod
-    def create_branch(
+    async def create_branch(
         self, parent_plan_id: str, branch_id: str, branch_data: Dict[str, Any]
     ) -> bool:
         """Create a branch from existing plan"""
         pass
 
     @abstractmethod
-    def get_branches(self, plan_id: str) -> List[Dict[str, Any]]:
+    async def get_branches(self, plan_id: str) -> List[Dict[str, Any]]:
         """Get all branches of a plan"""
         pass
 
     @abstractmethod
-    def list_active_plans(self) -> List[str]:
+    async def list_active_plans(self) -> List[str]:
         """List all active plan IDs"""
         pass
 
     @abstractmethod
-    def delete_plan(self, plan_id: str) -> bool:
+    async def delete_plan(self, plan_id: str) -> bool:
         """Delete a plan and its history"""
         pass
 
@@ -78,7 +84,7 @@ class InMemoryStateStore(PlanStateManager):
         self.branches: Dict[str, List[Dict[str, Any]]] = {}
         logger.debug("InMemoryStateStore initialized (no persistence)")
 
-    def save_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> bool:
+    async def save_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> bool:
         """Save plan to memory"""
         try:
             plan_data["plan_id"] = plan_id
@@ -90,7 +96,7 @@ class InMemoryStateStore(PlanStateManager):
                 self.execution_history[plan_id] = []
 
             # Add creation event
-            self.add_execution_event(
+            await self.add_execution_event(
                 plan_id,
                 {
                     "event_type": "plan_created",
@@ -105,7 +111,7 @@ class InMemoryStateStore(PlanStateManager):
             logger.error(f"Failed to save plan {plan_id}: {e}")
             return False
 
-    def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
+    async def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve plan from memory"""
         plan = self.plans.get(plan_id)
         if plan:
@@ -114,7 +120,17 @@ class InMemoryStateStore(PlanStateManager):
             logger.warning(f"Plan not found in memory: {plan_id}")
         return plan
 
-    def update_task_status(
+    async def get_task(self, plan_id: str, task_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a task from memory"""
+        plan = self.plans.get(plan_id)
+        if not plan:
+            return None
+        for task in plan.get("tasks", []):
+            if task.get("id") == task_id:
+                return task
+        return None
+
+    async def update_task_status(
         self, plan_id: str, task_id: int, status: str, result: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Update task status in memory"""
@@ -138,7 +154,7 @@ class InMemoryStateStore(PlanStateManager):
             plan["last_updated"] = datetime.utcnow().isoformat()
 
             # Add event
-            self.add_execution_event(
+            await self.add_execution_event(
                 plan_id,
                 {
                     "event_type": "task_status_updated",
@@ -153,7 +169,7 @@ class InMemoryStateStore(PlanStateManager):
             logger.error(f"Failed to update task status: {e}")
             return False
 
-    def add_execution_event(self, plan_id: str, event: Dict[str, Any]) -> bool:
+    async def add_execution_event(self, plan_id: str, event: Dict[str, Any]) -> bool:
         """Add execution event to history"""
         try:
             if plan_id not in self.execution_history:
@@ -167,11 +183,11 @@ class InMemoryStateStore(PlanStateManager):
             logger.error(f"Failed to add execution event: {e}")
             return False
 
-    def get_execution_history(self, plan_id: str) -> List[Dict[str, Any]]:
+    async def get_execution_history(self, plan_id: str) -> List[Dict[str, Any]]:
         """Get execution history from memory"""
         return self.execution_history.get(plan_id, [])
 
-    def create_branch(
+    async def create_branch(
         self, parent_plan_id: str, branch_id: str, branch_data: Dict[str, Any]
     ) -> bool:
         """Create branch in memory"""
@@ -186,7 +202,7 @@ class InMemoryStateStore(PlanStateManager):
             self.branches[parent_plan_id].append(branch_data)
 
             # Add event to parent plan
-            self.add_execution_event(
+            await self.add_execution_event(
                 parent_plan_id,
                 {
                     "event_type": "branch_created",
@@ -204,15 +220,15 @@ class InMemoryStateStore(PlanStateManager):
             logger.error(f"Failed to create branch: {e}")
             return False
 
-    def get_branches(self, plan_id: str) -> List[Dict[str, Any]]:
+    async def get_branches(self, plan_id: str) -> List[Dict[str, Any]]:
         """Get branches from memory"""
         return self.branches.get(plan_id, [])
 
-    def list_active_plans(self) -> List[str]:
+    async def list_active_plans(self) -> List[str]:
         """List all plan IDs in memory"""
         return list(self.plans.keys())
 
-    def delete_plan(self, plan_id: str) -> bool:
+    async def delete_plan(self, plan_id: str) -> bool:
         """Delete plan from memory"""
         try:
             if plan_id in self.plans:
@@ -230,10 +246,41 @@ class InMemoryStateStore(PlanStateManager):
 
 
 class RedisStateStore(PlanStateManager):
-    """Redis-backed implementation using native redis-py"""
+    """
+    Redis-backed implementation using redis-py's asyncio client
+
+    Layout:
+    - ``plan:{id}`` hash: ``meta`` (plan fields as JSON), ``task_ids``,
+      ``task:{task_id}`` (task definition as JSON), and per-task
+      ``status:`` / ``result:`` / ``updated:`` fields written individually,
+      so concurrent task transitions never overwrite each other
+    - ``plan:history:{id}`` / ``plan:branches:{id}`` lists, appended together
+      with their EXPIRE in one pipelined round trip
+    - ``plans:active`` sorted set of plan IDs scored by expiry time, used
+      instead of scanning the keyspace
+    """
+
+    PLAN_TTL_SECONDS = 86400  # 24h
+    ACTIVE_PLANS_KEY = "plans:active"
+
+    # KEYS: plan hash, history list. ARGV: history TTL, event JSON, field/value pairs.
+    # Writes only if the plan exists, so a missing plan is never half-created.
+    UPDATE_TASK_SCRIPT = """
+    if redis.call('HEXISTS', KEYS[1], 'meta') == 0 then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+    redis.call('RPUSH', KEYS[2], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+    return 1
+    """
 
     def __init__(
-        self, redis_host: str = None, redis_port: int = None, user_id: str = "mcp-planner"
+        self,
+        redis_host: str = None,
+        redis_port: int = None,
+        user_id: str = "mcp-planner",
+        client=None,
     ):
         """
         Initialize Redis state store
@@ -242,18 +289,36 @@ class RedisStateStore(PlanStateManager):
             redis_host: Redis service host (default from env or localhost)
             redis_port: Redis native port (default from env or 6379)
             user_id: User ID for Redis operations (used as key prefix)
+            client: Existing redis.asyncio client (must use decode_responses=True)
         """
+        self.user_id = user_id
+
+        if client is not None:
+            self.redis = client
+            self._update_task = self.redis.register_script(self.UPDATE_TASK_SCRIPT)
+            return
+
         try:
             import redis
+            import redis.asyncio as aioredis
+            from redis.backoff import NoBackoff
+            from redis.retry import Retry
 
             host = redis_host or os.getenv("REDIS_HOST", "localhost")
             port = redis_port or int(os.getenv("REDIS_PORT", "6379"))
 
-            self.redis = redis.Redis(host=host, port=port, decode_responses=True)
-            self.user_id = user_id
+            # Test connection once at startup so the factory can fall back to memory.
+            # No retries: redis-py otherwise backs off for seconds when Redis is absent.
+            probe = redis.Redis(
+                host=host, port=port, socket_connect_timeout=2, retry=Retry(NoBackoff(), 0)
+            )
+            try:
+                probe.ping()
+            finally:
+                probe.close()
 
-            # Test connection
-            self.redis.ping()
+            self.redis = aioredis.Redis(host=host, port=port, decode_responses=True)
+            self._update_task = self.redis.register_script(self.UPDATE_TASK_SCRIPT)
             logger.info(f"✅ RedisStateStore connected to Redis at {host}:{port}")
 
         except Exception as e:
@@ -272,19 +337,45 @@ class RedisStateStore(PlanStateManager):
         """Generate Redis key for branches"""
         return f"plan:branches:{plan_id}"
 
-    def save_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> bool:
+    def _new_event(self, event: Dict[str, Any]) -> str:
+        """Stamp an execution event and serialize it"""
+        event["event_id"] = str(uuid.uuid4())
+        event["timestamp"] = event.get("timestamp", datetime.utcnow().isoformat())
+        return json.dumps(event, ensure_ascii=False)
+
+    def _queue_event(self, pipe, plan_id: str, event: Dict[str, Any]) -> str:
+        """Queue RPUSH+EXPIRE of an execution event on a pipeline"""
+        event_json = self._new_event(event)
+        pipe.rpush(self._history_key(plan_id), event_json)
+        pipe.expire(self._history_key(plan_id), self.PLAN_TTL_SECONDS)
+        return event_json
+
+    async def save_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> bool:
         """Save plan to Redis"""
         try:
             plan_data["plan_id"] = plan_id
             plan_data["last_updated"] = datetime.utcnow().isoformat()
 
-            # Save as JSON string with 24h TTL
-            plan_json = json.dumps(plan_data, ensure_ascii=False)
-            result = self.redis.set(self._plan_key(plan_id), plan_json, ex=86400)
-
-            if result:
-                # Add creation event
-                self.add_execution_event(
+            meta = {k: v for k, v in plan_data.items() if k not in ("tasks", "last_updated")}
+            fields = {
+                "meta": json.dumps(meta, ensure_ascii=False),
+                "last_updated": plan_data["last_updated"],
+            }
+            if "tasks" in plan_data:
+                task_ids = [task.get("id", i + 1) for i, task in enumerate(plan_data["tasks"])]
+                fields["task_ids"] = json.dumps(task_ids)
+                for task_id, task in zip(task_ids, plan_data["tasks"]):
+                    fields[f"task:{task_id}"] = json.dumps(task, ensure_ascii=False)
+
+            # Replace the whole hash, index it and log creation in one round trip
+            key = self._plan_key(plan_id)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping=fields)
+                pipe.expire(key, self.PLAN_TTL_SECONDS)
+                pipe.zadd(self.ACTIVE_PLANS_KEY, {plan_id: time.time() + self.PLAN_TTL_SECONDS})
+                self._queue_event(
+                    pipe,
                     plan_id,
                     {
                         "event_type": "plan_created",
@@ -292,92 +383,117 @@ class RedisStateStore(PlanStateManager):
                         "data": {"total_tasks": plan_data.get("total_tasks", 0)},
                     },
                 )
-                logger.info(f"✅ Plan saved to Redis: {plan_id}")
-                return True
-            return False
+                await pipe.execute()
+
+            logger.info(f"✅ Plan saved to Redis: {plan_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save plan to Redis: {e}")
             return False
 
-    def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
+    def _task_from_fields(self, fields: Dict[str, str], task_id) -> Optional[Dict[str, Any]]:
+        """Merge a task definition with its field-level status updates"""
+        task_json = fields.get(f"task:{task_id}")
+        if task_json is None:
+            return None
+
+        task = json.loads(task_json)
+        if f"status:{task_id}" in fields:
+            task["status"] = fields[f"status:{task_id}"]
+            task["last_updated"] = fields.get(f"updated:{task_id}")
+        if f"result:{task_id}" in fields:
+            task["result"] = json.loads(fields[f"result:{task_id}"])
+        return task
+
+    async def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve plan from Redis"""
         try:
-            plan_json = self.redis.get(self._plan_key(plan_id))
-            if plan_json:
-                plan = json.loads(plan_json)
-                logger.debug(f"Retrieved plan from Redis: {plan_id}")
-                return plan
-            logger.warning(f"Plan not found in Redis: {plan_id}")
-            return None
+            fields = await self.redis.hgetall(self._plan_key(plan_id))
+            if "meta" not in fields:
+                logger.warning(f"Plan not found in Redis: {plan_id}")
+                return None
+
+            plan = json.loads(fields["meta"])
+            plan["last_updated"] = fields.get("last_updated")
+            if "task_ids" in fields:
+                tasks = (self._task_from_fields(fields, t) for t in json.loads(fields["task_ids"]))
+                plan["tasks"] = [task for task in tasks if task is not None]
+
+            logger.debug(f"Retrieved plan from Redis: {plan_id}")
+            return plan
         except Exception as e:
             logger.error(f"Failed to get plan from Redis: {e}")
             return None
 
-    def update_task_status(
+    async def get_task(self, plan_id: str, task_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a single task from Redis without loading the whole plan"""
+        try:
+            names = [
+                f"task:{task_id}",
+                f"status:{task_id}",
+                f"result:{task_id}",
+                f"updated:{task_id}",
+            ]
+            values = await self.redis.hmget(self._plan_key(plan_id), names)
+            fields = {name: value for name, value in zip(names, values) if value is not None}
+            return self._task_from_fields(fields, task_id)
+        except Exception as e:
+            logger.error(f"Failed to get task from Redis: {e}")
+            return None
+
+    async def update_task_status(
         self, plan_id: str, task_id: int, status: str, result: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Update task status in Redis"""
         try:
-            plan = self.get_plan(plan_id)
-            if not plan:
-                logger.error(f"Plan not found: {plan_id}")
-                return False
-
-            # Find and update task
-            tasks = plan.get("tasks", [])
-            for task in tasks:
-                if task.get("id") == task_id:
-                    task["status"] = status
-                    task["last_updated"] = datetime.utcnow().isoformat()
-                    if result:
-                        task["result"] = result
-                    break
-
-            # Update plan timestamp
-            plan["last_updated"] = datetime.utcnow().isoformat()
+            now = datetime.utcnow().isoformat()
+            key = self._plan_key(plan_id)
 
-            # Save updated plan
-            self.save_plan(plan_id, plan)
+            fields = {f"status:{task_id}": status, f"updated:{task_id}": now, "last_updated": now}
+            if result:
+                fields[f"result:{task_id}"] = json.dumps(result, ensure_ascii=False)
 
-            # Add event
-            self.add_execution_event(
-                plan_id,
+            event_json = self._new_event(
                 {
                     "event_type": "task_status_updated",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": now,
                     "data": {"task_id": task_id, "status": status, "result": result},
-                },
+                }
             )
 
+            # Existence check, field writes and history append run atomically in Redis
+            args = [self.PLAN_TTL_SECONDS, event_json]
+            for field, value in fields.items():
+                args.extend((field, value))
+            exists = await self._update_task(keys=[key, self._history_key(plan_id)], args=args)
+
+            if not exists:
+                logger.error(f"Plan not found: {plan_id}")
+                return False
+
             logger.info(f"✅ Task {task_id} status updated to '{status}' in Redis plan {plan_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to update task status in Redis: {e}")
             return False
 
-    def add_execution_event(self, plan_id: str, event: Dict[str, Any]) -> bool:
+    async def add_execution_event(self, plan_id: str, event: Dict[str, Any]) -> bool:
         """Add execution event to Redis list"""
         try:
-            event["event_id"] = str(uuid.uuid4())
-            event["timestamp"] = event.get("timestamp", datetime.utcnow().isoformat())
-            event_json = json.dumps(event, ensure_ascii=False)
-
-            # Use Redis RPUSH to append to list
-            result = self.redis.rpush(self._history_key(plan_id), event_json)
-
-            # Set TTL on history list
-            self.redis.expire(self._history_key(plan_id), 86400)  # 24h
+            async with self.redis.pipeline(transaction=True) as pipe:
+                self._queue_event(pipe, plan_id, event)
+                length, _ = await pipe.execute()
 
-            return result is not None
+            return length is not None
         except Exception as e:
             logger.error(f"Failed to add execution event to Redis: {e}")
             return False
 
-    def get_execution_history(self, plan_id: str) -> List[Dict[str, Any]]:
+    async def get_execution_history(self, plan_id: str) -> List[Dict[str, Any]]:
         """Get execution history from Redis"""
         try:
             # Get all events from Redis list
-            events_json = self.redis.lrange(self._history_key(plan_id), 0, -1)
+            events_json = await self.redis.lrange(self._history_key(plan_id), 0, -1)
             if not events_json:
                 return []
 
@@ -387,7 +503,7 @@ class RedisStateStore(PlanStateManager):
             logger.error(f"Failed to get execution history from Redis: {e}")
             return []
 
-    def create_branch(
+    async def create_branch(
         self, parent_plan_id: str, branch_id: str, branch_data: Dict[str, Any]
     ) -> bool:
         """Create branch in Redis"""
@@ -398,15 +514,12 @@ class RedisStateStore(PlanStateManager):
 
             branch_json = json.dumps(branch_data, ensure_ascii=False)
 
-            # Add to branch list
-            result = self.redis.rpush(self._branch_key(parent_plan_id), branch_json)
-
-            # Set TTL
-            self.redis.expire(self._branch_key(parent_plan_id), 86400)  # 24h
-
-            if result:
-                # Add event to parent plan
-                self.add_execution_event(
+            # Branch list and parent plan event in one round trip
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.rpush(self._branch_key(parent_plan_id), branch_json)
+                pipe.expire(self._branch_key(parent_plan_id), self.PLAN_TTL_SECONDS)
+                self._queue_event(
+                    pipe,
                     parent_plan_id,
                     {
                         "event_type": "branch_created",
@@ -417,6 +530,9 @@ class RedisStateStore(PlanStateManager):
                         },
                     },
                 )
+                result, *_ = await pipe.execute()
+
+            if result:
                 logger.info(f"✅ Branch {branch_id} created in Redis from plan {parent_plan_id}")
                 return True
             return False
@@ -424,10 +540,10 @@ class RedisStateStore(PlanStateManager):
             logger.error(f"Failed to create branch in Redis: {e}")
             return False
 
-    def get_branches(self, plan_id: str) -> List[Dict[str, Any]]:
+    async def get_branches(self, plan_id: str) -> List[Dict[str, Any]]:
         """Get branches from Redis"""
         try:
-            branches_json = self.redis.lrange(self._branch_key(plan_id), 0, -1)
+            branches_json = await self.redis.lrange(self._branch_key(plan_id), 0, -1)
             if not branches_json:
                 return []
 
@@ -437,33 +553,32 @@ class RedisStateStore(PlanStateManager):
             logger.error(f"Failed to get branches from Redis: {e}")
             return []
 
-    def list_active_plans(self) -> List[str]:
+    async def list_active_plans(self) -> List[str]:
         """List all active plan IDs in Redis"""
         try:
-            # Use Redis KEYS to find all plan keys
-            plan_keys = self.redis.keys("plan:*")
-            if not plan_keys:
-                return []
+            now = time.time()
 
-            # Extract plan IDs from keys
-            plan_ids = []
-            for key in plan_keys:
-                if key.startswith("plan:") and not ("history:" in key or "branches:" in key):
-                    plan_id = key.replace("plan:", "")
-                    plan_ids.append(plan_id)
+            # Drop expired plans from the index and read the rest in one round trip
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(self.ACTIVE_PLANS_KEY, "-inf", now)
+                pipe.zrange(self.ACTIVE_PLANS_KEY, 0, -1)
+                _, plan_ids = await pipe.execute()
 
-            return plan_ids
+            return list(plan_ids)
         except Exception as e:
             logger.error(f"Failed to list active plans from Redis: {e}")
             return []
 
-    def delete_plan(self, plan_id: str) -> bool:
+    async def delete_plan(self, plan_id: str) -> bool:
         """Delete plan from Redis"""
         try:
             # Delete plan, history, and branches
-            self.redis.delete(self._plan_key(plan_id))
-            self.redis.delete(self._history_key(plan_id))
-            self.redis.delete(self._branch_key(plan_id))
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(
+                    self._plan_key(plan_id), self._history_key(plan_id), self._branch_key(plan_id)
+                )
+                pipe.zrem(self.ACTIVE_PLANS_KEY, plan_id)
+                await pipe.execute()
 
             logger.info(f"✅ Plan {plan_id} deleted from Redis")
             return True
@@ -471,17 +586,21 @@ class RedisStateStore(PlanStateManager):
             logger.error(f"Failed to delete plan from Redis: {e}")
             return False
 
-    def __enter__(self):
-        """Context manager entry"""
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
+    async def close(self):
+        """Close the Redis connection pool"""
         try:
-            self.redis.close()
+            await self.redis.aclose()
         except Exception:
             pass
 
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
 
 def create_state_manager(prefer_redis: bool = True, **kwargs) -> PlanStateManager:
     """
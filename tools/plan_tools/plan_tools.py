@@ -249,7 +249,7 @@ class EnhancedAutonomousPlanner(BaseTool):
             }
 
             # Save to state manager
-            if self.state_manager.save_plan(plan_id, plan):
+            if await self.state_manager.save_plan(plan_id, plan):
                 self.current_plan_id = plan_id
                 print(f"✅ Plan saved with {len(plan_data.get('tasks', []))} tasks")
 
@@ -335,7 +335,7 @@ class EnhancedAutonomousPlanner(BaseTool):
         print(f"🔧 Adjusting plan {plan_id}: {adjustment_type}")
 
         try:
-            plan = self.state_manager.get_plan(plan_id)
+            plan = await self.state_manager.get_plan(plan_id)
             if not plan:
                 return self.create_response(
                     "error", "adjust_execution_plan", {}, f"Plan {plan_id} not found"
@@ -364,7 +364,7 @@ class EnhancedAutonomousPlanner(BaseTool):
                 plan["tasks"] = current_tasks
 
                 # Add event
-                self.state_manager.add_execution_event(
+                await self.state_manager.add_execution_event(
                     plan_id,
                     {
                         "event_type": "plan_expanded",
@@ -393,7 +393,7 @@ class EnhancedAutonomousPlanner(BaseTool):
                         break
 
                 # Add event
-                self.state_manager.add_execution_event(
+                await self.state_manager.add_execution_event(
                     plan_id,
                     {
                         "event_type": "task_revised",
@@ -416,7 +416,7 @@ class EnhancedAutonomousPlanner(BaseTool):
                 branch_id = f"branch_{uuid.uuid4().hex[:8]}"
 
                 # Create branch with new tasks
-                self.state_manager.create_branch(
+                await self.state_manager.create_branch(
                     plan_id,
                     branch_id,
                     {"branch_from_task": task_id, "tasks": new_tasks, "reasoning": reasoning},
@@ -433,7 +433,7 @@ class EnhancedAutonomousPlanner(BaseTool):
                 )
 
             # Save updated plan
-            self.state_manager.save_plan(plan_id, plan)
+            await self.state_manager.save_plan(plan_id, plan)
 
             return self.create_response(
                 "success",
@@ -447,7 +447,7 @@ class EnhancedAutonomousPlanner(BaseTool):
                 "error", "adjust_execution_plan", {}, f"Plan adjustment failed: {str(e)}"
             )
 
-    def update_task_status(
+    async def update_task_status(
         self, plan_id: str, task_id: int, status: str, result: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
@@ -460,26 +460,19 @@ class EnhancedAutonomousPlanner(BaseTool):
             result: Optional result data
         """
         try:
-            plan = self.state_manager.get_plan(plan_id)
-            if not plan:
-                return self.create_response(
-                    "error", "update_task_status", {}, f"Plan {plan_id} not found"
-                )
-
-            # Find task
-            task = None
-            for t in plan.get("tasks", []):
-                if t["id"] == task_id:
-                    task = t
-                    break
-
+            # Find task (a single field read, not the whole plan)
+            task = await self.state_manager.get_task(plan_id, task_id)
             if not task:
+                if not await self.state_manager.get_plan(plan_id):
+                    return self.create_response(
+                        "error", "update_task_status", {}, f"Plan {plan_id} not found"
+                    )
                 return self.create_response(
                     "error", "update_task_status", {}, f"Task {task_id} not found in plan"
                 )
 
             # Update status
-            success = self.state_manager.update_task_status(plan_id, task_id, status, result)
+            success = await self.state_manager.update_task_status(plan_id, task_id, status, result)
 
             if success:
                 # Print visual feedback
@@ -508,10 +501,10 @@ class EnhancedAutonomousPlanner(BaseTool):
                 "error", "update_task_status", {}, f"Task status update failed: {str(e)}"
             )
 
-    def get_plan_status(self, plan_id: str) -> Dict[str, Any]:
+    async def get_plan_status(self, plan_id: str) -> Dict[str, Any]:
         """Get real-time plan execution status"""
         try:
-            plan = self.state_manager.get_plan(plan_id)
+            plan = await self.state_manager.get_plan(plan_id)
             if not plan:
                 return self.create_response(
                     "error", "get_plan_status", {}, f"Plan {plan_id} not found"
@@ -545,8 +538,8 @@ class EnhancedAutonomousPlanner(BaseTool):
                     break
 
             # Get execution history
-            history = self.state_manager.get_execution_history(plan_id)
-            branches = self.state_manager.get_branches(plan_id)
+            history = await self.state_manager.get_execution_history(plan_id)
+            branches = await self.state_manager.get_branches(plan_id)
 
             status_data = {
                 "plan_id": plan_id,
@@ -925,7 +918,7 @@ def register_plan_tools(mcp: FastMCP):
         )
 
     @mcp.tool()
-    def update_task_status(
+    async def update_task_status(
         plan_id: str, task_id: int, status: str, result_json: str = None
     ) -> Dict[str, Any]:
         """
@@ -952,10 +945,10 @@ def register_plan_tools(mcp: FastMCP):
                     "error", "update_task_status", {}, f"Failed to parse result_json: {str(e)}"
                 )
 
-        return planner.update_task_status(plan_id, task_id, status, result)
+        return await planner.update_task_status(plan_id, task_id, status, result)
 
     @mcp.tool()
-    def get_plan_status(plan_id: str) -> Dict[str, Any]:
+    async def get_plan_status(plan_id: str) -> Dict[str, Any]:
         """
         Get real-time execution plan status
 
@@ -972,10 +965,10 @@ def register_plan_tools(mcp: FastMCP):
         Args:
             plan_id: Plan ID to check
         """
-        return planner.get_plan_status(plan_id)
+        return await planner.get_plan_status(plan_id)
 
     @mcp.tool()
-    def get_execution_history(plan_id: str) -> Dict[str, Any]:
+    async def get_execution_history(plan_id: str) -> Dict[str, Any]:
         """
         Get complete execution history for a plan
 
@@ -992,7 +985,7 @@ def register_plan_tools(mcp: FastMCP):
             plan_id: Plan ID
         """
         try:
-            history = planner.state_manager.get_execution_history(plan_id)
+            history = await planner.state_manager.get_execution_history(plan_id)
 
             return planner.create_response(
                 "success",
@@ -1005,7 +998,7 @@ def register_plan_tools(mcp: FastMCP):
             )
 
     @mcp.tool()
-    def list_active_plans() -> Dict[str, Any]:
+    async def list_active_plans() -> Dict[str, Any]:
         """
         List all active execution plans
 
@@ -1015,7 +1008,7 @@ def register_plan_tools(mcp: FastMCP):
         Category: planning
         """
         try:
-            plan_ids = planner.state_manager.list_active_plans()
+            plan_ids = await planner.state_manager.list_active_plans()
 
             return planner.create_response(
                 "success", "list_active_plans", {"plan_count": len(plan_ids), "plan_ids": plan_ids}
@@ -9,7 +9,13 @@ from typing import List, Dict, Any, Optional, Tuple
 import re
 import logging
 from datetime import datetime
-from chunking_service import BaseChunker, Chunk, ChunkConfig
+from .chunking_service import (
+    BaseChunker,
+    Chunk,
+    ChunkConfig,
+    adjacent_similarities,
+    embed_texts_to_matrix,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -120,8 +126,8 @@ class TopicChunker(BaseChunker):
                 from tools.intelligent_tools.language.embedding_generator import EmbeddingGenerator
 
                 embedder = EmbeddingGenerator()
-                embeddings = await embedder.embed_batch(
-                    sentences, model=self.config.embedding_model
+                embeddings = await embed_texts_to_matrix(
+                    embedder, sentences, model=self.config.embedding_model
                 )
             except Exception as e:
                 logger.warning(f"Could not generate embeddings: {e}")
@@ -174,22 +180,18 @@ class TopicChunker(BaseChunker):
         sentences = re.split(r"(?<=[.!?])\s+(?=[A-Z])", text)
         return [s.strip() for s in sentences if s.strip()]
 
-    def _detect_topic_boundaries(
-        self, sentences: List[str], embeddings: Optional[List[List[float]]] = None
-    ) -> List[int]:
+    def _detect_topic_boundaries(self, sentences: List[str], embeddings=None) -> List[int]:
         """Detect topic boundaries in text"""
         boundaries = []
 
-        if embeddings:
-            # Use embedding similarity
-            threshold = self.config.similarity_threshold
+        if embeddings is not None and len(embeddings) > 0:
+            import numpy as np
 
-            for i in range(1, len(embeddings)):
-                similarity = self._calculate_similarity(embeddings[i - 1], embeddings[i])
-
-                # Topic boundary if similarity drops
-                if similarity < threshold:
-                    boundaries.append(i)
+            # Use embedding similarity: a boundary wherever similarity between
+            # neighbouring sentences drops below the threshold
+            similarities = adjacent_similarities(np.asarray(embeddings, dtype=np.float32))
+            drops = np.flatnonzero(similarities < self.config.similarity_threshold) + 1
+            boundaries = drops.tolist()
         else:
             # Use heuristics
             for i, sentence in enumerate(sentences):
@@ -209,15 +211,6 @@ class TopicChunker(BaseChunker):
 
         return boundaries
 
-    def _calculate_similarity(self, emb1: List[float], emb2: List[float]) -> float:
-        """Calculate cosine similarity between embeddings"""
-        import numpy as np
-
-        vec1 = np.array(emb1)
-        vec2 = np.array(emb2)
-
-        return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
-
     async def _split_large_topic(
         self,
         sentences: List[str],
@@ -103,6 +103,36 @@ class BaseVectorDB(ABC):
         """
         pass
 
+    async def store_vectors(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Store many texts with their embeddings.
+
+        The default implementation stores items concurrently through
+        store_vector; backends with a native bulk write should override it.
+
+        Args:
+            items: Dicts with id, text, embedding, user_id and optional metadata
+
+        Returns:
+            Number of items stored
+        """
+        import asyncio
+
+        results = await asyncio.gather(
+            *(
+                self.store_vector(
+                    id=item["id"],
+                    text=item["text"],
+                    embedding=item["embedding"],
+                    user_id=item["user_id"],
+                    metadata=item.get("metadata"),
+                )
+                for item in items
+            ),
+            return_exceptions=True,
+        )
+        return sum(1 for r in results if r is True)
+
     @abstractmethod
     async def search_vectors(
         self, query_embedding: List[float], user_id: str, config: VectorSearchConfig
@@ -437,6 +467,27 @@ class BaseVectorDB(ABC):
         """
         pass
 
+    async def delete_vectors(self, ids: List[str], user_id: str) -> int:
+        """
+        Delete many vectors owned by one user.
+
+        The default implementation deletes concurrently through delete_vector;
+        backends with a native bulk delete should override it.
+
+        Args:
+            ids: Vector identifiers
+            user_id: User identifier for access control
+
+        Returns:
+            Number of vectors deleted
+        """
+        import asyncio
+
+        results = await asyncio.gather(
+            *(self.delete_vector(id, user_id) for id in ids), return_exceptions=True
+        )
+        return sum(1 for r in results if r is True)
+
     @abstractmethod
     async def get_vector(self, id: str, user_id: str) -> Optional[SearchResult]:
         """
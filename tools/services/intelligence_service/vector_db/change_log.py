@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Vector Index Change Log
+
+Durable, append-only log of record changes waiting to be applied to a vector
+index, plus a manifest of how many chunks each indexed record currently has.
+
+Both live in one SQLite database (WAL mode) so pending changes survive a
+restart and are only removed once the index update that covers them has
+succeeded. Acknowledging changes and updating the manifest happen in the same
+transaction.
+
+Changes whose update fails are retried with exponential backoff; after
+``max_attempts`` failures they are moved to the ``failed_changes`` table so
+they stop blocking the log. A record with a change in backoff is held back
+entirely, so its changes are still applied in order.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (table_name, user_id, record_id)
+RecordKey = Tuple[str, str, str]
+
+
+@dataclass
+class LoggedChange:
+    """A change read back from the log"""
+
+    seq: int
+    id: str
+    user_id: str
+    operation: str  # "insert", "update", "delete"
+    timestamp: datetime
+    table_name: str
+    text: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+
+    @property
+    def key(self) -> RecordKey:
+        return (self.table_name, self.user_id, self.id)
+
+
+class ChangeLog:
+    """SQLite-backed change log and chunk manifest"""
+
+    DB_FILENAME = "change_log.db"
+
+    def __init__(self, log_dir: str = "cache/vector_updates"):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.log_dir / self.DB_FILENAME
+        self._db_lock = threading.Lock()
+        self._db = self._open_db()
+
+    def _open_db(self) -> sqlite3.Connection:
+        """Open the log database in WAL mode"""
+        db = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                recorded_ts REAL NOT NULL,
+                text TEXT,
+                metadata TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_ts REAL NOT NULL DEFAULT 0
+            )
+            """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_changes_user ON changes (user_id, seq)")
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_changes_record "
+            "ON changes (table_name, user_id, record_id, seq)"
+        )
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS failed_changes (
+                seq INTEGER PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                recorded_ts REAL NOT NULL,
+                text TEXT,
+                metadata TEXT,
+                attempts INTEGER NOT NULL,
+                error TEXT,
+                failed_ts REAL NOT NULL
+            )
+            """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_manifest (
+                table_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL,
+                PRIMARY KEY (table_name, user_id, record_id)
+            )
+            """)
+        return db
+
+    def _db_execute(self, sql: str, params=()):
+        with self._db_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ============ Changes ============
+
+    def append(
+        self,
+        table_name: str,
+        user_id: str,
+        record_id: str,
+        operation: str,
+        recorded_at: datetime,
+        text: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Append a change and return its sequence number"""
+        with self._db_lock:
+            cursor = self._db.execute(
+                "INSERT INTO changes "
+                "(table_name, user_id, record_id, operation, recorded_ts, text, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    table_name,
+                    user_id,
+                    record_id,
+                    operation,
+                    recorded_at.timestamp(),
+                    text,
+                    json.dumps(metadata, default=str) if metadata is not None else None,
+                ),
+            )
+            return cursor.lastrowid
+
+    def read(
+        self, limit: int, due_before: Optional[float] = None, user_id: Optional[str] = None
+    ) -> List[LoggedChange]:
+        """
+        Oldest pending changes that are due, in the order they were recorded.
+
+        Args:
+            limit: Maximum number of changes
+            due_before: Only changes whose retry time is before this Unix
+                timestamp (default: now); records with an earlier change
+                still in backoff are skipped
+            user_id: Only this user's changes
+        """
+        due = time.time() if due_before is None else due_before
+        user_filter = "" if user_id is None else "c.user_id = ? AND "
+        rows = self._db_execute(
+            "SELECT seq, table_name, user_id, record_id, operation, recorded_ts, text, metadata, "
+            f"attempts FROM changes c WHERE {user_filter}NOT EXISTS ("
+            "SELECT 1 FROM changes b WHERE b.table_name = c.table_name "
+            "AND b.user_id = c.user_id AND b.record_id = c.record_id "
+            "AND b.seq <= c.seq AND b.next_attempt_ts >= ?) "
+            "ORDER BY seq LIMIT ?",
+            ((user_id,) if user_id is not None else ()) + (due, limit),
+        )
+        return [
+            LoggedChange(
+                seq=seq,
+                id=record_id,
+                user_id=user_id,
+                operation=operation,
+                timestamp=datetime.fromtimestamp(recorded_ts),
+                table_name=table_name,
+                text=text,
+                metadata=json.loads(metadata) if metadata else None,
+                attempts=attempts,
+            )
+            for (
+                seq,
+                table_name,
+                user_id,
+                record_id,
+                operation,
+                recorded_ts,
+                text,
+                metadata,
+                attempts,
+            ) in rows
+        ]
+
+    def count(self) -> int:
+        """Number of pending changes"""
+        return self._db_execute("SELECT COUNT(*) FROM changes")[0][0]
+
+    def failed_count(self) -> int:
+        """Number of changes moved to the failed table"""
+        return self._db_execute("SELECT COUNT(*) FROM failed_changes")[0][0]
+
+    def record_failure(
+        self,
+        seqs: List[int],
+        error: str,
+        max_attempts: int,
+        backoff_seconds: float,
+        max_backoff_seconds: float,
+    ) -> int:
+        """
+        Count a failed attempt for changes and schedule their retry.
+
+        The retry delay doubles with every attempt (capped at
+        ``max_backoff_seconds``). Changes that reached ``max_attempts`` move to
+        the failed table.
+
+        Returns:
+            Number of changes moved to the failed table
+        """
+        now = time.time()
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                placeholders = ", ".join("?" * len(seqs))
+                rows = self._db.execute(
+                    f"SELECT seq, attempts FROM changes WHERE seq IN ({placeholders})", seqs
+                ).fetchall()
+                retry = []
+                exhausted = []
+                for seq, attempts in rows:
+                    attempts += 1
+                    if attempts >= max_attempts:
+                        exhausted.append((attempts, error, now, seq))
+                    else:
+                        delay = min(backoff_seconds * 2 ** (attempts - 1), max_backoff_seconds)
+                        retry.append((attempts, now + delay, seq))
+
+                self._db.executemany(
+                    "UPDATE changes SET attempts = ?, next_attempt_ts = ? WHERE seq = ?", retry
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO failed_changes "
+                    "(seq, table_name, user_id, record_id, operation, recorded_ts, text, "
+                    "metadata, attempts, error, failed_ts) "
+                    "SELECT seq, table_name, user_id, record_id, operation, recorded_ts, text, "
+                    "metadata, ?, ?, ? FROM changes WHERE seq = ?",
+                    exhausted,
+                )
+                self._db.executemany(
+                    "DELETE FROM changes WHERE seq = ?", [(row[-1],) for row in exhausted]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(exhausted)
+
+    def pending_by_user(self) -> Dict[str, Tuple[int, float]]:
+        """Pending change count and oldest recorded timestamp per user"""
+        rows = self._db_execute(
+            "SELECT user_id, COUNT(*), MIN(recorded_ts) FROM changes GROUP BY user_id"
+        )
+        return {user_id: (count, oldest_ts) for user_id, count, oldest_ts in rows}
+
+    # ============ Chunk Manifest ============
+
+    def chunk_counts(self, keys: Iterable[RecordKey]) -> Dict[RecordKey, int]:
+        """Indexed chunk count for each key that has one"""
+        counts: Dict[RecordKey, int] = {}
+        for table_name, user_id, record_id in keys:
+            rows = self._db_execute(
+                "SELECT chunk_count FROM chunk_manifest "
+                "WHERE table_name = ? AND user_id = ? AND record_id = ?",
+                (table_name, user_id, record_id),
+            )
+            if rows:
+                counts[(table_name, user_id, record_id)] = rows[0][0]
+        return counts
+
+    def commit(self, seqs: List[int], chunk_counts: Dict[RecordKey, int]):
+        """
+        Acknowledge applied changes and record the resulting chunk counts.
+
+        A chunk count of 0 removes the record from the manifest.
+        """
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("DELETE FROM changes WHERE seq = ?", [(s,) for s in seqs])
+                self._db.executemany(
+                    "INSERT INTO chunk_manifest (table_name, user_id, record_id, chunk_count) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (table_name, user_id, record_id) "
+                    "DO UPDATE SET chunk_count = excluded.chunk_count",
+                    [(*key, n) for key, n in chunk_counts.items() if n > 0],
+                )
+                self._db.executemany(
+                    "DELETE FROM chunk_manifest "
+                    "WHERE table_name = ? AND user_id = ? AND record_id = ?",
+                    [key for key, n in chunk_counts.items() if n <= 0],
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        with self._db_lock:
+            self._db.close()
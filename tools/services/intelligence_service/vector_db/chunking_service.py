@@ -718,6 +718,59 @@ class CodeChunker(BaseChunker):
         return await self._chunk_by_lines(content, metadata)
 
 
+# ============ Embedding Helpers ============
+
+
+async def embed_texts_to_matrix(embedder, texts: List[str], model: Optional[str] = None):
+    """
+    Embed texts and return them as one contiguous float32 matrix.
+
+    The embedder batches requests to the service's limits; the result is
+    converted to NumPy once, so similarity math downstream never round-trips
+    through Python lists.
+
+    Returns:
+        ``np.ndarray`` of shape ``(len(texts), dim)`` and dtype float32
+    """
+    import numpy as np
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    rows = await embedder.embed_batch(texts, model=model)
+
+    matrix = np.ascontiguousarray(np.asarray(rows, dtype=np.float32))
+    if matrix.ndim != 2 or matrix.shape[0] != len(texts):
+        raise ValueError(
+            f"Embedding shape mismatch: expected {len(texts)} rows, got {matrix.shape}"
+        )
+    return matrix
+
+
+def normalize_rows(matrix):
+    """Scale each row to unit length (zero rows stay zero)"""
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def adjacent_similarities(matrix):
+    """
+    Cosine similarity between each row and the next one.
+
+    Returns:
+        float32 array of length ``len(matrix) - 1``
+    """
+    import numpy as np
+
+    if len(matrix) < 2:
+        return np.zeros(0, dtype=np.float32)
+    unit = normalize_rows(matrix)
+    return np.einsum("ij,ij->i", unit[:-1], unit[1:])
+
+
 class SemanticChunker(BaseChunker):
     """Chunk text based on semantic similarity between sentences"""
 
@@ -748,8 +801,8 @@ class SemanticChunker(BaseChunker):
         sentence_texts = [chunk.text for chunk in sentence_chunks]
 
         try:
-            embeddings = await embedder.embed_batch(
-                sentence_texts, model=self.config.embedding_model
+            embeddings = await embed_texts_to_matrix(
+                embedder, sentence_texts, model=self.config.embedding_model
             )
         except Exception as e:
             logger.warning(
@@ -765,95 +818,68 @@ class SemanticChunker(BaseChunker):
     async def _group_by_similarity(
         self,
         sentences: List[Chunk],
-        embeddings: List[List[float]],
+        embeddings,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> List[Chunk]:
-        """Group sentences based on embedding similarity"""
-        if not sentences or not embeddings:
-            return sentences
-
-        chunks = []
-        current_group = [sentences[0]]
-        current_embedding = embeddings[0]
-        current_size = len(sentences[0].text)
-        position = 0
-
-        for i in range(1, len(sentences)):
-            sentence = sentences[i]
-            embedding = embeddings[i]
-
-            # Calculate similarity
-            similarity = self._cosine_similarity(current_embedding, embedding)
+        """
+        Group sentences based on embedding similarity.
 
-            # Check if we should add to current group
-            should_add = (
-                similarity >= self.config.similarity_threshold
-                and current_size + len(sentence.text) <= self.config.chunk_size
-            )
+        Each sentence is compared against the centroid of the group it would
+        join. The centroid is kept as a running float32 sum of unit rows, so a
+        step costs one dot product and no allocations beyond NumPy scalars.
+        """
+        import numpy as np
 
-            if should_add:
-                current_group.append(sentence)
-                current_size += len(sentence.text)
-                # Update group embedding (average)
-                current_embedding = self._average_embeddings([current_embedding, embedding])
-            else:
-                # Create chunk from current group
-                chunk_text = " ".join([s.text for s in current_group])
-                start_char = current_group[0].start_char
-                end_char = current_group[-1].end_char
+        if not sentences or embeddings is None or len(embeddings) == 0:
+            return sentences
 
-                chunk_metadata = metadata or {}
-                chunk_metadata.update(
-                    {"sentence_count": len(current_group), "avg_similarity": similarity}
-                )
+        unit = normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        adjacent = adjacent_similarities(unit)
+        lengths = np.fromiter(
+            (len(s.text) for s in sentences), dtype=np.int64, count=len(sentences)
+        )
 
-                chunks.append(
-                    self._create_chunk(chunk_text, position, start_char, end_char, chunk_metadata)
-                )
-                position += 1
+        threshold = self.config.similarity_threshold
+        max_size = self.config.chunk_size
 
-                # Start new group
-                current_group = [sentence]
-                current_embedding = embedding
-                current_size = len(sentence.text)
+        # Choose group start indices
+        starts = [0]
+        group_sum = unit[0].copy()
+        group_size = int(lengths[0])
+        for i in range(1, len(sentences)):
+            sum_norm = float(np.linalg.norm(group_sum))
+            similarity = float(group_sum @ unit[i]) / sum_norm if sum_norm else 0.0
 
-        # Add last group
-        if current_group:
-            chunk_text = " ".join([s.text for s in current_group])
-            start_char = current_group[0].start_char
-            end_char = current_group[-1].end_char
+            if similarity >= threshold and group_size + lengths[i] <= max_size:
+                group_sum += unit[i]
+                group_size += int(lengths[i])
+            else:
+                starts.append(i)
+                group_sum = unit[i].copy()
+                group_size = int(lengths[i])
 
-            chunk_metadata = metadata or {}
-            chunk_metadata["sentence_count"] = len(current_group)
+        # Materialize chunks from boundaries
+        chunks = []
+        ends = starts[1:] + [len(sentences)]
+        for position, (start, end) in enumerate(zip(starts, ends)):
+            group = sentences[start:end]
+            chunk_metadata = dict(metadata or {})
+            chunk_metadata["sentence_count"] = len(group)
+            if end - start > 1:
+                chunk_metadata["avg_similarity"] = float(adjacent[start : end - 1].mean())
 
             chunks.append(
-                self._create_chunk(chunk_text, position, start_char, end_char, chunk_metadata)
+                self._create_chunk(
+                    " ".join(s.text for s in group),
+                    position,
+                    group[0].start_char,
+                    group[-1].end_char,
+                    chunk_metadata,
+                )
             )
 
         return chunks
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
-        import numpy as np
-
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
-    def _average_embeddings(self, embeddings: List[List[float]]) -> List[float]:
-        """Calculate average of multiple embeddings"""
-        import numpy as np
-
-        return np.mean(embeddings, axis=0).tolist()
-
 
 class TokenChunker(BaseChunker):
     """Chunk text based on token count for LLM compatibility"""
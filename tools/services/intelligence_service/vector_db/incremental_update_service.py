@@ -5,17 +5,42 @@ Incremental Update Service
 Manages incremental updates and index freshness for the RAG vector database.
 Provides efficient mechanisms to keep the knowledge base current without
 full reindexing.
+
+Changes are appended to a durable change log and applied in passes: the
+changes in a pass are coalesced per record (insert -> update -> delete
+collapses to the net effect), changed records are re-chunked, all chunks are
+embedded through the embedding batcher in one call, and the vector index is
+updated with one bulk upsert plus one bulk delete per user. Changes leave the
+log only after the index update succeeded, so a failed or interrupted pass is
+retried. Chunk point IDs are derived from the record key, which keeps retries
+idempotent and lets shrinking updates and deletes remove stale chunks.
+
+When a pass fails its records are retried one by one, so a single bad record
+does not hold back the rest of the batch. Records that keep failing are
+retried with exponential backoff and, after ``max_attempts`` tries, moved to
+the change log's failed table.
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Set
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
+from dataclasses import dataclass, field
 from enum import Enum
 
+from core.clients.embedding_batcher import EmbeddingBatcher
+from .change_log import ChangeLog, LoggedChange, RecordKey
+from .chunking_service import ChunkConfig, ChunkingService, ChunkingStrategy
+
 logger = logging.getLogger(__name__)
 
+OPERATIONS = ("insert", "update", "delete")
+
+# Loads the current text of changed records: (table_name, user_id, ids) -> {id: text}
+ContentLoader = Callable[[str, str, List[str]], Awaitable[Dict[str, str]]]
+
 
 class UpdateStrategy(Enum):
     """Update strategy enumeration"""
@@ -31,13 +56,25 @@ class UpdatePolicy:
     """Configuration for incremental updates"""
 
     strategy: UpdateStrategy = UpdateStrategy.BATCH
-    batch_size: int = 100
+    batch_size: int = 100  # Log entries applied per pass
     batch_interval_minutes: int = 5
     max_staleness_hours: int = 24
-    enable_auto_reindex: bool = True
-    reindex_threshold_changes: int = 1000
-    enable_change_tracking: bool = True
-    vacuum_interval_hours: int = 168  # 1 week
+    change_log_dir: str = "cache/vector_updates"
+
+    # Writers wait for a drain once this many changes are pending
+    max_backlog: int = 10_000
+    backpressure_timeout_seconds: float = 30.0
+
+    # Failed changes: retry delay doubles per attempt, then they are set aside
+    max_attempts: int = 5
+    retry_backoff_seconds: float = 30.0
+    max_retry_backoff_seconds: float = 3600.0
+
+    # Re-chunking and re-embedding
+    chunk_strategy: ChunkingStrategy = ChunkingStrategy.RECURSIVE
+    chunk_size: int = 1000
+    chunk_overlap: int = 100
+    embedding_model: Optional[str] = None
 
 
 @dataclass
@@ -50,6 +87,71 @@ class ChangeRecord:
     timestamp: datetime
     table_name: str
     metadata: Optional[Dict[str, Any]] = None
+    text: Optional[str] = None
+
+
+@dataclass
+class CoalescedChange:
+    """Net effect of the logged changes to one record"""
+
+    key: RecordKey
+    first_recorded: datetime
+    operation: Optional[str] = None  # "upsert", "delete" or None (no-op)
+    text: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    created: bool = False  # First change was an insert: nothing indexed before
+    seqs: List[int] = field(default_factory=list)
+
+
+@dataclass
+class UserFreshness:
+    """Freshness counters for one user"""
+
+    changes_applied: int = 0
+    last_applied_at: Optional[datetime] = None
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+
+
+def coalesce_changes(changes: List[LoggedChange]) -> Dict[RecordKey, CoalescedChange]:
+    """
+    Collapse logged changes (in log order) to one net change per record.
+
+    insert/update followed by updates becomes an upsert of the latest text;
+    anything followed by a delete becomes a delete, or a no-op if the record
+    was inserted within the same window and so was never indexed.
+    """
+    plan: Dict[RecordKey, CoalescedChange] = {}
+
+    for change in changes:
+        entry = plan.get(change.key)
+        if entry is None:
+            entry = plan[change.key] = CoalescedChange(
+                key=change.key,
+                first_recorded=change.timestamp,
+                created=change.operation == "insert",
+            )
+        entry.seqs.append(change.seq)
+
+        if change.operation == "delete":
+            entry.operation = None if entry.created else "delete"
+            entry.text = None
+            entry.metadata = None
+        else:
+            entry.operation = "upsert"
+            entry.text = change.text
+            if change.metadata is not None:
+                entry.metadata = change.metadata
+
+    return plan
+
+
+def chunk_point_id(key: RecordKey, index: int) -> str:
+    """Deterministic vector ID for chunk ``index`` of a record"""
+    table_name, user_id, record_id = key
+    return str(
+        uuid.uuid5(uuid.NAMESPACE_URL, f"vector-index:{table_name}/{user_id}/{record_id}#{index}")
+    )
 
 
 class IncrementalUpdateService:
@@ -57,33 +159,157 @@ class IncrementalUpdateService:
     Service for managing incremental updates to vector databases.
 
     Features:
-    - Change tracking and batching
-    - Automatic index maintenance
-    - Freshness monitoring
-    - Efficient update strategies
-    - Performance optimization
+    - Durable change log that survives restarts
+    - Per-record coalescing of pending changes
+    - Batched re-chunking, re-embedding and bulk index writes
+    - Backpressure on writers when the backlog grows
+    - Per-user freshness lag monitoring
     """
 
-    def __init__(self, policy: Optional[UpdatePolicy] = None):
+    def __init__(
+        self,
+        policy: Optional[UpdatePolicy] = None,
+        vector_db=None,
+        embedder: Optional[EmbeddingBatcher] = None,
+        chunking_service: Optional[ChunkingService] = None,
+        content_loader: Optional[ContentLoader] = None,
+    ):
         """
         Initialize incremental update service.
 
         Args:
             policy: Update policy configuration
+            vector_db: BaseVectorDB to update (default: the configured singleton)
+            embedder: EmbeddingBatcher used for re-embedding
+            chunking_service: ChunkingService used for re-chunking
+            content_loader: Loads current text for changes recorded without text
         """
         self.policy = policy or UpdatePolicy()
-        self.pending_changes: Dict[str, ChangeRecord] = {}
         self.last_batch_update = datetime.now()
-        self.last_reindex = datetime.now()
-        self.change_count = 0
         self.logger = logger
 
-        # Start background tasks if enabled
+        self._vector_db = vector_db
+        self._embedder = embedder
+        self._chunking = chunking_service or ChunkingService()
+        self._content_loader = content_loader
+
+        # Opened on first use so importing this module has no side effects;
+        # SQLite calls run in a worker thread to keep the event loop free
+        self._log: Optional[ChangeLog] = None
+        # Pending changes, counted once from the log and then kept up to date
+        self._pending: Optional[int] = None
+
+        self._process_lock = asyncio.Lock()
+        self._drain_task: Optional[asyncio.Task] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+        self._freshness: Dict[str, UserFreshness] = {}
+        self.backpressure_waits = 0
+        self.changes_coalesced = 0
+        self.chunks_embedded = 0
+
+    # ============ Dependencies ============
+
+    def _get_log(self) -> ChangeLog:
+        if self._log is None:
+            self._log = ChangeLog(self.policy.change_log_dir)
+        return self._log
+
+    async def _pending_count(self) -> int:
+        if self._pending is None:
+            count = await asyncio.to_thread(self._get_log().count)
+            # Another caller may have loaded it (and appended) meanwhile
+            if self._pending is None:
+                self._pending = count
+        return self._pending
+
+    def _remove_pending(self, count: int):
+        if self._pending is not None:
+            self._pending = max(0, self._pending - count)
+
+    def _get_vector_db(self):
+        if self._vector_db is None:
+            from .vector_db_factory import get_singleton_vector_db
+
+            self._vector_db = get_singleton_vector_db()
+        return self._vector_db
+
+    def _get_embedder(self) -> EmbeddingBatcher:
+        if self._embedder is None:
+            self._embedder = EmbeddingBatcher()
+        return self._embedder
+
+    # ============ Background Processing ============
+
+    def start(self):
+        """Start the background loop for the BATCH and SCHEDULED strategies"""
+        if self._worker_task and not self._worker_task.done():
+            return
+
         if self.policy.strategy == UpdateStrategy.BATCH:
-            asyncio.create_task(self._batch_update_loop())
+            self._wake = asyncio.Event()
+            self._worker_task = asyncio.create_task(self._batch_update_loop())
+        elif self.policy.strategy == UpdateStrategy.SCHEDULED:
+            self._worker_task = asyncio.create_task(self._scheduled_update_loop())
+
+    async def close(self):
+        """Stop background processing and close the change log"""
+        for task in (self._worker_task, self._drain_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._worker_task = None
+        self._drain_task = None
+
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._pending = None
+
+    def _drain(self) -> asyncio.Task:
+        """Shared task applying everything pending; concurrent callers reuse it"""
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self.process_pending_changes(force=True))
+        return self._drain_task
+
+    async def _batch_update_loop(self):
+        """Background loop for batch updates."""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=self.policy.batch_interval_minutes * 60
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.process_pending_changes()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in batch update loop: {e}")
+                await asyncio.sleep(60)  # Wait before retrying
+
+    async def _scheduled_update_loop(self):
+        """Background loop for scheduled updates."""
+        while True:
+            try:
+                # Wait until next scheduled time (simplified to daily)
+                await asyncio.sleep(24 * 60 * 60)
+                await self.process_pending_changes(force=True)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in scheduled update loop: {e}")
+                await asyncio.sleep(60 * 60)  # Wait an hour before retrying
 
-        if self.policy.strategy == UpdateStrategy.SCHEDULED:
-            asyncio.create_task(self._scheduled_update_loop())
+    # ============ Recording ============
 
     async def record_change(
         self,
@@ -92,47 +318,54 @@ class IncrementalUpdateService:
         operation: str,
         table_name: str = "user_knowledge",
         metadata: Optional[Dict[str, Any]] = None,
+        text: Optional[str] = None,
     ) -> bool:
         """
         Record a change for future batch processing.
 
+        The change is durable once this returns True. When the backlog is at
+        ``max_backlog`` the call waits (up to ``backpressure_timeout_seconds``)
+        for pending changes to be applied before returning.
+
         Args:
             id: Record identifier
             user_id: User identifier
             operation: Type of operation ("insert", "update", "delete")
             table_name: Table name
-            metadata: Additional metadata
+            metadata: Additional metadata stored with the record's vectors
+            text: Current record text; loaded via content_loader when omitted
 
         Returns:
             Success status
         """
+        if operation not in OPERATIONS:
+            self.logger.error(f"Unknown operation: {operation}")
+            return False
+
         try:
-            change_record = ChangeRecord(
-                id=id,
-                user_id=user_id,
-                operation=operation,
-                timestamp=datetime.now(),
-                table_name=table_name,
-                metadata=metadata,
+            await self._pending_count()
+            await asyncio.to_thread(
+                self._get_log().append,
+                table_name,
+                user_id,
+                id,
+                operation,
+                datetime.now(),
+                text,
+                metadata,
             )
+            self._pending += 1
+            backlog = self._pending
+            self.logger.debug(f"Recorded change: {operation} for {table_name}:{user_id}:{id}")
 
-            # Use composite key to handle duplicate changes
-            change_key = f"{table_name}:{user_id}:{id}"
-            self.pending_changes[change_key] = change_record
-            self.change_count += 1
-
-            self.logger.debug(f"Recorded change: {operation} for {change_key}")
-
-            # Handle immediate updates
             if self.policy.strategy == UpdateStrategy.IMMEDIATE:
-                await self._process_single_change(change_record)
-
-            # Check if we need automatic reindexing
-            if (
-                self.policy.enable_auto_reindex
-                and self.change_count >= self.policy.reindex_threshold_changes
-            ):
-                await self._trigger_reindex()
+                await self._drain()
+            elif backlog >= self.policy.max_backlog:
+                await self._apply_backpressure(backlog)
+            elif self.policy.strategy in (UpdateStrategy.BATCH, UpdateStrategy.SCHEDULED):
+                self.start()
+                if self._wake is not None and backlog >= self.policy.batch_size:
+                    self._wake.set()
 
             return True
 
@@ -140,24 +373,44 @@ class IncrementalUpdateService:
             self.logger.error(f"Error recording change: {e}")
             return False
 
-    async def process_pending_changes(self, force: bool = False) -> Dict[str, Any]:
+    async def _apply_backpressure(self, backlog: int):
+        """Hold the writer until the backlog drains or the timeout passes"""
+        self.backpressure_waits += 1
+        self.logger.warning(
+            f"Change backlog {backlog} reached {self.policy.max_backlog}, waiting for drain"
+        )
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._drain()), timeout=self.policy.backpressure_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("Change backlog still draining, releasing writer")
+
+    # ============ Processing ============
+
+    async def process_pending_changes(
+        self, force: bool = False, user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process all pending changes.
 
         Args:
             force: Force processing even if batch interval hasn't elapsed
+            user_id: Only apply this user's changes
 
         Returns:
             Processing result
         """
         try:
+            log = self._get_log()
             current_time = datetime.now()
             time_since_last = (current_time - self.last_batch_update).total_seconds() / 60
+            pending_count = await self._pending_count()
 
             # Check if we should process based on policy
             should_process = (
                 force
-                or len(self.pending_changes) >= self.policy.batch_size
+                or pending_count >= self.policy.batch_size
                 or time_since_last >= self.policy.batch_interval_minutes
             )
 
@@ -165,242 +418,265 @@ class IncrementalUpdateService:
                 return {
                     "processed": False,
                     "reason": "batch_criteria_not_met",
-                    "pending_count": len(self.pending_changes),
+                    "pending_count": pending_count,
                     "time_since_last": time_since_last,
                 }
 
-            if not self.pending_changes:
-                return {"processed": True, "changes_processed": 0, "message": "no_pending_changes"}
-
-            # Group changes by operation and user for efficient processing
-            grouped_changes = self._group_changes_for_processing()
-
-            # Process changes
-            results = {}
-            total_processed = 0
-
-            for group_key, changes in grouped_changes.items():
-                try:
-                    group_result = await self._process_change_group(group_key, changes)
-                    results[group_key] = group_result
-                    total_processed += len(changes)
-
-                except Exception as e:
-                    self.logger.error(f"Error processing change group {group_key}: {e}")
-                    results[group_key] = {"success": False, "error": str(e)}
-
-            # Clear processed changes
-            self.pending_changes.clear()
-            self.last_batch_update = current_time
+            totals = {
+                "changes_processed": 0,
+                "records_upserted": 0,
+                "records_deleted": 0,
+                "records_skipped": 0,
+                "chunks_embedded": 0,
+                "changes_failed": 0,
+                "changes_dead_lettered": 0,
+                "passes": 0,
+            }
 
-            self.logger.info(
-                f"Processed {total_processed} changes in {len(grouped_changes)} groups"
-            )
+            # Changes that fail in this call are not due again until after it
+            started = time.time()
+            while True:
+                # Locked per pass so a user's drain can run between passes of a full one
+                async with self._process_lock:
+                    changes = await asyncio.to_thread(
+                        log.read, self.policy.batch_size, due_before=started, user_id=user_id
+                    )
+                    if not changes:
+                        break
+
+                    try:
+                        result = await self._apply_changes(changes)
+                    except Exception as e:
+                        self.logger.warning(
+                            f"Pass of {len(changes)} changes failed, retrying per record: {e}"
+                        )
+                        result = await self._apply_per_record(changes, e)
+                totals["passes"] += 1
+                for name, value in result.items():
+                    totals[name] += value
+
+            if user_id is None:
+                self.last_batch_update = datetime.now()
+
+            if totals["changes_processed"]:
+                self.logger.info(
+                    f"Applied {totals['changes_processed']} changes in {totals['passes']} passes: "
+                    f"{totals['records_upserted']} upserted, {totals['records_deleted']} deleted"
+                )
+            if totals["changes_failed"]:
+                self.logger.warning(
+                    f"{totals['changes_failed']} changes failed, "
+                    f"{totals['changes_dead_lettered']} moved to the failed table"
+                )
 
             return {
                 "processed": True,
-                "changes_processed": total_processed,
-                "groups_processed": len(grouped_changes),
-                "results": results,
+                **totals,
                 "processing_time": datetime.now(),
             }
 
         except Exception as e:
             self.logger.error(f"Error processing pending changes: {e}")
-            return {"processed": False, "error": str(e)}
-
-    def _group_changes_for_processing(self) -> Dict[str, List[ChangeRecord]]:
-        """Group changes for efficient batch processing."""
-        groups = {}
-
-        for change in self.pending_changes.values():
-            # Group by table, user, and operation
-            group_key = f"{change.table_name}:{change.user_id}:{change.operation}"
-
-            if group_key not in groups:
-                groups[group_key] = []
-
-            groups[group_key].append(change)
-
-        return groups
-
-    async def _process_change_group(
-        self, group_key: str, changes: List[ChangeRecord]
-    ) -> Dict[str, Any]:
-        """Process a group of similar changes efficiently."""
-        try:
-            table_name, user_id, operation = group_key.split(":", 2)
-
-            if operation == "insert":
-                return await self._process_inserts(table_name, user_id, changes)
-            elif operation == "update":
-                return await self._process_updates(table_name, user_id, changes)
-            elif operation == "delete":
-                return await self._process_deletes(table_name, user_id, changes)
-            else:
-                return {"success": False, "error": f"Unknown operation: {operation}"}
-
-        except Exception as e:
-            self.logger.error(f"Error processing change group {group_key}: {e}")
-            return {"success": False, "error": str(e)}
-
-    async def _process_inserts(
-        self, table_name: str, user_id: str, changes: List[ChangeRecord]
-    ) -> Dict[str, Any]:
-        """Process insert operations."""
-        try:
-            # For inserts, we typically don't need to do anything extra
-            # as the new records are already in the database with indexes
-
-            insert_ids = [change.id for change in changes]
-
-            # Could trigger index optimization if needed
-            if len(insert_ids) > self.policy.batch_size:
-                await self._optimize_indexes(table_name, user_id)
-
             return {
-                "success": True,
-                "operation": "insert",
-                "processed_count": len(changes),
-                "ids": insert_ids,
+                "processed": False,
+                "error": str(e),
+                "pending_count": self._pending or 0,
             }
 
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-
-    async def _process_updates(
-        self, table_name: str, user_id: str, changes: List[ChangeRecord]
-    ) -> Dict[str, Any]:
-        """Process update operations."""
-        try:
-            # For updates, we may need to refresh any cached embeddings or indexes
-            update_ids = [change.id for change in changes]
-
-            # Update timestamp tracking
-            await self._update_freshness_tracking(table_name, user_id, update_ids)
-
-            return {
-                "success": True,
-                "operation": "update",
-                "processed_count": len(changes),
-                "ids": update_ids,
-            }
+    async def _apply_changes(self, changes: List[LoggedChange]) -> Dict[str, int]:
+        """Apply one pass of logged changes to the index and acknowledge them"""
+        plan = coalesce_changes(changes)
+        self.changes_coalesced += len(changes) - len(plan)
+
+        upserts = [c for c in plan.values() if c.operation == "upsert"]
+        deletes = [c for c in plan.values() if c.operation == "delete"]
+
+        skipped = await self._load_missing_text(upserts)
+        upserts = [c for c in upserts if c.text is not None]
+
+        log = self._get_log()
+        previous_counts = await asyncio.to_thread(
+            log.chunk_counts, [c.key for c in upserts + deletes]
+        )
+        new_counts: Dict[RecordKey, int] = {}
+
+        # Re-chunk every changed record, then embed all chunks in one batcher call
+        config = ChunkConfig(
+            strategy=self.policy.chunk_strategy,
+            chunk_size=self.policy.chunk_size,
+            chunk_overlap=self.policy.chunk_overlap,
+        )
+        chunker = self._chunking.get_chunker(config)
+        chunk_lists = await asyncio.gather(*(chunker.chunk(c.text, c.metadata) for c in upserts))
+
+        points: List[Dict[str, Any]] = []
+        for change, chunks in zip(upserts, chunk_lists):
+            table_name, user_id, record_id = change.key
+            new_counts[change.key] = len(chunks)
+            for index, chunk in enumerate(chunks):
+                points.append(
+                    {
+                        "id": chunk_point_id(change.key, index),
+                        "text": chunk.text,
+                        "user_id": user_id,
+                        "metadata": {
+                            **(change.metadata or {}),
+                            "record_id": record_id,
+                            "table_name": table_name,
+                            "chunk_index": index,
+                            "chunk_count": len(chunks),
+                        },
+                    }
+                )
+
+        if points:
+            embeddings = await self._get_embedder().embed(
+                [p["text"] for p in points], model=self.policy.embedding_model
+            )
+            for point, embedding in zip(points, embeddings):
+                point["embedding"] = embedding
+
+        # Chunks that no longer exist: all of a deleted record, the tail of a shrunk one
+        stale_ids: Dict[str, List[str]] = {}
+        for change in deletes:
+            new_counts[change.key] = 0
+        for key, count in new_counts.items():
+            for index in range(count, previous_counts.get(key, 0)):
+                stale_ids.setdefault(key[1], []).append(chunk_point_id(key, index))
+
+        vector_db = self._get_vector_db()
+        if points:
+            stored = await vector_db.store_vectors(points)
+            if stored < len(points):
+                raise RuntimeError(f"Stored {stored}/{len(points)} vectors")
+
+        for user_id, ids in stale_ids.items():
+            deleted = await vector_db.delete_vectors(ids, user_id)
+            if deleted < len(ids):
+                self.logger.warning(f"Deleted {deleted}/{len(ids)} stale vectors for {user_id}")
+
+        await asyncio.to_thread(log.commit, [c.seq for c in changes], new_counts)
+        self._remove_pending(len(changes))
+        self.chunks_embedded += len(points)
+        self._record_applied(plan.values())
+
+        return {
+            "changes_processed": len(changes),
+            "records_upserted": len(upserts),
+            "records_deleted": len(deletes),
+            "records_skipped": skipped,
+            "chunks_embedded": len(points),
+        }
+
+    async def _apply_per_record(
+        self, changes: List[LoggedChange], error: Exception
+    ) -> Dict[str, int]:
+        """Apply a failed pass record by record and count failures per change"""
+        by_record: Dict[RecordKey, List[LoggedChange]] = {}
+        for change in changes:
+            by_record.setdefault(change.key, []).append(change)
+
+        totals: Dict[str, int] = {"changes_failed": 0, "changes_dead_lettered": 0}
+        for group in by_record.values():
+            if len(by_record) > 1:
+                try:
+                    for name, value in (await self._apply_changes(group)).items():
+                        totals[name] = totals.get(name, 0) + value
+                    continue
+                except Exception as e:
+                    error = e
+
+            dead_lettered = await asyncio.to_thread(
+                self._get_log().record_failure,
+                [c.seq for c in group],
+                str(error),
+                max_attempts=self.policy.max_attempts,
+                backoff_seconds=self.policy.retry_backoff_seconds,
+                max_backoff_seconds=self.policy.max_retry_backoff_seconds,
+            )
+            self._remove_pending(dead_lettered)
+            totals["changes_failed"] += len(group)
+            totals["changes_dead_lettered"] += dead_lettered
+            self.logger.warning(f"Change to {':'.join(group[0].key)} failed: {error}")
+        return totals
+
+    async def _load_missing_text(self, upserts: List[CoalescedChange]) -> int:
+        """Fill in text for upserts recorded without it; returns how many stay empty"""
+        missing: Dict[tuple, List[CoalescedChange]] = {}
+        for change in upserts:
+            if change.text is None:
+                missing.setdefault(change.key[:2], []).append(change)
+
+        if missing and self._content_loader:
+            for (table_name, user_id), group in missing.items():
+                texts = await self._content_loader(table_name, user_id, [c.key[2] for c in group])
+                for change in group:
+                    change.text = texts.get(change.key[2])
+
+        skipped = [c for group in missing.values() for c in group if c.text is None]
+        for change in skipped:
+            self.logger.warning(f"No text for changed record {':'.join(change.key)}, skipping")
+        return len(skipped)
+
+    def _record_applied(self, changes):
+        """Update per-user freshness counters for applied changes"""
+        now = datetime.now()
+        for change in changes:
+            user_id = change.key[1]
+            lag = (now - change.first_recorded).total_seconds()
+            freshness = self._freshness.setdefault(user_id, UserFreshness())
+            freshness.changes_applied += len(change.seqs)
+            freshness.last_applied_at = now
+            freshness.last_lag_seconds = lag
+            freshness.max_lag_seconds = max(freshness.max_lag_seconds, lag)
+
+    # ============ Freshness ============
+
+    async def ensure_fresh(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Apply pending changes before a read (the LAZY strategy's access hook).
 
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        Changes still in retry backoff are left alone, so a failing record
+        does not force a pass on every read.
 
-    async def _process_deletes(
-        self, table_name: str, user_id: str, changes: List[ChangeRecord]
-    ) -> Dict[str, Any]:
-        """Process delete operations."""
-        try:
-            # For deletes, we may need to clean up indexes or vacuum
-            delete_ids = [change.id for change in changes]
+        Args:
+            user_id: Only apply this user's changes (default: everyone's)
 
-            # Schedule vacuum if many deletes
-            if len(delete_ids) > self.policy.batch_size // 2:
-                await self._schedule_vacuum(table_name)
+        Returns:
+            Processing result, or a no-op result when nothing is due
+        """
+        due = await asyncio.to_thread(self._get_log().read, 1, user_id=user_id)
+        if not due:
+            return {"processed": True, "changes_processed": 0, "message": "no_pending_changes"}
+        if user_id is None:
+            return await self._drain()
+        return await self.process_pending_changes(force=True, user_id=user_id)
+
+    async def get_freshness_lag(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Freshness lag per user.
 
-            return {
-                "success": True,
-                "operation": "delete",
-                "processed_count": len(changes),
-                "ids": delete_ids,
+        ``freshness_lag_seconds`` is the age of the user's oldest unapplied
+        change (0 when the user's index is current); the ``*_applied_*``
+        values measure how long applied changes waited in the log.
+        """
+        pending = await asyncio.to_thread(self._get_log().pending_by_user)
+        now = time.time()
+        lag: Dict[str, Dict[str, Any]] = {}
+
+        for user_id in set(pending) | set(self._freshness):
+            count, oldest_ts = pending.get(user_id, (0, None))
+            freshness = self._freshness.get(user_id, UserFreshness())
+            lag[user_id] = {
+                "pending_changes": count,
+                "freshness_lag_seconds": max(0.0, now - oldest_ts) if oldest_ts else 0.0,
+                "changes_applied": freshness.changes_applied,
+                "last_applied_at": freshness.last_applied_at,
+                "last_applied_lag_seconds": freshness.last_lag_seconds,
+                "max_applied_lag_seconds": freshness.max_lag_seconds,
             }
 
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-
-    async def _process_single_change(self, change: ChangeRecord) -> bool:
-        """Process a single change immediately."""
-        try:
-            # For immediate processing, we typically just log or trigger notifications
-            self.logger.debug(f"Immediate processing: {change.operation} on {change.id}")
-
-            # Could trigger real-time index updates here
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Error in immediate processing: {e}")
-            return False
-
-    async def _trigger_reindex(self) -> bool:
-        """Trigger a full reindex operation."""
-        try:
-            self.logger.info(f"Triggering reindex after {self.change_count} changes")
-
-            # Reset change count
-            self.change_count = 0
-            self.last_reindex = datetime.now()
-
-            # In a full implementation, this would trigger database reindexing
-            # For now, we just log the event
-
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Error triggering reindex: {e}")
-            return False
-
-    async def _optimize_indexes(self, table_name: str, user_id: str) -> bool:
-        """Optimize indexes for a specific table/user."""
-        try:
-            self.logger.debug(f"Optimizing indexes for {table_name}:{user_id}")
-
-            # In a full implementation, this would run VACUUM, ANALYZE, etc.
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Error optimizing indexes: {e}")
-            return False
-
-    async def _update_freshness_tracking(
-        self, table_name: str, user_id: str, ids: List[str]
-    ) -> bool:
-        """Update freshness tracking for modified records."""
-        try:
-            # Track when records were last updated for freshness queries
-            self.logger.debug(f"Updating freshness tracking for {len(ids)} records")
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Error updating freshness tracking: {e}")
-            return False
-
-    async def _schedule_vacuum(self, table_name: str) -> bool:
-        """Schedule a vacuum operation for the table."""
-        try:
-            self.logger.info(f"Scheduling vacuum for {table_name}")
-
-            # In a full implementation, this would schedule actual VACUUM operations
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Error scheduling vacuum: {e}")
-            return False
-
-    async def _batch_update_loop(self):
-        """Background loop for batch updates."""
-        while True:
-            try:
-                await asyncio.sleep(self.policy.batch_interval_minutes * 60)
-                await self.process_pending_changes()
-
-            except Exception as e:
-                self.logger.error(f"Error in batch update loop: {e}")
-                await asyncio.sleep(60)  # Wait before retrying
-
-    async def _scheduled_update_loop(self):
-        """Background loop for scheduled updates."""
-        while True:
-            try:
-                # Wait until next scheduled time (simplified to daily)
-                await asyncio.sleep(24 * 60 * 60)
-                await self.process_pending_changes(force=True)
-
-            except Exception as e:
-                self.logger.error(f"Error in scheduled update loop: {e}")
-                await asyncio.sleep(60 * 60)  # Wait an hour before retrying
+        return lag
 
     async def get_freshness_status(self, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -414,21 +690,26 @@ class IncrementalUpdateService:
         """
         try:
             current_time = datetime.now()
+            lag_by_user = await self.get_freshness_lag()
+            pending_changes = sum(u["pending_changes"] for u in lag_by_user.values())
 
             status = {
                 "current_time": current_time,
                 "last_batch_update": self.last_batch_update,
-                "last_reindex": self.last_reindex,
-                "pending_changes": len(self.pending_changes),
-                "total_changes_since_reindex": self.change_count,
+                "pending_changes": pending_changes,
                 "update_strategy": self.policy.strategy.value,
                 "batch_interval_minutes": self.policy.batch_interval_minutes,
                 "max_staleness_hours": self.policy.max_staleness_hours,
+                "max_backlog": self.policy.max_backlog,
+                "failed_changes": await asyncio.to_thread(self._get_log().failed_count),
+                "backpressure_waits": self.backpressure_waits,
+                "changes_coalesced": self.changes_coalesced,
+                "chunks_embedded": self.chunks_embedded,
             }
 
-            # Calculate staleness
-            time_since_update = current_time - self.last_batch_update
-            staleness_hours = time_since_update.total_seconds() / 3600
+            # Staleness is the age of the oldest change not yet in the index
+            lags = [u["freshness_lag_seconds"] for u in lag_by_user.values()]
+            staleness_hours = max(lags, default=0.0) / 3600
 
             status["staleness_hours"] = staleness_hours
             status["is_stale"] = staleness_hours > self.policy.max_staleness_hours
@@ -441,10 +722,18 @@ class IncrementalUpdateService:
 
             # User-specific information if requested
             if user_id:
-                user_changes = [
-                    change for change in self.pending_changes.values() if change.user_id == user_id
-                ]
-                status["user_pending_changes"] = len(user_changes)
+                user_lag = lag_by_user.get(user_id) or {
+                    "pending_changes": 0,
+                    "freshness_lag_seconds": 0.0,
+                    "changes_applied": 0,
+                    "last_applied_at": None,
+                    "last_applied_lag_seconds": 0.0,
+                    "max_applied_lag_seconds": 0.0,
+                }
+                status["user_pending_changes"] = user_lag["pending_changes"]
+                status["user_freshness"] = user_lag
+            else:
+                status["freshness_by_user"] = lag_by_user
 
             return status
 
@@ -466,11 +755,7 @@ class IncrementalUpdateService:
             self.logger.info(f"Force refresh requested for user: {user_id or 'all'}")
 
             # Process pending changes
-            result = await self.process_pending_changes(force=True)
-
-            # Trigger reindex if needed
-            if self.change_count > 0:
-                await self._trigger_reindex()
+            result = dict(await self._drain())
 
             result["forced"] = True
             result["refresh_time"] = datetime.now()
@@ -488,11 +773,20 @@ incremental_update_service = IncrementalUpdateService()
 
 # Convenience functions
 async def record_knowledge_change(
-    id: str, user_id: str, operation: str, metadata: Optional[Dict[str, Any]] = None
+    id: str,
+    user_id: str,
+    operation: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    text: Optional[str] = None,
 ) -> bool:
     """Convenience function to record knowledge changes."""
     return await incremental_update_service.record_change(
-        id=id, user_id=user_id, operation=operation, table_name="user_knowledge", metadata=metadata
+        id=id,
+        user_id=user_id,
+        operation=operation,
+        table_name="user_knowledge",
+        metadata=metadata,
+        text=text,
     )
 
 
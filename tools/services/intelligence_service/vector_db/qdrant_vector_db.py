@@ -131,6 +131,8 @@ class QdrantVectorDB(BaseVectorDB):
         try:
             # Index user_id for multi-tenant filtering
             self.client.create_field_index(self.collection_name, "user_id", "keyword")
+            # Index the payload ID for ownership checks in bulk deletes
+            self.client.create_field_index(self.collection_name, "id", "keyword")
 
             # Index metadata fields if needed
             # Can add more indexes based on usage patterns
@@ -192,6 +194,48 @@ class QdrantVectorDB(BaseVectorDB):
             logger.error(f"Failed to store vector: {e}")
             return False
 
+    async def store_vectors(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Store many texts with their embeddings in a single upsert.
+
+        Args:
+            items: Dicts with id, text, embedding, user_id and optional metadata
+
+        Returns:
+            Number of items stored
+        """
+        try:
+            points = []
+            for item in items:
+                if len(item["embedding"]) != self.vector_dimension:
+                    logger.error(
+                        f"Vector dimension mismatch for {item['id']}: expected "
+                        f"{self.vector_dimension}, got {len(item['embedding'])}"
+                    )
+                    continue
+
+                payload = {"user_id": item["user_id"], "text": item["text"], "id": item["id"]}
+                if item.get("metadata"):
+                    payload.update(item["metadata"])
+
+                points.append({"id": item["id"], "vector": item["embedding"], "payload": payload})
+
+            if not points:
+                return 0
+
+            operation_id = self.client.upsert_points(self.collection_name, points)
+
+            if operation_id:
+                logger.debug(f"Stored {len(points)} vectors")
+                return len(points)
+            else:
+                logger.error(f"Failed to store {len(points)} vectors")
+                return 0
+
+        except Exception as e:
+            logger.error(f"Failed to store vectors: {e}")
+            return 0
+
     async def search_vectors(
         self, query_embedding: List[float], user_id: str, config: VectorSearchConfig
     ) -> List[SearchResult]:
@@ -309,6 +353,61 @@ class QdrantVectorDB(BaseVectorDB):
             logger.error(f"Failed to delete vector: {e}")
             return False
 
+    async def delete_vectors(self, ids: List[str], user_id: str) -> int:
+        """
+        Delete many vectors in a single request.
+
+        Ownership is checked with one filtered scroll (user_id must match, id
+        any of ``ids``); IDs that do not exist or belong to another user are
+        skipped.
+
+        Args:
+            ids: Vector identifiers
+            user_id: User identifier for access control
+
+        Returns:
+            Number of vectors deleted
+        """
+        if not ids:
+            return 0
+
+        try:
+            filter_conditions = {
+                "must": [{"field": "user_id", "match": {"keyword": user_id}}],
+                "should": [{"field": "id", "match": {"keyword": str(id)}} for id in ids],
+            }
+            result = self.client.scroll(
+                self.collection_name,
+                filter_conditions=filter_conditions,
+                limit=len(ids),
+                with_payload=True,
+                with_vectors=False,
+            )
+            owned = {
+                point.get("payload", {}).get("id") for point in (result or {}).get("points", [])
+            }
+            owned_ids = [id for id in ids if str(id) in owned]
+            if len(owned_ids) < len(ids):
+                logger.warning(
+                    f"Skipping {len(ids) - len(owned_ids)} vectors not found or not owned "
+                    f"by user {user_id}"
+                )
+            if not owned_ids:
+                return 0
+
+            operation_id = self.client.delete_points(self.collection_name, owned_ids)
+
+            if operation_id:
+                logger.debug(f"Deleted {len(owned_ids)} vectors for user {user_id}")
+                return len(owned_ids)
+            else:
+                logger.error(f"Failed to delete {len(owned_ids)} vectors for user {user_id}")
+                return 0
+
+        except Exception as e:
+            logger.error(f"Failed to delete vectors: {e}")
+            return 0
+
     async def get_vector(self, id: str, user_id: str) -> Optional[SearchResult]:
         """
         Get a specific vector by ID.
@@ -0,0 +1,257 @@
+"""
+File Reader - Ranged, constant-memory reads backing the read_file tool.
+
+Provides:
+- LineIndex: Sparse line -> byte offset index of a text file
+- read_lines: Read a line range by seeking to the nearest indexed line
+- read_bytes: Read a byte range of a binary file
+
+Text reads seek via a per-file sparse index (one byte offset every
+``LINE_INDEX_STRIDE`` lines) cached by (path, mtime, size), so a read at
+line 10,000,000 costs the same as a read at line 1 once the file has been
+indexed, and a changed file is re-indexed automatically. Every read stops at
+a byte budget and reports where to continue, so memory use does not depend
+on file size or offset.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Lines between two entries of a sparse line index
+LINE_INDEX_STRIDE = 1000
+# Line indexes kept in memory (least recently used are dropped)
+LINE_INDEX_CACHE_SIZE = 64
+# Read size used while scanning files
+SCAN_CHUNK_SIZE = 1024 * 1024
+# Bytes added to each line by the "{n:6}\t" prefix and joining newline
+LINE_NUMBER_WIDTH = 8
+
+
+@dataclass
+class LineIndex:
+    """Byte offsets of every ``stride``-th line of a file (line 0 starts at 0)."""
+
+    total_lines: int
+    checkpoints: List[int] = field(default_factory=lambda: [0])
+    stride: int = LINE_INDEX_STRIDE
+
+    @classmethod
+    def build(cls, path: Path, stride: int = LINE_INDEX_STRIDE) -> "LineIndex":
+        """Scan a file once in fixed-size chunks and record line checkpoints."""
+        checkpoints = [0]
+        lines = 0
+        position = 0
+        last_byte = b"\n"
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(SCAN_CHUNK_SIZE)
+                if not chunk:
+                    break
+                newline = chunk.find(b"\n")
+                while newline != -1:
+                    lines += 1
+                    if lines % stride == 0:
+                        checkpoints.append(position + newline + 1)
+                    newline = chunk.find(b"\n", newline + 1)
+                position += len(chunk)
+                last_byte = chunk[-1:]
+
+        # A final line without a trailing newline still counts
+        if last_byte != b"\n":
+            lines += 1
+        return cls(total_lines=lines, checkpoints=checkpoints, stride=stride)
+
+    def seek_point(self, line: int) -> Tuple[int, int]:
+        """(line, byte offset) of the closest checkpoint at or before a 0-indexed line."""
+        slot = min(line // self.stride, len(self.checkpoints) - 1)
+        return slot * self.stride, self.checkpoints[slot]
+
+
+class LineIndexCache:
+    """LRU of line indexes keyed by (path, mtime, size)."""
+
+    def __init__(self, max_entries: int = LINE_INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, int], LineIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, stat: os.stat_result) -> LineIndex:
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+
+        index = LineIndex.build(path)
+        with self._lock:
+            # Drop indexes of older versions of the same file
+            for stale in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[stale]
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_line_indexes = LineIndexCache()
+
+
+def get_line_index_cache() -> LineIndexCache:
+    return _line_indexes
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    """Whether b"\\n" always marks a line end (false for UTF-16/32)."""
+    try:
+        return "\n".encode(encoding) == b"\n"
+    except LookupError:
+        return False
+
+
+def _read_line(f, max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    Read one line, keeping at most ``max_bytes`` of it in memory.
+
+    Returns:
+        (line bytes, whether the line was cut)
+    """
+    line = f.readline(max_bytes)
+    if not line or line.endswith(b"\n") or len(line) < max_bytes:
+        return line, False
+    # Discard the rest of an overlong line without buffering it
+    while True:
+        rest = f.readline(SCAN_CHUNK_SIZE)
+        if not rest or rest.endswith(b"\n"):
+            return line, True
+
+
+@dataclass
+class LineRange:
+    """Result of a ranged text read."""
+
+    lines: List[Tuple[int, str]]  # (1-indexed line number, text without newline)
+    total_lines: int
+    next_line: Optional[int]  # 1-indexed line to continue from, None at end of file
+    budget_exhausted: bool = False
+
+
+def read_lines(
+    path: Path,
+    start_line: int,
+    max_lines: int,
+    max_bytes: int,
+    max_line_length: int,
+    encoding: str = "utf-8",
+) -> LineRange:
+    """
+    Read up to ``max_lines`` lines starting at a 0-indexed line.
+
+    Lines longer than ``max_line_length`` characters are cut and marked
+    "... [truncated]". Reading stops early once ``max_bytes`` of text has been
+    collected (at least one line is always returned).
+    """
+    if not _is_ascii_compatible(encoding):
+        return _read_lines_decoded(
+            path, start_line, max_lines, max_bytes, max_line_length, encoding
+        )
+
+    stat = path.stat()
+    index = _line_indexes.get(path, stat)
+    line_no, position = index.seek_point(start_line)
+    # Worst case 4 bytes per character
+    line_bytes_limit = max_line_length * 4 + 1
+
+    lines: List[Tuple[int, str]] = []
+    used = 0
+    exhausted = False
+    with open(path, "rb") as f:
+        f.seek(position)
+        while line_no < start_line:
+            raw, _ = _read_line(f, SCAN_CHUNK_SIZE)
+            if not raw:
+                break
+            line_no += 1
+
+        while len(lines) < max_lines and line_no < index.total_lines:
+            raw, cut = _read_line(f, line_bytes_limit)
+            if not raw:
+                break
+            text = raw.decode(encoding, errors="replace").rstrip("\r\n")
+            if cut or len(text) > max_line_length:
+                text = text[:max_line_length] + "... [truncated]"
+            size = len(text.encode("utf-8")) + LINE_NUMBER_WIDTH
+            if lines and used + size > max_bytes:
+                exhausted = True
+                break
+            used += size
+            line_no += 1
+            lines.append((line_no, text))
+
+    next_line = line_no + 1 if line_no < index.total_lines else None
+    return LineRange(lines, index.total_lines, next_line, exhausted)
+
+
+def _read_lines_decoded(
+    path: Path,
+    start_line: int,
+    max_lines: int,
+    max_bytes: int,
+    max_line_length: int,
+    encoding: str,
+) -> LineRange:
+    """Streaming fallback for encodings where newlines are not single bytes."""
+    lines: List[Tuple[int, str]] = []
+    used = 0
+    exhausted = False
+    total = 0
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        while True:
+            text = f.readline(max_line_length + 1)
+            if not text:
+                break
+            cut = not text.endswith("\n") and len(text) > max_line_length
+            while cut:
+                rest = f.readline(SCAN_CHUNK_SIZE)
+                if not rest or rest.endswith("\n"):
+                    break
+            total += 1
+            if total <= start_line or len(lines) >= max_lines or exhausted:
+                continue
+            text = text.rstrip("\r\n")
+            if cut:
+                text = text[:max_line_length] + "... [truncated]"
+            size = len(text.encode("utf-8")) + LINE_NUMBER_WIDTH
+            if lines and used + size > max_bytes:
+                exhausted = True
+                continue
+            used += size
+            lines.append((total, text))
+
+    last = lines[-1][0] if lines else min(start_line, total)
+    next_line = last + 1 if last < total else None
+    return LineRange(lines, total, next_line, exhausted)
+
+
+def read_bytes(path: Path, offset: int, length: int) -> Tuple[bytes, Optional[int]]:
+    """
+    Read ``length`` bytes starting at ``offset``.
+
+    Returns:
+        (data, next offset or None at end of file)
+    """
+    size = path.stat().st_size
+    offset = max(0, min(offset, size))
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    end = offset + len(data)
+    return data, end if end < size else None
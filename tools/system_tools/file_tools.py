@@ -2,7 +2,7 @@
 File Tools - Core file operations for reading, writing, and editing files.
 
 Provides:
-- read_file: Read file contents with line offset/limit support
+- read_file: Read file contents with line offset/limit and byte range support
 - write_file: Create or overwrite files
 - edit_file: Exact string replacement in files
 - multi_edit_file: Multiple edits in one atomic operation
@@ -11,6 +11,7 @@ Keywords: file, read, write, edit, content, text, code, modify
 """
 
 import os
+import asyncio
 import base64
 import mimetypes
 import logging
@@ -20,10 +21,12 @@ from datetime import datetime
 
 from mcp.server.fastmcp import FastMCP
 
+from tools.system_tools.file_reader import read_bytes, read_lines
+
 logger = logging.getLogger(__name__)
 
-# Maximum file size to read (10MB)
-MAX_FILE_SIZE = 10 * 1024 * 1024
+# Maximum bytes returned by one read_file call (10MB); larger files are read in ranges
+MAX_READ_BYTES = 10 * 1024 * 1024
 # Maximum lines to read by default
 DEFAULT_MAX_LINES = 2000
 # Maximum line length before truncation
@@ -106,6 +109,8 @@ def register_file_tools(mcp: FastMCP):
         offset: Optional[int] = None,
         limit: Optional[int] = None,
         encoding: str = "utf-8",
+        byte_offset: Optional[int] = None,
+        byte_limit: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Read a file from the local filesystem.
@@ -116,12 +121,18 @@ def register_file_tools(mcp: FastMCP):
         - Images (PNG, JPG, etc. - returned as base64 with mime type)
         - PDFs (returned as base64)
         - Line offset and limit for large files
+        - Byte ranges for large binary files
+
+        Files of any size can be read: each call returns at most 10MB, and
+        "next_offset" / "next_byte_offset" tell where the next call continues.
 
         Args:
             file_path: Absolute path to the file to read.
             offset: Line number to start reading from (1-indexed). Optional.
             limit: Maximum number of lines to read. Defaults to 2000.
             encoding: Text encoding to use. Defaults to 'utf-8'.
+            byte_offset: Binary files only - byte to start reading from (0-indexed).
+            byte_limit: Binary files only - maximum number of bytes to read.
 
         Returns:
             {
@@ -133,10 +144,15 @@ def register_file_tools(mcp: FastMCP):
                 "total_lines": 100,
                 "lines_read": 50,
                 "offset": 1,
+                "next_offset": 51,
                 "truncated": false,
                 "encoding": "utf-8"
             }
 
+            Binary files report "byte_offset", "bytes_read" and
+            "next_byte_offset" (null once the end of the file is reached); one
+            call reads at most 7.5MB so the base64 content stays within 10MB.
+
         Keywords: read, file, content, text, code, view, open, cat
         """
         try:
@@ -168,20 +184,13 @@ def register_file_tools(mcp: FastMCP):
                     "timestamp": datetime.now().isoformat(),
                 }
 
-            # Check file size
             file_size = path.stat().st_size
-            if file_size > MAX_FILE_SIZE:
-                return {
-                    "status": "error",
-                    "action": "read_file",
-                    "error": f"File too large ({file_size} bytes). Maximum: {MAX_FILE_SIZE} bytes.",
-                    "error_code": "FILE_TOO_LARGE",
-                    "timestamp": datetime.now().isoformat(),
-                }
 
             # Determine file type
             mime_type, _ = mimetypes.guess_type(str(path))
-            mime_type = mime_type or "application/octet-stream"
+            if mime_type is None:
+                # Unknown extensions (.log, .out, ...) are sniffed instead of assumed binary
+                mime_type = "text/plain" if _is_text_file(path) else "application/octet-stream"
 
             # Handle binary/image files
             if (
@@ -189,8 +198,12 @@ def register_file_tools(mcp: FastMCP):
                 or mime_type in ["application/pdf", "application/octet-stream"]
                 or not _is_text_file(path)
             ):
-                with open(path, "rb") as f:
-                    content = base64.b64encode(f.read()).decode("ascii")
+                start = max(byte_offset or 0, 0)
+                # base64 grows data by 4/3, so read only what encodes within the budget
+                budget = MAX_READ_BYTES * 3 // 4
+                length = min(byte_limit, budget) if byte_limit else budget
+                data, next_byte_offset = await asyncio.to_thread(read_bytes, path, start, length)
+                content = base64.b64encode(data).decode("ascii")
 
                 content_type = "image" if mime_type.startswith("image/") else "binary"
 
@@ -204,36 +217,33 @@ def register_file_tools(mcp: FastMCP):
                         "mime_type": mime_type,
                         "file_size": file_size,
                         "encoding": "base64",
+                        "byte_offset": min(start, file_size),
+                        "bytes_read": len(data),
+                        "next_byte_offset": next_byte_offset,
+                        "truncated": next_byte_offset is not None or start > 0,
                     },
                     "timestamp": datetime.now().isoformat(),
                 }
 
-            # Handle text files
-            with open(path, "r", encoding=encoding, errors="replace") as f:
-                all_lines = f.readlines()
-
-            total_lines = len(all_lines)
-
-            # Apply offset and limit
+            # Handle text files: seek to the requested line via the cached line index
             start_line = (offset - 1) if offset and offset > 0 else 0
             max_lines = limit if limit else DEFAULT_MAX_LINES
-            end_line = min(start_line + max_lines, total_lines)
-
-            selected_lines = all_lines[start_line:end_line]
+            result = await asyncio.to_thread(
+                read_lines,
+                path,
+                start_line,
+                max_lines,
+                MAX_READ_BYTES,
+                MAX_LINE_LENGTH,
+                encoding,
+            )
 
             # Format with line numbers (like cat -n)
-            formatted_lines = []
-            for i, line in enumerate(selected_lines, start=start_line + 1):
-                # Truncate long lines
-                if len(line) > MAX_LINE_LENGTH:
-                    line = line[:MAX_LINE_LENGTH] + "... [truncated]\n"
-                # Format: "    5\t<content>"
-                formatted_lines.append(f"{i:6}\t{line.rstrip()}")
-
-            content = "\n".join(formatted_lines)
-            truncated = end_line < total_lines or start_line > 0
+            content = "\n".join(f"{i:6}\t{line.rstrip()}" for i, line in result.lines)
+            lines_read = len(result.lines)
+            truncated = result.next_line is not None or start_line > 0
 
-            logger.info(f"read_file: {file_path} ({end_line - start_line} lines)")
+            logger.info(f"read_file: {file_path} ({lines_read} lines)")
 
             return {
                 "status": "success",
@@ -243,9 +253,10 @@ def register_file_tools(mcp: FastMCP):
                     "content": content,
                     "content_type": "text",
                     "mime_type": mime_type,
-                    "total_lines": total_lines,
-                    "lines_read": end_line - start_line,
+                    "total_lines": result.total_lines,
+                    "lines_read": lines_read,
                     "offset": start_line + 1,
+                    "next_offset": result.next_line,
                     "truncated": truncated,
                     "encoding": encoding,
                 },